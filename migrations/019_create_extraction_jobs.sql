@@ -0,0 +1,38 @@
+-- Migration 019: Durable memory extraction job queue
+-- track_message() only enqueues; a background worker claims jobs with
+-- FOR UPDATE SKIP LOCKED and runs extraction off the chat path.
+-- At most one pending/running job per (user_id, channel_id) session.
+
+CREATE TABLE IF NOT EXISTS memory_extraction_jobs (
+    id BIGSERIAL PRIMARY KEY,
+    user_id BIGINT NOT NULL,
+    channel_id BIGINT NOT NULL,
+
+    trigger TEXT NOT NULL DEFAULT 'threshold',   -- 'threshold' | 'inactivity'
+    status TEXT NOT NULL DEFAULT 'pending',      -- 'pending' | 'running' | 'done' | 'failed'
+    attempts INT NOT NULL DEFAULT 0,
+    run_after TIMESTAMPTZ NOT NULL DEFAULT NOW(),  -- backoff: not claimable before this
+    locked_at TIMESTAMPTZ,
+    last_error TEXT,
+
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMPTZ
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_extraction_jobs_active_session
+    ON memory_extraction_jobs(user_id, channel_id)
+    WHERE status IN ('pending', 'running');
+
+CREATE INDEX IF NOT EXISTS idx_extraction_jobs_claimable
+    ON memory_extraction_jobs(run_after)
+    WHERE status = 'pending';
+
+CREATE INDEX IF NOT EXISTS idx_extraction_jobs_session_created
+    ON memory_extraction_jobs(user_id, channel_id, created_at DESC);
+
+-- Agent that owns the session, so inactivity-triggered jobs know which
+-- persona to store memories under
+ALTER TABLE memory_sessions ADD COLUMN IF NOT EXISTS agent_id TEXT;
+
+COMMENT ON TABLE memory_extraction_jobs IS 'Durable queue of memory extraction work; one active job per memory_sessions row';
+COMMENT ON COLUMN memory_extraction_jobs.trigger IS 'threshold (message count reached) | inactivity (extraction_inactivity_minutes elapsed)';
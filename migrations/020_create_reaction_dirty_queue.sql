@@ -0,0 +1,28 @@
+-- Migration 020: Dirty-memory queue for incremental reaction aggregation
+-- ReactionStore.store_reaction/remove_reaction mark every memory linked to
+-- the reacted message; ReactionAggregator drains the queue and recomputes
+-- reaction_summary for the whole batch in one set-based pass.
+
+CREATE TABLE IF NOT EXISTS memory_reaction_dirty (
+    memory_id INT PRIMARY KEY REFERENCES memories(id) ON DELETE CASCADE,
+    queued_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_reaction_dirty_queued
+    ON memory_reaction_dirty(queued_at);
+
+-- Seed with everything the old discovery query would have picked up, so
+-- nothing pending at cutover is lost
+INSERT INTO memory_reaction_dirty (memory_id)
+SELECT DISTINCT m.id
+FROM memories m
+JOIN memory_message_links l ON m.id = l.memory_id
+JOIN message_reactions r ON l.message_id = r.message_id
+WHERE r.removed_at IS NULL
+AND (
+    m.reaction_summary IS NULL
+    OR r.reacted_at > (m.reaction_summary->>'last_aggregated_at')::timestamptz
+)
+ON CONFLICT (memory_id) DO NOTHING;
+
+COMMENT ON TABLE memory_reaction_dirty IS 'Memories whose linked reactions changed since the last aggregation run';
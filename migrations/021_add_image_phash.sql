@@ -0,0 +1,16 @@
+-- Migration 021: Perceptual hash and moderation verdict on image observations
+-- ImageObserver checks exact (file_hash) and near (phash) duplicates before
+-- any paid call, and reuses the matched observation's analysis, embedding
+-- and moderation verdict instead of re-running them.
+
+-- 64-bit dHash stored as signed BIGINT (see memory/images/phash.py)
+ALTER TABLE image_observations ADD COLUMN IF NOT EXISTS phash BIGINT;
+
+-- ModerationResult at capture time; NULL when moderation was disabled
+ALTER TABLE image_observations ADD COLUMN IF NOT EXISTS moderation JSONB;
+
+-- Cross-user exact-duplicate lookup (obs_user_hash_idx leads with user_id)
+CREATE INDEX IF NOT EXISTS obs_file_hash_idx ON image_observations(file_hash);
+
+COMMENT ON COLUMN image_observations.phash IS 'Perceptual difference hash for near-duplicate reuse of analysis';
+COMMENT ON COLUMN image_observations.moderation IS 'Moderation verdict reused for duplicate and near-duplicate uploads';
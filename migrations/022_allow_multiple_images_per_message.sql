@@ -0,0 +1,8 @@
+-- Migration 022: Allow one observation per image attachment, not per message
+-- image_observations.message_id was UNIQUE, so only the first screenshot of a
+-- multi-image message could be stored. Attachments of one message are now
+-- observed in parallel; dedup stays on (user_id, file_hash).
+
+ALTER TABLE image_observations DROP CONSTRAINT IF EXISTS image_observations_message_id_key;
+
+CREATE INDEX IF NOT EXISTS obs_message_idx ON image_observations(message_id);
@@ -0,0 +1,49 @@
+-- Migration 023: Local indexed archive of guild messages
+-- Fed by on_message / raw edit / raw delete events plus a resumable backfill,
+-- so search_messages, read_messages and the proactive observer query Postgres
+-- instead of paging channel.history() over REST.
+-- Messages deleted while the bot is offline are not removed until seen again.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE TABLE IF NOT EXISTS message_archive (
+    message_id BIGINT PRIMARY KEY,
+    channel_id BIGINT NOT NULL,
+    guild_id BIGINT NOT NULL,
+    author_id BIGINT NOT NULL,
+    author_name TEXT NOT NULL,
+    author_display_name TEXT NOT NULL,
+    author_is_bot BOOLEAN NOT NULL DEFAULT FALSE,
+    content TEXT NOT NULL DEFAULT '',
+    created_at TIMESTAMPTZ NOT NULL,
+    edited_at TIMESTAMPTZ,
+    -- 'simple' config: exact tokens (player names, mod names) without stemming
+    content_tsv tsvector GENERATED ALWAYS AS (to_tsvector('simple', content)) STORED
+);
+
+-- Word search (any order) and substring search (ILIKE, matches the old behavior)
+CREATE INDEX IF NOT EXISTS idx_message_archive_tsv ON message_archive USING GIN(content_tsv);
+CREATE INDEX IF NOT EXISTS idx_message_archive_trgm ON message_archive USING GIN(content gin_trgm_ops);
+
+-- Recent messages per channel / per author
+CREATE INDEX IF NOT EXISTS idx_message_archive_channel_created
+    ON message_archive(channel_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_message_archive_author_created
+    ON message_archive(author_id, created_at DESC);
+
+-- Backfill progress per channel: history is walked backwards from the
+-- oldest archived message, so a restart resumes where it stopped.
+-- newest_message_id is the head the backfill has caught up to; only the
+-- backfill advances it, so messages archived by live events after a restart
+-- can't hide the gap the bot was offline for
+CREATE TABLE IF NOT EXISTS message_archive_channels (
+    channel_id BIGINT PRIMARY KEY,
+    guild_id BIGINT NOT NULL,
+    oldest_message_id BIGINT,
+    newest_message_id BIGINT,
+    backfill_complete BOOLEAN NOT NULL DEFAULT FALSE,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE message_archive IS 'Local copy of guild messages for fast search; kept current by gateway events and backfill';
+COMMENT ON TABLE message_archive_channels IS 'Resumable backfill cursors per channel (oldest archived and caught-up head message ids)';
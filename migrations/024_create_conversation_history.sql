@@ -0,0 +1,17 @@
+-- Migration 024: Persisted short-term chat history
+-- Written behind by ConversationStore (src/conversation_store.py) so a
+-- restart or redeploy keeps recent conversation context. One row per
+-- (client scope, user, channel); rows idle past CONVERSATION_TTL_SECONDS
+-- are pruned by the store.
+
+CREATE TABLE IF NOT EXISTS conversation_history (
+    scope TEXT NOT NULL,                      -- Owning client's agent_id
+    user_id TEXT NOT NULL,
+    channel_id TEXT NOT NULL,
+    messages JSONB NOT NULL DEFAULT '[]',     -- [[role, content], ...] oldest first
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (scope, user_id, channel_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_conversation_history_updated
+    ON conversation_history(scope, updated_at);
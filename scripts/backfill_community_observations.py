@@ -33,6 +33,8 @@ import discord
 import voyageai
 from dotenv import load_dotenv
 
+from memory.reactions.store import insert_memory_links
+
 load_dotenv()
 
 logging.basicConfig(
@@ -177,57 +179,50 @@ class CommunityObservationBackfill:
                 if "invalid" not in str(e).lower():
                     logger.warning(f"Could not generate embedding: {e}")
 
-            # Create memory (with or without embedding)
-            if embedding_str:
-                memory_id = await self.db.fetchval(
-                    """
-                    INSERT INTO memories (
-                        user_id, topic_summary, raw_dialogue, memory_type,
-                        privacy_level, confidence, origin_guild_id, origin_channel_id, embedding
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9::vector)
-                    RETURNING id
-                    """,
-                    author_id,
-                    summary,
-                    content,
-                    "community_observation",
-                    "guild_public",
-                    0.5,
-                    guild_id,
-                    channel_id,
-                    embedding_str,
-                )
-            else:
-                memory_id = await self.db.fetchval(
-                    """
-                    INSERT INTO memories (
-                        user_id, topic_summary, raw_dialogue, memory_type,
-                        privacy_level, confidence, origin_guild_id, origin_channel_id
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                    RETURNING id
-                    """,
-                    author_id,
-                    summary,
-                    content,
-                    "community_observation",
-                    "guild_public",
-                    0.5,
-                    guild_id,
-                    channel_id,
-                )
+            # Create the memory and its link together, so an interrupted run
+            # never leaves an unlinked observation for a re-run to duplicate
+            async with self.db.acquire() as conn, conn.transaction():
+                if embedding_str:
+                    memory_id = await conn.fetchval(
+                        """
+                        INSERT INTO memories (
+                            user_id, topic_summary, raw_dialogue, memory_type,
+                            privacy_level, confidence, origin_guild_id, origin_channel_id, embedding
+                        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9::vector)
+                        RETURNING id
+                        """,
+                        author_id,
+                        summary,
+                        content,
+                        "community_observation",
+                        "guild_public",
+                        0.5,
+                        guild_id,
+                        channel_id,
+                        embedding_str,
+                    )
+                else:
+                    memory_id = await conn.fetchval(
+                        """
+                        INSERT INTO memories (
+                            user_id, topic_summary, raw_dialogue, memory_type,
+                            privacy_level, confidence, origin_guild_id, origin_channel_id
+                        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+                        RETURNING id
+                        """,
+                        author_id,
+                        summary,
+                        content,
+                        "community_observation",
+                        "guild_public",
+                        0.5,
+                        guild_id,
+                        channel_id,
+                    )
 
-            # Create link
-            await self.db.execute(
-                """
-                INSERT INTO memory_message_links (memory_id, message_id, channel_id, contribution_type)
-                VALUES ($1, $2, $3, $4)
-                ON CONFLICT DO NOTHING
-                """,
-                memory_id,
-                message_id,
-                channel_id,
-                "community_observation",
-            )
+                await insert_memory_links(
+                    conn, [(memory_id, message_id, channel_id, "community_observation")]
+                )
 
             self.stats["observations_created"] += 1
             logger.debug(f"Created observation {memory_id} for message {message_id}")
@@ -0,0 +1,120 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Benchmark memory_message_links writes: per-row loop vs bulk unnest insert.
+
+Compares the old per-link `INSERT ... VALUES` loop (one round-trip per
+link) with `insert_memory_links()` (one `INSERT ... SELECT unnest` per
+batch). Writes go to a TEMP table that shadows memory_message_links inside
+a rolled-back transaction, so production data is never touched.
+
+Usage:
+    # Default: 5 memories x 10 messages (a typical extraction), 50 rounds
+    python scripts/benchmark_memory_links.py
+
+    # Larger backfill-style batch
+    python scripts/benchmark_memory_links.py --memories 50 --messages 20 --rounds 20
+
+Environment:
+    DATABASE_URL          required
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import asyncpg
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from memory.reactions.store import insert_memory_links  # noqa: E402
+
+
+async def _loop_insert(conn: asyncpg.Connection, links: list[tuple[int, int, int, str]]) -> None:
+    for memory_id, message_id, channel_id, contribution_type in links:
+        await conn.execute(
+            """
+            INSERT INTO memory_message_links (memory_id, message_id, channel_id, contribution_type)
+            VALUES ($1, $2, $3, $4)
+            ON CONFLICT (memory_id, message_id) DO NOTHING
+            """,
+            memory_id,
+            message_id,
+            channel_id,
+            contribution_type,
+        )
+
+
+async def _time(conn, fn, links, rounds: int) -> list[float]:
+    samples = []
+    for _ in range(rounds):
+        await conn.execute("TRUNCATE memory_message_links")
+        start = time.perf_counter()
+        await fn(conn, links)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("DATABASE_URL not set")
+        return 1
+
+    links = [
+        (memory_id, 10_000_000 + message_id, 42, "source")
+        for memory_id in range(1, args.memories + 1)
+        for message_id in range(args.messages)
+    ]
+
+    conn = await asyncpg.connect(database_url)
+    try:
+        tx = conn.transaction()
+        await tx.start()
+        try:
+            # pg_temp is searched first, so unqualified names hit this table
+            await conn.execute(
+                "CREATE TEMP TABLE memory_message_links "
+                "(LIKE public.memory_message_links INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING INDEXES)"
+            )
+            loop_ms = await _time(conn, _loop_insert, links, args.rounds)
+            bulk_ms = await _time(conn, insert_memory_links, links, args.rounds)
+        finally:
+            await tx.rollback()
+    finally:
+        await conn.close()
+
+    print(f"{len(links)} links ({args.memories} memories x {args.messages} messages), {args.rounds} rounds")
+    for name, samples in (("loop", loop_ms), ("bulk", bulk_ms)):
+        print(
+            f"  {name:4}  median {statistics.median(samples):8.2f} ms   "
+            f"p95 {sorted(samples)[int(len(samples) * 0.95) - 1]:8.2f} ms"
+        )
+    print(f"  speedup {statistics.median(loop_ms) / statistics.median(bulk_ms):.1f}x")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--memories", type=int, default=5, help="Memories per batch (default 5).")
+    parser.add_argument("--messages", type=int, default=10, help="Source messages per memory (default 10).")
+    parser.add_argument("--rounds", type=int, default=50, help="Timed repetitions per method (default 50).")
+    args = parser.parse_args()
+
+    rc = asyncio.run(main_async(args))
+    sys.exit(rc)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Benchmark voice DSP: audioop vs the NumPy core in voice.dsp.
+
+Reports CPU time per second of audio per speaker for the two hot paths:
+
+- receive:  one 20ms Discord frame (48kHz stereo) -> 16kHz mono + VAD RMS,
+            50 times per second per speaking user, on the socket thread
+- playback: 24kHz TTS chunks -> 48kHz stereo, plus per-frame volume
+
+The audioop column is skipped on Python 3.13+, where audioop is gone.
+
+Usage:
+    python scripts/benchmark_voice_dsp.py
+    python scripts/benchmark_voice_dsp.py --seconds 30 --tts-chunk-ms 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from voice import dsp  # noqa: E402
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    try:
+        import audioop
+    except ImportError:
+        audioop = None
+
+FRAME_MS = 20
+VOLUME = 0.8
+
+
+def _speech_like(samples: int, rate: int, channels: int) -> bytes:
+    """Amplitude-modulated 180Hz tone plus noise, roughly voice-shaped."""
+    rng = np.random.default_rng(0)
+    t = np.arange(samples) / rate
+    mono = 6000 * np.sin(2 * np.pi * 180 * t) * (1 + 0.5 * np.sin(2 * np.pi * 3 * t))
+    mono += rng.normal(0, 800, samples)
+    pcm = np.clip(mono, -32768, 32767).astype("<i2")
+    return np.repeat(pcm, channels).tobytes()
+
+
+def _chunks(pcm: bytes, chunk_bytes: int) -> list[bytes]:
+    return [pcm[i : i + chunk_bytes] for i in range(0, len(pcm), chunk_bytes)]
+
+
+def _cpu_us(fn, items: list[bytes], rounds: int) -> float:
+    """Best-of-rounds CPU time (microseconds) to process all items."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.process_time()
+        for item in items:
+            fn(item)
+        best = min(best, time.process_time() - start)
+    return best * 1e6
+
+
+def _receive_old():
+    def run(frame: bytes) -> None:
+        mono = audioop.tomono(frame, 2, 1, 0)
+        pcm, _ = audioop.ratecv(mono, 2, 1, 48000, 16000, None)
+        audioop.rms(pcm, 2)
+    return run
+
+
+def _receive_new():
+    down = dsp.Downmixer()
+
+    def run(frame: bytes) -> None:
+        dsp.rms(down.process(frame))
+    return run
+
+
+def _playback_old():
+    state = None
+
+    def run(chunk: bytes) -> None:
+        nonlocal state
+        pcm, state = audioop.ratecv(chunk, 2, 1, 24000, 48000, state)
+        stereo = audioop.tostereo(pcm, 2, 1, 1)
+        for frame in _chunks(stereo, 3840):
+            audioop.mul(frame, 2, VOLUME)
+    return run
+
+
+def _playback_new():
+    up = dsp.Upmixer()
+
+    def run(chunk: bytes) -> None:
+        for frame in _chunks(up.process(chunk), 3840):
+            dsp.apply_gain(frame, VOLUME)
+    return run
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=int, default=10, help="Audio per round (default: 10)")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds; best is reported (default: 5)")
+    parser.add_argument("--tts-chunk-ms", type=int, default=100, help="TTS chunk size (default: 100)")
+    args = parser.parse_args()
+
+    received = _chunks(_speech_like(48000 * args.seconds, 48000, 2), 48000 * 2 * 2 * FRAME_MS // 1000)
+    tts = _chunks(_speech_like(24000 * args.seconds, 24000, 1), 24000 * 2 * args.tts_chunk_ms // 1000)
+
+    print(f"Python {sys.version.split()[0]}, NumPy {np.__version__}, {args.seconds}s of audio x {args.rounds} rounds")
+    print(f"{'path':<10} {'impl':<8} {'CPU us / audio s':>18} {'speakers / core':>16}")
+    for path, old, new, items in (
+        ("receive", _receive_old, _receive_new, received),
+        ("playback", _playback_old, _playback_new, tts),
+    ):
+        impls = [("numpy", new)]
+        if audioop is not None:
+            impls.insert(0, ("audioop", old))
+        for name, factory in impls:
+            per_second = _cpu_us(factory(), items, args.rounds) / args.seconds
+            print(f"{path:<10} {name:<8} {per_second:>18.0f} {1e6 / per_second:>16.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -261,6 +261,14 @@ class AgentClient(discord.Client):
                 await self._voice_session.leave()
                 self._voice_session = None
 
+    async def close(self):
+        """Persist queued conversation history, then disconnect."""
+        try:
+            await self.claude.close()
+        except Exception as e:
+            logger.error(f"[{self.persona.display_name}] conversation flush failed: {e}")
+        await super().close()
+
     # --- Discord tool methods (used by ClaudeClient._execute_tool) ---
 
     async def _send_chunked(
@@ -21,42 +21,176 @@ Lightweight analytics tracking for slashAI.
 Usage:
     from analytics import track, track_async
 
-    # Synchronous (fire-and-forget, uses background task)
+    # Synchronous (fire-and-forget, buffered)
     track("message_received", "message", user_id=123, properties={"channel_type": "dm"})
 
     # Async (when you need to await completion)
     await track_async("command_used", "command", user_id=123, properties={"command": "memories list"})
+
+Events go into an in-process ring buffer; one background flusher writes them
+with COPY every ANALYTICS_FLUSH_INTERVAL_MS or as soon as
+ANALYTICS_BATCH_SIZE events are waiting. When the buffer is full the oldest
+events are dropped and counted, so tracking never blocks or grows without
+bound. shutdown() flushes whatever is still buffered.
+
+The bot hands its main pool to use_pool(); without one a small dedicated
+pool is created from DATABASE_URL.
 """
 
 import asyncio
 import json
 import logging
 import os
+from collections import deque
+from datetime import datetime, timezone
 from typing import Any, Optional
 
 import asyncpg
 
 logger = logging.getLogger(__name__)
 
-# Module-level connection pool (initialized lazily)
+# Module-level connection pool (initialized lazily unless shared)
 _pool: Optional[asyncpg.Pool] = None
+_owns_pool: bool = False
 _enabled: bool = os.getenv("ANALYTICS_ENABLED", "true").lower() == "true"
 
+# Buffer capacity; beyond it the oldest events are dropped
+BUFFER_SIZE = int(os.getenv("ANALYTICS_BUFFER_SIZE", "10000"))
+
+# Flush when this many events are waiting...
+BATCH_SIZE = int(os.getenv("ANALYTICS_BATCH_SIZE", "200"))
+
+# ...or after this long, whichever comes first
+FLUSH_INTERVAL_MS = int(os.getenv("ANALYTICS_FLUSH_INTERVAL_MS", "2000"))
+
+_COLUMNS = (
+    "event_name", "event_category", "user_id", "channel_id",
+    "guild_id", "properties", "created_at",
+)
+
+_buffer: deque[tuple] = deque(maxlen=BUFFER_SIZE)
+_wakeup: Optional[asyncio.Event] = None
+_flusher: Optional[asyncio.Task] = None
+_flush_lock: Optional[asyncio.Lock] = None
+_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+_stats = {"tracked": 0, "written": 0, "dropped": 0, "failed": 0, "flushes": 0}
+
+
+def use_pool(pool: asyncpg.Pool) -> None:
+    """Write through an existing pool (e.g. the bot's) instead of a dedicated one."""
+    global _pool, _owns_pool
+    _pool = pool
+    _owns_pool = False
+
 
 async def _get_pool() -> Optional[asyncpg.Pool]:
     """Get or create the connection pool."""
-    global _pool
+    global _pool, _owns_pool
     if _pool is None and _enabled:
         database_url = os.getenv("DATABASE_URL")
         if database_url:
             try:
-                _pool = await asyncpg.create_pool(database_url, min_size=1, max_size=3)
+                _pool = await asyncpg.create_pool(database_url, min_size=1, max_size=2)
+                _owns_pool = True
             except Exception as e:
                 logger.warning(f"Analytics pool creation failed: {e}")
                 return None
     return _pool
 
 
+def stats() -> dict[str, int]:
+    """Counters: tracked, written, dropped (buffer full), failed (write errors), flushes, buffered."""
+    return {**_stats, "buffered": len(_buffer)}
+
+
+def _enqueue(
+    event_name: str,
+    event_category: str,
+    user_id: Optional[int],
+    channel_id: Optional[int],
+    guild_id: Optional[int],
+    properties: Optional[dict[str, Any]],
+) -> None:
+    if len(_buffer) == _buffer.maxlen:
+        _stats["dropped"] += 1  # deque drops the oldest on append
+    _buffer.append((
+        event_name,
+        event_category,
+        user_id,
+        channel_id,
+        guild_id,
+        json.dumps(properties or {}),
+        datetime.now(timezone.utc),  # Event time, not flush time
+    ))
+    _stats["tracked"] += 1
+
+
+def _get_flush_lock() -> asyncio.Lock:
+    """The flush lock for the running loop (one writer at a time)."""
+    global _flush_lock, _lock_loop
+    loop = asyncio.get_running_loop()
+    if _flush_lock is None or _lock_loop is not loop:
+        _flush_lock, _lock_loop = asyncio.Lock(), loop
+    return _flush_lock
+
+
+async def flush() -> int:
+    """
+    Write everything buffered, in batches of BATCH_SIZE.
+
+    Returns:
+        Number of events written
+    """
+    written = 0
+    async with _get_flush_lock():
+        while _buffer:
+            pool = await _get_pool()
+            if pool is None:
+                _stats["failed"] += len(_buffer)
+                _buffer.clear()
+                break
+            batch = [_buffer.popleft() for _ in range(min(BATCH_SIZE, len(_buffer)))]
+            try:
+                await pool.copy_records_to_table(
+                    "analytics_events", records=batch, columns=_COLUMNS
+                )
+            except Exception as e:
+                _stats["failed"] += len(batch)
+                logger.debug(f"Analytics flush failed ({len(batch)} events): {e}")
+                break
+            _stats["written"] += len(batch)
+            _stats["flushes"] += 1
+            written += len(batch)
+    return written
+
+
+async def _flush_loop() -> None:
+    """Flush every FLUSH_INTERVAL_MS, or early when a batch fills up."""
+    while True:
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=FLUSH_INTERVAL_MS / 1000)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
+        try:
+            await flush()
+        except Exception as e:
+            logger.error(f"Error in analytics flusher: {e}", exc_info=True)
+
+
+def _ensure_flusher() -> None:
+    """Start the flusher on the running loop (no-op outside one)."""
+    global _flusher, _wakeup
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return  # Buffered; flushed once a loop calls track()
+    if _flusher is not None and not _flusher.done() and _flusher.get_loop() is loop:
+        return
+    _wakeup = asyncio.Event()
+    _flusher = loop.create_task(_flush_loop(), name="analytics-flusher")
+
+
 async def track_async(
     event_name: str,
     event_category: str,
@@ -66,7 +200,7 @@ async def track_async(
     properties: Optional[dict[str, Any]] = None,
 ) -> bool:
     """
-    Track an event asynchronously.
+    Track an event and flush it before returning.
 
     Args:
         event_name: Specific event identifier (e.g., "message_received")
@@ -77,33 +211,15 @@ async def track_async(
         properties: Additional event data as key-value pairs
 
     Returns:
-        True if event was recorded, False otherwise
+        True if the buffer (including this event) was written, False otherwise
     """
     if not _enabled:
         return False
 
-    pool = await _get_pool()
-    if pool is None:
-        return False
-
-    try:
-        await pool.execute(
-            """
-            INSERT INTO analytics_events
-                (event_name, event_category, user_id, channel_id, guild_id, properties)
-            VALUES ($1, $2, $3, $4, $5, $6)
-            """,
-            event_name,
-            event_category,
-            user_id,
-            channel_id,
-            guild_id,
-            json.dumps(properties or {}),
-        )
-        return True
-    except Exception as e:
-        logger.debug(f"Analytics tracking failed: {e}")
-        return False
+    _enqueue(event_name, event_category, user_id, channel_id, guild_id, properties)
+    failed_before = _stats["failed"]
+    await flush()
+    return _stats["failed"] == failed_before
 
 
 def track(
@@ -117,25 +233,39 @@ def track(
     """
     Track an event (fire-and-forget).
 
-    Creates a background task to record the event without blocking.
+    Appends to the buffer without blocking or creating a task per event.
     Safe to call from sync or async contexts.
     """
     if not _enabled:
         return
 
-    try:
-        loop = asyncio.get_running_loop()
-        loop.create_task(
-            track_async(event_name, event_category, user_id, channel_id, guild_id, properties)
-        )
-    except RuntimeError:
-        # No running loop - skip tracking
-        pass
+    _enqueue(event_name, event_category, user_id, channel_id, guild_id, properties)
+    _ensure_flusher()
+    if len(_buffer) >= BATCH_SIZE and _wakeup is not None:
+        _wakeup.set()
 
 
 async def shutdown() -> None:
-    """Close the connection pool. Call on bot shutdown."""
-    global _pool
-    if _pool is not None:
+    """Stop the flusher, write everything still buffered, close an owned pool. Call on bot shutdown."""
+    global _pool, _flusher, _owns_pool
+    if _flusher is not None and _flusher.get_loop() is asyncio.get_running_loop():
+        # Cancel between flushes so no popped batch is lost mid-write
+        async with _get_flush_lock():
+            _flusher.cancel()
+        try:
+            await _flusher
+        except asyncio.CancelledError:
+            pass
+    _flusher = None
+    if _buffer:
+        written = await flush()
+        logger.info(f"Analytics: flushed {written} buffered events on shutdown")
+    if _stats["dropped"] or _stats["failed"]:
+        logger.warning(
+            f"Analytics: {_stats['dropped']} events dropped (buffer full), "
+            f"{_stats['failed']} failed to write"
+        )
+    if _pool is not None and _owns_pool:
         await _pool.close()
-        _pool = None
+    _pool = None
+    _owns_pool = False
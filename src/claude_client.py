@@ -28,12 +28,15 @@ import logging
 import time
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, AsyncIterator, Optional
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Optional
 
 import discord
-from anthropic import AsyncAnthropic
-
 from analytics import track
+from context_assembly import DEFAULT_BUDGET_MS, SOURCE_TIMEOUTS_MS, ContextSource, assemble_context
+from conversation_store import ConversationStore
+from llm_gateway import LANE_CHAT, LANE_VOICE, get_llm_gateway
+from prompt_layout import PromptLayout, cache_hit_ratio
+from tool_execution import ToolCall, execute_tool_calls
 from tools.github_docs import (
     READ_GITHUB_FILE_TOOL,
     LIST_GITHUB_DOCS_TOOL,
@@ -59,6 +62,9 @@ class ChatResult:
     memory_count: int = 0
     expansion_reason: str = "none"
     query_count: int = 1
+    context_ms: int = 0  # Wall-clock time of concurrent context assembly
+    context_timings_ms: dict[str, int] = field(default_factory=dict)  # Per source
+    context_dropped: list[str] = field(default_factory=list)  # Sources that timed out/failed
 
 logger = logging.getLogger(__name__)
 
@@ -652,31 +658,6 @@ When asked about past interactions and no relevant memories are retrieved, clear
 If you're uncertain about a memory detail, say so. Don't fill gaps with assumptions—users trust your memory system and will take fabricated details as fact.
 """
 
-# Maximum messages to keep in conversation history
-MAX_HISTORY_LENGTH = 20
-
-
-@dataclass
-class ConversationHistory:
-    """Stores conversation history for a user/channel pair."""
-
-    messages: list = field(default_factory=list)
-
-    def add_message(self, role: str, content: str):
-        """Add a message to the history."""
-        self.messages.append({"role": role, "content": content})
-        # Trim old messages if needed
-        if len(self.messages) > MAX_HISTORY_LENGTH:
-            self.messages = self.messages[-MAX_HISTORY_LENGTH:]
-
-    def get_messages(self) -> list:
-        """Get all messages in the history."""
-        return self.messages.copy()
-
-    def clear(self):
-        """Clear the conversation history."""
-        self.messages.clear()
-
 
 @dataclass
 class PendingEventDraft:
@@ -707,7 +688,10 @@ class ClaudeClient:
         agent_id: Optional[str] = None,
         is_agent: bool = False,
     ):
-        self.client = AsyncAnthropic(api_key=api_key)
+        # Shared process-wide gateway; voice replies get their own lane for accounting
+        self._gateway = get_llm_gateway(api_key)
+        self.client = self._gateway.client(LANE_CHAT)
+        self.voice_client = self._gateway.client(LANE_VOICE)
         self.memory = memory_manager
         self.system_prompt = system_prompt
         self.model = model
@@ -716,18 +700,16 @@ class ClaudeClient:
         self.owner_id = owner_id  # Owner's Discord user ID (tools only enabled for owner)
         self.agent_id = agent_id  # INCEPTION: agent persona identifier for memory scoping
         self.events_api = EventsAPIClient()  # Events API client (available to all users)
-        # Conversation history keyed by (user_id, channel_id)
-        self._conversations: dict[tuple[str, str], ConversationHistory] = defaultdict(
-            ConversationHistory
+        # Conversation history keyed by (user_id, channel_id): LRU/TTL bounded,
+        # written behind to Postgres when the memory system provides a pool
+        self._conversations = ConversationStore(
+            scope=agent_id or "slashai",
+            db_pool=getattr(memory_manager, "db", None),
         )
         # Pending event drafts keyed by (user_id, channel_id) (v0.13.1)
         self._pending_drafts_by_context: dict[tuple[str, str], PendingEventDraft] = {}
-        # Token usage tracking
-        self.total_input_tokens = 0
-        self.total_output_tokens = 0
-        # Prompt caching stats
-        self.total_cache_creation_tokens = 0
-        self.total_cache_read_tokens = 0
+        # Latency budget for concurrent context assembly in chat()
+        self.context_budget_ms = DEFAULT_BUDGET_MS
 
     def _get_conversation_key(self, user_id: str, channel_id: str) -> tuple[str, str]:
         """Get the key for storing conversation history."""
@@ -743,6 +725,7 @@ class ClaudeClient:
         images: Optional[list[tuple[bytes, str]]] = None,
         skip_memory_tracking: bool = False,
         on_expansion: Optional[object] = None,
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None,
     ) -> "ChatResult":
         """
         Send a message and get a response from Claude.
@@ -759,22 +742,57 @@ class ClaudeClient:
             skip_memory_tracking: If True, caller will handle memory tracking (v0.12.0)
             on_expansion: Optional async callback invoked when query expansion triggers,
                 before the API call. Used for real-time UI signals (e.g., reactions).
+            on_text: Optional async callback receiving text deltas as they stream.
+                When set, each API call uses messages.stream. Text from tool-use
+                turns is streamed too (followed by a paragraph break); the
+                returned ChatResult.text is the authoritative final reply.
 
         Returns:
             ChatResult with response text and retrieval metadata
         """
         key = self._get_conversation_key(user_id, channel_id)
-        conversation = self._conversations[key]
+        conversation = await self._conversations.get(key)
+        self._sweep_expired_drafts()
 
-        # Retrieve relevant memories (privacy-filtered)
+        # Assemble context concurrently: memories, builds, images, date.
+        # Each source is bounded by its own timeout and the overall budget;
+        # a slow or failing source is dropped instead of holding up the reply.
         memory_context = ""
         build_context = ""
         image_context = ""
         memory_count = 0
         expansion_reason = "none"
         query_count = 1
+        sources = [
+            ContextSource(
+                "date", self._build_date_context(user_id),
+                SOURCE_TIMEOUTS_MS["date"], default=self._format_date_context("UTC"),
+            ),
+        ]
         if self.memory and channel:
-            retrieval = await self.memory.retrieve(int(user_id), content, channel, agent_id=self.agent_id)
+            sources += [
+                ContextSource(
+                    "memories",
+                    self.memory.retrieve(int(user_id), content, channel, agent_id=self.agent_id),
+                    SOURCE_TIMEOUTS_MS["memories"],
+                ),
+                ContextSource(
+                    "builds", self.memory.get_build_context(int(user_id), channel),
+                    SOURCE_TIMEOUTS_MS["builds"], default="",
+                ),
+                ContextSource(
+                    "images", self.memory.retrieve_images(int(user_id), content, channel),
+                    SOURCE_TIMEOUTS_MS["images"], default=[],
+                ),
+            ]
+        assembled = await assemble_context(sources, self.context_budget_ms)
+        logger.info(
+            f"Context assembled in {assembled.total_ms}ms {assembled.timings_ms}"
+            + (f" dropped={assembled.dropped}" if assembled.dropped else "")
+        )
+
+        retrieval = assembled.get("memories")
+        if retrieval is not None:
             memories = retrieval.memories
             expansion_reason = retrieval.expansion_reason
             query_count = retrieval.query_count
@@ -792,13 +810,10 @@ class ClaudeClient:
                     guild=guild,
                 )
 
-            # Get image/build context (Issue 1: Retrieval Gap fix)
-            build_context = await self.memory.get_build_context(int(user_id), channel)
-
-            # Get query-relevant image observations
-            retrieved_images = await self.memory.retrieve_images(int(user_id), content, channel)
-            if retrieved_images:
-                image_context = self._format_images(retrieved_images)
+        build_context = assembled.get("builds") or ""
+        retrieved_images = assembled.get("images")
+        if retrieved_images:
+            image_context = self._format_images(retrieved_images)
 
         # Build message content (multimodal if images present)
         if images:
@@ -809,19 +824,10 @@ class ClaudeClient:
         # Add user message to history (text only for history storage)
         conversation.add_message("user", content or "[image]")
 
-        # Build system prompt with caching
-        # Base prompt is cached (stable across calls), memory context is not (dynamic)
-        system = [
-            {
-                "type": "text",
-                "text": self.system_prompt,
-                "cache_control": {"type": "ephemeral"}
-            }
-        ]
-
-        # Combine all context sources (dynamic, not cached)
+        # Per-turn retrieval rides in the current user message; the build
+        # profile changes rarely, so it stays in the cached system prefix
         from datetime import datetime, timezone
-        date_context = await self._build_date_context(user_id)
+        date_context = assembled.get("date")
         year = datetime.now(timezone.utc).year
         context_parts = [
             f"{date_context} Use this date for all time references. "
@@ -832,22 +838,14 @@ class ClaudeClient:
             context_parts.append(memory_context)
         if image_context:
             context_parts.append(image_context)
-        if build_context:
-            context_parts.append(build_context)
-
-        combined_context = "\n\n".join(context_parts)
-
-        if combined_context:
-            system.append({
-                "type": "text",
-                "text": combined_context
-            })
+        turn_context = "\n\n".join(context_parts)
 
         # Build messages list, replacing last message with multimodal if needed
         messages = conversation.get_messages()
         if images and messages:
             # Replace the last user message with multimodal content
             messages[-1] = {"role": "user", "content": message_content}
+        turn_start = len(messages) - 1
 
         # Check if tools should be enabled
         # Owner gets all tools; agents get AGENT_TOOLS; community users get COMMUNITY_TOOLS
@@ -871,6 +869,13 @@ class ClaudeClient:
         elif has_community_tools:
             active_tools = COMMUNITY_TOOLS
 
+        layout = PromptLayout(
+            persona=self.system_prompt,
+            profile=build_context,
+            turn_context=turn_context,
+            tools=active_tools if tools_enabled else [],
+        )
+
         # Agentic loop - continue until we get a final text response
         max_iterations = 10  # Safety limit to prevent infinite loops
         iteration = 0
@@ -878,31 +883,30 @@ class ClaudeClient:
         while iteration < max_iterations:
             iteration += 1
 
-            # Make API request
+            # Make API request (breakpoints move forward with each tool round trip)
             api_kwargs = {
                 "model": self.model,
                 "max_tokens": max_tokens,
-                "system": system,
-                "messages": messages,
+                **layout.request(messages, turn_start),
             }
-            if tools_enabled and active_tools:
-                api_kwargs["tools"] = active_tools
 
             api_start = time.time()
-            response = await self.client.messages.create(**api_kwargs)
+            if on_text:
+                async with self.client.messages.stream(**api_kwargs) as stream:
+                    async for text in stream.text_stream:
+                        await on_text(text)
+                    response = await stream.get_final_message()
+            else:
+                response = await self.client.messages.create(**api_kwargs)
             api_latency_ms = int((time.time() - api_start) * 1000)
 
-            # Track token usage (including cache stats)
-            self.total_input_tokens += response.usage.input_tokens
-            self.total_output_tokens += response.usage.output_tokens
+            # Cache stats for analytics (process totals live in the LLM gateway)
             cache_read = 0
             cache_creation = 0
             if hasattr(response.usage, 'cache_creation_input_tokens'):
                 cache_creation = response.usage.cache_creation_input_tokens or 0
-                self.total_cache_creation_tokens += cache_creation
             if hasattr(response.usage, 'cache_read_input_tokens'):
                 cache_read = response.usage.cache_read_input_tokens or 0
-                self.total_cache_read_tokens += cache_read
 
             # Analytics: Track API call
             guild_id = None
@@ -921,8 +925,12 @@ class ClaudeClient:
                     "output_tokens": response.usage.output_tokens,
                     "cache_read": cache_read,
                     "cache_creation": cache_creation,
+                    "cache_hit_ratio": cache_hit_ratio(response.usage),
+                    "call_site": "chat",
+                    "iteration": iteration,
                     "latency_ms": api_latency_ms,
                     "has_tools": bool(active_tools),
+                    "streamed": on_text is not None,
                 },
             )
 
@@ -951,20 +959,56 @@ class ClaudeClient:
                 ]
             })
 
-            # Execute each tool and build tool results
-            tool_results = []
-            for tool_block in tool_use_blocks:
-                result = await self._execute_tool(
-                    tool_block.name,
-                    tool_block.input,
+            # Settle interim text ("Let me check...") so it shows while tools run
+            if on_text and any(block.type == "text" for block in response.content):
+                await on_text("\n\n")
+
+            # Execute tools (independent reads concurrently, side effects in order)
+            batch = await execute_tool_calls(
+                [ToolCall(block.id, block.name, block.input) for block in tool_use_blocks],
+                lambda call: self._execute_tool(
+                    call.name,
+                    call.input,
                     source_channel=channel,
                     user_id=user_id,
-                )
-                tool_results.append({
+                ),
+            )
+            tool_results = [
+                {
                     "type": "tool_result",
-                    "tool_use_id": tool_block.id,
-                    "content": result,
-                })
+                    "tool_use_id": outcome.call.id,
+                    "content": outcome.result,
+                }
+                for outcome in batch.outcomes
+            ]
+            for outcome in batch.outcomes:
+                if outcome.timed_out:
+                    track(
+                        "tool_timeout",
+                        "error",
+                        properties={
+                            "tool_name": outcome.call.name,
+                            "latency_ms": outcome.latency_ms,
+                        },
+                    )
+            if len(batch.outcomes) > 1:
+                logger.info(
+                    f"Ran {len(batch.outcomes)} tools in {batch.wall_ms}ms "
+                    f"(serial would be {batch.serial_ms}ms): "
+                    + ", ".join(f"{o.call.name}={o.latency_ms}ms" for o in batch.outcomes)
+                )
+                track(
+                    "tool_batch_executed",
+                    "tool",
+                    user_id=int(user_id),
+                    channel_id=int(channel_id),
+                    properties={
+                        "tool_count": len(batch.outcomes),
+                        "wall_ms": batch.wall_ms,
+                        "serial_ms": batch.serial_ms,
+                        "tool_latencies_ms": [[o.call.name, o.latency_ms] for o in batch.outcomes],
+                    },
+                )
 
             # Add tool results to messages
             messages.append({
@@ -986,6 +1030,7 @@ class ClaudeClient:
 
         # Add assistant response to history (text only)
         conversation.add_message("assistant", response_text)
+        self._conversations.save(key)
 
         # Track message for memory extraction
         # Caller can skip this to handle it with message IDs (v0.12.0)
@@ -1000,6 +1045,9 @@ class ClaudeClient:
             memory_count=memory_count,
             expansion_reason=expansion_reason,
             query_count=query_count,
+            context_ms=assembled.total_ms,
+            context_timings_ms=assembled.timings_ms,
+            context_dropped=assembled.dropped,
         )
 
     async def chat_streaming(
@@ -1018,40 +1066,40 @@ class ClaudeClient:
         the same as chat(). No tool use (voice doesn't need Discord actions).
         """
         key = self._get_conversation_key(user_id, channel_id)
-        conversation = self._conversations[key]
+        conversation = await self._conversations.get(key)
 
-        # Retrieve relevant memories
+        # Retrieve relevant memories and the date context concurrently
         memory_context = ""
+        sources = [
+            ContextSource(
+                "date", self._build_date_context(user_id),
+                SOURCE_TIMEOUTS_MS["date"], default=self._format_date_context("UTC"),
+            ),
+        ]
         if self.memory:
-            try:
-                retrieval = await self.memory.retrieve(
-                    int(user_id), content, channel, agent_id=self.agent_id
-                )
-                if retrieval.memories:
-                    guild = getattr(channel, "guild", None) if channel else None
-                    memory_context = self._format_memories(
-                        retrieval.memories, current_user_id=int(user_id), guild=guild
-                    )
-                    logger.info(
-                        f"Voice memory: {len(retrieval.memories)} memories retrieved"
-                    )
-            except Exception as e:
-                logger.warning(f"Voice memory retrieval failed: {e}")
+            sources.append(ContextSource(
+                "memories",
+                self.memory.retrieve(int(user_id), content, channel, agent_id=self.agent_id),
+                SOURCE_TIMEOUTS_MS["memories"],
+            ))
+        assembled = await assemble_context(sources, self.context_budget_ms)
+        retrieval = assembled.get("memories")
+        if retrieval is not None and retrieval.memories:
+            guild = getattr(channel, "guild", None) if channel else None
+            memory_context = self._format_memories(
+                retrieval.memories, current_user_id=int(user_id), guild=guild
+            )
+            logger.info(
+                f"Voice memory: {len(retrieval.memories)} memories retrieved "
+                f"(context {assembled.total_ms}ms)"
+            )
 
         # Add user message to history
         conversation.add_message("user", content)
 
-        # Build system prompt with caching (same as chat())
-        system = [
-            {
-                "type": "text",
-                "text": self.system_prompt,
-                "cache_control": {"type": "ephemeral"},
-            }
-        ]
-
-        # Build dynamic context (date + speaker identity + memories)
-        date_context = await self._build_date_context(user_id)
+        # Per-turn context (date + speaker identity + memories); laid out
+        # after the cached persona prompt and history, same as chat()
+        date_context = assembled.get("date")
         context_parts = [date_context]
 
         # Identify who is speaking in the voice channel
@@ -1077,22 +1125,18 @@ class ClaudeClient:
         if memory_context:
             context_parts.append(memory_context)
 
-        combined_context = "\n\n".join(context_parts)
-        if combined_context:
-            system.append({"type": "text", "text": combined_context})
-
-        messages = conversation.get_messages()
+        layout = PromptLayout(persona=self.system_prompt, turn_context="\n\n".join(context_parts))
+        request = layout.request(conversation.get_messages())
 
         # Stream response, yielding at sentence boundaries
         full_response = ""
         buffer = ""
 
         try:
-            async with self.client.messages.stream(
+            async with self.voice_client.messages.stream(
                 model=self.model,
                 max_tokens=1024,
-                system=system,
-                messages=messages,
+                **request,
             ) as stream:
                 async for text in stream.text_stream:
                     buffer += text
@@ -1114,6 +1158,7 @@ class ClaudeClient:
             # Always update conversation history
             if full_response:
                 conversation.add_message("assistant", full_response)
+            self._conversations.save(key)
             # Note: memory tracking is handled by the caller (voice session)
             # to avoid blocking the streaming pipeline with extraction
 
@@ -1246,10 +1291,6 @@ class ClaudeClient:
                         }]
                     )
 
-                    # Track token usage for this vision call
-                    self.total_input_tokens += vision_response.usage.input_tokens
-                    self.total_output_tokens += vision_response.usage.output_tokens
-
                     result = vision_response.content[0].text
                     success = True
 
@@ -1557,16 +1598,8 @@ class ClaudeClient:
                     else:
                         draft_key = (user_id, channel_id_str)
 
-                        # Prune expired drafts
                         now = time.time()
-                        expired = [
-                            k for k, v in self._pending_drafts_by_context.items()
-                            if now - v.created_at > DRAFT_TTL_SECONDS
-                        ]
-                        for k in expired:
-                            old = self._pending_drafts_by_context.pop(k)
-                            if self.bot and old.message_id:
-                                self.bot._pending_event_drafts.pop(old.message_id, None)
+                        self._sweep_expired_drafts(now)
 
                         # If overwriting an existing draft, clean up old message_id mapping
                         if draft_key in self._pending_drafts_by_context:
@@ -1826,10 +1859,14 @@ class ClaudeClient:
 
     async def _build_date_context(self, user_id: str) -> str:
         """Build timezone-aware date/time string for system prompt injection."""
+        tz_name = await self._get_user_timezone(int(user_id))
+        return self._format_date_context(tz_name)
+
+    def _format_date_context(self, tz_name: str) -> str:
+        """Format the date/time string for a timezone (UTC if unknown)."""
         import pytz
-        from datetime import datetime, timezone
+        from datetime import datetime
 
-        tz_name = await self._get_user_timezone(int(user_id))
         try:
             tz = pytz.timezone(tz_name)
         except pytz.exceptions.UnknownTimeZoneError:
@@ -1985,38 +2022,51 @@ class ClaudeClient:
             messages=[{"role": "user", "content": content}],
         )
 
-        self.total_input_tokens += response.usage.input_tokens
-        self.total_output_tokens += response.usage.output_tokens
-        if hasattr(response.usage, 'cache_creation_input_tokens'):
-            self.total_cache_creation_tokens += response.usage.cache_creation_input_tokens or 0
-        if hasattr(response.usage, 'cache_read_input_tokens'):
-            self.total_cache_read_tokens += response.usage.cache_read_input_tokens or 0
-
         return response.content[0].text
 
+    def _sweep_expired_drafts(self, now: Optional[float] = None) -> None:
+        """Drop event drafts past DRAFT_TTL_SECONDS, here and in the bot's message map."""
+        now = now or time.time()
+        for k in [
+            k for k, v in self._pending_drafts_by_context.items()
+            if now - v.created_at > DRAFT_TTL_SECONDS
+        ]:
+            del self._pending_drafts_by_context[k]
+        # Linked drafts live only in the bot's map once their reply is sent
+        by_message = getattr(self.bot, "_pending_event_drafts", None)
+        if isinstance(by_message, dict):
+            for message_id in [
+                m for m, d in by_message.items() if now - d.created_at > DRAFT_TTL_SECONDS
+            ]:
+                del by_message[message_id]
+
+    async def close(self) -> None:
+        """Write queued conversation history before shutdown."""
+        await self._conversations.close()
+
+    async def amend_interrupted_reply(self, user_id: str, channel_id: str, spoken: str) -> None:
+        """
+        Cut the last assistant reply down to what was said before a barge-in.
+
+        Voice replies are recorded in full when generation ends; if the user
+        interrupts playback, the history should only claim what they heard.
+        """
+        key = self._get_conversation_key(user_id, channel_id)
+        conversation = await self._conversations.get(key)
+        note = "[interrupted by the user]"
+        content = f"{spoken} {note}" if spoken else note
+        if conversation.replace_last("assistant", content):
+            self._conversations.save(key)
+
     def clear_conversation(self, user_id: str, channel_id: str):
         """Clear conversation history for a user/channel pair."""
-        key = self._get_conversation_key(user_id, channel_id)
-        if key in self._conversations:
-            self._conversations[key].clear()
+        self._conversations.clear(self._get_conversation_key(user_id, channel_id))
 
     def get_usage_stats(self) -> dict:
-        """Get token usage statistics including cache performance."""
-        # Pricing: $3/M input, $15/M output
-        # Cache: 25% of base price for writes, 10% for reads
-        input_cost = (self.total_input_tokens / 1_000_000) * 3
-        output_cost = (self.total_output_tokens / 1_000_000) * 15
-        cache_write_cost = (self.total_cache_creation_tokens / 1_000_000) * 3 * 0.25
-        cache_read_cost = (self.total_cache_read_tokens / 1_000_000) * 3 * 0.10
-
-        # Calculate savings from cache reads (vs paying full price)
-        cache_savings = (self.total_cache_read_tokens / 1_000_000) * 3 * 0.90
-
-        return {
-            "total_input_tokens": self.total_input_tokens,
-            "total_output_tokens": self.total_output_tokens,
-            "cache_creation_tokens": self.total_cache_creation_tokens,
-            "cache_read_tokens": self.total_cache_read_tokens,
-            "estimated_cost_usd": round(input_cost + output_cost + cache_write_cost + cache_read_cost, 4),
-            "cache_savings_usd": round(cache_savings, 4),
-        }
+        """
+        Get token usage statistics including cache performance.
+
+        Totals are process-wide (every lane of the shared LLM gateway), with
+        a per-lane breakdown under "lanes".
+        """
+        return self._gateway.usage_stats()
@@ -0,0 +1,105 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Commercial licensing: [slashdaemon@protonmail.com]
+
+"""
+Concurrent Context Assembly
+
+ClaudeClient.chat() pulls prompt context from several independent sources
+(memories, build context, image observations, user timezone). This module
+runs them concurrently under per-source timeouts and an overall latency
+budget. A source that is slow or fails is dropped and replaced with its
+default, so the reply waits only as long as the slowest source within budget.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable
+
+logger = logging.getLogger(__name__)
+
+# Overall wall-clock budget for context assembly (milliseconds)
+DEFAULT_BUDGET_MS = int(os.getenv("CONTEXT_BUDGET_MS", "3000"))
+
+# Per-source timeouts (milliseconds). Memories get the most room since they
+# matter most to reply quality; the date lookup is a single-row query.
+SOURCE_TIMEOUTS_MS = {
+    "memories": int(os.getenv("CONTEXT_TIMEOUT_MEMORIES_MS", "3000")),
+    "builds": int(os.getenv("CONTEXT_TIMEOUT_BUILDS_MS", "1500")),
+    "images": int(os.getenv("CONTEXT_TIMEOUT_IMAGES_MS", "1500")),
+    "date": int(os.getenv("CONTEXT_TIMEOUT_DATE_MS", "500")),
+}
+
+
+@dataclass
+class ContextSource:
+    """One awaitable context source with its own timeout and fallback."""
+
+    name: str
+    awaitable: Awaitable
+    timeout_ms: int
+    default: Any = None
+
+
+@dataclass
+class AssembledContext:
+    """Results of assemble_context(), keyed by source name."""
+
+    results: dict[str, Any] = field(default_factory=dict)
+    timings_ms: dict[str, int] = field(default_factory=dict)
+    dropped: list[str] = field(default_factory=list)  # timed out or failed
+    total_ms: int = 0
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.results.get(name, default)
+
+
+async def assemble_context(
+    sources: list[ContextSource],
+    budget_ms: int = DEFAULT_BUDGET_MS,
+) -> AssembledContext:
+    """
+    Run all sources concurrently and collect what finishes in time.
+
+    Each source gets min(its own timeout, budget_ms). Timeouts and
+    exceptions are logged and the source's default is used instead;
+    this function never raises for a single source.
+    """
+    assembled = AssembledContext()
+    start = time.monotonic()
+
+    async def _run(source: ContextSource) -> None:
+        timeout = min(source.timeout_ms, budget_ms) / 1000
+        t0 = time.monotonic()
+        try:
+            value = await asyncio.wait_for(source.awaitable, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Context source '{source.name}' exceeded {timeout * 1000:.0f}ms; dropped")
+            assembled.dropped.append(source.name)
+            value = source.default
+        except Exception as e:
+            logger.warning(f"Context source '{source.name}' failed: {e}")
+            assembled.dropped.append(source.name)
+            value = source.default
+        assembled.results[source.name] = value
+        assembled.timings_ms[source.name] = int((time.monotonic() - t0) * 1000)
+
+    await asyncio.gather(*(_run(s) for s in sources))
+    assembled.total_ms = int((time.monotonic() - start) * 1000)
+    return assembled
@@ -0,0 +1,321 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Commercial licensing: [slashdaemon@protonmail.com]
+
+"""
+Bounded Conversation Store
+
+Short-term chat history for ClaudeClient, keyed by (user_id, channel_id).
+
+- ConversationHistory keeps (role, content, tokens) tuples in a deque and
+  trims by an estimated token budget rather than a fixed message count.
+  When over budget it trims to a low-water mark, so the history prefix (and
+  its prompt-cache entry) stays put for several turns instead of shifting
+  on every message. History always starts with a user turn.
+- ConversationStore is an LRU of histories with idle expiry: the least
+  recently used conversation is evicted past CONVERSATION_MAX_ENTRIES and
+  conversations idle for CONVERSATION_TTL_SECONDS are dropped, so memory
+  stays flat however many users and channels the bot sees.
+- With a database pool, changed histories are written behind to
+  conversation_history (migration 024) every CONVERSATION_FLUSH_INTERVAL
+  seconds and loaded back on a cache miss, so a restart or redeploy keeps
+  recent context. Rows idle past the TTL are pruned on flush.
+"""
+
+import json
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from typing import Optional
+
+import asyncpg
+from discord.ext import tasks
+
+logger = logging.getLogger("slashAI.conversation_store")
+
+# Estimated-token budget for one conversation's history
+HISTORY_TOKEN_BUDGET = int(os.getenv("CONVERSATION_TOKEN_BUDGET", "8000"))
+
+# Hard cap on messages per conversation, whatever their size
+HISTORY_MAX_MESSAGES = int(os.getenv("CONVERSATION_MAX_MESSAGES", "50"))
+
+# Conversations held in memory before least-recently-used eviction
+MAX_CONVERSATIONS = int(os.getenv("CONVERSATION_MAX_ENTRIES", "1000"))
+
+# Idle time after which a conversation expires (memory and database)
+CONVERSATION_TTL_SECONDS = int(os.getenv("CONVERSATION_TTL_SECONDS", str(6 * 3600)))
+
+# Write-behind persistence to Postgres
+PERSIST_ENABLED = os.getenv("CONVERSATION_PERSIST_ENABLED", "true").lower() == "true"
+FLUSH_INTERVAL_SECONDS = int(os.getenv("CONVERSATION_FLUSH_INTERVAL", "15"))
+
+# Over budget, trim down to this fraction of it
+TRIM_LOW_WATER = 0.75
+
+# Per-message overhead (role, framing) in estimated tokens
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+ConversationKey = tuple[str, str]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (~4 characters per token)."""
+    return len(text) // 4 + _MESSAGE_OVERHEAD_TOKENS
+
+
+class ConversationHistory:
+    """Token-bounded chat history for one user/channel pair."""
+
+    __slots__ = ("_entries", "_tokens", "token_budget", "max_messages", "touched_at")
+
+    def __init__(
+        self,
+        token_budget: int = HISTORY_TOKEN_BUDGET,
+        max_messages: int = HISTORY_MAX_MESSAGES,
+    ):
+        self._entries: deque[tuple[str, str, int]] = deque()
+        self._tokens = 0
+        self.token_budget = token_budget
+        self.max_messages = max_messages
+        self.touched_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def token_count(self) -> int:
+        """Estimated tokens currently held."""
+        return self._tokens
+
+    def add_message(self, role: str, content: str):
+        """Add a message to the history, trimming the oldest if over budget."""
+        tokens = estimate_tokens(content)
+        self._entries.append((role, content, tokens))
+        self._tokens += tokens
+        if self._tokens > self.token_budget or len(self._entries) > self.max_messages:
+            self._trim()
+
+    def _trim(self) -> None:
+        token_target = int(self.token_budget * TRIM_LOW_WATER)
+        message_target = int(self.max_messages * TRIM_LOW_WATER)
+        # Always keep the newest message, even if it alone is over budget
+        while len(self._entries) > 1 and (
+            self._tokens > token_target or len(self._entries) > message_target
+        ):
+            self._tokens -= self._entries.popleft()[2]
+        # The API requires the first message to be a user turn
+        while len(self._entries) > 1 and self._entries[0][0] != "user":
+            self._tokens -= self._entries.popleft()[2]
+
+    def replace_last(self, role: str, content: str) -> bool:
+        """Rewrite the newest message if it has `role`. Returns whether it did."""
+        if not self._entries or self._entries[-1][0] != role:
+            return False
+        tokens = estimate_tokens(content)
+        self._tokens += tokens - self._entries.pop()[2]
+        self._entries.append((role, content, tokens))
+        return True
+
+    def get_messages(self) -> list:
+        """Messages as API dicts (a new list the caller may extend)."""
+        return [{"role": role, "content": content} for role, content, _ in self._entries]
+
+    def clear(self):
+        """Clear the conversation history."""
+        self._entries.clear()
+        self._tokens = 0
+
+    def to_json(self) -> str:
+        return json.dumps([[role, content] for role, content, _ in self._entries])
+
+    def load_json(self, payload: str) -> None:
+        """Replace the history with a to_json() snapshot."""
+        self.clear()
+        for role, content in json.loads(payload):
+            self.add_message(role, content)
+
+
+class ConversationStore:
+    """LRU + TTL bounded map of conversation histories with write-behind persistence."""
+
+    def __init__(
+        self,
+        scope: str,
+        db_pool: Optional[asyncpg.Pool] = None,
+        max_conversations: int = MAX_CONVERSATIONS,
+        ttl_seconds: int = CONVERSATION_TTL_SECONDS,
+        token_budget: int = HISTORY_TOKEN_BUDGET,
+        flush_interval: int = FLUSH_INTERVAL_SECONDS,
+        clock=time.monotonic,
+    ):
+        """
+        Args:
+            scope: Namespace for persisted rows (the owning client's agent_id)
+            db_pool: Pool for write-behind persistence (None = memory only)
+            max_conversations: LRU capacity
+            ttl_seconds: Idle expiry
+            token_budget: Per-conversation history budget
+            flush_interval: Seconds between write-behind flushes
+        """
+        self.scope = scope
+        self.db = db_pool if PERSIST_ENABLED else None
+        self.max_conversations = max_conversations
+        self.ttl_seconds = ttl_seconds
+        self.token_budget = token_budget
+        self._clock = clock
+        self._entries: OrderedDict[ConversationKey, ConversationHistory] = OrderedDict()
+        # Changed since the last flush; holds evicted histories until written
+        self._dirty: dict[ConversationKey, ConversationHistory] = {}
+        self._started = False
+        self._flush_loop.change_interval(seconds=flush_interval)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _new_history(self) -> ConversationHistory:
+        return ConversationHistory(token_budget=self.token_budget)
+
+    async def get(self, key: ConversationKey) -> ConversationHistory:
+        """The history for `key`, loaded from the database on a miss."""
+        self._expire()
+        history = self._entries.get(key)
+        if history is None:
+            history = self._dirty.get(key)  # Evicted but not yet written
+            if history is None:
+                history = await self._load(key)
+            # Another caller may have loaded it while we awaited
+            history = self._entries.setdefault(key, history)
+        self._entries.move_to_end(key)
+        history.touched_at = self._clock()
+        while len(self._entries) > self.max_conversations:
+            self._entries.popitem(last=False)
+        return history
+
+    def save(self, key: ConversationKey) -> None:
+        """Queue `key` for the next write-behind flush."""
+        if self.db is None:
+            return
+        history = self._entries.get(key)
+        if history is not None:
+            self._dirty[key] = history
+            self._start()
+
+    def clear(self, key: ConversationKey) -> None:
+        """Empty a conversation (persisted as empty on the next flush)."""
+        history = self._entries.get(key)
+        if history is not None:
+            history.clear()
+            self.save(key)
+
+    def _expire(self) -> None:
+        """Drop idle conversations (the LRU front is always the stalest)."""
+        cutoff = self._clock() - self.ttl_seconds
+        while self._entries:
+            key, history = next(iter(self._entries.items()))
+            if history.touched_at > cutoff:
+                break
+            self._entries.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    async def _load(self, key: ConversationKey) -> ConversationHistory:
+        history = self._new_history()
+        if self.db is None:
+            return history
+        try:
+            payload = await self.db.fetchval(
+                """
+                SELECT messages::text FROM conversation_history
+                WHERE scope = $1 AND user_id = $2 AND channel_id = $3
+                  AND updated_at > NOW() - make_interval(secs => $4)
+                """,
+                self.scope,
+                key[0],
+                key[1],
+                self.ttl_seconds,
+            )
+            if payload:
+                history.load_json(payload)
+        except Exception as e:
+            logger.warning(f"Failed to load conversation {key}: {e}")
+        return history
+
+    async def flush(self) -> int:
+        """
+        Write queued histories in one round-trip and prune expired rows.
+
+        Returns:
+            Number of conversations written
+        """
+        if self.db is None or not self._dirty:
+            return 0
+        pending, self._dirty = self._dirty, {}
+        keys = list(pending)
+        try:
+            await self.db.execute(
+                """
+                INSERT INTO conversation_history (scope, user_id, channel_id, messages, updated_at)
+                SELECT $1, u, c, m::jsonb, NOW()
+                FROM unnest($2::text[], $3::text[], $4::text[]) AS t(u, c, m)
+                ON CONFLICT (scope, user_id, channel_id) DO UPDATE SET
+                    messages = EXCLUDED.messages,
+                    updated_at = NOW()
+                """,
+                self.scope,
+                [k[0] for k in keys],
+                [k[1] for k in keys],
+                [pending[k].to_json() for k in keys],
+            )
+            await self.db.execute(
+                """
+                DELETE FROM conversation_history
+                WHERE scope = $1 AND updated_at < NOW() - make_interval(secs => $2)
+                """,
+                self.scope,
+                self.ttl_seconds,
+            )
+        except Exception as e:
+            # Requeue unless a newer change already is
+            for key, history in pending.items():
+                self._dirty.setdefault(key, history)
+            logger.warning(f"Failed to persist {len(keys)} conversations: {e}")
+            return 0
+        return len(keys)
+
+    def _start(self) -> None:
+        # Started lazily from the first save, inside the running event loop
+        if not self._started:
+            self._flush_loop.start()
+            self._started = True
+
+    async def close(self) -> None:
+        """Stop the flush loop and write anything still queued."""
+        if self._started:
+            self._flush_loop.cancel()
+            self._started = False
+        await self.flush()
+
+    @tasks.loop(seconds=15)  # placeholder; actual interval set in __init__
+    async def _flush_loop(self) -> None:
+        try:
+            written = await self.flush()
+            if written:
+                logger.debug(f"Persisted {written} conversations")
+        except Exception as e:
+            logger.error(f"Error in conversation flush: {e}", exc_info=True)
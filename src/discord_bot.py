@@ -29,19 +29,28 @@ import json
 import os
 import re
 import time
+from datetime import datetime
 from typing import Optional
 
 import asyncpg
 import discord
 from aiohttp import web
-from anthropic import AsyncAnthropic
 from discord.ext import commands
 from dotenv import load_dotenv
-from PIL import Image
 
-from analytics import track, shutdown as analytics_shutdown
+from analytics import track, shutdown as analytics_shutdown, use_pool as analytics_use_pool
 from claude_client import ChatResult, ClaudeClient, PendingEventDraft
+from image_processing import get_image_processor, shutdown_image_processor
+from llm_gateway import (
+    LANE_MEMORY,
+    LANE_PROACTIVE,
+    LaneClient,
+    get_llm_gateway,
+    shutdown_llm_gateway,
+)
+from utils.attachments import AttachmentDownloads
 from utils.discord_typing import safe_typing
+from utils.streaming_reply import StreamingReply
 
 load_dotenv()
 
@@ -50,85 +59,6 @@ import logging
 # Discord message length limit
 DISCORD_MAX_LENGTH = 2000
 
-# Anthropic API limits for images
-MAX_IMAGE_BYTES = 1_000_000  # ~1MB limit (accounts for base64 overhead + API efficiency)
-MAX_IMAGE_DIMENSION = 2048  # Max 2048px (Anthropic downsamples to ~1.15MP anyway)
-
-
-def normalize_image_for_api(image_bytes: bytes, media_type: str) -> tuple[bytes, str]:
-    """
-    Normalize an image to ensure API compatibility.
-
-    Fixes common issues that cause "Could not process image" errors:
-    - CMYK/YCCK color space (convert to RGB)
-    - Progressive JPEG encoding
-    - Problematic EXIF metadata
-    - Palette mode images
-
-    Args:
-        image_bytes: Original image data
-        media_type: MIME type (e.g., "image/jpeg")
-
-    Returns:
-        Tuple of (normalized_bytes, media_type)
-    """
-    img = None
-    try:
-        img = Image.open(io.BytesIO(image_bytes))
-
-        # Check if normalization is needed
-        needs_normalize = (
-            img.mode in ("CMYK", "YCCK", "LAB", "P", "PA", "LA", "I", "F") or
-            media_type == "image/jpeg"  # Always re-encode JPEGs to strip EXIF/fix progressive
-        )
-
-        if not needs_normalize:
-            return image_bytes, media_type
-
-        # Convert to RGB (or RGBA if has transparency)
-        if img.mode in ("RGBA", "LA", "PA"):
-            img = img.convert("RGBA")
-            out_format = "PNG"
-            out_media = "image/png"
-        elif img.mode in ("CMYK", "YCCK", "LAB", "I", "F"):
-            img = img.convert("RGB")
-            out_format = "JPEG"
-            out_media = "image/jpeg"
-        elif img.mode == "P":
-            # Palette mode - check if has transparency
-            if img.info.get("transparency") is not None:
-                img = img.convert("RGBA")
-                out_format = "PNG"
-                out_media = "image/png"
-            else:
-                img = img.convert("RGB")
-                out_format = "JPEG"
-                out_media = "image/jpeg"
-        else:
-            # RGB or L mode - just re-encode
-            if img.mode == "L":
-                img = img.convert("RGB")
-            out_format = "JPEG"
-            out_media = "image/jpeg"
-
-        # Re-encode (strips EXIF, fixes progressive JPEG, normalizes encoding)
-        buffer = io.BytesIO()
-        if out_format == "JPEG":
-            img.save(buffer, format="JPEG", quality=90, optimize=True)
-        else:
-            img.save(buffer, format="PNG", optimize=True)
-
-        result = buffer.getvalue()
-        logger.info(f"[NORMALIZE] Converted {media_type} {img.mode} -> {out_media} ({len(image_bytes)} -> {len(result)} bytes)")
-        return result, out_media
-
-    except Exception as e:
-        logger.warning(f"[NORMALIZE] Failed to normalize image: {e}")
-        return image_bytes, media_type
-    finally:
-        if img is not None:
-            img.close()
-
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -137,91 +67,6 @@ logging.basicConfig(
 logger = logging.getLogger("slashAI")
 
 
-def resize_image_for_api(image_bytes: bytes, media_type: str, max_bytes: int = MAX_IMAGE_BYTES) -> tuple[bytes, str]:
-    """
-    Resize an image for optimal API transmission.
-
-    Always resizes large images first (Anthropic downsamples to ~1.15MP anyway),
-    then compresses to stay under the byte limit.
-
-    Args:
-        image_bytes: Original image data
-        media_type: MIME type (e.g., "image/jpeg")
-        max_bytes: Maximum allowed size in bytes
-
-    Returns:
-        Tuple of (resized_bytes, media_type) - media_type may change to JPEG for better compression
-    """
-    img = None
-    try:
-        img = Image.open(io.BytesIO(image_bytes))
-        original_size = img.size
-        needs_resize = img.width > MAX_IMAGE_DIMENSION or img.height > MAX_IMAGE_DIMENSION
-
-        # Always resize if dimensions exceed limit (no point sending 4K to API)
-        if needs_resize:
-            ratio = min(MAX_IMAGE_DIMENSION / img.width, MAX_IMAGE_DIMENSION / img.height)
-            new_size = (int(img.width * ratio), int(img.height * ratio))
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
-            logger.info(f"[RESIZE] Reduced dimensions from {original_size} to {new_size}")
-
-        # Convert to RGB for JPEG compression (no alpha channel)
-        save_img = img
-        if img.mode in ("RGBA", "P", "PA", "LA"):
-            rgb_img = Image.new("RGB", img.size, (255, 255, 255))
-            if img.mode == "P":
-                save_img = img.convert("RGBA")
-            elif img.mode in ("PA", "LA"):
-                save_img = img.convert("RGBA")
-            else:
-                save_img = img
-            if save_img.mode == "RGBA":
-                rgb_img.paste(save_img, mask=save_img.split()[3])
-            else:
-                rgb_img.paste(save_img)
-            save_img = rgb_img
-        elif img.mode == "L":
-            save_img = img.convert("RGB")
-
-        # Try progressively lower quality until under limit
-        result_bytes = image_bytes  # fallback
-        for quality in [85, 70, 55, 40]:
-            buffer = io.BytesIO()
-            save_img.save(buffer, format="JPEG", quality=quality, optimize=True)
-            result_bytes = buffer.getvalue()
-
-            if len(result_bytes) <= max_bytes:
-                if needs_resize or len(image_bytes) > max_bytes:
-                    logger.info(f"[RESIZE] Compressed to {len(result_bytes)} bytes at quality={quality}")
-                return result_bytes, "image/jpeg"
-
-        # Last resort: reduce dimensions further
-        while len(result_bytes) > max_bytes and min(img.size) > 100:
-            new_size = (img.width // 2, img.height // 2)
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
-            # Reconvert to RGB after resize
-            if img.mode in ("RGBA", "P", "PA", "LA"):
-                rgb_img = Image.new("RGB", img.size, (255, 255, 255))
-                rgba_img = img.convert("RGBA") if img.mode != "RGBA" else img
-                rgb_img.paste(rgba_img, mask=rgba_img.split()[3])
-                save_img = rgb_img
-            else:
-                save_img = img if img.mode == "RGB" else img.convert("RGB")
-            buffer = io.BytesIO()
-            save_img.save(buffer, format="JPEG", quality=40, optimize=True)
-            result_bytes = buffer.getvalue()
-            logger.info(f"[RESIZE] Further reduced to {new_size}, now {len(result_bytes)} bytes")
-
-        return result_bytes, "image/jpeg"
-
-    except Exception as e:
-        logger.error(f"[RESIZE] Failed to resize image: {e}")
-        return image_bytes, media_type  # Return original on failure
-    finally:
-        if img is not None:
-            img.close()
-
-
 class DiscordBot(commands.Bot):
     """Discord bot with MCP-compatible methods and chatbot functionality."""
 
@@ -235,15 +80,21 @@ class DiscordBot(commands.Bot):
         super().__init__(command_prefix="!", intents=intents)
 
         self.enable_chat = enable_chat  # Disable for MCP-only mode
+        # Stream chat replies with progressive edits instead of waiting for the full answer
+        self.stream_replies = os.getenv("CHAT_STREAMING_ENABLED", "true").lower() == "true"
         self.claude_client: Optional[ClaudeClient] = None
         self.db_pool: Optional[asyncpg.Pool] = None
         self.image_observer = None  # Image memory system
+        self.image_pipeline = None  # Background image observation queue
         self.reminder_manager = None  # Reminder system (v0.9.17)
         self.reminder_scheduler = None  # Background scheduler for reminders
         self.decay_job = None  # Memory decay job (v0.10.1)
+        self.extraction_queue = None  # Memory extraction worker
         self.recognition_scheduler = None  # Recognition system for build reviews
         self.reaction_store = None  # Reaction storage (v0.12.0)
         self.reaction_aggregator = None  # Reaction aggregation job (v0.12.0)
+        self.message_archive = None  # Local indexed copy of guild messages
+        self.archive_backfill = None  # Background history backfill for the archive
         # Proactive interaction subsystem (Enhancement 015 / v0.14.0)
         self.proactive_scheduler = None  # Primary bot's ProactiveScheduler
         self.agent_manager = None  # Multi-persona AgentManager (was in main())
@@ -320,12 +171,17 @@ class DiscordBot(commands.Bot):
                 self.db_pool = await asyncpg.create_pool(
                     database_url, min_size=2, max_size=5
                 )
+                # Analytics batches through the main pool instead of its own
+                analytics_use_pool(self.db_pool)
 
                 # Auto-run pending migrations
                 await self._run_migrations(self.db_pool)
 
-                anthropic_client = AsyncAnthropic(api_key=api_key)
+                # One process-wide LLM gateway; background work gets its own lanes
+                gateway = get_llm_gateway(api_key)
+                anthropic_client = gateway.client(LANE_MEMORY)
                 memory_manager = MemoryManager(self.db_pool, anthropic_client)
+                await memory_manager.warm_embedding_cache()
                 self.claude_client = ClaudeClient(
                     api_key,
                     memory_manager=memory_manager,
@@ -425,6 +281,14 @@ class DiscordBot(commands.Bot):
                     logger.error(f"Failed to initialize decay job: {e}", exc_info=True)
                     logger.warning("Memory decay disabled due to initialization failure")
 
+                # Start memory extraction worker (durable job queue)
+                try:
+                    self.extraction_queue = memory_manager.extraction_queue
+                    self.extraction_queue.start()
+                except Exception as e:
+                    logger.error(f"Failed to start extraction worker: {e}", exc_info=True)
+                    logger.warning("Queued extractions will wait until a worker runs")
+
                 # Initialize reaction system (v0.12.0)
                 try:
                     from memory.reactions import ReactionStore, ReactionAggregator
@@ -436,6 +300,18 @@ class DiscordBot(commands.Bot):
                     logger.error(f"Failed to initialize reaction system: {e}", exc_info=True)
                     logger.warning("Reaction tracking disabled due to initialization failure")
 
+                # Initialize message archive (serves search_messages / read_messages)
+                if os.getenv("MESSAGE_ARCHIVE_ENABLED", "true").lower() == "true":
+                    try:
+                        from message_archive import ArchiveBackfill, MessageArchive
+
+                        self.message_archive = MessageArchive(self.db_pool)
+                        self.archive_backfill = ArchiveBackfill(self, self.message_archive)
+                        logger.info("Message archive initialized")
+                    except Exception as e:
+                        logger.error(f"Failed to initialize message archive: {e}", exc_info=True)
+                        logger.warning("Message search will page live channel history")
+
                 # Initialize recognition scheduler for Core Curriculum
                 recognition_enabled = os.getenv("RECOGNITION_ENABLED", "false").lower() == "true"
                 if recognition_enabled:
@@ -450,14 +326,16 @@ class DiscordBot(commands.Bot):
 
                 # Initialize proactive interaction subsystem (Enhancement 015 / v0.14.0)
                 try:
-                    await self._setup_proactive(anthropic_client, memory_manager, owner_id)
+                    await self._setup_proactive(
+                        gateway.client(LANE_PROACTIVE), memory_manager, owner_id
+                    )
                 except Exception as e:
                     logger.error(f"Failed to initialize proactive subsystem: {e}", exc_info=True)
                     logger.warning("Proactive interaction disabled due to initialization failure")
 
                 # Initialize image memory if enabled
                 if image_memory_enabled and self._has_image_memory_config():
-                    await self._setup_image_memory(anthropic_client)
+                    await self._setup_image_memory(anthropic_client, memory_manager.embeddings)
 
             except Exception as e:
                 logger.error(f"Failed to initialize memory system: {e}", exc_info=True)
@@ -479,27 +357,30 @@ class DiscordBot(commands.Bot):
         spaces_secret = os.getenv("DO_SPACES_SECRET")
         return bool(spaces_key and spaces_secret)
 
-    async def _setup_image_memory(self, anthropic_client: AsyncAnthropic):
+    async def _setup_image_memory(self, anthropic_client: LaneClient, embeddings=None):
         """Initialize the image memory system."""
         try:
-            from memory.images import ImageObserver, ImageStorage
+            from memory.images import ImageObservationPipeline, ImageObserver, ImageStorage
 
             storage = ImageStorage()
             self.image_observer = ImageObserver(
                 db_pool=self.db_pool,
                 anthropic_client=anthropic_client,
                 storage=storage,
+                embeddings=embeddings,
                 moderation_enabled=os.getenv("IMAGE_MODERATION_ENABLED", "true").lower() == "true",
             )
+            self.image_pipeline = ImageObservationPipeline(self.image_observer, bot=self)
             logger.info("Image memory system initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize image memory: {e}", exc_info=True)
             logger.warning("Image memory disabled due to initialization failure")
             self.image_observer = None
+            self.image_pipeline = None
 
     async def _setup_proactive(
         self,
-        anthropic_client: AsyncAnthropic,
+        anthropic_client: LaneClient,
         memory_manager,
         owner_id: Optional[str],
     ):
@@ -625,6 +506,12 @@ class DiscordBot(commands.Bot):
             if self.reaction_aggregator:
                 self.reaction_aggregator.start()
 
+            # A new gateway session may have missed events: every channel's
+            # head is caught up again before the archive serves recent reads
+            if self.message_archive:
+                self.message_archive.reset_live()
+                self.archive_backfill.start()
+
             # Start proactive scheduler (Enhancement 015 / v0.14.0)
             if self.proactive_scheduler is not None:
                 try:
@@ -646,6 +533,13 @@ class DiscordBot(commands.Bot):
 
     async def on_message(self, message: discord.Message):
         """Handle incoming messages for chatbot functionality."""
+        # Archive every guild message, including our own and other bots'
+        if self.message_archive and message.guild is not None:
+            try:
+                await self.message_archive.record(message)
+            except Exception as e:
+                logger.warning(f"Failed to archive message {message.id}: {e}")
+
         # Always ignore our own messages
         if self.user is not None and message.author.id == self.user.id:
             return
@@ -692,11 +586,13 @@ class DiscordBot(commands.Bot):
         # Process commands first
         await self.process_commands(message)
 
-        # Process image attachments for memory (before chat handling)
+        # Queue image attachments for memory in the background; chat handling
+        # starts immediately and shares the downloads
+        downloads = AttachmentDownloads()
         if message.attachments:
-            logger.info(f"[IMAGE] Message has {len(message.attachments)} attachments, image_observer={'enabled' if self.image_observer else 'DISABLED'}")
-        if self.image_observer and message.attachments:
-            await self._process_image_attachments(message)
+            logger.info(f"[IMAGE] Message has {len(message.attachments)} attachments, image_pipeline={'enabled' if self.image_pipeline else 'DISABLED'}")
+        if self.image_pipeline and message.attachments:
+            self.image_pipeline.submit(message, downloads)
 
         # Chatbot: respond when mentioned or in DMs (skip if chat disabled)
         if not self.enable_chat:
@@ -706,7 +602,7 @@ class DiscordBot(commands.Bot):
         if self.user in message.mentions or isinstance(
             message.channel, discord.DMChannel
         ):
-            await self._handle_chat(message)
+            await self._handle_chat(message, downloads)
         else:
             # Activity-path proactive hook (Enhancement 015 / v0.14.0).
             # Only fires when proactive is configured + enabled + channel
@@ -719,40 +615,42 @@ class DiscordBot(commands.Bot):
                         f"Proactive on_message_hook failed: {e}", exc_info=True
                     )
 
-    async def _process_image_attachments(self, message: discord.Message):
-        """Process image attachments for memory system."""
-        logger.info(f"[IMAGE] Processing {len(message.attachments)} attachment(s) from user {message.author.id}")
-        
-        for i, attachment in enumerate(message.attachments):
-            logger.info(f"[IMAGE] Attachment {i+1}: filename={attachment.filename}, size={attachment.size}, content_type={attachment.content_type}, url={attachment.url[:80]}...")
-            
-            # Check if it is a supported image format
-            if self._is_supported_image(attachment.filename):
-                logger.info(f"[IMAGE] Supported format detected, starting processing...")
-                try:
-                    observation_id = await self.image_observer.handle_image(
-                        message, attachment, bot=self
-                    )
-                    if observation_id:
-                        logger.info(
-                            f"[IMAGE] SUCCESS: Stored observation {observation_id} for user {message.author.id}"
-                        )
-                    else:
-                        logger.warning(f"[IMAGE] handle_image returned None (rejected/moderated/duplicate)")
-                except Exception as e:
-                    logger.error(
-                        f"[IMAGE] FAILED to process image from {message.author.id}: {e}",
-                        exc_info=True,
-                    )
-            else:
-                logger.debug(f"[IMAGE] Skipping unsupported format: {attachment.filename}")
+    # --- Message Archive Event Handlers ---
 
-    def _is_supported_image(self, filename: str) -> bool:
-        """Check if file extension is a supported image format."""
-        if not filename:
-            return False
-        ext = filename.rsplit(".", 1)[-1].lower()
-        return ext in {"png", "jpg", "jpeg", "gif", "webp"}
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        """Keep the archived copy of an edited message in sync."""
+        if not self.message_archive or payload.guild_id is None:
+            return
+        # Embed-only updates carry no content
+        if "content" not in payload.data:
+            return
+        try:
+            edited = payload.data.get("edited_timestamp")
+            await self.message_archive.apply_edit(
+                payload.message_id,
+                payload.data["content"],
+                datetime.fromisoformat(edited) if edited else None,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to archive edit of message {payload.message_id}: {e}")
+
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        """Drop a deleted message from the archive."""
+        if not self.message_archive:
+            return
+        try:
+            await self.message_archive.delete([payload.message_id])
+        except Exception as e:
+            logger.warning(f"Failed to archive deletion of message {payload.message_id}: {e}")
+
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        """Drop bulk-deleted messages from the archive."""
+        if not self.message_archive:
+            return
+        try:
+            await self.message_archive.delete(payload.message_ids)
+        except Exception as e:
+            logger.warning(f"Failed to archive bulk deletion in {payload.channel_id}: {e}")
 
     # --- Reaction Event Handlers (v0.12.0) ---
 
@@ -1111,7 +1009,9 @@ class DiscordBot(commands.Bot):
             logger.error(f"Error fetching channel/message for reaction: {e}")
             return None
 
-    async def _handle_chat(self, message: discord.Message):
+    async def _handle_chat(
+        self, message: discord.Message, downloads: Optional[AttachmentDownloads] = None
+    ):
         """Generate a Claude response to a message."""
         if self.claude_client is None:
             await message.channel.send(
@@ -1128,7 +1028,7 @@ class DiscordBot(commands.Bot):
             content = f"{content}\n\n{attachment_contents}" if content else attachment_contents
 
         # Download image attachments for vision
-        images = await self._read_image_attachments(message.attachments)
+        images = await self._read_image_attachments(message.attachments, downloads)
 
         # Need either text or images to proceed
         if not content and not images:
@@ -1145,6 +1045,13 @@ class DiscordBot(commands.Bot):
             except discord.HTTPException:
                 pass  # Non-critical
 
+        # Post the reply progressively as it streams (sections appear as they complete)
+        streamed_reply = (
+            StreamingReply(message.channel, self._chunk_message, reply_to=message)
+            if self.stream_replies
+            else None
+        )
+
         async with safe_typing(message.channel):
             try:
                 result = await self.claude_client.chat(
@@ -1155,6 +1062,7 @@ class DiscordBot(commands.Bot):
                     images=images if images else None,
                     skip_memory_tracking=True,  # We'll track with message IDs below
                     on_expansion=_on_expansion,
+                    on_text=streamed_reply.feed if streamed_reply else None,
                 )
 
                 # Build display text with footer for expanded retrievals
@@ -1168,7 +1076,10 @@ class DiscordBot(commands.Bot):
                     display_text = result.text
 
                 chunks = self._chunk_message(display_text)
-                response_msg = await self._send_chunked(message.channel, display_text, reply_to=message)
+                if streamed_reply:
+                    response_msg = await streamed_reply.finish(display_text)
+                else:
+                    response_msg = await self._send_chunked(message.channel, display_text, reply_to=message)
 
                 # Remove 🧠 reaction after response is sent
                 if added_brain_reaction:
@@ -1206,6 +1117,11 @@ class DiscordBot(commands.Bot):
 
                 # Analytics: Track response sent
                 latency_ms = int((time.time() - start_time) * 1000)
+                first_chunk_ms = (
+                    int((streamed_reply.first_sent_at - start_time) * 1000)
+                    if streamed_reply and streamed_reply.first_sent_at
+                    else latency_ms
+                )
                 track(
                     "response_sent",
                     "message",
@@ -1216,13 +1132,20 @@ class DiscordBot(commands.Bot):
                         "response_length": len(result.text),
                         "chunk_count": len(chunks),
                         "latency_ms": latency_ms,
+                        "first_chunk_ms": first_chunk_ms,
+                        "streamed": streamed_reply is not None,
                         "has_images": bool(images),
                         "expansion_reason": result.expansion_reason,
                         "query_count": result.query_count,
                         "memory_count": result.memory_count,
+                        "context_ms": result.context_ms,
+                        "context_timings_ms": result.context_timings_ms,
+                        "context_dropped": result.context_dropped,
                     },
                 )
             except Exception as e:
+                if streamed_reply:
+                    await streamed_reply.cancel()
                 # Remove brain reaction on error too
                 if added_brain_reaction:
                     try:
@@ -1284,16 +1207,23 @@ class DiscordBot(commands.Bot):
         return "\n\n".join(parts)
 
     async def _read_image_attachments(
-        self, attachments: list[discord.Attachment]
+        self,
+        attachments: list[discord.Attachment],
+        downloads: Optional[AttachmentDownloads] = None,
     ) -> list[tuple[bytes, str]]:
         """Download image attachments for vision analysis.
 
+        Args:
+            attachments: Message attachments (non-images are skipped)
+            downloads: Download memo shared with the image observation pipeline
+
         Returns:
             List of (image_bytes, media_type) tuples
         """
         IMAGE_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "webp"}
         MAX_IMAGE_SIZE = 20_000_000  # 20MB limit for downloading
 
+        downloads = downloads or AttachmentDownloads()
         images = []
         for attachment in attachments:
             # Check file extension
@@ -1307,7 +1237,7 @@ class DiscordBot(commands.Bot):
                 continue
 
             try:
-                image_bytes = await attachment.read()
+                image_bytes = await downloads.read(attachment)
                 # Map extension to media type
                 media_type = {
                     "png": "image/png",
@@ -1319,13 +1249,9 @@ class DiscordBot(commands.Bot):
 
                 logger.info(f"Read image for vision: {attachment.filename} ({len(image_bytes)} bytes)")
 
-                # Normalize first (fix color space, strip EXIF, re-encode)
-                image_bytes, media_type = normalize_image_for_api(image_bytes, media_type)
-
-                # Then resize if too large for Anthropic API (5MB limit)
-                image_bytes, media_type = resize_image_for_api(image_bytes, media_type)
-
-                images.append((image_bytes, media_type))
+                # Normalize + resize for the Anthropic API off the event loop
+                processed = await get_image_processor().process(image_bytes, media_type)
+                images.append((processed.api_bytes, processed.api_media_type))
             except Exception as e:
                 logger.warning(f"Failed to read image {attachment.filename}: {e}", exc_info=True)
 
@@ -1445,9 +1371,15 @@ class DiscordBot(commands.Bot):
         # Stop decay job (v0.10.1)
         if self.decay_job:
             self.decay_job.stop()
+        # Stop extraction worker
+        if self.extraction_queue:
+            self.extraction_queue.stop()
         # Stop reaction aggregator (v0.12.0)
         if self.reaction_aggregator:
             self.reaction_aggregator.stop()
+        # Stop message archive backfill
+        if self.archive_backfill:
+            self.archive_backfill.stop()
         # Stop proactive scheduler (Enhancement 015 / v0.14.0)
         if self.proactive_scheduler:
             try:
@@ -1463,7 +1395,15 @@ class DiscordBot(commands.Bot):
         # Stop recognition scheduler
         if self.recognition_scheduler:
             await self.recognition_scheduler.close()
+        # Stop background image observation (queued images are dropped)
+        if self.image_pipeline:
+            await self.image_pipeline.close()
+        # Persist queued conversation history while the pool is still open
+        if self.claude_client:
+            await self.claude_client.close()
         await analytics_shutdown()
+        shutdown_image_processor()
+        await shutdown_llm_gateway()
         if self.db_pool:
             await self.db_pool.close()
         await super().close()
@@ -1556,7 +1496,21 @@ class DiscordBot(commands.Bot):
     async def read_messages(
         self, channel_id: int, limit: int = 10
     ) -> list[discord.Message]:
-        """Read recent messages from a channel. Used by MCP tools."""
+        """
+        Read recent messages from a channel, newest first. Used by MCP tools.
+
+        Served from the message archive once the channel's head is caught up
+        this session (ArchivedMessage has the same id/author/content/
+        created_at fields); otherwise pages live history.
+        """
+        if self.message_archive and await self.message_archive.is_available():
+            try:
+                archived = await self.message_archive.recent(channel_id, limit)
+                if archived is not None:
+                    return archived
+            except Exception as e:
+                logger.warning(f"Archive read failed for channel {channel_id}, using history: {e}")
+
         channel = self.get_channel(channel_id)
         if channel is None:
             channel = await self.fetch_channel(channel_id)
@@ -1644,6 +1598,10 @@ class DiscordBot(commands.Bot):
         """
         Search messages by content, optionally filtering by channel and/or author.
 
+        Guild channels are searched in the message archive (full history,
+        word or substring match); DMs, or a bot without the archive, page
+        recent live history instead.
+
         Args:
             query: Text to search for (case-insensitive)
             channel_id: Optional channel to search (if None, searches all channels)
@@ -1667,27 +1625,23 @@ class DiscordBot(commands.Bot):
                     if isinstance(ch, discord.TextChannel):
                         channels_to_search.append(ch)
 
-        # Resolve author username to ID if provided (check first guild)
-        author_id = None
-        if author and channels_to_search:
-            first_channel = channels_to_search[0]
-            if hasattr(first_channel, "guild"):
-                # Try exact match first (username or display name)
-                member = first_channel.guild.get_member_named(author)
-                if member:
-                    author_id = member.id
-                else:
-                    # Try case-insensitive partial match
-                    author_lower = author.lower()
-                    for m in first_channel.guild.members:
-                        if (
-                            author_lower in m.name.lower()
-                            or author_lower in m.display_name.lower()
-                        ):
-                            author_id = m.id
-                            break
+        author_id = self._resolve_author_id(author, channels_to_search) if author else None
 
-        # Search through channels
+        archivable = all(getattr(ch, "guild", None) for ch in channels_to_search)
+        if archivable and self.message_archive and await self.message_archive.is_available():
+            try:
+                archived = await self.message_archive.search(
+                    query,
+                    channel_ids=[ch.id for ch in channels_to_search],
+                    author_id=author_id,
+                    author_name=author if author and author_id is None else None,
+                    limit=limit,
+                )
+                return [self._search_result(msg, self.get_channel(msg.channel_id)) for msg in archived]
+            except Exception as e:
+                logger.warning(f"Archive search failed, searching live history: {e}")
+
+        # Search through live channel history
         results = []
         query_lower = query.lower()
 
@@ -1708,18 +1662,7 @@ class DiscordBot(commands.Bot):
                     if query_lower not in msg.content.lower():
                         continue
 
-                    results.append(
-                        {
-                            "message_id": str(msg.id),
-                            "author_id": str(msg.author.id),
-                            "author_name": msg.author.name,
-                            "author_display_name": msg.author.display_name,
-                            "content": msg.content[:500] if len(msg.content) > 500 else msg.content,
-                            "timestamp": msg.created_at.isoformat(),
-                            "channel_id": str(channel.id),
-                            "channel_name": getattr(channel, "name", "DM"),
-                        }
-                    )
+                    results.append(self._search_result(msg, channel))
 
                     # Early exit if we have enough results for single-channel search
                     if channel_id is not None and len(results) >= limit:
@@ -1739,6 +1682,37 @@ class DiscordBot(commands.Bot):
         results.sort(key=lambda x: x["timestamp"], reverse=True)
         return results[:limit]
 
+    @staticmethod
+    def _resolve_author_id(author: str, channels: list) -> Optional[int]:
+        """Resolve a username/display name to a member ID (checks the first channel's guild)."""
+        if not channels or not hasattr(channels[0], "guild"):
+            return None
+        guild = channels[0].guild
+        # Try exact match first (username or display name)
+        member = guild.get_member_named(author)
+        if member:
+            return member.id
+        # Try case-insensitive partial match
+        author_lower = author.lower()
+        for m in guild.members:
+            if author_lower in m.name.lower() or author_lower in m.display_name.lower():
+                return m.id
+        return None
+
+    @staticmethod
+    def _search_result(msg, channel) -> dict:
+        """Format a live or archived message as a search_messages result."""
+        return {
+            "message_id": str(msg.id),
+            "author_id": str(msg.author.id),
+            "author_name": msg.author.name,
+            "author_display_name": msg.author.display_name,
+            "content": msg.content[:500] if len(msg.content) > 500 else msg.content,
+            "timestamp": msg.created_at.isoformat(),
+            "channel_id": str(channel.id if channel else msg.channel_id),
+            "channel_name": getattr(channel, "name", "DM"),
+        }
+
 
 class WebhookServer:
     """
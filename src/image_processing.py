@@ -0,0 +1,316 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Commercial licensing: [slashdaemon@protonmail.com]
+
+"""
+Off-loop Image Processing
+
+All Pillow work (decode, color-space normalization, LANCZOS resizes, JPEG
+re-encodes) runs here, in a small process pool, instead of on the asyncio
+event loop where a large build screenshot could stall Discord heartbeats.
+
+Each image is decoded once and every derivative is produced from that one
+decode:
+- API copy: RGB JPEG within MAX_IMAGE_DIMENSION / MAX_IMAGE_BYTES
+- Embedding copy: PIL image within EMBED_MAX_DIMENSION for Voyage multimodal
+- Perceptual hash: 64-bit dHash for near-duplicate detection
+
+Stage timings are returned with every result and aggregated in stats().
+Workers are spawned (not forked), and a spawned worker re-imports the
+parent's main module. Started through run_bot.py, whose import is a no-op,
+workers only load Pillow and this module; running discord_bot.py directly
+makes every worker import the whole bot.
+"""
+
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Optional
+
+from PIL import Image
+
+logger = logging.getLogger("slashAI.images")
+
+# Anthropic API limits for images
+MAX_IMAGE_BYTES = 1_000_000  # ~1MB limit (accounts for base64 overhead + API efficiency)
+MAX_IMAGE_DIMENSION = 2048  # Max 2048px (Anthropic downsamples to ~1.15MP anyway)
+
+# Voyage multimodal input; smaller keeps embedding memory low on constrained workers
+EMBED_MAX_DIMENSION = 512
+
+# JPEG qualities tried in order until the API copy fits MAX_IMAGE_BYTES
+API_JPEG_QUALITIES = (85, 70, 55, 40)
+
+DHASH_SIZE = 8  # 8x8 comparisons -> 64-bit hash
+
+
+@dataclass
+class ProcessedImage:
+    """Derivatives of one decoded image."""
+
+    api_bytes: bytes
+    api_media_type: str
+    width: int
+    height: int
+    embed_image: Optional[Image.Image] = None
+    phash: Optional[int] = None
+    timings_ms: dict[str, float] = field(default_factory=dict)
+
+
+def _to_rgb(img: Image.Image) -> Image.Image:
+    """Flatten any mode to RGB, compositing transparency onto white."""
+    if img.mode == "RGB":
+        return img
+    if img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and img.info.get("transparency") is not None):
+        rgba = img.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.split()[3])
+        return background
+    return img.convert("RGB")
+
+
+def _fit(img: Image.Image, max_dimension: int) -> Image.Image:
+    """Downscale (LANCZOS) so neither side exceeds max_dimension."""
+    if img.width <= max_dimension and img.height <= max_dimension:
+        return img
+    ratio = min(max_dimension / img.width, max_dimension / img.height)
+    new_size = (max(1, int(img.width * ratio)), max(1, int(img.height * ratio)))
+    return img.resize(new_size, Image.Resampling.LANCZOS)
+
+
+def _encode_for_api(img: Image.Image, max_bytes: int) -> bytes:
+    """
+    Encode an RGB image as JPEG under max_bytes.
+
+    Tries API_JPEG_QUALITIES, then halves the dimensions at the lowest
+    quality until the result fits. Re-encoding always strips EXIF and
+    progressive encoding, which avoids "Could not process image" errors.
+    """
+    result = b""
+    for quality in API_JPEG_QUALITIES:
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=quality, optimize=True)
+        result = buffer.getvalue()
+        if len(result) <= max_bytes:
+            return result
+
+    while len(result) > max_bytes and min(img.size) > 100:
+        img = img.resize((img.width // 2, img.height // 2), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=API_JPEG_QUALITIES[-1], optimize=True)
+        result = buffer.getvalue()
+        logger.info(f"[PROCESS] Further reduced to {img.size}, now {len(result)} bytes")
+    return result
+
+
+def dhash_image(img: Image.Image, hash_size: int = DHASH_SIZE) -> int:
+    """Difference hash of a decoded image (see memory.images.phash)."""
+    small = _to_rgb(img).convert("L").resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    pixels = small.tobytes()  # one byte per pixel in mode "L"
+
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] < pixels[offset + col + 1])
+    return value
+
+
+def process_image(
+    image_bytes: bytes,
+    media_type: str,
+    embed: bool = False,
+    phash: bool = False,
+    max_bytes: int = MAX_IMAGE_BYTES,
+) -> ProcessedImage:
+    """
+    Decode once and build the requested derivatives. Runs in a worker process.
+
+    Args:
+        image_bytes: Encoded image data
+        media_type: MIME type of image_bytes
+        embed: Also build the Voyage embedding copy
+        phash: Also compute the perceptual hash
+        max_bytes: Byte budget for the API copy
+
+    Returns:
+        ProcessedImage. If the image cannot be decoded, the original bytes
+        are returned as the API copy with width/height 0.
+    """
+    timings: dict[str, float] = {}
+    start = time.perf_counter()
+
+    def lap(stage: str) -> None:
+        nonlocal start
+        now = time.perf_counter()
+        timings[stage] = round((now - start) * 1000, 2)
+        start = now
+
+    try:
+        img = Image.open(io.BytesIO(image_bytes))
+        img.load()
+    except Exception as e:
+        logger.warning(f"[PROCESS] Failed to decode {media_type} image: {e}")
+        return ProcessedImage(image_bytes, media_type, 0, 0, timings_ms=timings)
+    lap("decode")
+
+    try:
+        width, height = img.size
+        rgb = _to_rgb(img)
+        api_bytes = _encode_for_api(_fit(rgb, MAX_IMAGE_DIMENSION), max_bytes)
+        lap("api")
+
+        embed_image = None
+        if embed:
+            # Copy so the result owns its pixels independently of `img`
+            embed_image = _fit(rgb, EMBED_MAX_DIMENSION).copy()
+            lap("embed")
+
+        image_phash = None
+        if phash:
+            image_phash = dhash_image(rgb)
+            lap("phash")
+    finally:
+        img.close()
+
+    timings["total"] = round(sum(timings.values()), 2)
+    return ProcessedImage(
+        api_bytes=api_bytes,
+        api_media_type="image/jpeg",
+        width=width,
+        height=height,
+        embed_image=embed_image,
+        phash=image_phash,
+        timings_ms=timings,
+    )
+
+
+class ImageProcessor:
+    """Runs process_image() in a process pool and tracks timings."""
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Args:
+            workers: Worker processes. 0 runs in a thread instead (tests,
+                single-core hosts). Defaults to IMAGE_PROCESS_WORKERS or 2.
+        """
+        if workers is None:
+            workers = int(os.getenv("IMAGE_PROCESS_WORKERS", "2"))
+        self.workers = workers
+        self._pool: Optional[Executor] = None
+        self._stats = {"images": 0, "failures": 0, "wall_ms": 0.0, "queue_ms": 0.0}
+        self._stage_ms: dict[str, float] = {}
+
+    def _executor(self) -> Optional[Executor]:
+        if self.workers <= 0:
+            return None
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    async def process(
+        self,
+        image_bytes: bytes,
+        media_type: str,
+        embed: bool = False,
+        phash: bool = False,
+        max_bytes: int = MAX_IMAGE_BYTES,
+    ) -> ProcessedImage:
+        """
+        Build image derivatives off the event loop.
+
+        Args:
+            image_bytes: Encoded image data
+            media_type: MIME type of image_bytes
+            embed: Also build the Voyage embedding copy
+            phash: Also compute the perceptual hash
+            max_bytes: Byte budget for the API copy
+
+        Returns:
+            ProcessedImage
+        """
+        job = partial(process_image, image_bytes, media_type, embed, phash, max_bytes)
+        start = time.perf_counter()
+        try:
+            executor = self._executor()
+            if executor is None:
+                result = await asyncio.to_thread(job)
+            else:
+                result = await asyncio.get_running_loop().run_in_executor(executor, job)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge image); rebuild the pool next time
+            logger.error("[PROCESS] Image worker pool broke; restarting it")
+            self._pool = None
+            self._stats["failures"] += 1
+            result = await asyncio.to_thread(job)
+
+        wall_ms = (time.perf_counter() - start) * 1000
+        self._stats["images"] += 1
+        self._stats["wall_ms"] += wall_ms
+        self._stats["queue_ms"] += max(0.0, wall_ms - result.timings_ms.get("total", 0.0))
+        for stage, ms in result.timings_ms.items():
+            self._stage_ms[stage] = self._stage_ms.get(stage, 0.0) + ms
+
+        logger.info(
+            f"[PROCESS] {media_type} {len(image_bytes)} -> {len(result.api_bytes)} bytes "
+            f"in {wall_ms:.0f}ms ({', '.join(f'{k}={v:.0f}ms' for k, v in result.timings_ms.items())})"
+        )
+        return result
+
+    def stats(self) -> dict:
+        """Counts and mean per-stage timings since startup."""
+        images = self._stats["images"] or 1
+        return {
+            "workers": self.workers,
+            "images": self._stats["images"],
+            "failures": self._stats["failures"],
+            "avg_wall_ms": round(self._stats["wall_ms"] / images, 2),
+            "avg_queue_ms": round(self._stats["queue_ms"] / images, 2),
+            "avg_stage_ms": {stage: round(ms / images, 2) for stage, ms in self._stage_ms.items()},
+        }
+
+    def shutdown(self) -> None:
+        """Stop worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_processor: Optional[ImageProcessor] = None
+
+
+def get_image_processor() -> ImageProcessor:
+    """Shared processor for the bot and the image memory system."""
+    global _processor
+    if _processor is None:
+        _processor = ImageProcessor()
+    return _processor
+
+
+def shutdown_image_processor() -> None:
+    """Stop the shared processor's workers, if started."""
+    if _processor is not None:
+        _processor.shutdown()
@@ -0,0 +1,530 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Commercial licensing: [slashdaemon@protonmail.com]
+
+"""
+Process-wide LLM Gateway
+
+Every Anthropic call in the process goes through one LLMGateway:
+- One AsyncAnthropic client over one pooled keep-alive HTTP connection pool,
+  instead of a client (and pool) per ClaudeClient, scheduler and analyzer.
+- Priority lanes: callers get a LaneClient for their purpose (chat, voice,
+  reminders, proactive, memory, reflection, recognition). Interactive lanes
+  are admitted first and background lanes can never take the last
+  LLM_INTERACTIVE_RESERVE slots, so extraction or a recognition backlog
+  can't queue a chat reply.
+- Adaptive concurrency: the in-flight limit grows by ~1 per limit's worth of
+  successes and halves on 429/529. retry-after pauses every lane, and the
+  request is retried after it (the SDK's own retries are disabled so the
+  gateway sees every throttle).
+- Request coalescing: identical concurrent create() calls share one request.
+- Unified accounting: calls, tokens (incl. prompt cache), latency, errors and
+  throttles per lane and model, via usage_stats().
+
+LaneClient mirrors the subset of AsyncAnthropic the codebase uses
+(messages.create and messages.stream), so existing call sites and test
+doubles keep working unchanged.
+"""
+
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+import anthropic
+import httpx
+
+logger = logging.getLogger("slashAI.llm_gateway")
+
+# Lanes (purposes) and their priority: lower is admitted first
+LANE_CHAT = "chat"
+LANE_VOICE = "voice"
+LANE_REMINDERS = "reminders"
+LANE_PROACTIVE = "proactive"
+LANE_MEMORY = "memory"
+LANE_REFLECTION = "reflection"
+LANE_RECOGNITION = "recognition"
+
+LANE_PRIORITY = {
+    LANE_CHAT: 0,
+    LANE_VOICE: 0,
+    LANE_REMINDERS: 1,
+    LANE_PROACTIVE: 1,
+    LANE_MEMORY: 2,
+    LANE_REFLECTION: 2,
+    LANE_RECOGNITION: 2,
+}
+INTERACTIVE_PRIORITY = 0
+
+# Ceiling and floor for concurrent in-flight requests across all lanes
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+MIN_CONCURRENCY = int(os.getenv("LLM_MIN_CONCURRENCY", "2"))
+
+# Slots only interactive lanes may use
+INTERACTIVE_RESERVE = int(os.getenv("LLM_INTERACTIVE_RESERVE", "4"))
+
+# Retries after a throttle (429/529), server error or connection error
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+
+# Backoff when the API gives no retry-after (seconds)
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+# Keep-alive pool shared by every lane
+HTTP_LIMITS = httpx.Limits(
+    max_connections=MAX_CONCURRENCY + 4,
+    max_keepalive_connections=MAX_CONCURRENCY,
+    keepalive_expiry=60.0,
+)
+HTTP_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+
+# USD per million tokens (input, output) by model family; cache writes bill at
+# 1.25x input and cache reads at 0.1x input
+MODEL_PRICING = {
+    "claude-haiku": (1.0, 5.0),
+    "claude-sonnet": (3.0, 15.0),
+}
+DEFAULT_PRICING = MODEL_PRICING["claude-sonnet"]
+
+
+def _pricing(model: str) -> tuple[float, float]:
+    for prefix, price in MODEL_PRICING.items():
+        if model.startswith(prefix):
+            return price
+    return DEFAULT_PRICING
+
+
+# OverloadedError is missing from older SDKs; the 529 check covers them
+_THROTTLE_ERRORS = tuple(
+    cls
+    for cls in (anthropic.RateLimitError, getattr(anthropic, "OverloadedError", None))
+    if cls is not None
+)
+
+
+def _is_throttle(error: Exception) -> bool:
+    """429 rate limit or 529 overloaded: back off and shrink concurrency."""
+    return isinstance(error, _THROTTLE_ERRORS) or (
+        isinstance(error, anthropic.APIStatusError) and error.status_code == 529
+    )
+
+
+def _is_retryable(error: Exception) -> bool:
+    if _is_throttle(error):
+        return True
+    if isinstance(error, anthropic.APIConnectionError):
+        return True
+    return isinstance(error, anthropic.APIStatusError) and error.status_code >= 500
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds from the retry-after header, if the error carries one."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    raw = response.headers.get("retry-after")
+    try:
+        return max(0.0, float(raw)) if raw is not None else None
+    except ValueError:
+        return None
+
+
+def _backoff(attempt: int) -> float:
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt))
+    return delay * (0.5 + random.random() / 2)
+
+
+@dataclass
+class UsageStats:
+    """Accumulated usage for one (lane, model) pair."""
+
+    calls: int = 0
+    errors: int = 0
+    throttled: int = 0
+    coalesced: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_tokens: int = 0
+    cache_read_tokens: int = 0
+    latency_ms_total: int = 0
+    latency_ms_max: int = 0
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Share of prompt tokens served from cache."""
+        prompt = self.input_tokens + self.cache_read_tokens + self.cache_creation_tokens
+        return round(self.cache_read_tokens / prompt, 4) if prompt else 0.0
+
+    def add(self, other: "UsageStats") -> None:
+        for name, value in asdict(other).items():
+            if name == "latency_ms_max":
+                self.latency_ms_max = max(self.latency_ms_max, value)
+            else:
+                setattr(self, name, getattr(self, name) + value)
+
+
+class AdaptiveLimiter:
+    """
+    Priority-ordered concurrency limiter with AIMD sizing.
+
+    Waiters are admitted lowest priority number first, FIFO within a
+    priority. Non-interactive priorities can't use the last `reserve` slots.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, reserve: int = 0, clock=time.monotonic):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.reserve = reserve
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self._clock = clock
+        self._cooldown_until = 0.0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._wake_handle: Optional[asyncio.TimerHandle] = None
+
+    def _capacity(self, priority: int) -> int:
+        cap = int(self.limit)
+        if priority > INTERACTIVE_PRIORITY:
+            cap -= self.reserve
+        return max(1, cap)
+
+    def _cooling(self) -> bool:
+        return self._clock() < self._cooldown_until
+
+    async def acquire(self, priority: int) -> None:
+        if not self._waiters and not self._cooling() and self.in_flight < self._capacity(priority):
+            self.in_flight += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        self._wake()  # Admits us now if only lower-priority waiters are blocked
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # Granted just as we were cancelled
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def on_success(self) -> None:
+        """Additive increase: about +1 slot per `limit` successful calls."""
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._wake()
+
+    def on_throttle(self, delay: float) -> None:
+        """Multiplicative decrease, and pause admissions for `delay` seconds."""
+        self.limit = max(self.min_limit, self.limit / 2)
+        self._cooldown_until = max(self._cooldown_until, self._clock() + delay)
+        if self._wake_handle is not None:
+            self._wake_handle.cancel()
+        self._wake_handle = asyncio.get_running_loop().call_later(delay, self._wake)
+
+    def _wake(self) -> None:
+        if self._cooling():
+            return
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self.in_flight >= self._capacity(priority):
+                break
+            heapq.heappop(self._waiters)
+            self.in_flight += 1
+            future.set_result(None)
+
+
+class LLMGateway:
+    """Shared Anthropic client with lanes, adaptive limits and accounting."""
+
+    def __init__(self, api_key: Optional[str] = None, client: Optional[Any] = None, clock=time.monotonic):
+        """
+        Args:
+            api_key: Anthropic API key (defaults to ANTHROPIC_API_KEY)
+            client: Pre-built AsyncAnthropic-compatible client (tests)
+            clock: Monotonic clock (injectable for tests)
+        """
+        self._client = client or anthropic.AsyncAnthropic(
+            api_key=api_key or os.getenv("ANTHROPIC_API_KEY"),
+            max_retries=0,  # Retries happen here so throttles shrink concurrency
+            http_client=anthropic.DefaultAsyncHttpxClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT),
+        )
+        self.limiter = AdaptiveLimiter(
+            MAX_CONCURRENCY, MIN_CONCURRENCY, INTERACTIVE_RESERVE, clock=clock
+        )
+        self.max_retries = MAX_RETRIES
+        self._clock = clock
+        self._stats: dict[tuple[str, str], UsageStats] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def client(self, lane: str) -> "LaneClient":
+        """An AsyncAnthropic-compatible client whose calls run in `lane`."""
+        if lane not in LANE_PRIORITY:
+            raise ValueError(f"Unknown LLM lane: {lane}")
+        return LaneClient(self, lane)
+
+    async def close(self) -> None:
+        await self._client.close()
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+
+    async def create(self, lane: str, **kwargs) -> Any:
+        """messages.create() in `lane`, coalesced with identical in-flight calls."""
+        key = self._coalesce_key(kwargs)
+        if key is None:
+            return await self._create(lane, kwargs)
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._lane_stats(lane, kwargs.get("model", "")).coalesced += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(self._create(lane, kwargs))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _create(self, lane: str, kwargs: dict) -> Any:
+        return await self._run(
+            lane, kwargs.get("model", ""), lambda: self._client.messages.create(**kwargs)
+        )
+
+    def stream(self, lane: str, **kwargs) -> "_GatewayStream":
+        """messages.stream() in `lane` (async context manager)."""
+        return _GatewayStream(self, lane, kwargs)
+
+    async def _run(
+        self, lane: str, model: str, call: Callable[[], Awaitable[Any]], hold: bool = False
+    ) -> Any:
+        """
+        Admit, call, retry on throttles/transient errors, and record usage.
+
+        With hold=True the slot stays taken after a successful call and the
+        caller releases it and records usage (streams).
+        """
+        priority = LANE_PRIORITY[lane]
+        stats = self._lane_stats(lane, model)
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire(priority)
+            start = self._clock()
+            try:
+                response = await call()
+            except asyncio.CancelledError:
+                self.limiter.release()
+                raise
+            except Exception as e:
+                self.limiter.release()
+                if not _is_retryable(e) or attempt == self.max_retries:
+                    stats.errors += 1
+                    raise
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = _backoff(attempt)
+                if _is_throttle(e):
+                    stats.throttled += 1
+                    self.limiter.on_throttle(delay)
+                    logger.warning(
+                        f"LLM throttled ({lane}, {type(e).__name__}); retry in {delay:.1f}s, "
+                        f"concurrency now {int(self.limiter.limit)}"
+                    )
+                else:
+                    logger.warning(f"LLM call failed ({lane}): {e}; retry in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            if hold:
+                return response
+            self.limiter.on_success()
+            self.limiter.release()
+            self._record(stats, getattr(response, "usage", None), start)
+            return response
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+    # ------------------------------------------------------------------
+    # Accounting
+    # ------------------------------------------------------------------
+
+    def _lane_stats(self, lane: str, model: str) -> UsageStats:
+        return self._stats.setdefault((lane, model), UsageStats())
+
+    def _record(self, stats: UsageStats, usage: Any, start: float) -> None:
+        latency_ms = int((self._clock() - start) * 1000)
+        stats.calls += 1
+        stats.latency_ms_total += latency_ms
+        stats.latency_ms_max = max(stats.latency_ms_max, latency_ms)
+        if usage is not None:
+            stats.input_tokens += getattr(usage, "input_tokens", 0) or 0
+            stats.output_tokens += getattr(usage, "output_tokens", 0) or 0
+            stats.cache_creation_tokens += getattr(usage, "cache_creation_input_tokens", 0) or 0
+            stats.cache_read_tokens += getattr(usage, "cache_read_input_tokens", 0) or 0
+
+    def usage_stats(self, lane: Optional[str] = None) -> dict:
+        """
+        Token usage, cost estimate and latency, in total and per lane.
+
+        Args:
+            lane: Restrict the totals to one lane
+        """
+        total = UsageStats()
+        per_lane: dict[str, UsageStats] = {}
+        cost = savings = 0.0
+        for (stat_lane, model), stats in self._stats.items():
+            if lane is not None and stat_lane != lane:
+                continue
+            total.add(stats)
+            per_lane.setdefault(stat_lane, UsageStats()).add(stats)
+            input_price, output_price = _pricing(model)
+            cost += (
+                stats.input_tokens * input_price
+                + stats.output_tokens * output_price
+                + stats.cache_creation_tokens * input_price * 1.25
+                + stats.cache_read_tokens * input_price * 0.10
+            ) / 1_000_000
+            savings += stats.cache_read_tokens * input_price * 0.90 / 1_000_000
+
+        return {
+            "total_input_tokens": total.input_tokens,
+            "total_output_tokens": total.output_tokens,
+            "cache_creation_tokens": total.cache_creation_tokens,
+            "cache_read_tokens": total.cache_read_tokens,
+            "cache_hit_ratio": total.cache_hit_ratio,
+            "estimated_cost_usd": round(cost, 4),
+            "cache_savings_usd": round(savings, 4),
+            "calls": total.calls,
+            "errors": total.errors,
+            "throttled": total.throttled,
+            "coalesced": total.coalesced,
+            "avg_latency_ms": total.latency_ms_total // total.calls if total.calls else 0,
+            "concurrency_limit": int(self.limiter.limit),
+            "in_flight": self.limiter.in_flight,
+            "lanes": {
+                name: {**asdict(stats), "cache_hit_ratio": stats.cache_hit_ratio}
+                for name, stats in per_lane.items()
+            },
+        }
+
+    @staticmethod
+    def _coalesce_key(kwargs: dict) -> Optional[str]:
+        try:
+            payload = json.dumps(kwargs, sort_keys=True)
+        except (TypeError, ValueError):
+            return None  # Non-JSON arguments: don't coalesce
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class _GatewayStream:
+    """messages.stream() context manager that holds a lane slot while open."""
+
+    def __init__(self, gateway: LLMGateway, lane: str, kwargs: dict):
+        self._gateway = gateway
+        self._lane = lane
+        self._kwargs = kwargs
+        self._manager = None
+        self._stream = None
+        self._start = 0.0
+
+    async def __aenter__(self):
+        gateway = self._gateway
+
+        async def _open():
+            manager = gateway._client.messages.stream(**self._kwargs)
+            stream = await manager.__aenter__()
+            return manager, stream
+
+        # Admission, retries and throttle handling cover opening the stream;
+        # the slot stays held until __aexit__
+        self._manager, self._stream = await gateway._run(
+            self._lane, self._kwargs.get("model", ""), _open, hold=True
+        )
+        self._start = gateway._clock()
+        return self._stream
+
+    async def __aexit__(self, exc_type, exc, tb):
+        gateway = self._gateway
+        stats = gateway._lane_stats(self._lane, self._kwargs.get("model", ""))
+        try:
+            return await self._manager.__aexit__(exc_type, exc, tb)
+        finally:
+            gateway.limiter.release()
+            if exc_type is not None and issubclass(exc_type, asyncio.CancelledError):
+                pass  # Deliberate (e.g. voice barge-in): neither error nor success
+            elif exc_type is not None:
+                stats.errors += 1
+            else:
+                gateway.limiter.on_success()
+                snapshot = getattr(self._stream, "current_message_snapshot", None)
+                gateway._record(stats, getattr(snapshot, "usage", None), self._start)
+
+
+class _LaneMessages:
+    def __init__(self, gateway: LLMGateway, lane: str):
+        self._gateway = gateway
+        self._lane = lane
+
+    async def create(self, **kwargs) -> Any:
+        return await self._gateway.create(self._lane, **kwargs)
+
+    def stream(self, **kwargs) -> _GatewayStream:
+        return self._gateway.stream(self._lane, **kwargs)
+
+
+class LaneClient:
+    """AsyncAnthropic stand-in whose calls go through the gateway in one lane."""
+
+    def __init__(self, gateway: LLMGateway, lane: str):
+        self.gateway = gateway
+        self.lane = lane
+        self.messages = _LaneMessages(gateway, lane)
+
+    def for_lane(self, lane: str) -> "LaneClient":
+        """A sibling client on the same gateway in another lane."""
+        return self.gateway.client(lane)
+
+    def usage_stats(self) -> dict:
+        """Gateway usage for this client's lane."""
+        return self.gateway.usage_stats(self.lane)
+
+
+# Process-wide gateway, created on first use
+_gateway: Optional[LLMGateway] = None
+
+
+def get_llm_gateway(api_key: Optional[str] = None) -> LLMGateway:
+    """Return the process-wide gateway, creating it on first call."""
+    global _gateway
+    if _gateway is None:
+        _gateway = LLMGateway(api_key)
+    return _gateway
+
+
+async def shutdown_llm_gateway() -> None:
+    """Close the shared HTTP pool (call once at process shutdown)."""
+    global _gateway
+    if _gateway is not None:
+        await _gateway.close()
+        _gateway = None
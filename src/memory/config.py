@@ -24,6 +24,7 @@ Values can be overridden via environment variables.
 
 import os
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
@@ -49,8 +50,16 @@ class MemoryConfig:
     extraction_message_threshold: int = 5
     extraction_inactivity_minutes: int = 30
 
+    # Extraction job queue (see extraction_queue.py)
+    extraction_queue_enabled: bool = True  # False = extract inline in track_message
+    extraction_worker_concurrency: int = 2
+    extraction_max_attempts: int = 5
+    extraction_retry_base_seconds: int = 30  # Doubles per attempt, capped at 1h
+    extraction_poll_seconds: float = 5.0
+
     # Merge settings
     merge_similarity_threshold: float = 0.85
+    merge_concurrency: int = 4  # Concurrent Claude merge calls in update_many()
 
     # Embedding settings (Voyage AI)
     embedding_model: str = "voyage-3.5-lite"
@@ -64,6 +73,19 @@ class MemoryConfig:
     hybrid_candidate_limit: int = 20  # Candidates per search type for RRF
     rrf_k: int = 60  # Smoothing constant for RRF
 
+    # In-process retrieval tier (see vector_index.py) - off by default
+    retrieval_cache_enabled: bool = False  # TTL/LRU cache of recent results
+    retrieval_cache_ttl_seconds: int = 60
+    retrieval_cache_max_entries: int = 1024
+    vector_index_enabled: bool = False  # Per-user NumPy index in front of hybrid search
+    vector_index_ttl_seconds: int = 300  # Reload after this to pick up external writes
+    vector_index_max_users: int = 256
+
+    # Shared text-embedding cache (see embeddings.py)
+    embedding_cache_enabled: bool = True
+    embedding_cache_max_entries: int = 4096
+    embedding_cache_path: Optional[str] = None  # SQLite file; memory-only when unset
+
     # Decay settings (v0.10.1)
     # Relevance-weighted decay: memories decay slower if frequently retrieved
     decay_enabled: bool = True
@@ -111,14 +133,32 @@ class MemoryConfig:
             extraction_inactivity_minutes=int(
                 os.getenv("MEMORY_INACTIVITY_MINUTES", "30")
             ),
+            extraction_queue_enabled=os.getenv("MEMORY_EXTRACTION_QUEUE", "true").lower() == "true",
+            extraction_worker_concurrency=int(os.getenv("MEMORY_EXTRACTION_CONCURRENCY", "2")),
+            extraction_max_attempts=int(os.getenv("MEMORY_EXTRACTION_MAX_ATTEMPTS", "5")),
+            extraction_retry_base_seconds=int(
+                os.getenv("MEMORY_EXTRACTION_RETRY_BASE_SECONDS", "30")
+            ),
+            extraction_poll_seconds=float(os.getenv("MEMORY_EXTRACTION_POLL_SECONDS", "5.0")),
             merge_similarity_threshold=float(
                 os.getenv("MEMORY_MERGE_THRESHOLD", "0.85")
             ),
+            merge_concurrency=int(os.getenv("MEMORY_MERGE_CONCURRENCY", "4")),
             embedding_model=os.getenv("MEMORY_EMBEDDING_MODEL", "voyage-3.5-lite"),
             max_memory_tokens=int(os.getenv("MEMORY_MAX_TOKENS", "2000")),
             hybrid_search_enabled=os.getenv("MEMORY_HYBRID_SEARCH", "true").lower() == "true",
             hybrid_candidate_limit=int(os.getenv("MEMORY_HYBRID_CANDIDATES", "20")),
             rrf_k=int(os.getenv("MEMORY_RRF_K", "60")),
+            # In-process retrieval tier
+            retrieval_cache_enabled=os.getenv("MEMORY_RETRIEVAL_CACHE", "false").lower() == "true",
+            retrieval_cache_ttl_seconds=int(os.getenv("MEMORY_RETRIEVAL_CACHE_TTL", "60")),
+            retrieval_cache_max_entries=int(os.getenv("MEMORY_RETRIEVAL_CACHE_SIZE", "1024")),
+            vector_index_enabled=os.getenv("MEMORY_VECTOR_INDEX", "false").lower() == "true",
+            vector_index_ttl_seconds=int(os.getenv("MEMORY_VECTOR_INDEX_TTL", "300")),
+            vector_index_max_users=int(os.getenv("MEMORY_VECTOR_INDEX_MAX_USERS", "256")),
+            embedding_cache_enabled=os.getenv("MEMORY_EMBEDDING_CACHE", "true").lower() == "true",
+            embedding_cache_max_entries=int(os.getenv("MEMORY_EMBEDDING_CACHE_SIZE", "4096")),
+            embedding_cache_path=os.getenv("MEMORY_EMBEDDING_CACHE_PATH") or None,
             # Decay settings
             decay_enabled=os.getenv("MEMORY_DECAY_ENABLED", "true").lower() == "true",
             base_decay_rate=float(os.getenv("MEMORY_BASE_DECAY_RATE", "0.95")),
@@ -186,6 +226,10 @@ class ImageMemoryConfig:
     # Context injection
     max_build_context_clusters: int = 3
 
+    # Background observation pipeline
+    observation_concurrency: int = 2  # Images processed at once, all guilds
+    observation_queue_size: int = 20  # Pending messages per guild before dropping
+
     @classmethod
     def from_env(cls) -> "ImageMemoryConfig":
         """Create config from environment variables with defaults."""
@@ -214,4 +258,6 @@ class ImageMemoryConfig:
             max_build_context_clusters=int(
                 os.getenv("IMAGE_MAX_CONTEXT_CLUSTERS", "3")
             ),
+            observation_concurrency=int(os.getenv("IMAGE_OBSERVATION_CONCURRENCY", "2")),
+            observation_queue_size=int(os.getenv("IMAGE_OBSERVATION_QUEUE_SIZE", "20")),
         )
@@ -0,0 +1,311 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Commercial licensing: [slashdaemon@protonmail.com]
+
+"""
+Shared Text Embedding Cache
+
+One EmbeddingService fronts every Voyage text-embedding call made by the
+memory system (retriever, updater, manager search, image text queries,
+reflections). Vectors are keyed by (model, input_type, sha256(text)):
+
+- In-memory LRU for hot entries, plus a pinned set that is never evicted
+  (the fixed query-expansion sub-queries).
+- Optional on-disk SQLite store so embeddings survive restarts.
+- Request coalescing: concurrent callers asking for the same text share
+  one in-flight Voyage request, and misses in one call are batched into a
+  single API request.
+
+Embeddings are deterministic for a given model/input_type, so entries
+never expire. Image (pixel) embeddings are not cached here; those are
+already deduplicated by file hash in image_observations.
+"""
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+import numpy as np
+
+logger = logging.getLogger("slashAI.memory.embeddings")
+
+# Cache key input_type for text queries embedded with multimodal_embed()
+MULTIMODAL_TEXT = "multimodal_text"
+
+CacheKey = tuple[str, str, str]
+
+
+def _cache_key(text: str, model: str, input_type: str) -> CacheKey:
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return (model, input_type, digest)
+
+
+class _DiskStore:
+    """SQLite-backed key/vector store (float32 blobs)."""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    input_type TEXT NOT NULL,
+                    text_sha256 TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    PRIMARY KEY (model, input_type, text_sha256)
+                )
+                """
+            )
+            self._conn.commit()
+
+    def get_many(self, keys: list[CacheKey]) -> dict[CacheKey, list[float]]:
+        found: dict[CacheKey, list[float]] = {}
+        with self._lock:
+            for key in keys:
+                row = self._conn.execute(
+                    "SELECT vector FROM embeddings "
+                    "WHERE model = ? AND input_type = ? AND text_sha256 = ?",
+                    key,
+                ).fetchone()
+                if row is not None:
+                    found[key] = np.frombuffer(row[0], dtype=np.float32).tolist()
+        return found
+
+    def put_many(self, items: list[tuple[CacheKey, list[float]]]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, input_type, text_sha256, vector) "
+                "VALUES (?, ?, ?, ?)",
+                [(*key, np.asarray(vec, dtype=np.float32).tobytes()) for key, vec in items],
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class EmbeddingService:
+    """Caching, coalescing wrapper around a voyageai.AsyncClient."""
+
+    def __init__(
+        self,
+        client,
+        max_entries: int = 4096,
+        store_path: Optional[str] = None,
+        enabled: bool = True,
+    ):
+        self.client = client
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self._lru: OrderedDict[CacheKey, list[float]] = OrderedDict()
+        self._pinned: dict[CacheKey, list[float]] = {}
+        self._inflight: dict[CacheKey, asyncio.Future] = {}
+        self._store: Optional[_DiskStore] = None
+        if enabled and store_path:
+            try:
+                self._store = _DiskStore(store_path)
+            except Exception as e:
+                logger.warning(f"Embedding disk cache unavailable ({store_path}): {e}")
+        self.hits = 0
+        self.disk_hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self.api_calls = 0
+
+    async def embed(
+        self,
+        texts: list[str],
+        model: str,
+        input_type: str = "document",
+        pin: bool = False,
+    ) -> list[list[float]]:
+        """Embed texts with embed(), serving repeats from cache."""
+
+        async def fetch(batch: list[str]) -> list[list[float]]:
+            result = await self.client.embed(batch, model=model, input_type=input_type)
+            return result.embeddings
+
+        return await self._get_many(texts, model, input_type, fetch, pin)
+
+    async def embed_one(self, text: str, model: str, input_type: str = "document") -> list[float]:
+        """Embed a single text."""
+        return (await self.embed([text], model, input_type))[0]
+
+    async def embed_multimodal_text(
+        self, texts: list[str], model: str, pin: bool = False
+    ) -> list[list[float]]:
+        """Embed text queries with multimodal_embed() (same space as image embeddings)."""
+
+        async def fetch(batch: list[str]) -> list[list[float]]:
+            result = await self.client.multimodal_embed(
+                inputs=[[t] for t in batch], model=model
+            )
+            return result.embeddings
+
+        return await self._get_many(texts, model, MULTIMODAL_TEXT, fetch, pin)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._lru),
+            "pinned": len(self._pinned),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "api_calls": self.api_calls,
+            "disk_store": self._store is not None,
+        }
+
+    def close(self) -> None:
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _get_many(
+        self,
+        texts: list[str],
+        model: str,
+        input_type: str,
+        fetch: Callable[[list[str]], Awaitable[list[list[float]]]],
+        pin: bool,
+    ) -> list[list[float]]:
+        if not texts:
+            return []
+        if not self.enabled:
+            self.api_calls += 1
+            return [list(v) for v in await fetch(texts)]
+
+        keys = [_cache_key(t, model, input_type) for t in texts]
+        results: dict[CacheKey, list[float]] = {}
+        waiting: dict[CacheKey, asyncio.Future] = {}
+        missing: list[CacheKey] = []
+
+        for key in keys:
+            if key in results or key in waiting or key in missing:
+                continue
+            cached = self._lookup(key)
+            if cached is not None:
+                self.hits += 1
+                results[key] = cached
+            elif key in self._inflight:
+                self.coalesced += 1
+                waiting[key] = self._inflight[key]
+            else:
+                missing.append(key)
+
+        if missing and self._store is not None:
+            try:
+                from_disk = await asyncio.to_thread(self._store.get_many, missing)
+            except Exception as e:
+                logger.warning(f"Embedding disk cache read failed: {e}")
+                from_disk = {}
+            for key, vector in from_disk.items():
+                self.disk_hits += 1
+                self._remember(key, vector, pin)
+                results[key] = vector
+            missing = [k for k in missing if k not in from_disk]
+
+        # Another caller may have started the same request while we read disk
+        still_missing = []
+        for key in missing:
+            if key in self._inflight:
+                self.coalesced += 1
+                waiting[key] = self._inflight[key]
+            else:
+                still_missing.append(key)
+        missing = still_missing
+
+        if missing:
+            results.update(await self._fetch_missing(missing, keys, texts, fetch, pin))
+
+        for key, future in waiting.items():
+            results[key] = await asyncio.shield(future)
+
+        if pin:
+            for key in keys:
+                self._pinned[key] = results[key]
+                self._lru.pop(key, None)
+
+        return [results[k] for k in keys]
+
+    async def _fetch_missing(
+        self,
+        missing: list[CacheKey],
+        keys: list[CacheKey],
+        texts: list[str],
+        fetch: Callable[[list[str]], Awaitable[list[list[float]]]],
+        pin: bool,
+    ) -> dict[CacheKey, list[float]]:
+        text_by_key = dict(zip(keys, texts))
+        loop = asyncio.get_running_loop()
+        futures = {key: loop.create_future() for key in missing}
+        self._inflight.update(futures)
+        self.misses += len(missing)
+        self.api_calls += 1
+        try:
+            vectors = await fetch([text_by_key[k] for k in missing])
+        except BaseException as e:
+            for key, future in futures.items():
+                self._inflight.pop(key, None)
+                future.set_exception(e)
+                future.exception()  # Mark retrieved; waiters still see it
+            raise
+
+        fetched = {key: list(vec) for key, vec in zip(missing, vectors)}
+        for key, vector in fetched.items():
+            self._remember(key, vector, pin)
+            self._inflight.pop(key, None)
+            futures[key].set_result(vector)
+
+        if self._store is not None:
+            try:
+                await asyncio.to_thread(self._store.put_many, list(fetched.items()))
+            except Exception as e:
+                logger.warning(f"Embedding disk cache write failed: {e}")
+        return fetched
+
+    def _lookup(self, key: CacheKey) -> Optional[list[float]]:
+        vector = self._pinned.get(key)
+        if vector is not None:
+            return vector
+        vector = self._lru.get(key)
+        if vector is not None:
+            self._lru.move_to_end(key)
+        return vector
+
+    def _remember(self, key: CacheKey, vector: list[float], pin: bool) -> None:
+        if pin:
+            self._pinned[key] = vector
+            return
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
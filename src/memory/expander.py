@@ -109,6 +109,14 @@ _TOPIC_PATTERNS: list[tuple[re.Pattern, list[str]]] = [
 ]
 
 
+def fixed_subqueries() -> list[str]:
+    """All canned sub-queries, for pre-embedding at startup."""
+    queries = list(_BROAD_PERSONAL_SUBQUERIES)
+    for _, subqueries in _TOPIC_PATTERNS:
+        queries.extend(subqueries)
+    return list(dict.fromkeys(queries))
+
+
 def expand_query(query: str, config: "MemoryConfig") -> ExpandedQuery:
     """
     Expand a broad query into multiple targeted sub-queries.
@@ -0,0 +1,264 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Commercial licensing: [slashdaemon@protonmail.com]
+
+"""
+Memory Extraction Job Queue
+
+Durable Postgres-backed queue (memory_extraction_jobs, migration 019) that
+moves memory extraction off the chat path:
+
+- track_message() enqueues a job when a session reaches the message
+  threshold. The partial unique index allows one pending/running job per
+  (user, channel) session, so repeat enqueues are no-ops.
+- A background worker claims jobs with FOR UPDATE SKIP LOCKED (safe with
+  several bot processes), runs up to `extraction_worker_concurrency` at a
+  time, and retries failures with exponential backoff until
+  `extraction_max_attempts`.
+- The same loop enqueues sessions idle for `extraction_inactivity_minutes`,
+  so conversations that never reach the threshold are still extracted.
+- Jobs left 'running' by a crashed worker are reclaimed after a timeout.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+import asyncpg
+from discord.ext import tasks
+
+from .config import MemoryConfig
+
+logger = logging.getLogger("slashAI.memory.extraction_queue")
+
+# A 'running' job older than this is assumed orphaned and is reclaimed
+STALE_JOB_SECONDS = 15 * 60
+# Finished jobs are kept this long for diagnostics
+JOB_RETENTION_DAYS = 7
+# Run the inactivity sweep every N worker ticks
+SWEEP_EVERY_TICKS = 12
+
+ProcessJob = Callable[[int, int], Awaitable[None]]
+
+
+class ExtractionQueue:
+    """Enqueue and process memory extraction jobs."""
+
+    def __init__(
+        self,
+        db_pool: asyncpg.Pool,
+        process_job: ProcessJob,
+        config: Optional[MemoryConfig] = None,
+    ):
+        self.db = db_pool
+        self.process_job = process_job  # async (user_id, channel_id) -> None; raises on failure
+        self.config = config or MemoryConfig.from_env()
+        self._available: bool | None = None  # Cache for schema check
+        self._started = False
+        self._ticks = 0
+
+    async def is_available(self) -> bool:
+        """True when the queue is enabled and migration 019 has been applied."""
+        if not self.config.extraction_queue_enabled:
+            return False
+        if self._available is not None:
+            return self._available
+
+        try:
+            self._available = bool(await self.db.fetchval(
+                "SELECT to_regclass('memory_extraction_jobs') IS NOT NULL"
+            ))
+            if not self._available:
+                logger.warning(
+                    "Extraction queue unavailable: memory_extraction_jobs not found. "
+                    "Run migration 019. Extracting inline."
+                )
+        except Exception as e:
+            logger.warning(f"Extraction queue schema check failed: {e}")
+            self._available = False
+        return self._available
+
+    async def enqueue(self, user_id: int, channel_id: int, trigger: str = "threshold") -> bool:
+        """
+        Queue extraction for a session.
+
+        Returns:
+            True if a new job was created, False if one was already active
+        """
+        job_id = await self.db.fetchval(
+            """
+            INSERT INTO memory_extraction_jobs (user_id, channel_id, trigger)
+            VALUES ($1, $2, $3)
+            ON CONFLICT (user_id, channel_id) WHERE status IN ('pending', 'running')
+            DO NOTHING
+            RETURNING id
+            """,
+            user_id,
+            channel_id,
+            trigger,
+        )
+        return job_id is not None
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the worker loop."""
+        if not self.config.extraction_queue_enabled:
+            logger.info("Extraction queue disabled via config")
+            return
+
+        if not self._started:
+            self._worker_loop.change_interval(seconds=self.config.extraction_poll_seconds)
+            self._worker_loop.start()
+            self._started = True
+            logger.info(
+                f"Extraction worker started (concurrency="
+                f"{self.config.extraction_worker_concurrency})"
+            )
+
+    def stop(self) -> None:
+        """Stop the worker loop. Jobs in flight are reclaimed after STALE_JOB_SECONDS."""
+        if self._started:
+            self._worker_loop.cancel()
+            self._started = False
+            logger.info("Extraction worker stopped")
+
+    @tasks.loop(seconds=5)
+    async def _worker_loop(self) -> None:
+        """Sweep idle sessions periodically and process one batch of jobs."""
+        try:
+            if not await self.is_available():
+                return
+            if self._ticks % SWEEP_EVERY_TICKS == 0:
+                await self.enqueue_inactive()
+            self._ticks += 1
+            await self.run_once()
+        except Exception as e:
+            logger.error(f"Error in extraction worker: {e}", exc_info=True)
+
+    async def run_once(self) -> int:
+        """
+        Claim and process up to `extraction_worker_concurrency` jobs concurrently.
+
+        Returns:
+            Number of jobs claimed
+        """
+        jobs = await self.db.fetch(
+            """
+            UPDATE memory_extraction_jobs
+            SET status = 'running', locked_at = NOW(), attempts = attempts + 1
+            WHERE id IN (
+                SELECT id FROM memory_extraction_jobs
+                WHERE (status = 'pending' AND run_after <= NOW())
+                   OR (status = 'running' AND locked_at < NOW() - make_interval(secs => $2))
+                ORDER BY run_after
+                LIMIT $1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, user_id, channel_id, trigger, attempts
+            """,
+            self.config.extraction_worker_concurrency,
+            STALE_JOB_SECONDS,
+        )
+        if jobs:
+            await asyncio.gather(*(self._run_job(job) for job in jobs))
+        return len(jobs)
+
+    async def enqueue_inactive(self) -> int:
+        """
+        Queue sessions idle for `extraction_inactivity_minutes` with unextracted messages.
+
+        Sessions that already had a job since their last activity are skipped,
+        so a permanently failing session is not re-queued every sweep.
+        Also prunes old finished jobs.
+
+        Returns:
+            Number of jobs created
+        """
+        rows = await self.db.fetch(
+            """
+            INSERT INTO memory_extraction_jobs (user_id, channel_id, trigger)
+            SELECT s.user_id, s.channel_id, 'inactivity'
+            FROM memory_sessions s
+            WHERE s.message_count > 0
+              AND s.last_activity_at < NOW() - make_interval(mins => $1)
+              AND NOT EXISTS (
+                  SELECT 1 FROM memory_extraction_jobs j
+                  WHERE j.user_id = s.user_id AND j.channel_id = s.channel_id
+                    AND j.created_at >= s.last_activity_at
+              )
+            ON CONFLICT (user_id, channel_id) WHERE status IN ('pending', 'running')
+            DO NOTHING
+            RETURNING id
+            """,
+            self.config.extraction_inactivity_minutes,
+        )
+        await self.db.execute(
+            """
+            DELETE FROM memory_extraction_jobs
+            WHERE status IN ('done', 'failed')
+              AND finished_at < NOW() - make_interval(days => $1)
+            """,
+            JOB_RETENTION_DAYS,
+        )
+        if rows:
+            logger.info(f"Queued {len(rows)} inactive sessions for extraction")
+        return len(rows)
+
+    async def _run_job(self, job: asyncpg.Record) -> None:
+        """Process one claimed job and record the outcome."""
+        try:
+            await self.process_job(job["user_id"], job["channel_id"])
+        except Exception as e:
+            attempts = job["attempts"]
+            final = attempts >= self.config.extraction_max_attempts
+            backoff = min(
+                self.config.extraction_retry_base_seconds * 2 ** (attempts - 1),
+                3600,
+            )
+            await self.db.execute(
+                """
+                UPDATE memory_extraction_jobs
+                SET status = $2, locked_at = NULL, last_error = $3,
+                    run_after = NOW() + make_interval(secs => $4),
+                    finished_at = CASE WHEN $2 = 'failed' THEN NOW() END
+                WHERE id = $1
+                """,
+                job["id"],
+                "failed" if final else "pending",
+                f"{type(e).__name__}: {e}"[:1000],
+                backoff,
+            )
+            if final:
+                logger.error(
+                    f"Extraction job {job['id']} failed permanently after {attempts} attempts: {e}"
+                )
+            else:
+                logger.warning(
+                    f"Extraction job {job['id']} failed (attempt {attempts}), retrying in {backoff}s: {e}"
+                )
+            return
+
+        await self.db.execute(
+            """
+            UPDATE memory_extraction_jobs
+            SET status = 'done', locked_at = NULL, finished_at = NOW()
+            WHERE id = $1
+            """,
+            job["id"],
+        )
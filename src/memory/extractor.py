@@ -210,6 +210,23 @@ class MemoryExtractor:
             List of (ExtractedMemory, PrivacyLevel) tuples
         """
         channel_privacy = await classify_channel_privacy(channel)
+        return await self.extract_for_channel_privacy(
+            messages, channel_privacy, model=model, reaction_context=reaction_context
+        )
+
+    async def extract_for_channel_privacy(
+        self,
+        messages: list[dict],
+        channel_privacy: PrivacyLevel,
+        model: str = "claude-sonnet-4-6",
+        reaction_context: Optional[list[dict]] = None,
+    ) -> list[tuple[ExtractedMemory, PrivacyLevel]]:
+        """
+        Like extract_with_privacy(), but with an already-known channel privacy.
+
+        Used by the extraction queue worker, which has the session's stored
+        privacy level rather than a live channel object.
+        """
         extracted = await self._extract(messages, model, reaction_context)
 
         results = []
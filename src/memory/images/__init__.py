@@ -21,6 +21,7 @@ from .observer import ImageObserver
 from .analyzer import ImageAnalyzer, AnalysisResult, ModerationResult
 from .clusterer import BuildClusterer, ClusterAssignment
 from .narrator import BuildNarrator, BuildNarrative
+from .pipeline import ImageObservationPipeline
 from .storage import ImageStorage
 
 __all__ = [
@@ -33,4 +34,5 @@ __all__ = [
     "BuildNarrator",
     "BuildNarrative",
     "ImageStorage",
+    "ImageObservationPipeline",
 ]
@@ -36,172 +36,11 @@ from anthropic import AsyncAnthropic
 from PIL import Image
 import voyageai
 
-logger = logging.getLogger("slashAI.images")
-
-# Anthropic API limits for images
-MAX_IMAGE_BYTES = 1_000_000  # ~1MB limit (accounts for base64 overhead + API efficiency)
-MAX_IMAGE_DIMENSION = 2048  # Max 2048px (Anthropic downsamples to ~1.15MP anyway)
-
-
-def normalize_image_for_api(image_bytes: bytes, media_type: str) -> tuple[bytes, str]:
-    """
-    Normalize an image to ensure API compatibility.
-
-    Fixes common issues that cause "Could not process image" errors:
-    - CMYK/YCCK color space (convert to RGB)
-    - Progressive JPEG encoding
-    - Problematic EXIF metadata
-    - Palette mode images
-
-    Args:
-        image_bytes: Original image data
-        media_type: MIME type (e.g., "image/jpeg")
-
-    Returns:
-        Tuple of (normalized_bytes, media_type)
-    """
-    img = None
-    try:
-        img = Image.open(io.BytesIO(image_bytes))
-
-        # Check if normalization is needed
-        needs_normalize = (
-            img.mode in ("CMYK", "YCCK", "LAB", "P", "PA", "LA", "I", "F") or
-            media_type == "image/jpeg"  # Always re-encode JPEGs to strip EXIF/fix progressive
-        )
+from image_processing import ImageProcessor, ProcessedImage, get_image_processor
 
-        if not needs_normalize:
-            return image_bytes, media_type
-
-        # Convert to RGB (or RGBA if has transparency)
-        if img.mode in ("RGBA", "LA", "PA"):
-            img = img.convert("RGBA")
-            out_format = "PNG"
-            out_media = "image/png"
-        elif img.mode in ("CMYK", "YCCK", "LAB", "I", "F"):
-            img = img.convert("RGB")
-            out_format = "JPEG"
-            out_media = "image/jpeg"
-        elif img.mode == "P":
-            # Palette mode - check if has transparency
-            if img.info.get("transparency") is not None:
-                img = img.convert("RGBA")
-                out_format = "PNG"
-                out_media = "image/png"
-            else:
-                img = img.convert("RGB")
-                out_format = "JPEG"
-                out_media = "image/jpeg"
-        else:
-            # RGB or L mode - just re-encode
-            if img.mode == "L":
-                img = img.convert("RGB")
-            out_format = "JPEG"
-            out_media = "image/jpeg"
-
-        # Re-encode (strips EXIF, fixes progressive JPEG, normalizes encoding)
-        buffer = io.BytesIO()
-        if out_format == "JPEG":
-            img.save(buffer, format="JPEG", quality=90, optimize=True)
-        else:
-            img.save(buffer, format="PNG", optimize=True)
-
-        result = buffer.getvalue()
-        logger.info(f"[NORMALIZE] Converted {media_type} {img.mode} -> {out_media} ({len(image_bytes)} -> {len(result)} bytes)")
-        return result, out_media
-
-    except Exception as e:
-        logger.warning(f"[NORMALIZE] Failed to normalize image: {e}")
-        return image_bytes, media_type
-    finally:
-        if img is not None:
-            img.close()
-
-
-def resize_image_for_api(image_bytes: bytes, media_type: str, max_bytes: int = MAX_IMAGE_BYTES) -> tuple[bytes, str]:
-    """
-    Resize an image for optimal API transmission.
-
-    Always resizes large images first (Anthropic downsamples to ~1.15MP anyway),
-    then compresses to stay under the byte limit.
-
-    Args:
-        image_bytes: Original image data
-        media_type: MIME type (e.g., "image/jpeg")
-        max_bytes: Maximum allowed size in bytes
-
-    Returns:
-        Tuple of (resized_bytes, media_type) - media_type may change to JPEG for better compression
-    """
-    img = None
-    try:
-        img = Image.open(io.BytesIO(image_bytes))
-        original_size = img.size
-        needs_resize = img.width > MAX_IMAGE_DIMENSION or img.height > MAX_IMAGE_DIMENSION
-
-        # Always resize if dimensions exceed limit (no point sending 4K to API)
-        if needs_resize:
-            ratio = min(MAX_IMAGE_DIMENSION / img.width, MAX_IMAGE_DIMENSION / img.height)
-            new_size = (int(img.width * ratio), int(img.height * ratio))
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
-            logger.info(f"[RESIZE] Reduced dimensions from {original_size} to {new_size}")
-
-        # Convert to RGB for JPEG compression (no alpha channel)
-        save_img = img
-        if img.mode in ("RGBA", "P", "PA", "LA"):
-            rgb_img = Image.new("RGB", img.size, (255, 255, 255))
-            if img.mode == "P":
-                save_img = img.convert("RGBA")
-            elif img.mode in ("PA", "LA"):
-                save_img = img.convert("RGBA")
-            else:
-                save_img = img
-            if save_img.mode == "RGBA":
-                rgb_img.paste(save_img, mask=save_img.split()[3])
-            else:
-                rgb_img.paste(save_img)
-            save_img = rgb_img
-        elif img.mode == "L":
-            save_img = img.convert("RGB")
-
-        # Try progressively lower quality until under limit
-        result_bytes = image_bytes  # fallback
-        for quality in [85, 70, 55, 40]:
-            buffer = io.BytesIO()
-            save_img.save(buffer, format="JPEG", quality=quality, optimize=True)
-            result_bytes = buffer.getvalue()
-
-            if len(result_bytes) <= max_bytes:
-                if needs_resize or len(image_bytes) > max_bytes:
-                    logger.info(f"[RESIZE] Compressed to {len(result_bytes)} bytes at quality={quality}")
-                return result_bytes, "image/jpeg"
-
-        # Last resort: reduce dimensions further
-        while len(result_bytes) > max_bytes and min(img.size) > 100:
-            new_size = (img.width // 2, img.height // 2)
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
-            # Reconvert to RGB after resize
-            if img.mode in ("RGBA", "P", "PA", "LA"):
-                rgb_img = Image.new("RGB", img.size, (255, 255, 255))
-                rgba_img = img.convert("RGBA") if img.mode != "RGBA" else img
-                rgb_img.paste(rgba_img, mask=rgba_img.split()[3])
-                save_img = rgb_img
-            else:
-                save_img = img if img.mode == "RGB" else img.convert("RGB")
-            buffer = io.BytesIO()
-            save_img.save(buffer, format="JPEG", quality=40, optimize=True)
-            result_bytes = buffer.getvalue()
-            logger.info(f"[RESIZE] Further reduced to {new_size}, now {len(result_bytes)} bytes")
-
-        return result_bytes, "image/jpeg"
-
-    except Exception as e:
-        logger.error(f"[RESIZE] Failed to resize image: {e}")
-        return image_bytes, media_type  # Return original on failure
-    finally:
-        if img is not None:
-            img.close()
+from ..embeddings import EmbeddingService
 
+logger = logging.getLogger("slashAI.images")
 
 # Analysis prompt for Minecraft screenshots
 IMAGE_ANALYSIS_PROMPT = """
@@ -332,18 +171,29 @@ class ImageAnalyzer:
         anthropic_client: AsyncAnthropic,
         voyage_client: Optional[voyageai.AsyncClient] = None,
         config: Optional[ImageAnalysisConfig] = None,
+        embeddings: Optional[EmbeddingService] = None,
+        processor: Optional[ImageProcessor] = None,
     ):
         self.anthropic = anthropic_client
         self.voyage = voyage_client or voyageai.AsyncClient()
         self.config = config or ImageAnalysisConfig()
+        self.embeddings = embeddings or EmbeddingService(self.voyage)
+        self.processor = processor or get_image_processor()
 
-    async def analyze(self, image_bytes: bytes, media_type: str) -> AnalysisResult:
+    async def analyze(
+        self,
+        image_bytes: bytes,
+        media_type: str,
+        processed: Optional[ProcessedImage] = None,
+    ) -> AnalysisResult:
         """
         Full analysis: description, tags, elements, embedding.
 
         Args:
             image_bytes: Raw image data
             media_type: MIME type (e.g., "image/png")
+            processed: Derivatives from ImageProcessor (with embed=True), if
+                the caller already has them; otherwise built off-loop here
 
         Returns:
             AnalysisResult with all extracted information
@@ -351,17 +201,16 @@ class ImageAnalyzer:
         # Generate file hash for deduplication (before any processing)
         file_hash = hashlib.sha256(image_bytes).hexdigest()
 
-        # Normalize first (fix color space, strip EXIF, re-encode)
-        normalized_bytes, normalized_media_type = normalize_image_for_api(image_bytes, media_type)
+        # One off-loop decode yields the API copy and the embedding copy
+        if processed is None or processed.embed_image is None:
+            processed = await self.processor.process(image_bytes, media_type, embed=True)
 
-        # Then resize if needed for Anthropic API
-        resized_bytes, resized_media_type = resize_image_for_api(normalized_bytes, normalized_media_type)
+        # Get Claude vision analysis (with the API copy)
+        analysis = await self._get_vision_analysis(processed.api_bytes, processed.api_media_type)
 
-        # Get Claude vision analysis (with resized image)
-        analysis = await self._get_vision_analysis(resized_bytes, resized_media_type)
-
-        # Get Voyage multimodal embedding (use original for best quality, or resized if too large)
-        embedding = await self._get_embedding(image_bytes if len(image_bytes) <= 10_000_000 else resized_bytes)
+        # Get Voyage multimodal embedding (falls back to the API copy if undecodable)
+        embed_input = processed.embed_image if processed.embed_image is not None else processed.api_bytes
+        embedding = await self._get_embedding(embed_input)
 
         return AnalysisResult(
             description=analysis.get("description", "No description available"),
@@ -373,23 +222,27 @@ class ImageAnalyzer:
             file_hash=file_hash,
         )
 
-    async def moderate(self, image_bytes: bytes, media_type: str) -> ModerationResult:
+    async def moderate(
+        self,
+        image_bytes: bytes,
+        media_type: str,
+        processed: Optional[ProcessedImage] = None,
+    ) -> ModerationResult:
         """
         Check image for policy violations.
 
         Args:
             image_bytes: Raw image data
             media_type: MIME type
+            processed: Derivatives from ImageProcessor, if already built
 
         Returns:
             ModerationResult indicating safety status
         """
-        # Normalize first (fix color space, strip EXIF, re-encode)
-        normalized_bytes, normalized_media_type = normalize_image_for_api(image_bytes, media_type)
-
-        # Then resize if needed for Anthropic API
-        resized_bytes, resized_media_type = resize_image_for_api(normalized_bytes, normalized_media_type)
-        base64_image = base64.standard_b64encode(resized_bytes).decode("utf-8")
+        if processed is None:
+            processed = await self.processor.process(image_bytes, media_type)
+        resized_media_type = processed.api_media_type
+        base64_image = base64.standard_b64encode(processed.api_bytes).decode("utf-8")
 
         response = await self.anthropic.messages.create(
             model=self.config.vision_model,
@@ -451,27 +304,16 @@ class ImageAnalyzer:
 
         return self._parse_json_response(response.content[0].text)
 
-    async def _get_embedding(self, image_bytes: bytes) -> list[float]:
+    async def _get_embedding(self, image: Image.Image | bytes) -> list[float]:
         """
         Get Voyage multimodal embedding for the image.
 
-        Uses voyage-multimodal-3 which requires PIL Image objects.
-        Resizes to max 512px to reduce memory usage on constrained workers.
+        Uses voyage-multimodal-3 which requires PIL Image objects. Callers
+        pass ProcessedImage.embed_image, already downscaled off-loop to
+        EMBED_MAX_DIMENSION to reduce memory on constrained workers.
         """
-        MAX_EMBEDDING_DIMENSION = 512  # Reduce memory for embeddings
-
-        pil_image = None
+        pil_image = image if isinstance(image, Image.Image) else Image.open(io.BytesIO(image))
         try:
-            # Convert bytes to PIL Image
-            pil_image = Image.open(io.BytesIO(image_bytes))
-
-            # Resize if too large (reduces memory significantly)
-            if pil_image.width > MAX_EMBEDDING_DIMENSION or pil_image.height > MAX_EMBEDDING_DIMENSION:
-                ratio = min(MAX_EMBEDDING_DIMENSION / pil_image.width, MAX_EMBEDDING_DIMENSION / pil_image.height)
-                new_size = (int(pil_image.width * ratio), int(pil_image.height * ratio))
-                pil_image = pil_image.resize(new_size, Image.Resampling.LANCZOS)
-                logger.info(f"[EMBED] Resized image to {new_size} for embedding")
-
             result = await self.voyage.multimodal_embed(
                 inputs=[[pil_image]],
                 model=self.config.embedding_model,
@@ -480,8 +322,7 @@ class ImageAnalyzer:
             return result.embeddings[0]
         finally:
             # Explicitly close PIL image to free memory
-            if pil_image is not None:
-                pil_image.close()
+            pil_image.close()
 
     async def get_text_embedding(self, text: str, input_type: str = "document") -> list[float]:
         """
@@ -489,12 +330,9 @@ class ImageAnalyzer:
 
         Used for querying image observations by text description.
         """
-        result = await self.voyage.embed(
-            [text],
-            model="voyage-3.5-lite",
-            input_type=input_type,
+        return await self.embeddings.embed_one(
+            text, model="voyage-3.5-lite", input_type=input_type
         )
-        return result.embeddings[0]
 
     def _parse_json_response(self, response_text: str) -> dict:
         """Extract JSON from Claude response, handling markdown code blocks."""
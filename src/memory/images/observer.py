@@ -19,14 +19,20 @@
 Image Observer - Main entry point for image processing pipeline.
 
 Orchestrates:
-1. Content moderation (must pass before any storage)
-2. Image analysis (Claude vision + embeddings)
-3. Storage (DO Spaces)
-4. Clustering (build grouping)
+1. Duplicate detection (exact hash + perceptual hash, before any paid call)
+2. Content moderation (must pass before any storage)
+3. Image analysis (Claude vision + embeddings)
+4. Storage (DO Spaces)
+5. Clustering (build grouping)
 """
 
+import asyncio
 import gc
+import hashlib
+import json
 import logging
+import weakref
+from dataclasses import asdict
 from datetime import datetime
 from typing import Optional
 
@@ -34,10 +40,14 @@ import asyncpg
 import discord
 from anthropic import AsyncAnthropic
 
+from image_processing import ImageProcessor, get_image_processor
+
+from ..embeddings import EmbeddingService
 from ..privacy import PrivacyLevel, classify_channel_privacy
-from .analyzer import ImageAnalyzer, ImageAnalysisConfig, ModerationResult
+from .analyzer import AnalysisResult, ImageAnalyzer, ImageAnalysisConfig, ModerationResult
 from .clusterer import BuildClusterer, ClusterConfig
 from .narrator import BuildNarrator
+from .phash import BKTree, from_signed64, to_signed64
 from .storage import ImageStorage
 
 
@@ -55,12 +65,18 @@ MIME_TYPES = {
     "webp": "image/webp",
 }
 
+# Max dHash Hamming distance treated as the same picture (of 64 bits)
+NEAR_DUPLICATE_MAX_DISTANCE = 6
+
 
 class ImageObserver:
     """
     Main entry point for processing shared images.
 
-    Handles the full pipeline: moderation -> analysis -> storage -> clustering.
+    Handles the full pipeline: dedup -> moderation -> analysis -> storage -> clustering.
+    Exact and near-duplicate uploads reuse the stored analysis and embedding.
+    Only exact copies reuse the moderation verdict; near-duplicates are
+    moderated again, since a small edit can change what the picture shows.
     """
 
     def __init__(
@@ -72,25 +88,41 @@ class ImageObserver:
         clusterer: Optional[BuildClusterer] = None,
         narrator: Optional[BuildNarrator] = None,
         moderation_enabled: bool = True,
+        embeddings: Optional[EmbeddingService] = None,
+        near_duplicate_max_distance: int = NEAR_DUPLICATE_MAX_DISTANCE,
+        processor: Optional[ImageProcessor] = None,
     ):
         self.db = db_pool
         self.anthropic = anthropic_client
         self.storage = storage
         self.moderation_enabled = moderation_enabled
+        self.processor = processor or get_image_processor()
 
         # Initialize components
-        self.analyzer = analyzer or ImageAnalyzer(anthropic_client)
+        self.analyzer = analyzer or ImageAnalyzer(
+            anthropic_client, embeddings=embeddings, processor=self.processor
+        )
         self.clusterer = clusterer or BuildClusterer(db_pool)
         self.narrator = narrator or BuildNarrator(db_pool, anthropic_client)
 
         # Cache for mod channel lookups
         self._mod_channels: dict[int, Optional[int]] = {}
 
+        # Perceptual hash index: phash -> observation id (loaded lazily)
+        self.near_duplicate_max_distance = near_duplicate_max_distance
+        self._phash_index: Optional[BKTree[int]] = None
+        self._phash_available: Optional[bool] = None  # Cache for migration 021 check
+        self._phash_lock = asyncio.Lock()
+
+        # Per-user locks serializing observation insert + clustering
+        self._user_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+
     async def handle_image(
         self,
         message: discord.Message,
         attachment: discord.Attachment,
         bot: Optional[discord.Client] = None,
+        image_bytes: Optional[bytes] = None,
     ) -> Optional[int]:
         """
         Process an image attachment.
@@ -99,6 +131,7 @@ class ImageObserver:
             message: Discord message containing the image
             attachment: The image attachment
             bot: Discord bot client (for moderation notifications)
+            image_bytes: Already-downloaded attachment data, if shared
 
         Returns:
             observation_id if stored, None if rejected/moderated
@@ -110,22 +143,45 @@ class ImageObserver:
             logger.warning(f"[OBSERVER] Unsupported format: {attachment.filename}")
             return None
 
-        # Download image
-        logger.info(f"[OBSERVER] Downloading image from Discord (size={attachment.size} bytes)...")
-        try:
-            image_bytes = await attachment.read()
-            logger.info(f"[OBSERVER] Downloaded {len(image_bytes)} bytes successfully")
-        except discord.HTTPException as e:
-            logger.error(f"[OBSERVER] Failed to download image: {e}")
-            return None
+        # Download image (unless the caller shares an existing download)
+        if image_bytes is None:
+            logger.info(f"[OBSERVER] Downloading image from Discord (size={attachment.size} bytes)...")
+            try:
+                image_bytes = await attachment.read()
+                logger.info(f"[OBSERVER] Downloaded {len(image_bytes)} bytes successfully")
+            except discord.HTTPException as e:
+                logger.error(f"[OBSERVER] Failed to download image: {e}")
+                return None
 
         media_type = self._get_media_type(attachment.filename)
         logger.info(f"[OBSERVER] Media type: {media_type}")
 
-        # STEP 1: Content moderation (MUST happen first)
-        if self.moderation_enabled:
-            logger.info(f"[OBSERVER] Step 1: Running content moderation...")
-            moderation = await self.analyzer.moderate(image_bytes, media_type)
+        # STEP 1: Duplicate detection (free; must precede every paid call)
+        file_hash = hashlib.sha256(image_bytes).hexdigest()
+        existing = await self._check_duplicate(file_hash, message.author.id)
+        if existing:
+            logger.info(f"[OBSERVER] Exact re-upload of observation {existing}, skipping")
+            return existing
+
+        # One off-loop decode: perceptual hash, API copy and embedding copy
+        processed = await self.processor.process(
+            image_bytes, media_type, embed=True, phash=True
+        )
+        phash = processed.phash
+        guild_id = message.guild.id if message.guild else None
+        reused = await self._find_reusable_observation(
+            file_hash, phash, message.author.id, guild_id
+        )
+
+        # STEP 2: Content moderation (MUST happen before storage)
+        moderation = None
+        if reused and reused["exact_match"]:
+            moderation = self._stored_moderation(reused)
+        if moderation is None and self.moderation_enabled:
+            logger.info(f"[OBSERVER] Step 2: Running content moderation...")
+            moderation = await self.analyzer.moderate(image_bytes, media_type, processed)
+
+        if moderation:
             logger.info(f"[OBSERVER] Moderation result: safe={moderation.is_safe}, confidence={moderation.confidence}, type={moderation.violation_type}")
 
             if not moderation.is_safe:
@@ -140,20 +196,14 @@ class ImageObserver:
                     await self._flag_for_review(message, moderation, bot=bot)
                     # Continue processing...
 
-        # STEP 2: Check for duplicate
-        file_hash = None  # Will be set by analysis
-
-        # STEP 3: Full analysis (description, tags, embedding)
-        logger.info(f"[OBSERVER] Step 3: Running full analysis (Claude Vision + Voyage embedding)...")
-        analysis = await self.analyzer.analyze(image_bytes, media_type)
-        file_hash = analysis.file_hash
+        # STEP 3: Full analysis (description, tags, embedding), or reuse
+        if reused:
+            analysis = self._stored_analysis(reused, file_hash)
+        else:
+            logger.info(f"[OBSERVER] Step 3: Running full analysis (Claude Vision + Voyage embedding)...")
+            analysis = await self.analyzer.analyze(image_bytes, media_type, processed)
         logger.info(f"[OBSERVER] Analysis complete: type={analysis.observation_type}, tags={analysis.tags[:3] if analysis.tags else []}, embedding_dims={len(analysis.embedding)}")
 
-        # Check for existing observation with same hash
-        existing = await self._check_duplicate(file_hash, message.author.id)
-        if existing:
-            return existing
-
         # STEP 4: Upload to storage
         logger.info(f"[OBSERVER] Step 4: Uploading to DO Spaces...")
         storage_key, storage_url = await self.storage.upload(
@@ -161,6 +211,28 @@ class ImageObserver:
         )
         logger.info(f"[OBSERVER] Uploaded: key={storage_key}")
 
+        # Steps 5-7 are serialized per user so images from one message,
+        # processed in parallel, don't race each other into new clusters
+        async with self._user_lock(message.author.id):
+            return await self._store_observation(
+                message, attachment, image_bytes, file_hash, media_type,
+                storage_key, storage_url, analysis, phash, moderation,
+            )
+
+    async def _store_observation(
+        self,
+        message: discord.Message,
+        attachment: discord.Attachment,
+        image_bytes: bytes,
+        file_hash: str,
+        media_type: str,
+        storage_key: str,
+        storage_url: str,
+        analysis: AnalysisResult,
+        phash: Optional[int],
+        moderation: Optional[ModerationResult],
+    ) -> int:
+        """Insert the observation and assign it to a build cluster."""
         # STEP 5: Get privacy level
         privacy_level = await classify_channel_privacy(message.channel)
         guild_id = message.guild.id if message.guild else None
@@ -189,9 +261,13 @@ class ImageObserver:
             privacy_level=privacy_level,
             accompanying_text=message.content if message.content else None,
             captured_at=message.created_at,
+            phash=phash,
+            moderation=moderation,
         )
 
         logger.info(f"[OBSERVER] Inserted observation_id={observation_id}")
+        if phash is not None and self._phash_index is not None:
+            self._phash_index.add(phash, observation_id)
         
         # STEP 7: Assign to cluster
         logger.info(f"[OBSERVER] Step 7: Assigning to cluster...")
@@ -214,6 +290,14 @@ class ImageObserver:
 
         return observation_id
 
+    def _user_lock(self, user_id: int) -> asyncio.Lock:
+        """Lock for one user's observation writes (dropped when unused)."""
+        lock = self._user_locks.get(user_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._user_locks[user_id] = lock
+        return lock
+
     async def _check_duplicate(
         self,
         file_hash: str,
@@ -227,6 +311,125 @@ class ImageObserver:
         )
         return row["id"] if row else None
 
+    async def _has_phash_columns(self) -> bool:
+        """True when image_observations has phash/moderation (migration 021)."""
+        if self._phash_available is None:
+            try:
+                self._phash_available = bool(await self.db.fetchval(
+                    """
+                    SELECT EXISTS (
+                        SELECT 1 FROM information_schema.columns
+                        WHERE table_name = 'image_observations' AND column_name = 'phash'
+                    )
+                    """
+                ))
+            except Exception as e:
+                logger.warning(f"[OBSERVER] phash schema check failed: {e}")
+                self._phash_available = False
+        return self._phash_available
+
+    async def _get_phash_index(self) -> Optional[BKTree[int]]:
+        """Load the perceptual hash index on first use."""
+        if self._phash_index is not None:
+            return self._phash_index
+        if not await self._has_phash_columns():
+            return None
+
+        async with self._phash_lock:
+            if self._phash_index is None:
+                rows = await self.db.fetch(
+                    "SELECT id, phash FROM image_observations WHERE phash IS NOT NULL"
+                )
+                index: BKTree[int] = BKTree()
+                for row in rows:
+                    index.add(from_signed64(row["phash"]), row["id"])
+                self._phash_index = index
+                logger.info(f"[OBSERVER] Loaded perceptual hash index ({len(index)} observations)")
+        return self._phash_index
+
+    async def _find_reusable_observation(
+        self,
+        file_hash: str,
+        phash: Optional[int],
+        user_id: int,
+        guild_id: Optional[int],
+    ) -> Optional[dict]:
+        """
+        Find a stored observation of the same picture the uploader may see.
+
+        Candidates are the uploader's own observations, guild-public ones
+        from the same guild, and global ones, so a description never crosses
+        privacy levels. Matches the exact file hash first, then the nearest
+        perceptual hash within `near_duplicate_max_distance`. The new upload
+        still gets its own observation row with the uploader's privacy level.
+
+        Returns:
+            Observation row (with `exact_match`) or None
+        """
+        index = await self._get_phash_index()
+        if index is None:
+            return None
+
+        near_ids = []
+        if phash is not None:
+            near_ids = [
+                obs_id for _, obs_id in index.search(phash, self.near_duplicate_max_distance)
+            ]
+
+        row = await self.db.fetchrow(
+            """
+            SELECT id, description, summary, tags, detected_elements,
+                   embedding::text AS embedding, observation_type, moderation,
+                   file_hash = $1 AS exact_match
+            FROM image_observations
+            WHERE (file_hash = $1 OR id = ANY($2::int[]))
+              AND (
+                  user_id = $3
+                  OR privacy_level = 'global'
+                  OR (privacy_level = 'guild_public' AND guild_id = $4)
+              )
+            ORDER BY file_hash = $1 DESC, array_position($2::int[], id)
+            LIMIT 1
+            """,
+            file_hash,
+            near_ids,
+            user_id,
+            guild_id,
+        )
+        if row:
+            logger.info(f"[OBSERVER] Reusing analysis of near-duplicate observation {row['id']}")
+        return dict(row) if row else None
+
+    @staticmethod
+    def _stored_moderation(row: dict) -> Optional[ModerationResult]:
+        """Rebuild the moderation verdict of an exact copy (None = moderate again)."""
+        verdict = row.get("moderation")
+        if isinstance(verdict, str):
+            verdict = json.loads(verdict)
+        if not verdict:
+            return None  # Stored without a verdict; nothing to trust
+        return ModerationResult(
+            is_safe=verdict.get("is_safe", True),
+            confidence=verdict.get("confidence", 0.0),
+            flags=verdict.get("flags", []),
+            violation_type=verdict.get("violation_type"),
+            description=verdict.get("description", ""),
+        )
+
+    @staticmethod
+    def _stored_analysis(row: dict, file_hash: str) -> AnalysisResult:
+        """Rebuild the analysis of a reused observation for a new upload."""
+        detected = row["detected_elements"]
+        return AnalysisResult(
+            description=row["description"],
+            summary=row["summary"],
+            tags=list(row["tags"] or []),
+            detected_elements=json.loads(detected) if isinstance(detected, str) else (detected or {}),
+            observation_type=row["observation_type"],
+            embedding=json.loads(row["embedding"]),
+            file_hash=file_hash,
+        )
+
     async def _insert_observation(
         self,
         user_id: int,
@@ -248,25 +451,34 @@ class ImageObserver:
         privacy_level: PrivacyLevel,
         accompanying_text: Optional[str],
         captured_at: datetime,
+        phash: Optional[int] = None,
+        moderation: Optional[ModerationResult] = None,
     ) -> int:
         """Insert a new image observation record."""
-        import json
-
         # Convert embedding list to pgvector string format
         embedding_str = '[' + ','.join(str(x) for x in embedding) + ']'
-        
+
+        # phash/moderation columns exist from migration 021
+        extra_columns, extra_values, extra_args = "", "", []
+        if await self._has_phash_columns():
+            extra_columns, extra_values = ", phash, moderation", ", $20, $21::jsonb"
+            extra_args = [
+                to_signed64(phash) if phash is not None else None,
+                json.dumps(asdict(moderation)) if moderation else None,
+            ]
+
         row = await self.db.fetchrow(
-            """
+            f"""
             INSERT INTO image_observations (
                 user_id, message_id, channel_id, guild_id,
                 storage_key, storage_url, original_url, file_hash,
                 file_size_bytes, dimensions,
                 description, summary, tags, detected_elements,
                 embedding, observation_type, privacy_level,
-                accompanying_text, captured_at
+                accompanying_text, captured_at{extra_columns}
             ) VALUES (
                 $1, $2, $3, $4, $5, $6, $7, $8, $9, $10,
-                $11, $12, $13, $14, $15, $16, $17, $18, $19
+                $11, $12, $13, $14, $15, $16, $17, $18, $19{extra_values}
             )
             RETURNING id
             """,
@@ -289,6 +501,7 @@ class ImageObserver:
             privacy_level.value,
             accompanying_text,
             captured_at,
+            *extra_args,
         )
 
         return row["id"]
@@ -0,0 +1,101 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Commercial licensing: [slashdaemon@protonmail.com]
+
+"""
+Perceptual hashing for near-duplicate image detection.
+
+A 64-bit difference hash (dHash) survives re-encoding, rescaling, light
+compression and small crops, so re-posted screenshots land within a few
+bits of the original. Hashes come from image_processing.dhash_image, run
+off the event loop by ImageProcessor.process(..., phash=True), and are
+indexed in a BK-tree for Hamming-radius lookups without scanning every
+stored observation.
+"""
+
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return (a ^ b).bit_count()
+
+
+def to_signed64(value: int) -> int:
+    """Map an unsigned 64-bit hash into Postgres BIGINT range."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def from_signed64(value: int) -> int:
+    """Inverse of to_signed64."""
+    return value + (1 << 64) if value < 0 else value
+
+
+class BKTree(Generic[T]):
+    """Burkhard-Keller tree over 64-bit hashes with Hamming distance."""
+
+    def __init__(self):
+        self._root: Optional[tuple[int, list[T], dict[int, tuple]]] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value: int, item: T) -> None:
+        """Insert an item under a hash. Equal hashes share one node."""
+        self._size += 1
+        if self._root is None:
+            self._root = (value, [item], {})
+            return
+
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (value, [item], {})
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> list[tuple[int, T]]:
+        """
+        Find items within a Hamming radius.
+
+        Returns:
+            (distance, item) pairs, nearest first
+        """
+        if self._root is None:
+            return []
+
+        matches: list[tuple[int, T]] = []
+        stack = [self._root]
+        while stack:
+            node_value, items, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= max_distance:
+                matches.extend((distance, item) for item in items)
+            # Triangle inequality: only subtrees in [d - r, d + r] can match
+            for edge, child in children.items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+
+        matches.sort(key=lambda match: match[0])
+        return matches
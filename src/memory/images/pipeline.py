@@ -0,0 +1,167 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Commercial licensing: [slashdaemon@protonmail.com]
+
+"""
+Image Observation Pipeline - background processing of shared images.
+
+Takes image observation (moderation, vision analysis, storage, clustering)
+off the on_message path so chat replies start immediately:
+
+- Each guild (and DMs, as guild 0) has a bounded FIFO queue drained by its
+  own worker, so one busy server cannot starve the others. When a queue is
+  full, new messages are dropped with a warning instead of piling up.
+- A global semaphore caps how many images are processed at once across all
+  guilds (each one costs Claude vision calls and memory).
+- The attachments of one message are processed in parallel, within that cap.
+- Downloads are shared with chat handling via AttachmentDownloads.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import discord
+
+from utils.attachments import AttachmentDownloads
+
+from ..config import ImageMemoryConfig
+from .observer import ImageObserver, SUPPORTED_FORMATS
+
+logger = logging.getLogger("slashAI.images")
+
+
+class ImageObservationPipeline:
+    """Per-guild queues feeding ImageObserver under a global concurrency cap."""
+
+    def __init__(
+        self,
+        observer: ImageObserver,
+        bot: Optional[discord.Client] = None,
+        config: Optional[ImageMemoryConfig] = None,
+    ):
+        self.observer = observer
+        self.bot = bot
+        self.config = config or ImageMemoryConfig.from_env()
+        self._semaphore = asyncio.Semaphore(max(1, self.config.observation_concurrency))
+        self._queues: dict[int, asyncio.Queue] = {}
+        self._workers: dict[int, asyncio.Task] = {}
+        self._stats = {"queued": 0, "dropped": 0, "stored": 0, "skipped": 0, "failed": 0}
+
+    def submit(
+        self,
+        message: discord.Message,
+        downloads: Optional[AttachmentDownloads] = None,
+    ) -> bool:
+        """
+        Queue a message's image attachments for observation. Never blocks.
+
+        Args:
+            message: Message with attachments
+            downloads: Download memo shared with chat handling for this message
+
+        Returns:
+            True if queued, False if it had no images or the guild queue is full
+        """
+        attachments = [a for a in message.attachments if _is_supported_image(a.filename)]
+        if not attachments:
+            return False
+
+        guild_key = message.guild.id if message.guild else 0
+        queue = self._queues.get(guild_key)
+        if queue is None:
+            queue = asyncio.Queue(maxsize=self.config.observation_queue_size)
+            self._queues[guild_key] = queue
+        try:
+            queue.put_nowait((message, attachments, downloads or AttachmentDownloads()))
+        except asyncio.QueueFull:
+            self._stats["dropped"] += 1
+            logger.warning(
+                f"[IMAGE] Observation queue full for guild {guild_key}; "
+                f"dropping {len(attachments)} image(s) from message {message.id}"
+            )
+            return False
+
+        self._stats["queued"] += 1
+        worker = self._workers.get(guild_key)
+        if worker is None or worker.done():
+            self._workers[guild_key] = asyncio.create_task(self._drain(guild_key, queue))
+        return True
+
+    async def _drain(self, guild_key: int, queue: asyncio.Queue) -> None:
+        """Process one guild's queue in order; exits when it is empty."""
+        while not queue.empty():
+            message, attachments, downloads = queue.get_nowait()
+            try:
+                await asyncio.gather(
+                    *(self._observe(message, attachment, downloads) for attachment in attachments)
+                )
+            finally:
+                queue.task_done()
+
+    async def _observe(
+        self,
+        message: discord.Message,
+        attachment: discord.Attachment,
+        downloads: AttachmentDownloads,
+    ) -> None:
+        """Observe one attachment under the global concurrency cap."""
+        async with self._semaphore:
+            try:
+                image_bytes = await downloads.read(attachment)
+                observation_id = await self.observer.handle_image(
+                    message, attachment, bot=self.bot, image_bytes=image_bytes
+                )
+            except Exception as e:
+                self._stats["failed"] += 1
+                logger.error(
+                    f"[IMAGE] FAILED to process image from {message.author.id}: {e}",
+                    exc_info=True,
+                )
+                return
+
+        if observation_id:
+            self._stats["stored"] += 1
+            logger.info(f"[IMAGE] Stored observation {observation_id} for user {message.author.id}")
+        else:
+            self._stats["skipped"] += 1
+            logger.info(f"[IMAGE] {attachment.filename} not stored (rejected/moderated)")
+
+    async def join(self) -> None:
+        """Wait until every queued message has been processed."""
+        for queue in list(self._queues.values()):
+            await queue.join()
+
+    def stats(self) -> dict:
+        """Counters plus current backlog per guild."""
+        return {
+            **self._stats,
+            "backlog": {guild: q.qsize() for guild, q in self._queues.items() if q.qsize()},
+        }
+
+    async def close(self) -> None:
+        """Cancel workers. Queued images are dropped."""
+        for task in self._workers.values():
+            task.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers.clear()
+
+
+def _is_supported_image(filename: Optional[str]) -> bool:
+    """Check if file extension is a supported image format."""
+    if not filename or "." not in filename:
+        return False
+    return filename.rsplit(".", 1)[-1].lower() in SUPPORTED_FORMATS
@@ -30,7 +30,6 @@ from typing import Optional
 
 import asyncpg
 import discord
-import voyageai
 from anthropic import AsyncAnthropic
 
 from analytics import track
@@ -39,8 +38,10 @@ logger = logging.getLogger("slashAI.memory")
 
 from .config import MemoryConfig, ImageMemoryConfig
 from .expander import expand_query
+from .extraction_queue import ExtractionQueue
 from .extractor import MemoryExtractor
 from .privacy import PrivacyLevel, classify_channel_privacy
+from .reactions.store import insert_memory_links
 from .retriever import MemoryRetriever, RetrievedMemory
 from .updater import MemoryUpdater
 
@@ -87,12 +88,24 @@ class MemoryManager:
         )
         self.db = db_pool
         self._anthropic = anthropic_client
-        self._voyage = voyageai.AsyncClient()  # For image embeddings
+        self.embeddings = self.retriever.embeddings  # Shared embedding cache
+        self.extraction_queue = ExtractionQueue(
+            db_pool, self._process_extraction_job, self.config
+        )
 
         # Image memory components (lazy initialized)
         self._image_observer = None
         self._build_narrator = None
 
+    async def warm_embedding_cache(self) -> None:
+        """Pre-embed the fixed expansion sub-queries so expanded retrievals only embed the user's query."""
+        if not self.config.expansion_enabled:
+            return
+        try:
+            await self.retriever.warm_expansion_embeddings()
+        except Exception as e:
+            logger.warning(f"Failed to warm embedding cache: {e}")
+
     async def retrieve(
         self, user_id: int, query: str, channel: discord.abc.Messageable,
         agent_id: Optional[str] = None,
@@ -397,6 +410,8 @@ class MemoryManager:
             )
 
             if memory_id:
+                self.retriever.invalidate_user(author_id)
+
                 # Create memory-message link
                 await self.db.execute(
                     """
@@ -533,6 +548,8 @@ class MemoryManager:
                 )
 
             if memory_id:
+                self.retriever.invalidate_user(reactor_id)
+
                 # Create memory-message link
                 await self.db.execute(
                     """
@@ -629,11 +646,9 @@ class MemoryManager:
         # Embed query using multimodal model (same as image embeddings)
         # Note: Must use multimodal_embed() with text input, not embed()
         # voyage-multimodal-3 embeds both images and text in the same space
-        result = await self._voyage.multimodal_embed(
-            inputs=[[query]],  # Text wrapped in list for multimodal API
-            model=self.image_config.image_embedding_model,
+        (embedding,) = await self.embeddings.embed_multimodal_text(
+            [query], model=self.image_config.image_embedding_model
         )
-        embedding = result.embeddings[0]
         embedding_str = "[" + ",".join(str(x) for x in embedding) + "]"
 
         # Build privacy-filtered query
@@ -729,77 +744,82 @@ class MemoryManager:
 
         logger.info(f"Tracking message for user={user_id}, channel={channel_id}, privacy={channel_privacy.value}")
 
-        session = await self._get_or_create_session(
-            user_id, channel_id, guild_id, channel_privacy
-        )
-
-        # Append new messages to session
-        # Handle both list (correct) and string (legacy double-encoded) formats
-        raw_messages = session["messages"]
-        if isinstance(raw_messages, str):
-            messages = json.loads(raw_messages) if raw_messages else []
-        else:
-            messages = raw_messages or []
         # Include message IDs for reaction linking (v0.12.0)
-        messages.append({
-            "role": "user",
-            "content": user_message,
-            "message_id": user_message_id,
-        })
-        messages.append({
-            "role": "assistant",
-            "content": assistant_message,
-            "message_id": assistant_message_id,
-        })
-
-        await self.db.execute(
-            """UPDATE memory_sessions SET messages = $1::jsonb, message_count = message_count + 2,
-               last_activity_at = NOW() WHERE user_id = $2 AND channel_id = $3""",
-            json.dumps(messages),
-            user_id,
-            channel_id,
+        new_messages = [
+            {"role": "user", "content": user_message, "message_id": user_message_id},
+            {"role": "assistant", "content": assistant_message, "message_id": assistant_message_id},
+        ]
+
+        # One constant-size round-trip: create the session or append with
+        # jsonb ||, returning the new length. Legacy sessions whose messages
+        # were double-encoded as a JSON string are unwrapped on the way.
+        queue_available = await self.extraction_queue.is_available()
+        # Record the owning agent so inactivity-triggered jobs can use it
+        agent_column = ", agent_id" if queue_available else ""
+        agent_value = ", $6" if queue_available else ""
+        agent_update = (
+            ", agent_id = COALESCE(EXCLUDED.agent_id, memory_sessions.agent_id)"
+            if queue_available else ""
+        )
+        params = [
+            user_id, channel_id, guild_id, channel_privacy.value, json.dumps(new_messages),
+        ]
+        if queue_available:
+            params.append(agent_id)
+        message_total = await self.db.fetchval(
+            f"""
+            INSERT INTO memory_sessions
+                (user_id, channel_id, guild_id, channel_privacy_level, messages, message_count{agent_column})
+            VALUES ($1, $2, $3, $4, $5::jsonb, 2{agent_value})
+            ON CONFLICT (user_id, channel_id) DO UPDATE SET
+                messages = (
+                    CASE jsonb_typeof(memory_sessions.messages)
+                        WHEN 'array' THEN memory_sessions.messages
+                        WHEN 'string' THEN (memory_sessions.messages #>> '{{}}')::jsonb
+                        ELSE '[]'::jsonb
+                    END
+                ) || EXCLUDED.messages,
+                message_count = memory_sessions.message_count + 2,
+                last_activity_at = NOW(){agent_update}
+            RETURNING jsonb_array_length(messages)
+            """,
+            *params,
         )
 
-        msg_count = len(messages) // 2
+        msg_count = message_total // 2
         threshold = self.config.extraction_message_threshold
         logger.info(f"Session has {msg_count}/{threshold} message exchanges")
 
         # Check if we should trigger extraction
         # Threshold is per-message, but we store pairs, so multiply by 2
-        if len(messages) >= self.config.extraction_message_threshold * 2:
-            logger.info(f"Threshold reached, triggering extraction for user={user_id}")
-            await self._trigger_extraction(user_id, channel_id, channel, messages, agent_id=agent_id)
-
-    async def _get_or_create_session(
-        self,
-        user_id: int,
-        channel_id: int,
-        guild_id: Optional[int],
-        channel_privacy: PrivacyLevel,
-    ) -> dict:
-        """Get or create a session for tracking messages."""
-        session = await self.db.fetchrow(
-            "SELECT * FROM memory_sessions WHERE user_id = $1 AND channel_id = $2",
+        if message_total >= self.config.extraction_message_threshold * 2:
+            if queue_available:
+                # Only enqueue here; the extraction worker does the Claude/Voyage work
+                if await self.extraction_queue.enqueue(user_id, channel_id):
+                    logger.info(f"Threshold reached, queued extraction for user={user_id}")
+            else:
+                logger.info(f"Threshold reached, triggering extraction for user={user_id}")
+                messages = await self._get_session_messages(user_id, channel_id)
+                await self._trigger_extraction(user_id, channel_id, channel, messages, agent_id=agent_id)
+
+    async def _get_session_messages(self, user_id: int, channel_id: int) -> list[dict]:
+        """Read a session's pending message window in one query."""
+        raw_messages = await self.db.fetchval(
+            "SELECT messages FROM memory_sessions WHERE user_id = $1 AND channel_id = $2",
             user_id,
             channel_id,
         )
+        return self._decode_session_messages(raw_messages)
 
-        if not session:
-            await self.db.execute(
-                """INSERT INTO memory_sessions (user_id, channel_id, guild_id, channel_privacy_level)
-                   VALUES ($1, $2, $3, $4)""",
-                user_id,
-                channel_id,
-                guild_id,
-                channel_privacy.value,
-            )
-            session = await self.db.fetchrow(
-                "SELECT * FROM memory_sessions WHERE user_id = $1 AND channel_id = $2",
-                user_id,
-                channel_id,
-            )
-
-        return dict(session)
+    @staticmethod
+    def _decode_session_messages(raw_messages) -> list[dict]:
+        """Handle both list (correct) and string (legacy double-encoded) formats."""
+        if isinstance(raw_messages, str):
+            raw_messages = json.loads(raw_messages) if raw_messages else []
+            # Legacy rows stored the array as a JSON string inside JSONB
+            if isinstance(raw_messages, str):
+                raw_messages = json.loads(raw_messages) if raw_messages else []
+        return raw_messages or []
 
     async def _trigger_extraction(
         self,
@@ -809,11 +829,56 @@ class MemoryManager:
         messages: list[dict],
         agent_id: Optional[str] = None,
     ):
-        """Extract memories from accumulated messages."""
+        """Extract memories inline (fallback when the extraction queue is unavailable)."""
         guild = getattr(channel, "guild", None)
         guild_id = guild.id if guild else None
         channel_privacy = await classify_channel_privacy(channel)
+        try:
+            await self._extract_session_messages(
+                user_id, channel_id, guild_id, channel_privacy, messages, agent_id=agent_id
+            )
+        except Exception:
+            pass  # Logged and tracked; session kept so the next threshold retries
+
+    async def _process_extraction_job(self, user_id: int, channel_id: int) -> None:
+        """
+        Run one queued extraction job (called by the ExtractionQueue worker).
+
+        Reads the session as it is now, so messages tracked after the job was
+        enqueued are included. Raises on failure so the queue can retry.
+        """
+        session = await self.db.fetchrow(
+            """SELECT guild_id, channel_privacy_level, agent_id, messages
+               FROM memory_sessions WHERE user_id = $1 AND channel_id = $2""",
+            user_id,
+            channel_id,
+        )
+        if not session:
+            return
+
+        messages = self._decode_session_messages(session["messages"])
+        if not messages:
+            return
+
+        await self._extract_session_messages(
+            user_id,
+            channel_id,
+            session["guild_id"],
+            PrivacyLevel(session["channel_privacy_level"]),
+            messages,
+            agent_id=session["agent_id"],
+        )
 
+    async def _extract_session_messages(
+        self,
+        user_id: int,
+        channel_id: int,
+        guild_id: Optional[int],
+        channel_privacy: PrivacyLevel,
+        messages: list[dict],
+        agent_id: Optional[str] = None,
+    ) -> None:
+        """Extract memories from accumulated messages, then drop them from the session."""
         # Analytics: Track extraction triggered
         track(
             "extraction_triggered",
@@ -832,8 +897,8 @@ class MemoryManager:
             reaction_context = await self._get_reaction_context_for_messages(messages)
 
             logger.info(f"Extracting memories from {len(messages)} messages")
-            extracted_with_privacy = await self.extractor.extract_with_privacy(
-                messages, channel, reaction_context=reaction_context
+            extracted_with_privacy = await self.extractor.extract_for_channel_privacy(
+                messages, channel_privacy, reaction_context=reaction_context
             )
             logger.info(f"Extracted {len(extracted_with_privacy)} memory topics")
 
@@ -844,18 +909,20 @@ class MemoryManager:
                 if m.get("message_id") is not None
             ]
 
-            for memory, privacy_level in extracted_with_privacy:
-                logger.info(f"Storing memory: [{privacy_level.value}] {memory.summary[:50]}...")
-                memory_id = await self.updater.update(
-                    user_id, memory, privacy_level, channel_id, guild_id,
-                    agent_id=agent_id,
+            # Embed, match, merge and write all topics as one batch
+            memory_ids = await self.updater.update_many(
+                user_id, extracted_with_privacy, channel_id, guild_id,
+                agent_id=agent_id,
+            )
+
+            # Link memories to source messages for reaction aggregation (v0.12.0)
+            if message_ids:
+                await self._create_memory_message_links(
+                    memory_ids, message_ids, channel_id
                 )
 
-                # Link memory to source messages for reaction aggregation (v0.12.0)
-                if message_ids:
-                    await self._create_memory_message_links(
-                        memory_id, message_ids, channel_id
-                    )
+            for (memory, privacy_level), memory_id in zip(extracted_with_privacy, memory_ids):
+                logger.info(f"Stored memory {memory_id}: [{privacy_level.value}] {memory.summary[:50]}...")
 
                 # Analytics: Track memory created
                 track(
@@ -872,12 +939,21 @@ class MemoryManager:
                     },
                 )
 
-            # Reset session after extraction
+            # Drop the extracted messages from the session. Only the first
+            # len(messages) entries are removed, so anything tracked while
+            # extraction was running stays for the next run.
             await self.db.execute(
-                """UPDATE memory_sessions SET extracted_at = NOW(), messages = '[]'::jsonb,
-                   message_count = 0 WHERE user_id = $1 AND channel_id = $2""",
+                """UPDATE memory_sessions SET extracted_at = NOW(),
+                   messages = COALESCE(
+                       (SELECT jsonb_agg(m ORDER BY i)
+                        FROM jsonb_array_elements(messages) WITH ORDINALITY AS t(m, i)
+                        WHERE i > $3),
+                       '[]'::jsonb),
+                   message_count = GREATEST(message_count - $3, 0)
+                   WHERE user_id = $1 AND channel_id = $2""",
                 user_id,
                 channel_id,
+                len(messages),
             )
             logger.info(f"Session reset for user={user_id}, channel={channel_id}")
         except Exception as e:
@@ -894,7 +970,7 @@ class MemoryManager:
                     "message_count": len(messages),
                 },
             )
-            # Don't reset session on failure - will retry next threshold
+            raise
 
     async def _get_reaction_context_for_messages(
         self,
@@ -970,38 +1046,33 @@ class MemoryManager:
 
     async def _create_memory_message_links(
         self,
-        memory_id: int,
+        memory_ids: list[int],
         message_ids: list[int],
         channel_id: int,
     ) -> None:
         """
-        Create links between a memory and its source messages.
+        Create links between memories and their source messages.
 
         This enables reaction aggregation - reactions on these messages
         will contribute to the memory's confidence/decay calculations.
+        All links for an extraction are written in one statement.
 
         Args:
-            memory_id: Memory ID
-            message_ids: List of Discord message IDs that contributed to this memory
+            memory_ids: Memory IDs created or merged by the extraction
+            message_ids: List of Discord message IDs that contributed to these memories
             channel_id: Discord channel ID
         """
-        if not message_ids:
+        if not memory_ids or not message_ids:
             return
 
+        links = [
+            (memory_id, msg_id, channel_id, "source")
+            for memory_id in dict.fromkeys(memory_ids)
+            for msg_id in message_ids
+        ]
         try:
-            # Use executemany for efficiency
-            for msg_id in message_ids:
-                await self.db.execute(
-                    """
-                    INSERT INTO memory_message_links (memory_id, message_id, channel_id, contribution_type)
-                    VALUES ($1, $2, $3, 'source')
-                    ON CONFLICT (memory_id, message_id) DO NOTHING
-                    """,
-                    memory_id,
-                    msg_id,
-                    channel_id,
-                )
-            logger.debug(f"Linked memory {memory_id} to {len(message_ids)} messages")
+            created = await insert_memory_links(self.db, links)
+            logger.debug(f"Linked {len(set(memory_ids))} memories to {len(message_ids)} messages ({created} new links)")
         except Exception as e:
             # Log but don't fail - linking is optional enhancement
             logger.warning(f"Failed to create memory-message links: {e}")
@@ -1250,6 +1321,7 @@ class MemoryManager:
 
         deleted = result == "DELETE 1"
         if deleted:
+            self.retriever.note_memory_removed(user_id, memory_id)
             logger.info(f"Deleted memory={memory_id} for user={user_id}: {memory['topic_summary'][:50]}...")
         return deleted
 
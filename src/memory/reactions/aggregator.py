@@ -12,12 +12,15 @@ updating memory metadata with reaction summaries and confidence boosts.
 
 Part of v0.12.0 - Reaction-Based Memory Signals.
 Updated in v0.12.6 - Memory Type Promotion.
+
+Aggregation is incremental and set-based: only memories queued in
+memory_reaction_dirty are revisited, and each batch is summarised,
+written and promotion-checked in a constant number of statements.
 """
 
 import json
 import logging
 import math
-from collections import Counter
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -29,6 +32,88 @@ from memory.config import MemoryConfig
 
 logger = logging.getLogger(__name__)
 
+# Memories aggregated per transaction; run_aggregation loops until the queue drains
+AGGREGATION_BATCH_SIZE = 2000
+# Newly-linked sweep re-scans this much before the previous run's start
+LINK_SWEEP_OVERLAP = timedelta(minutes=1)
+
+# Batch sources for _AGGREGATE_SQL; both take a single $1 parameter
+_CLAIM_DIRTY_SQL = """
+    DELETE FROM memory_reaction_dirty
+    WHERE memory_id IN (
+        SELECT memory_id FROM memory_reaction_dirty
+        ORDER BY queued_at
+        LIMIT $1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING memory_id
+"""
+_EXPLICIT_IDS_SQL = "SELECT DISTINCT unnest($1::int[]) AS memory_id"
+
+# Per-memory reaction statistics for a whole batch in one pass. Memories
+# without active reactions come back with total_reactions = 0.
+_AGGREGATE_SQL = """
+    WITH batch AS ({source}),
+    active AS (
+        SELECT l.memory_id, r.emoji, r.sentiment, r.intensity, r.intent, r.reactor_id
+        FROM batch b
+        JOIN memory_message_links l ON l.memory_id = b.memory_id
+        JOIN message_reactions r ON r.message_id = l.message_id AND r.removed_at IS NULL
+    ),
+    totals AS (
+        SELECT memory_id,
+               COUNT(*) AS total_reactions,
+               COUNT(DISTINCT reactor_id) AS unique_reactors,
+               COUNT(sentiment) AS sentiment_count,
+               SUM(sentiment * intensity) AS weighted_sentiment_sum,
+               SUM(intensity) FILTER (WHERE sentiment IS NOT NULL) AS weight_sum,
+               AVG(intensity) AS avg_intensity,
+               COUNT(*) FILTER (WHERE sentiment > 0.3) AS positive_count,
+               COUNT(*) FILTER (WHERE sentiment < -0.3) AS negative_count
+        FROM active
+        GROUP BY memory_id
+    ),
+    intents AS (
+        SELECT memory_id, jsonb_object_agg(intent, n) AS intent_distribution
+        FROM (
+            SELECT memory_id, intent, COUNT(*) AS n
+            FROM active WHERE intent IS NOT NULL AND intent <> ''
+            GROUP BY memory_id, intent
+        ) t
+        GROUP BY memory_id
+    ),
+    emoji AS (
+        SELECT memory_id,
+               jsonb_agg(jsonb_build_object('emoji', emoji, 'count', n) ORDER BY n DESC, emoji) AS top_emoji
+        FROM (
+            SELECT memory_id, emoji, COUNT(*) AS n,
+                   ROW_NUMBER() OVER (PARTITION BY memory_id ORDER BY COUNT(*) DESC, emoji) AS rank
+            FROM active
+            GROUP BY memory_id, emoji
+        ) t
+        WHERE rank <= 5
+        GROUP BY memory_id
+    )
+    SELECT b.memory_id,
+           COALESCE(t.total_reactions, 0) AS total_reactions,
+           COALESCE(t.unique_reactors, 0) AS unique_reactors,
+           COALESCE(t.sentiment_count, 0) AS sentiment_count,
+           t.weighted_sentiment_sum, t.weight_sum, t.avg_intensity,
+           COALESCE(t.positive_count, 0) AS positive_count,
+           COALESCE(t.negative_count, 0) AS negative_count,
+           i.intent_distribution, e.top_emoji
+    FROM batch b
+    JOIN memories m ON m.id = b.memory_id
+    LEFT JOIN totals t ON t.memory_id = b.memory_id
+    LEFT JOIN intents i ON i.memory_id = b.memory_id
+    LEFT JOIN emoji e ON e.memory_id = b.memory_id
+"""
+
+
+def _jsonb(value):
+    """Decode a jsonb column (asyncpg returns text without a codec)."""
+    return json.loads(value) if isinstance(value, str) else value
+
 
 class ReactionAggregator:
     """Background job to aggregate reactions into memory metadata."""
@@ -46,6 +131,8 @@ class ReactionAggregator:
         self.db = db_pool
         self.config = config or MemoryConfig.from_env()
         self._started = False
+        self._dirty_queue: bool | None = None  # Cache for migration 020 check
+        self._links_since: Optional[datetime] = None  # Newly-linked sweep watermark
 
     def start(self):
         """Start the background aggregation loop."""
@@ -76,39 +163,41 @@ class ReactionAggregator:
 
     async def run_aggregation(self) -> dict:
         """
-        Run aggregation for all memories with linked reactions.
+        Re-aggregate every memory whose linked reactions changed.
+
+        Dirty memories come from memory_reaction_dirty (migration 020), which
+        ReactionStore fills on every reaction add/remove. Memories linked to
+        already-reacted messages since the last run (community observations,
+        extraction after reactions) are queued here. Each batch is then
+        claimed, aggregated in one SQL pass, written with one bulk UPDATE and
+        checked for promotion with one more, inside a single transaction, so
+        a failed batch stays queued.
 
-        This finds memories that have:
-        1. Linked messages via memory_message_links
-        2. Active reactions on those messages
-        3. Either no reaction_summary or new reactions since last aggregation
+        Without migration 020 the old discovery join picks the batch instead.
 
         Returns:
             Dictionary with aggregation statistics
         """
-        stats = {"memories_processed": 0, "memories_updated": 0, "errors": 0}
+        stats = {"memories_processed": 0, "memories_updated": 0, "memories_promoted": 0, "errors": 0}
 
         try:
-            # Find memory IDs that need aggregation:
-            # - Have linked messages with active reactions
-            # - Either no summary yet, or new reactions since last aggregation
-            memory_ids = await self._get_memories_needing_aggregation()
-            logger.info(f"Found {len(memory_ids)} memories needing reaction aggregation")
-
-            for memory_id in memory_ids:
-                try:
-                    updated = await self.aggregate_memory(memory_id)
-                    stats["memories_processed"] += 1
-                    if updated:
-                        stats["memories_updated"] += 1
-                except Exception as e:
-                    logger.error(f"Error aggregating memory {memory_id}: {e}", exc_info=True)
-                    stats["errors"] += 1
+            if await self._has_dirty_queue():
+                await self._queue_newly_linked()
+                while True:
+                    batch = await self._aggregate_batch(claim=True)
+                    self._add_batch_stats(stats, batch)
+                    if batch["memories_processed"] < AGGREGATION_BATCH_SIZE:
+                        break
+            else:
+                memory_ids = await self._get_memories_needing_aggregation()
+                logger.info(f"Found {len(memory_ids)} memories needing reaction aggregation")
+                if memory_ids:
+                    self._add_batch_stats(stats, await self._aggregate_batch(memory_ids))
 
             logger.info(
                 f"Reaction aggregation complete: "
                 f"{stats['memories_updated']}/{stats['memories_processed']} updated, "
-                f"{stats['errors']} errors"
+                f"{stats['memories_promoted']} promoted, {stats['errors']} errors"
             )
 
         except Exception as e:
@@ -117,8 +206,55 @@ class ReactionAggregator:
 
         return stats
 
+    @staticmethod
+    def _add_batch_stats(stats: dict, batch: dict) -> None:
+        for key, value in batch.items():
+            stats[key] += value
+
+    async def _has_dirty_queue(self) -> bool:
+        """True when memory_reaction_dirty (migration 020) exists."""
+        if self._dirty_queue is None:
+            try:
+                self._dirty_queue = bool(await self.db.fetchval(
+                    "SELECT to_regclass('memory_reaction_dirty') IS NOT NULL"
+                ))
+                if not self._dirty_queue:
+                    logger.warning(
+                        "memory_reaction_dirty not found; run migration 020. "
+                        "Falling back to full discovery scan."
+                    )
+            except Exception as e:
+                logger.warning(f"Reaction dirty-queue schema check failed: {e}")
+                self._dirty_queue = False
+        return self._dirty_queue
+
+    async def _queue_newly_linked(self) -> None:
+        """
+        Queue memories linked since the last run to messages that already have reactions.
+
+        Reactions only mark memories that were linked when the reaction
+        arrived; this catches links created afterwards.
+        """
+        started = datetime.now(timezone.utc)
+        await self.db.execute(
+            """
+            INSERT INTO memory_reaction_dirty (memory_id)
+            SELECT DISTINCT l.memory_id
+            FROM memory_message_links l
+            WHERE l.created_at > COALESCE($1, NOW() - INTERVAL '1 day')
+            AND EXISTS (
+                SELECT 1 FROM message_reactions r
+                WHERE r.message_id = l.message_id AND r.removed_at IS NULL
+            )
+            ON CONFLICT (memory_id) DO NOTHING
+            """,
+            self._links_since,
+        )
+        # Overlap slightly; re-queueing is idempotent
+        self._links_since = started - LINK_SWEEP_OVERLAP
+
     async def _get_memories_needing_aggregation(self) -> list[int]:
-        """Get IDs of memories that need reaction aggregation."""
+        """Get IDs of memories that need reaction aggregation (pre-migration 020 fallback)."""
         try:
             # Find memories with linked messages that have reactions,
             # where either no summary exists or reactions are newer than summary
@@ -134,8 +270,9 @@ class ReactionAggregator:
                     OR r.reacted_at > (m.reaction_summary->>'last_aggregated_at')::timestamptz
                 )
                 ORDER BY m.id
-                LIMIT 500
-                """
+                LIMIT $1
+                """,
+                AGGREGATION_BATCH_SIZE,
             )
             return [row["id"] for row in rows]
 
@@ -154,183 +291,174 @@ class ReactionAggregator:
             True if memory was updated
         """
         try:
-            # Get all active reactions on linked messages
-            reactions = await self.db.fetch(
-                """
-                SELECT r.emoji, r.sentiment, r.intensity, r.intent, r.relevance,
-                       r.reactor_id, r.reacted_at
-                FROM message_reactions r
-                JOIN memory_message_links l ON r.message_id = l.message_id
-                WHERE l.memory_id = $1 AND r.removed_at IS NULL
-                """,
-                memory_id,
-            )
-
-            if not reactions:
-                # No reactions - clear summary if exists
-                await self.db.execute(
-                    """
-                    UPDATE memories
-                    SET reaction_summary = NULL, reaction_confidence_boost = 0.0
-                    WHERE id = $1 AND reaction_summary IS NOT NULL
-                    """,
-                    memory_id,
-                )
-                return False
-
-            # Calculate aggregated summary
-            summary = self._calculate_reaction_summary(reactions)
-
-            # Calculate confidence boost
-            confidence_boost = self._calculate_confidence_boost(summary)
-
-            # Update memory
-            await self.db.execute(
-                """
-                UPDATE memories
-                SET reaction_summary = $2::jsonb, reaction_confidence_boost = $3
-                WHERE id = $1
-                """,
-                memory_id,
-                json.dumps(summary),
-                confidence_boost,
-            )
-
-            # v0.12.6: Check if memory qualifies for promotion to semantic
-            if self.config.promotion_enabled:
-                await self._check_for_promotion(memory_id, summary)
-
-            return True
-
+            batch = await self._aggregate_batch([memory_id])
+            return batch["memories_updated"] > 0
         except Exception as e:
             logger.error(f"Error aggregating memory {memory_id}: {e}", exc_info=True)
             return False
 
-    async def _check_for_promotion(self, memory_id: int, reaction_summary: dict) -> bool:
+    async def _aggregate_batch(
+        self,
+        memory_ids: Optional[list[int]] = None,
+        claim: bool = False,
+    ) -> dict:
         """
-        Check if a memory qualifies for promotion to semantic type.
-
-        Criteria (configurable via MemoryConfig):
-        - memory_type is 'episodic' or 'community_observation'
-        - total_reactions >= promotion_min_reactions
-        - unique_reactors >= promotion_min_unique_reactors
-        - sentiment_score > promotion_min_sentiment
-        - controversy_score < promotion_max_controversy
-        - created_at < now - promotion_min_age_days
+        Aggregate, store and promote one batch of memories in constant round-trips.
 
         Args:
-            memory_id: Memory ID to check
-            reaction_summary: Already-computed reaction summary
+            memory_ids: Explicit memory IDs to aggregate
+            claim: Instead, claim up to AGGREGATION_BATCH_SIZE memories from
+                memory_reaction_dirty (removed only if the transaction commits)
 
         Returns:
-            True if memory was promoted
+            Batch statistics
         """
-        try:
-            # Get memory details
-            memory = await self.db.fetchrow(
-                """
-                SELECT id, memory_type, user_id, created_at, topic_summary
-                FROM memories WHERE id = $1
-                """,
-                memory_id,
-            )
-
-            if not memory:
-                return False
-
-            # Only promote episodic or community_observation
-            if memory["memory_type"] not in ("episodic", "community_observation"):
-                return False
-
-            # Check reaction thresholds
-            total_reactions = reaction_summary.get("total_reactions", 0)
-            unique_reactors = reaction_summary.get("unique_reactors", 0)
-            sentiment_score = reaction_summary.get("sentiment_score", 0)
-            controversy_score = reaction_summary.get("controversy_score", 1)
+        source = _CLAIM_DIRTY_SQL if claim else _EXPLICIT_IDS_SQL
+        param = AGGREGATION_BATCH_SIZE if claim else memory_ids
+        aggregated_at = datetime.now(timezone.utc)
+
+        async with self.db.acquire() as conn:
+            async with conn.transaction():
+                rows = await conn.fetch(_AGGREGATE_SQL.format(source=source), param)
+
+                ids, summaries, boosts = [], [], []
+                for row in rows:
+                    summary = self._summary_from_stats(row, aggregated_at) if row["total_reactions"] else None
+                    ids.append(row["memory_id"])
+                    summaries.append(json.dumps(summary) if summary else None)
+                    boosts.append(self._calculate_confidence_boost(summary) if summary else 0.0)
+
+                if ids:
+                    await conn.execute(
+                        """
+                        UPDATE memories m
+                        SET reaction_summary = u.summary::jsonb,
+                            reaction_confidence_boost = u.boost
+                        FROM unnest($1::int[], $2::text[], $3::float8[]) AS u(id, summary, boost)
+                        WHERE m.id = u.id
+                        """,
+                        ids,
+                        summaries,
+                        boosts,
+                    )
+
+                promoted = 0
+                if self.config.promotion_enabled:
+                    candidates = [
+                        row["memory_id"] for row, summary in zip(rows, summaries)
+                        if summary and self._meets_promotion_thresholds(json.loads(summary))
+                    ]
+                    promoted = await self._promote_batch(conn, candidates, dict(zip(ids, summaries)))
 
-            if total_reactions < self.config.promotion_min_reactions:
-                return False
+        return {
+            "memories_processed": len(ids),
+            "memories_updated": sum(1 for summary in summaries if summary),
+            "memories_promoted": promoted,
+            "errors": 0,
+        }
 
-            if unique_reactors < self.config.promotion_min_unique_reactors:
-                return False
+    def _meets_promotion_thresholds(self, reaction_summary: dict) -> bool:
+        """
+        Check the reaction criteria for promotion to semantic type.
 
-            if sentiment_score <= self.config.promotion_min_sentiment:
-                return False
+        Criteria (configurable via MemoryConfig):
+        - total_reactions >= promotion_min_reactions
+        - unique_reactors >= promotion_min_unique_reactors
+        - sentiment_score > promotion_min_sentiment
+        - controversy_score < promotion_max_controversy
 
-            if controversy_score >= self.config.promotion_max_controversy:
-                return False
+        Type and age are checked in SQL by _promote_batch.
+        """
+        return (
+            reaction_summary.get("total_reactions", 0) >= self.config.promotion_min_reactions
+            and reaction_summary.get("unique_reactors", 0) >= self.config.promotion_min_unique_reactors
+            and reaction_summary.get("sentiment_score", 0) > self.config.promotion_min_sentiment
+            and reaction_summary.get("controversy_score", 1) < self.config.promotion_max_controversy
+        )
+
+    async def _promote_batch(
+        self,
+        conn: asyncpg.Connection,
+        memory_ids: list[int],
+        summaries: dict[int, str],
+    ) -> int:
+        """
+        Promote qualifying episodic/community_observation memories to semantic.
 
-            # Check age
-            min_age = timedelta(days=self.config.promotion_min_age_days)
-            if memory["created_at"] > datetime.now(timezone.utc) - min_age:
-                return False
+        One UPDATE applies the type and age criteria (created_at older than
+        promotion_min_age_days) to every reaction-qualified candidate.
 
-            # All criteria met - promote to semantic!
-            await self.db.execute(
-                """
-                UPDATE memories
-                SET memory_type = 'semantic', confidence = GREATEST(confidence, 0.8)
-                WHERE id = $1
-                """,
-                memory_id,
-            )
+        Args:
+            conn: Connection holding the aggregation transaction
+            memory_ids: Memories that met the reaction thresholds
+            summaries: Serialized reaction summary by memory ID (for analytics)
 
+        Returns:
+            Number of memories promoted
+        """
+        if not memory_ids:
+            return 0
+
+        rows = await conn.fetch(
+            """
+            UPDATE memories m
+            SET memory_type = 'semantic', confidence = GREATEST(m.confidence, 0.8)
+            FROM memories old
+            WHERE old.id = m.id
+            AND m.id = ANY($1::int[])
+            AND m.memory_type IN ('episodic', 'community_observation')
+            AND m.created_at < NOW() - make_interval(days => $2)
+            RETURNING m.id, old.memory_type AS from_type, m.user_id, m.topic_summary
+            """,
+            memory_ids,
+            self.config.promotion_min_age_days,
+        )
+
+        for row in rows:
+            summary = json.loads(summaries[row["id"]])
             logger.info(
-                f"Promoted memory {memory_id} to semantic "
-                f"(was {memory['memory_type']}, {total_reactions} reactions, "
-                f"sentiment={sentiment_score:.2f})"
+                f"Promoted memory {row['id']} to semantic "
+                f"(was {row['from_type']}, {summary['total_reactions']} reactions, "
+                f"sentiment={summary['sentiment_score']:.2f})"
             )
-
-            # Track analytics
             track(
                 "memory_promoted",
                 "memory",
-                user_id=memory["user_id"],
+                user_id=row["user_id"],
                 properties={
-                    "memory_id": memory_id,
-                    "from_type": memory["memory_type"],
+                    "memory_id": row["id"],
+                    "from_type": row["from_type"],
                     "to_type": "semantic",
-                    "total_reactions": total_reactions,
-                    "unique_reactors": unique_reactors,
-                    "sentiment_score": sentiment_score,
-                    "topic_preview": memory["topic_summary"][:100] if memory["topic_summary"] else None,
+                    "total_reactions": summary["total_reactions"],
+                    "unique_reactors": summary["unique_reactors"],
+                    "sentiment_score": summary["sentiment_score"],
+                    "topic_preview": row["topic_summary"][:100] if row["topic_summary"] else None,
                 },
             )
 
-            return True
-
-        except Exception as e:
-            logger.error(f"Error checking promotion for memory {memory_id}: {e}", exc_info=True)
-            return False
+        return len(rows)
 
-    def _calculate_reaction_summary(self, reactions: list) -> dict:
+    @staticmethod
+    def _summary_from_stats(row, aggregated_at: datetime) -> dict:
         """
-        Calculate aggregated summary from reactions.
+        Build the stored reaction summary from one row of _AGGREGATE_SQL.
 
         Args:
-            reactions: List of reaction records
+            row: Per-memory reaction statistics
+            aggregated_at: Timestamp recorded as last_aggregated_at
 
         Returns:
             Summary dictionary for storage as JSONB
         """
-        total_reactions = len(reactions)
-        unique_reactors = len(set(r["reactor_id"] for r in reactions))
-
-        # Sentiment stats (weighted by intensity)
-        sentiments = [r["sentiment"] for r in reactions if r["sentiment"] is not None]
-        intensities = [r["intensity"] for r in reactions if r["intensity"] is not None]
-
-        if sentiments and intensities:
-            # Weighted average sentiment
-            weights = intensities
-            weighted_sentiment = sum(s * w for s, w in zip(sentiments, weights)) / sum(weights)
-            avg_intensity = sum(intensities) / len(intensities)
+        if row["sentiment_count"] and row["weight_sum"]:
+            # Intensity-weighted average sentiment
+            weighted_sentiment = row["weighted_sentiment_sum"] / row["weight_sum"]
+            avg_intensity = row["avg_intensity"]
 
             # Controversy: high if reactions are mixed (both positive and negative)
-            positive_count = sum(1 for s in sentiments if s > 0.3)
-            negative_count = sum(1 for s in sentiments if s < -0.3)
+            positive_count = row["positive_count"]
+            negative_count = row["negative_count"]
             if positive_count > 0 and negative_count > 0:
-                # Controversy based on balance of positive/negative
                 minority = min(positive_count, negative_count)
                 majority = max(positive_count, negative_count)
                 controversy = (2 * minority) / (minority + majority)  # 0 to 1
@@ -341,23 +469,15 @@ class ReactionAggregator:
             avg_intensity = 0.5
             controversy = 0.0
 
-        # Intent distribution
-        intents = [r["intent"] for r in reactions if r["intent"]]
-        intent_distribution = dict(Counter(intents))
-
-        # Top emoji
-        emoji_counts = Counter(r["emoji"] for r in reactions)
-        top_emoji = [{"emoji": e, "count": c} for e, c in emoji_counts.most_common(5)]
-
         return {
-            "total_reactions": total_reactions,
-            "unique_reactors": unique_reactors,
+            "total_reactions": row["total_reactions"],
+            "unique_reactors": row["unique_reactors"],
             "sentiment_score": round(weighted_sentiment, 3),
             "intensity_score": round(avg_intensity, 3),
             "controversy_score": round(controversy, 3),
-            "intent_distribution": intent_distribution,
-            "top_emoji": top_emoji,
-            "last_aggregated_at": datetime.now(timezone.utc).isoformat(),
+            "intent_distribution": _jsonb(row["intent_distribution"]) or {},
+            "top_emoji": _jsonb(row["top_emoji"]) or [],
+            "last_aggregated_at": aggregated_at.isoformat(),
         }
 
     def _calculate_confidence_boost(self, summary: dict) -> float:
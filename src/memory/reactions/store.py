@@ -22,6 +22,73 @@ from .dimensions import EmojiDimensions
 
 logger = logging.getLogger(__name__)
 
+# (memory_id, message_id, channel_id, contribution_type)
+MemoryLink = tuple[int, int, int, str]
+
+
+async def insert_memory_links(db, links: list[MemoryLink]) -> int:
+    """
+    Insert many memory-message links in one round-trip.
+
+    Uses INSERT ... SELECT FROM unnest() so the statement size is constant
+    and the server does the row expansion. Existing (memory_id, message_id)
+    pairs are skipped.
+
+    Args:
+        db: asyncpg pool or connection
+        links: (memory_id, message_id, channel_id, contribution_type) tuples
+
+    Returns:
+        Number of links actually inserted
+    """
+    if not links:
+        return 0
+
+    # Keep the first link per (memory_id, message_id); a single INSERT
+    # cannot hit ON CONFLICT for a row it inserted itself
+    first: dict[tuple[int, int], MemoryLink] = {}
+    for link in links:
+        first.setdefault((link[0], link[1]), link)
+    memory_ids, message_ids, channel_ids, types = (list(col) for col in zip(*first.values()))
+
+    return await db.fetchval(
+        """
+        WITH inserted AS (
+            INSERT INTO memory_message_links (memory_id, message_id, channel_id, contribution_type)
+            SELECT * FROM unnest($1::int[], $2::bigint[], $3::bigint[], $4::text[])
+            ON CONFLICT (memory_id, message_id) DO NOTHING
+            RETURNING 1
+        )
+        SELECT COUNT(*) FROM inserted
+        """,
+        memory_ids,
+        message_ids,
+        channel_ids,
+        types,
+    )
+
+
+_MARK_DIRTY_CTE = """,
+        dirty AS (
+            INSERT INTO memory_reaction_dirty (memory_id)
+            SELECT l.memory_id
+            FROM memory_message_links l
+            JOIN changed c ON c.message_id = l.message_id
+            ON CONFLICT (memory_id) DO NOTHING
+        )"""
+
+
+def _mark_dirty(change_sql: str, select_sql: str, enabled: bool) -> str:
+    """
+    Wrap a reaction write so it also queues the affected memories.
+
+    `change_sql` must RETURN message_id. When the dirty queue exists, every
+    memory linked to the changed message is added to memory_reaction_dirty
+    in the same statement, so the aggregator only revisits those memories.
+    """
+    dirty = _MARK_DIRTY_CTE if enabled else ""
+    return f"WITH changed AS ({change_sql}){dirty}\n{select_sql}"
+
 
 class ReactionStore:
     """Database operations for reaction storage."""
@@ -34,6 +101,19 @@ class ReactionStore:
             db_pool: AsyncPG connection pool
         """
         self.db = db_pool
+        self._dirty_queue: bool | None = None  # Cache for migration 020 check
+
+    async def _has_dirty_queue(self) -> bool:
+        """True when memory_reaction_dirty (migration 020) exists."""
+        if self._dirty_queue is None:
+            try:
+                self._dirty_queue = bool(await self.db.fetchval(
+                    "SELECT to_regclass('memory_reaction_dirty') IS NOT NULL"
+                ))
+            except Exception as e:
+                logger.warning(f"Reaction dirty-queue schema check failed: {e}")
+                self._dirty_queue = False
+        return self._dirty_queue
 
     async def store_reaction(
         self,
@@ -66,19 +146,23 @@ class ReactionStore:
         """
         try:
             result = await self.db.fetchrow(
-                """
-                INSERT INTO message_reactions (
-                    message_id, channel_id, guild_id, message_author_id,
-                    reactor_id, emoji, emoji_is_custom,
-                    sentiment, intensity, intent, relevance, context_dependent,
-                    reacted_at, removed_at
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, NOW(), NULL)
-                ON CONFLICT (message_id, reactor_id, emoji)
-                DO UPDATE SET
-                    removed_at = NULL,
-                    reacted_at = NOW()
-                RETURNING id
-                """,
+                _mark_dirty(
+                    """
+                    INSERT INTO message_reactions (
+                        message_id, channel_id, guild_id, message_author_id,
+                        reactor_id, emoji, emoji_is_custom,
+                        sentiment, intensity, intent, relevance, context_dependent,
+                        reacted_at, removed_at
+                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, NOW(), NULL)
+                    ON CONFLICT (message_id, reactor_id, emoji)
+                    DO UPDATE SET
+                        removed_at = NULL,
+                        reacted_at = NOW()
+                    RETURNING id, message_id
+                    """,
+                    "SELECT id FROM changed",
+                    await self._has_dirty_queue(),
+                ),
                 message_id,
                 channel_id,
                 guild_id,
@@ -116,18 +200,23 @@ class ReactionStore:
             True if reaction was found and updated
         """
         try:
-            result = await self.db.execute(
-                """
-                UPDATE message_reactions
-                SET removed_at = NOW()
-                WHERE message_id = $1 AND reactor_id = $2 AND emoji = $3
-                    AND removed_at IS NULL
-                """,
+            removed = await self.db.fetchval(
+                _mark_dirty(
+                    """
+                    UPDATE message_reactions
+                    SET removed_at = NOW()
+                    WHERE message_id = $1 AND reactor_id = $2 AND emoji = $3
+                        AND removed_at IS NULL
+                    RETURNING message_id
+                    """,
+                    "SELECT COUNT(*) FROM changed",
+                    await self._has_dirty_queue(),
+                ),
                 message_id,
                 reactor_id,
                 emoji,
             )
-            return result == "UPDATE 1"
+            return removed == 1
 
         except Exception as e:
             logger.error(f"Error removing reaction: {e}", exc_info=True)
@@ -281,6 +370,22 @@ class ReactionStore:
             logger.error(f"Error creating memory link: {e}", exc_info=True)
             return None
 
+    async def create_memory_links(self, links: list[MemoryLink]) -> int:
+        """
+        Create many memory-message links in a single statement.
+
+        Args:
+            links: (memory_id, message_id, channel_id, contribution_type) tuples
+
+        Returns:
+            Number of links created (0 on failure)
+        """
+        try:
+            return await insert_memory_links(self.db, links)
+        except Exception as e:
+            logger.error(f"Error creating memory links: {e}", exc_info=True)
+            return 0
+
     async def get_message_ids_for_memory(self, memory_id: int) -> list[int]:
         """
         Get all message IDs linked to a memory.
@@ -38,7 +38,10 @@ import discord
 import voyageai
 
 from .config import MemoryConfig
+from .embeddings import EmbeddingService
+from .expander import fixed_subqueries
 from .privacy import PrivacyLevel, classify_channel_privacy
+from .vector_index import MemoryVectorIndex, RetrievalCache
 
 logger = logging.getLogger("slashAI.memory")
 
@@ -67,8 +70,30 @@ class MemoryRetriever:
         self.db = db_pool
         self.voyage = voyageai.AsyncClient()  # Uses VOYAGE_API_KEY env var
         self.config = config
+        self.embeddings = EmbeddingService(
+            self.voyage,
+            max_entries=config.embedding_cache_max_entries,
+            store_path=config.embedding_cache_path,
+            enabled=config.embedding_cache_enabled,
+        )
         self._hybrid_available: bool | None = None  # Cached check for hybrid search
 
+        # Optional in-process tier (see vector_index.py)
+        self.cache: Optional[RetrievalCache] = None
+        if config.retrieval_cache_enabled:
+            self.cache = RetrievalCache(
+                max_entries=config.retrieval_cache_max_entries,
+                ttl_seconds=config.retrieval_cache_ttl_seconds,
+            )
+        self.index: Optional[MemoryVectorIndex] = None
+        if config.vector_index_enabled:
+            self.index = MemoryVectorIndex(
+                db_pool,
+                ttl_seconds=config.vector_index_ttl_seconds,
+                max_users=config.vector_index_max_users,
+            )
+        self._background_tasks: set[asyncio.Task] = set()
+
     async def retrieve(
         self,
         user_id: int,
@@ -105,15 +130,32 @@ class MemoryRetriever:
 
         logger.info(f"Retrieval context: privacy={context_privacy.value}, guild={guild_id}, channel={channel_id}")
 
+        cache_key = (
+            "retrieve", agent_id, user_id, context_privacy.value, guild_id, channel_id,
+            top_k, RetrievalCache.normalize_query(query),
+        )
+        if self.cache is not None:
+            cached = self.cache.get(user_id, cache_key)
+            if cached is not None:
+                logger.info(f"Retrieval cache hit: {len(cached)} memories")
+                return list(cached)
+
         # Generate query embedding
         embedding = await self._embed(query, input_type="query")
 
         # Try hybrid search if enabled and available
+        from_index = False
         if self.config.hybrid_search_enabled and await self._is_hybrid_available():
-            rows = await self._retrieve_hybrid(
+            rows = await self._search_index(
                 query, embedding, user_id, context_privacy.value,
                 guild_id, channel_id, top_k, agent_id=agent_id,
             )
+            from_index = rows is not None
+            if rows is None:
+                rows = await self._retrieve_hybrid(
+                    query, embedding, user_id, context_privacy.value,
+                    guild_id, channel_id, top_k, agent_id=agent_id,
+                )
         else:
             # Fallback to semantic-only search
             rows = await self._retrieve_semantic(
@@ -123,7 +165,11 @@ class MemoryRetriever:
         # Reinforce retrieved memories (update access time, boost confidence, increment count)
         if rows:
             ids = [r["id"] for r in rows]
-            await self._reinforce_memories(ids)
+            if from_index:
+                # Keep the index-served path free of database round-trips
+                self._run_in_background(self._reinforce_memories(ids))
+            else:
+                await self._reinforce_memories(ids)
 
         memories = [
             RetrievedMemory(
@@ -165,6 +211,9 @@ class MemoryRetriever:
                 )
             )
 
+        if self.cache is not None:
+            self.cache.put(user_id, cache_key, list(memories))
+
         return memories
 
     async def retrieve_multi(
@@ -204,17 +253,33 @@ class MemoryRetriever:
             f"guild={guild_id}, channel={channel_id}"
         )
 
-        # Batch embed all queries in a single API call
-        result = await self.voyage.embed(
+        cache_key = (
+            "retrieve_multi", agent_id, user_id, context_privacy.value, guild_id, channel_id,
+            top_k, tuple(RetrievalCache.normalize_query(q) for q in queries),
+        )
+        if self.cache is not None:
+            cached = self.cache.get(user_id, cache_key)
+            if cached is not None:
+                logger.info(f"Multi-retrieve cache hit: {len(cached)} memories")
+                return list(cached)
+
+        # Batch embed all queries in one call; fixed sub-queries come from cache
+        embeddings = await self.embeddings.embed(
             queries, model=self.config.embedding_model, input_type="query"
         )
-        embeddings = result.embeddings
 
         # Run hybrid searches concurrently
         use_hybrid = self.config.hybrid_search_enabled and await self._is_hybrid_available()
 
         async def _search_one(query: str, embedding: list[float]) -> list[asyncpg.Record]:
             if use_hybrid:
+                rows = await self._search_index(
+                    query, embedding, user_id, context_privacy.value,
+                    guild_id, channel_id, self.config.top_k,
+                    agent_id=agent_id,
+                )
+                if rows is not None:
+                    return rows
                 return await self._retrieve_hybrid(
                     query, embedding, user_id, context_privacy.value,
                     guild_id, channel_id, self.config.top_k,
@@ -270,8 +335,89 @@ class MemoryRetriever:
             f"→ {len(best_by_id)} unique → {len(memories)} returned"
         )
 
+        if self.cache is not None:
+            self.cache.put(user_id, cache_key, list(memories))
+
         return memories
 
+    # =========================================================================
+    # In-process tier
+    # =========================================================================
+
+    async def _search_index(
+        self,
+        query: str,
+        embedding: list[float],
+        user_id: int,
+        context_privacy: str,
+        guild_id: Optional[int],
+        channel_id: Optional[int],
+        top_k: int,
+        agent_id: Optional[str] = None,
+    ) -> Optional[list[dict]]:
+        """
+        Answer a hybrid search from the in-process vector index.
+
+        Returns None when the index is disabled or unusable, in which case
+        the caller falls back to hybrid_memory_search() in Postgres.
+        """
+        if self.index is None:
+            return None
+        try:
+            await self.index.ensure_loaded(user_id)
+            rows = self.index.search(
+                user_id, query, embedding, context_privacy, guild_id, channel_id,
+                top_k, self.config.hybrid_candidate_limit, agent_id,
+            )
+        except Exception as e:
+            logger.warning(f"Vector index search failed, using Postgres: {e}")
+            self.index.invalidate(user_id)
+            return None
+        if rows is not None:
+            logger.info(f"Vector index returned {len(rows)} results")
+        return rows
+
+    def note_memory_written(self, row: dict, embedding: list[float]) -> None:
+        """
+        Keep the in-process tier consistent after a memory insert/update.
+
+        Called by MemoryUpdater after _add/_merge with the written row
+        (must include user_id) and the stored embedding.
+        """
+        user_id = row["user_id"]
+        if self.cache is not None:
+            self.cache.invalidate_user(user_id)
+        if self.index is not None:
+            self.index.upsert(row, embedding)
+
+    def note_memory_removed(self, user_id: int, memory_id: int) -> None:
+        """Drop a deleted memory from the in-process tier."""
+        if self.cache is not None:
+            self.cache.invalidate_user(user_id)
+        if self.index is not None:
+            self.index.remove(user_id, memory_id)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Forget everything cached for a user after a write made outside the updater."""
+        if self.cache is not None:
+            self.cache.invalidate_user(user_id)
+        if self.index is not None:
+            self.index.invalidate(user_id)
+
+    def get_tier_stats(self) -> dict:
+        """Cache/index counters for diagnostics."""
+        return {
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "index": self.index.stats() if self.index is not None else None,
+            "embeddings": self.embeddings.stats(),
+        }
+
+    def _run_in_background(self, coro) -> None:
+        """Fire-and-forget a coroutine, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
     async def _is_hybrid_available(self) -> bool:
         """Check if hybrid search is available (tsv column and function exist)."""
         if self._hybrid_available is not None:
@@ -424,10 +570,16 @@ class MemoryRetriever:
             text: Text to embed
             input_type: "query" for retrieval queries, "document" for stored memories
         """
-        result = await self.voyage.embed(
-            [text], model=self.config.embedding_model, input_type=input_type
+        return await self.embeddings.embed_one(
+            text, model=self.config.embedding_model, input_type=input_type
+        )
+
+    async def warm_expansion_embeddings(self) -> None:
+        """Embed the fixed query-expansion sub-queries once and pin them."""
+        await self.embeddings.embed(
+            fixed_subqueries(), model=self.config.embedding_model,
+            input_type="query", pin=True,
         )
-        return result.embeddings[0]
 
     async def _reinforce_memories(self, memory_ids: list[int]) -> None:
         """
@@ -22,7 +22,10 @@ Handles storing new memories with intelligent merging of similar topics.
 Based on RMM paper's "Prospective Reflection" methodology.
 """
 
+import asyncio
 import json
+import math
+from dataclasses import dataclass, field
 from typing import Optional
 
 import asyncpg
@@ -33,6 +36,35 @@ from .extractor import ExtractedMemory
 from .privacy import PrivacyLevel
 from .retriever import MemoryRetriever
 
+# Columns returned by ADD/MERGE writes so the retriever's in-process
+# index can be updated without re-reading the row
+_WRITTEN_COLUMNS = """id, user_id, agent_id, topic_summary, raw_dialogue, memory_type,
+                privacy_level, origin_channel_id, origin_guild_id, source_count,
+                confidence, created_at, updated_at"""
+
+_INSERT_SQL = f"""
+    INSERT INTO memories (
+        user_id, topic_summary, raw_dialogue, embedding,
+        memory_type, confidence, privacy_level, origin_channel_id, origin_guild_id,
+        agent_id, source_platform, user_identifier
+    ) VALUES ($1, $2, $3, $4::vector, $5, $6, $7, $8, $9, $10, $11, $12)
+    ON CONFLICT (user_id, md5(topic_summary)) DO UPDATE SET
+        raw_dialogue = EXCLUDED.raw_dialogue,
+        embedding = EXCLUDED.embedding,
+        confidence = EXCLUDED.confidence,
+        updated_at = NOW(),
+        source_count = memories.source_count + 1
+    RETURNING {_WRITTEN_COLUMNS}
+"""
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    """Cosine similarity of two embeddings."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
 # Merge prompt for combining related memories
 MEMORY_MERGE_PROMPT = """
 You are merging two related memories about a user into a single, consolidated memory.
@@ -66,6 +98,26 @@ OUTPUT:
 """
 
 
+@dataclass
+class _WriteGroup:
+    """
+    Batch items that end up as one stored memory in update_many().
+
+    The target is either an existing row (MERGE) or the first new item in
+    the group (ADD). Any further items are folded in with Claude merges.
+    """
+
+    privacy_level: PrivacyLevel
+    existing: Optional[dict] = None  # Nearest stored memory being merged into
+    head: Optional[ExtractedMemory] = None  # First new item when adding
+    head_embedding: Optional[list[float]] = None
+    merge_items: list[ExtractedMemory] = field(default_factory=list)
+    item_indexes: list[int] = field(default_factory=list)
+    summary: str = ""
+    dialogue: str = ""
+    confidence: float = 0.0
+
+
 class MemoryUpdater:
     """Handles ADD and MERGE operations for memories."""
 
@@ -119,6 +171,200 @@ class MemoryUpdater:
                 agent_id=agent_id,
             )
 
+    async def update_many(
+        self,
+        user_id: int,
+        memories: list[tuple[ExtractedMemory, PrivacyLevel]],
+        channel_id: Optional[int] = None,
+        guild_id: Optional[int] = None,
+        agent_id: Optional[str] = None,
+    ) -> list[int]:
+        """
+        Add or merge a batch of memories. Returns memory IDs in input order.
+
+        Same decisions as calling update() per item, but with API cost
+        bounded by batches rather than topics: one Voyage call for all
+        summaries, one nearest-neighbour query, concurrent Claude merges
+        (bounded by config.merge_concurrency), one Voyage call for merged
+        summaries, and all writes in a single transaction. Items that are
+        near-duplicates of an earlier item in the same batch are merged
+        into it, as sequential update() calls would have done.
+        """
+        if not memories:
+            return []
+
+        embeddings = await self.retriever.embeddings.embed(
+            [m.summary for m, _ in memories],
+            model=self.config.embedding_model,
+            input_type="document",
+        )
+        neighbours = await self._find_similar_many(
+            user_id, embeddings, [p for _, p in memories]
+        )
+        groups = self._plan_groups(memories, embeddings, neighbours)
+
+        # Run the needed merges concurrently; items within a group fold in order
+        semaphore = asyncio.Semaphore(self.config.merge_concurrency)
+
+        async def _fold(group: _WriteGroup) -> None:
+            for item in group.merge_items:
+                async with semaphore:
+                    merged = await self._merge_content(group.summary, group.dialogue, item)
+                group.summary = merged["merged_summary"]
+                group.dialogue = merged["merged_dialogue"]
+                group.confidence = merged.get("confidence", item.confidence)
+
+        await asyncio.gather(*(_fold(g) for g in groups if g.merge_items))
+
+        # Re-embed merged summaries in one batch
+        merged_groups = [g for g in groups if g.merge_items]
+        merged_embeddings = await self.retriever.embeddings.embed(
+            [g.summary for g in merged_groups],
+            model=self.config.embedding_model,
+            input_type="document",
+        )
+        final_embedding = {id(g): e for g, e in zip(merged_groups, merged_embeddings)}
+
+        written: list[tuple[dict, list[float]]] = []
+        ids = [0] * len(memories)
+        async with self.db.acquire() as conn:
+            async with conn.transaction():
+                for group in groups:
+                    embedding = final_embedding.get(id(group), group.head_embedding)
+                    if group.existing is not None:
+                        row = await conn.fetchrow(
+                            f"""
+                            UPDATE memories SET
+                                topic_summary = $1, raw_dialogue = $2, embedding = $3::vector,
+                                confidence = $4, source_count = source_count + $5,
+                                updated_at = NOW()
+                            WHERE id = $6
+                            RETURNING {_WRITTEN_COLUMNS}
+                            """,
+                            group.summary,
+                            group.dialogue,
+                            self._embedding_to_str(embedding),
+                            group.confidence,
+                            len(group.merge_items),
+                            group.existing["id"],
+                        )
+                    else:
+                        row = await conn.fetchrow(
+                            _INSERT_SQL,
+                            user_id,
+                            group.summary,
+                            group.dialogue,
+                            self._embedding_to_str(embedding),
+                            group.head.memory_type,
+                            group.confidence,
+                            group.privacy_level.value,
+                            channel_id,
+                            guild_id,
+                            agent_id,
+                            "discord",
+                            None,
+                        )
+                    written.append(({"user_id": user_id, **dict(row)}, embedding))
+                    for i in group.item_indexes:
+                        ids[i] = row["id"]
+
+        for row, embedding in written:
+            self.retriever.note_memory_written(row, embedding)
+        return ids
+
+    def _plan_groups(
+        self,
+        memories: list[tuple[ExtractedMemory, PrivacyLevel]],
+        embeddings: list[list[float]],
+        neighbours: list[Optional[dict]],
+    ) -> list[_WriteGroup]:
+        """Decide ADD vs MERGE for each batch item, grouping items that share a target."""
+        threshold = self.config.merge_similarity_threshold
+        by_existing: dict[int, _WriteGroup] = {}
+        new_groups: list[_WriteGroup] = []
+        groups: list[_WriteGroup] = []
+
+        for i, ((memory, privacy_level), embedding) in enumerate(zip(memories, embeddings)):
+            best_similarity = -1.0
+            target: Optional[_WriteGroup] = None
+
+            similar = neighbours[i]
+            if similar and similar["similarity"] > threshold:
+                best_similarity = similar["similarity"]
+                target = by_existing.get(similar["id"])
+                if target is None:
+                    target = _WriteGroup(
+                        privacy_level=privacy_level,
+                        existing=dict(similar),
+                        summary=similar["topic_summary"],
+                        dialogue=similar["raw_dialogue"],
+                    )
+                    by_existing[similar["id"]] = target
+                    groups.append(target)
+
+            # A new item earlier in this batch may be closer than anything stored
+            for group in new_groups:
+                if group.privacy_level != privacy_level:
+                    continue
+                similarity = _cosine(embedding, group.head_embedding)
+                if similarity > threshold and similarity > best_similarity:
+                    best_similarity = similarity
+                    target = group
+
+            if target is None:
+                target = _WriteGroup(
+                    privacy_level=privacy_level,
+                    head=memory,
+                    head_embedding=embedding,
+                    summary=memory.summary,
+                    dialogue=memory.raw_dialogue,
+                    confidence=memory.confidence,
+                )
+                new_groups.append(target)
+                groups.append(target)
+            else:
+                target.merge_items.append(memory)
+            target.item_indexes.append(i)
+
+        # Drop MERGE groups that lost all their items to closer in-batch matches
+        return [g for g in groups if g.item_indexes]
+
+    async def _find_similar_many(
+        self,
+        user_id: int,
+        embeddings: list[list[float]],
+        privacy_levels: list[PrivacyLevel],
+    ) -> list[Optional[dict]]:
+        """Nearest stored memory at the same privacy level for each embedding, in one query."""
+        index = self.retriever.index
+        if index is not None and index.is_fresh(user_id):
+            return [
+                index.nearest(user_id, e, p.value)
+                for e, p in zip(embeddings, privacy_levels)
+            ]
+
+        rows = await self.db.fetch(
+            """
+            SELECT q.ord, m.id, m.topic_summary, m.raw_dialogue, m.source_count, m.similarity
+            FROM unnest($2::text[], $3::text[]) WITH ORDINALITY AS q(query_embedding, privacy_level, ord)
+            CROSS JOIN LATERAL (
+                SELECT mem.id, mem.topic_summary, mem.raw_dialogue, mem.source_count,
+                       1 - (mem.embedding <=> q.query_embedding::vector) AS similarity
+                FROM memories mem
+                WHERE mem.user_id = $1 AND mem.privacy_level = q.privacy_level
+                ORDER BY mem.embedding <=> q.query_embedding::vector
+                LIMIT 1
+            ) m
+            """,
+            user_id,
+            [self._embedding_to_str(e) for e in embeddings],
+            [p.value for p in privacy_levels],
+        )
+        nearest: list[Optional[dict]] = [None] * len(embeddings)
+        for row in rows:
+            nearest[row["ord"] - 1] = dict(row)
+        return nearest
+
     async def _find_similar(
         self, user_id: int, embedding: list[float], privacy_level: PrivacyLevel
     ) -> Optional[dict]:
@@ -128,6 +374,10 @@ class MemoryUpdater:
         Critical: Merging only happens within the same privacy level
         to prevent privacy escalation.
         """
+        index = self.retriever.index
+        if index is not None and index.is_fresh(user_id):
+            return index.nearest(user_id, embedding, privacy_level.value)
+
         sql = """
             SELECT id, topic_summary, raw_dialogue, source_count,
                    1 - (embedding <=> $1::vector) as similarity
@@ -143,36 +393,22 @@ class MemoryUpdater:
         self, existing: dict, new: ExtractedMemory, new_embedding: list[float]
     ) -> int:
         """Merge new memory with existing similar memory."""
-        response = await self.anthropic.messages.create(
-            model="claude-sonnet-4-6",
-            max_tokens=1024,
-            messages=[
-                {
-                    "role": "user",
-                    "content": MEMORY_MERGE_PROMPT.format(
-                        existing_summary=existing["topic_summary"],
-                        existing_dialogue=existing["raw_dialogue"],
-                        new_summary=new.summary,
-                        new_dialogue=new.raw_dialogue,
-                    ),
-                }
-            ],
+        merged = await self._merge_content(
+            existing["topic_summary"], existing["raw_dialogue"], new
         )
 
-        merged = self._parse_merge_response(response.content[0].text)
-
         # Re-embed the merged summary
         merged_embedding = await self.retriever._embed(
             merged["merged_summary"], input_type="document"
         )
 
         result = await self.db.fetchrow(
-            """
+            f"""
             UPDATE memories SET
                 topic_summary = $1, raw_dialogue = $2, embedding = $3::vector,
                 confidence = $4, source_count = source_count + 1, updated_at = NOW()
             WHERE id = $5
-            RETURNING id
+            RETURNING {_WRITTEN_COLUMNS}
             """,
             merged["merged_summary"],
             merged["merged_dialogue"],
@@ -180,8 +416,30 @@ class MemoryUpdater:
             merged.get("confidence", new.confidence),
             existing["id"],
         )
+        self.retriever.note_memory_written(dict(result), merged_embedding)
         return result["id"]
 
+    async def _merge_content(
+        self, existing_summary: str, existing_dialogue: str, new: ExtractedMemory
+    ) -> dict:
+        """Ask Claude to combine an existing memory with a new one."""
+        response = await self.anthropic.messages.create(
+            model="claude-sonnet-4-6",
+            max_tokens=1024,
+            messages=[
+                {
+                    "role": "user",
+                    "content": MEMORY_MERGE_PROMPT.format(
+                        existing_summary=existing_summary,
+                        existing_dialogue=existing_dialogue,
+                        new_summary=new.summary,
+                        new_dialogue=new.raw_dialogue,
+                    ),
+                }
+            ],
+        )
+        return self._parse_merge_response(response.content[0].text)
+
     async def _add(
         self,
         user_id: int,
@@ -196,20 +454,7 @@ class MemoryUpdater:
     ) -> int:
         """Add new memory with privacy level, origin tracking, and agent scoping."""
         result = await self.db.fetchrow(
-            """
-            INSERT INTO memories (
-                user_id, topic_summary, raw_dialogue, embedding,
-                memory_type, confidence, privacy_level, origin_channel_id, origin_guild_id,
-                agent_id, source_platform, user_identifier
-            ) VALUES ($1, $2, $3, $4::vector, $5, $6, $7, $8, $9, $10, $11, $12)
-            ON CONFLICT (user_id, md5(topic_summary)) DO UPDATE SET
-                raw_dialogue = EXCLUDED.raw_dialogue,
-                embedding = EXCLUDED.embedding,
-                confidence = EXCLUDED.confidence,
-                updated_at = NOW(),
-                source_count = memories.source_count + 1
-            RETURNING id
-            """,
+            _INSERT_SQL,
             user_id,
             memory.summary,
             memory.raw_dialogue,
@@ -223,6 +468,9 @@ class MemoryUpdater:
             source_platform,
             user_identifier,
         )
+        self.retriever.note_memory_written(
+            {"user_id": user_id, **dict(result)}, embedding
+        )
         return result["id"]
 
     def _parse_merge_response(self, response_text: str) -> dict:
@@ -0,0 +1,373 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Commercial licensing: [slashdaemon@protonmail.com]
+
+"""
+In-Process Retrieval Tier
+
+Optional layer in front of Postgres for MemoryRetriever:
+
+- RetrievalCache: TTL/LRU cache of recent retrieval results keyed by
+  (agent, user, privacy scope, query). A hit skips both the Voyage query
+  embedding and the hybrid_memory_search round-trip.
+- MemoryVectorIndex: per-user NumPy matrix of memory embeddings, loaded
+  once from Postgres and kept warm by MemoryUpdater writes. Mirrors the
+  privacy/agent filtering and RRF fusion of hybrid_memory_search() so a
+  warm index can answer retrievals without touching the database.
+
+hybrid_memory_search() only ever looks at one user's memories for one
+agent (migration 017), which is what makes a per-user index sufficient.
+The lexical half is an approximation of Postgres full-text search
+(lowercased tokens, English stopwords, prefix matching instead of
+stemming), so rankings can differ slightly from the SQL path on
+keyword-heavy queries. Both tiers are disabled by default.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Hashable, Optional
+
+import asyncpg
+import numpy as np
+
+logger = logging.getLogger("slashAI.memory.index")
+
+# Columns kept per memory so index hits can build RetrievedMemory objects
+# without a follow-up fetch. Matches the hybrid_memory_search() projection.
+_INDEX_COLUMNS = """
+    id, user_id, agent_id, topic_summary, raw_dialogue, memory_type,
+    privacy_level, origin_channel_id, origin_guild_id, source_count,
+    confidence, created_at, updated_at, embedding::text AS embedding
+"""
+
+# Postgres 'english' text search stopwords (subset that matters for chat)
+_STOPWORDS = frozenset(
+    "a about above after again against all am an and any are as at be because "
+    "been before being below between both but by can did do does doing down "
+    "during each few for from further had has have having he her here hers "
+    "herself him himself his how i if in into is it its itself just me more "
+    "most my myself no nor not now of off on once only or other our ours "
+    "ourselves out over own same she should so some such than that the their "
+    "theirs them themselves then there these they this those through to too "
+    "under until up very was we were what when where which while who whom why "
+    "will with you your yours yourself yourselves".split()
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# RRF smoothing constant hardcoded in hybrid_memory_search()
+_SQL_RRF_K = 60
+
+
+def parse_pgvector(raw: Any) -> np.ndarray:
+    """Parse a pgvector value (text '[0.1,...]' or sequence) into float32."""
+    if isinstance(raw, str):
+        return np.array([float(x) for x in raw.strip("[]").split(",")], dtype=np.float32)
+    return np.array(raw, dtype=np.float32)
+
+
+def _normalize(vec: np.ndarray) -> np.ndarray:
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm > 0 else vec
+
+
+def _tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in _STOPWORDS]
+
+
+def _row_tokens(row: dict) -> list[str]:
+    return _tokenize(f"{row.get('topic_summary') or ''} {row.get('raw_dialogue') or ''}")
+
+
+class RetrievalCache:
+    """TTL + LRU cache of retrieval results, invalidated per user."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, int, Any]] = OrderedDict()
+        # Bumped on every write for a user; entries from older generations are dead
+        self._generations: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Collapse whitespace and case so trivially different queries share a slot."""
+        return " ".join(query.lower().split())
+
+    def get(self, user_id: int, key: Hashable) -> Optional[Any]:
+        """Return a cached value, or None on miss/expiry/invalidation."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, generation, value = entry
+        if (
+            time.monotonic() - stored_at > self.ttl_seconds
+            or generation != self._generations.get(user_id, 0)
+        ):
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, user_id: int, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic(), self._generations.get(user_id, 0), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached result for a user (lazily, via generation bump)."""
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+@dataclass
+class _UserIndex:
+    """Embeddings and row payloads for one user's memories."""
+
+    loaded_at: float
+    rows: list[dict] = field(default_factory=list)
+    matrix: np.ndarray = field(default_factory=lambda: np.zeros((0, 0), dtype=np.float32))
+    tokens: list[list[str]] = field(default_factory=list)
+    positions: dict[int, int] = field(default_factory=dict)  # memory_id -> row
+
+    def upsert(self, row: dict, embedding: np.ndarray) -> None:
+        vec = _normalize(embedding.astype(np.float32))
+        tokens = _row_tokens(row)
+        pos = self.positions.get(row["id"])
+        if pos is not None:
+            self.rows[pos] = row
+            self.matrix[pos] = vec
+            self.tokens[pos] = tokens
+            return
+
+        self.positions[row["id"]] = len(self.rows)
+        self.rows.append(row)
+        self.tokens.append(tokens)
+        if self.matrix.size == 0:
+            self.matrix = vec.reshape(1, -1)
+        else:
+            self.matrix = np.vstack([self.matrix, vec])
+
+    def remove(self, memory_id: int) -> None:
+        pos = self.positions.pop(memory_id, None)
+        if pos is None:
+            return
+        del self.rows[pos]
+        del self.tokens[pos]
+        self.matrix = np.delete(self.matrix, pos, axis=0)
+        self.positions = {r["id"]: i for i, r in enumerate(self.rows)}
+
+
+class MemoryVectorIndex:
+    """Per-user in-process vector index over the memories table."""
+
+    def __init__(
+        self,
+        db_pool: asyncpg.Pool,
+        ttl_seconds: float = 300.0,
+        max_users: int = 256,
+    ):
+        self.db = db_pool
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._users: OrderedDict[int, _UserIndex] = OrderedDict()
+        self._load_locks: dict[int, asyncio.Lock] = {}
+
+    def is_fresh(self, user_id: int) -> bool:
+        """True if the user's index is loaded and younger than the TTL."""
+        index = self._users.get(user_id)
+        return index is not None and time.monotonic() - index.loaded_at <= self.ttl_seconds
+
+    async def ensure_loaded(self, user_id: int) -> _UserIndex:
+        """Return the user's index, (re)loading it from Postgres if stale."""
+        if self.is_fresh(user_id):
+            self._users.move_to_end(user_id)
+            return self._users[user_id]
+
+        # Concurrent sub-queries from retrieve_multi share a single load
+        lock = self._load_locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            if self.is_fresh(user_id):
+                return self._users[user_id]
+
+            rows = await self.db.fetch(
+                f"SELECT {_INDEX_COLUMNS} FROM memories WHERE user_id = $1 AND embedding IS NOT NULL",
+                user_id,
+            )
+            index = _UserIndex(loaded_at=time.monotonic())
+            vectors = []
+            for r in rows:
+                row = dict(r)
+                vectors.append(_normalize(parse_pgvector(row.pop("embedding"))))
+                index.positions[row["id"]] = len(index.rows)
+                index.rows.append(row)
+                index.tokens.append(_row_tokens(row))
+            if vectors:
+                index.matrix = np.vstack(vectors)
+
+            self._users[user_id] = index
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                evicted, _ = self._users.popitem(last=False)
+                self._load_locks.pop(evicted, None)
+
+        logger.debug(f"Loaded vector index for user={user_id} ({len(index.rows)} memories)")
+        return index
+
+    def upsert(self, row: dict, embedding: list[float]) -> None:
+        """Apply a write to an already-loaded index (no-op if not loaded)."""
+        index = self._users.get(row["user_id"])
+        if index is not None:
+            index.upsert(dict(row), np.asarray(embedding, dtype=np.float32))
+
+    def remove(self, user_id: int, memory_id: int) -> None:
+        index = self._users.get(user_id)
+        if index is not None:
+            index.remove(memory_id)
+
+    def invalidate(self, user_id: int) -> None:
+        """Force the next access to reload from Postgres."""
+        self._users.pop(user_id, None)
+
+    def nearest(
+        self, user_id: int, embedding: list[float], privacy_level: str
+    ) -> Optional[dict]:
+        """
+        Most similar memory at the same privacy level (MemoryUpdater._find_similar).
+
+        Callers must check is_fresh() first and fall back to SQL otherwise.
+        Returns None if the user has no memories at that privacy level.
+        """
+        index = self._users[user_id]
+        mask = np.array([r["privacy_level"] == privacy_level for r in index.rows], dtype=bool)
+        if not mask.any():
+            return None
+
+        sims = index.matrix @ _normalize(np.asarray(embedding, dtype=np.float32))
+        sims = np.where(mask, sims, -np.inf)
+        best = int(np.argmax(sims))
+        return {**index.rows[best], "similarity": float(sims[best])}
+
+    def search(
+        self,
+        user_id: int,
+        query: str,
+        embedding: list[float],
+        context_privacy: str,
+        guild_id: Optional[int],
+        channel_id: Optional[int],
+        top_k: int,
+        candidate_limit: int,
+        agent_id: Optional[str],
+    ) -> Optional[list[dict]]:
+        """
+        In-process equivalent of hybrid_memory_search().
+
+        Returns None if the user's index isn't fresh.
+        """
+        if not self.is_fresh(user_id):
+            return None
+        index = self._users[user_id]
+        if not index.rows:
+            return []
+
+        candidates = [
+            i for i, r in enumerate(index.rows)
+            if r.get("agent_id") == agent_id
+            and self._privacy_visible(r, context_privacy, guild_id, channel_id)
+        ]
+        if not candidates:
+            return []
+
+        # Semantic ranks: cosine similarity over the visible rows
+        sims = index.matrix[candidates] @ _normalize(np.asarray(embedding, dtype=np.float32))
+        order = np.argsort(-sims)[:candidate_limit]
+        semantic_rank = {candidates[int(j)]: rank + 1 for rank, j in enumerate(order)}
+
+        # Lexical ranks: every query term must match (plainto_tsquery is an AND)
+        terms = _tokenize(query)
+        lexical_rank: dict[int, int] = {}
+        if terms:
+            scored = []
+            for i in candidates:
+                doc = index.tokens[i]
+                counts = [sum(1 for t in doc if t.startswith(term)) for term in terms]
+                if all(counts):
+                    scored.append((sum(counts) / (1 + len(doc) ** 0.5), i))
+            scored.sort(key=lambda s: s[0], reverse=True)
+            lexical_rank = {i: rank + 1 for rank, (_, i) in enumerate(scored[:candidate_limit])}
+
+        fused = []
+        for i in set(semantic_rank) | set(lexical_rank):
+            s_rank = semantic_rank.get(i)
+            l_rank = lexical_rank.get(i)
+            score = (1.0 / (_SQL_RRF_K + s_rank) if s_rank else 0.0) + (
+                1.0 / (_SQL_RRF_K + l_rank) if l_rank else 0.0
+            )
+            fused.append({
+                **index.rows[i],
+                "similarity": score,
+                "rrf_score": score,
+                "semantic_rank": s_rank or 999,
+                "lexical_rank": l_rank or 999,
+                "reaction_summary": None,
+            })
+
+        fused.sort(key=lambda r: r["rrf_score"], reverse=True)
+        return fused[:top_k]
+
+    @staticmethod
+    def _privacy_visible(
+        row: dict, context_privacy: str, guild_id: Optional[int], channel_id: Optional[int]
+    ) -> bool:
+        """Mirror of the privacy_filter CTE in hybrid_memory_search()."""
+        level = row["privacy_level"]
+        if context_privacy == "dm":
+            return level in ("dm", "global")
+        if context_privacy == "channel_restricted":
+            return (
+                level == "channel_restricted" and row.get("origin_channel_id") == channel_id
+            ) or level == "global"
+        if context_privacy == "guild_public":
+            return level in ("guild_public", "global")
+        return level == "global"
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self._users),
+            "memories": sum(len(i.rows) for i in self._users.values()),
+        }
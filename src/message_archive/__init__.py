@@ -0,0 +1,20 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Message Archive Package
+
+Local, indexed copy of guild messages that serves search_messages and
+recent-message reads without paging Discord history.
+"""
+
+from .store import ArchivedAuthor, ArchivedMessage, MessageArchive
+from .backfill import ArchiveBackfill
+
+__all__ = [
+    "ArchivedAuthor",
+    "ArchivedMessage",
+    "MessageArchive",
+    "ArchiveBackfill",
+]
@@ -0,0 +1,211 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Message Archive Backfill
+
+Background job that fills message_archive from channel history.
+
+Each tick, for every guild text channel the bot can read:
+1. Head catch-up (once per gateway session): fetch everything newer than the
+   head cursor in message_archive_channels, oldest first, then mark the
+   channel live. From then on on_message/edit/delete events keep the
+   channel's head complete, so MessageArchive.recent() can serve it. The
+   cursor is advanced only here, never by live events, so a message archived
+   by on_message before the tick reaches the channel can't skip the gap.
+2. History walk: page backward from message_archive_channels.oldest_message_id
+   until a short page marks the channel complete. The walk is spread across
+   ticks by a page budget to stay well under Discord's rate limits, and
+   resumes from the saved cursor after a restart.
+"""
+
+import logging
+import os
+from typing import TYPE_CHECKING, Optional
+
+import discord
+from discord.ext import tasks
+
+from .store import MessageArchive
+
+if TYPE_CHECKING:
+    from discord_bot import DiscordBot
+
+logger = logging.getLogger("slashAI.message_archive.backfill")
+
+# Discord's maximum page size for channel history
+PAGE_SIZE = 100
+
+# History pages fetched per tick across all channels (head catch-up included)
+BACKFILL_PAGES = int(os.getenv("MESSAGE_ARCHIVE_BACKFILL_PAGES", "5"))
+
+# Seconds between ticks
+BACKFILL_INTERVAL = int(os.getenv("MESSAGE_ARCHIVE_BACKFILL_INTERVAL", "60"))
+
+
+class ArchiveBackfill:
+    """Resumable history backfill for the message archive."""
+
+    def __init__(
+        self,
+        bot: "DiscordBot",
+        archive: MessageArchive,
+        pages_per_tick: int = BACKFILL_PAGES,
+        interval: int = BACKFILL_INTERVAL,
+    ):
+        """
+        Args:
+            bot: Discord bot instance
+            archive: Archive to fill
+            pages_per_tick: History page budget per tick
+            interval: Seconds between ticks
+        """
+        self.bot = bot
+        self.archive = archive
+        self.pages_per_tick = pages_per_tick
+        self._started = False
+        self._backfill_loop.change_interval(seconds=interval)
+
+    def start(self) -> None:
+        """Start the backfill loop."""
+        if not self._started:
+            self._backfill_loop.start()
+            self._started = True
+            logger.info("Message archive backfill started")
+
+    def stop(self) -> None:
+        """Stop the backfill loop."""
+        if self._started:
+            self._backfill_loop.cancel()
+            self._started = False
+            logger.info("Message archive backfill stopped")
+
+    @tasks.loop(seconds=60)  # placeholder; actual interval set in __init__
+    async def _backfill_loop(self) -> None:
+        try:
+            await self.run_once()
+        except Exception as e:
+            logger.error(f"Error in message archive backfill: {e}", exc_info=True)
+
+    @_backfill_loop.before_loop
+    async def _before_backfill(self) -> None:
+        """Wait for the bot to be ready before starting."""
+        await self.bot.wait_until_ready()
+
+    def _readable_channels(self) -> list[discord.TextChannel]:
+        channels = []
+        for guild in self.bot.guilds:
+            for ch in guild.channels:
+                if not isinstance(ch, discord.TextChannel):
+                    continue
+                perms = ch.permissions_for(guild.me)
+                if perms.read_messages and perms.read_message_history:
+                    channels.append(ch)
+        return channels
+
+    async def run_once(self) -> dict:
+        """
+        Run one tick: head catch-up where needed, then history pages.
+
+        Returns:
+            Dictionary with tick statistics
+        """
+        stats = {"pages": 0, "messages": 0, "caught_up": 0, "completed": 0}
+        if not await self.archive.is_available():
+            return stats
+
+        channels = self._readable_channels()
+        if not channels:
+            return stats
+
+        channel_ids = [ch.id for ch in channels]
+        cursors = await self.archive.get_cursors(channel_ids)
+
+        # Catch-up always finishes (a channel isn't live until it has), but
+        # its pages count against the walk budget
+        for channel in channels:
+            if self.archive.is_live(channel.id):
+                continue
+            cursor = cursors.get(channel.id)
+            try:
+                await self._catch_up(
+                    channel, cursor["newest_message_id"] if cursor else None, stats
+                )
+                stats["caught_up"] += 1
+            except discord.HTTPException as e:
+                logger.warning(f"Archive catch-up failed for #{channel.name}: {e}")
+
+        if stats["caught_up"]:
+            cursors = await self.archive.get_cursors(channel_ids)
+        for channel in channels:
+            if stats["pages"] >= self.pages_per_tick:
+                break
+            cursor = cursors.get(channel.id)
+            if cursor is None or cursor["backfill_complete"] or cursor["oldest_message_id"] is None:
+                continue
+            try:
+                await self._walk_back(channel, cursor["oldest_message_id"], stats)
+            except discord.HTTPException as e:
+                logger.warning(f"Archive backfill failed for #{channel.name}: {e}")
+
+        if stats["messages"]:
+            logger.info(
+                f"Message archive backfill: {stats['messages']} messages in "
+                f"{stats['pages']} pages, {stats['caught_up']} channels caught up, "
+                f"{stats['completed']} completed"
+            )
+        return stats
+
+    async def _fetch_page(self, channel: discord.TextChannel, **kwargs) -> list[discord.Message]:
+        return [m async for m in channel.history(limit=PAGE_SIZE, **kwargs)]
+
+    async def _catch_up(
+        self, channel: discord.TextChannel, newest: Optional[int], stats: dict
+    ) -> None:
+        """Archive everything newer than the head cursor `newest`, then mark live."""
+        if newest is None:
+            # Never backfilled: take the latest page and start the walk below it
+            page = await self._fetch_page(channel)
+            stats["pages"] += 1
+            stats["messages"] += await self.archive.record_many(page)
+            complete = len(page) < PAGE_SIZE
+            await self.archive.save_cursor(
+                channel.id,
+                channel.guild.id,
+                page[-1].id if page else None,
+                complete,
+                newest_message_id=page[0].id if page else None,
+            )
+            if complete:
+                stats["completed"] += 1
+        else:
+            while True:
+                page = await self._fetch_page(
+                    channel, after=discord.Object(id=newest), oldest_first=True
+                )
+                stats["pages"] += 1
+                stats["messages"] += await self.archive.record_many(page)
+                if page:
+                    newest = page[-1].id
+                    await self.archive.advance_head(channel.id, newest)
+                if len(page) < PAGE_SIZE:
+                    break
+
+        self.archive.mark_live(channel.id)
+
+    async def _walk_back(
+        self, channel: discord.TextChannel, oldest: Optional[int], stats: dict
+    ) -> None:
+        """Page backward from `oldest` until the budget runs out or history ends."""
+        while stats["pages"] < self.pages_per_tick:
+            page = await self._fetch_page(channel, before=discord.Object(id=oldest))
+            stats["pages"] += 1
+            stats["messages"] += await self.archive.record_many(page)
+            complete = len(page) < PAGE_SIZE
+            if page:
+                oldest = page[-1].id
+            await self.archive.save_cursor(channel.id, channel.guild.id, oldest, complete)
+            if complete:
+                stats["completed"] += 1
+                return
@@ -0,0 +1,306 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Message Archive Store
+
+Postgres-backed copy of guild messages (message_archive, migration 023).
+
+- record() / record_many() upsert messages from gateway events and backfill
+- apply_edit() / delete() keep the copy in sync with raw edit/delete events
+- search() matches words (full-text, any order) or substrings (trigram
+  ILIKE) with optional channel and author filters, newest first
+- recent() serves "last N messages" reads for channels whose head has been
+  caught up since this gateway session started; otherwise it returns None
+  and the caller falls back to channel.history()
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional
+
+import asyncpg
+import discord
+
+logger = logging.getLogger("slashAI.message_archive")
+
+_UPSERT_SQL = """
+    INSERT INTO message_archive (
+        message_id, channel_id, guild_id, author_id, author_name,
+        author_display_name, author_is_bot, content, created_at, edited_at
+    )
+    SELECT * FROM unnest(
+        $1::bigint[], $2::bigint[], $3::bigint[], $4::bigint[], $5::text[],
+        $6::text[], $7::bool[], $8::text[], $9::timestamptz[], $10::timestamptz[]
+    )
+    ON CONFLICT (message_id) DO UPDATE SET
+        content = EXCLUDED.content,
+        edited_at = EXCLUDED.edited_at,
+        author_display_name = EXCLUDED.author_display_name
+"""
+
+_COLUMNS = "message_id, channel_id, author_id, author_name, author_display_name, author_is_bot, content, created_at"
+
+
+@dataclass
+class ArchivedAuthor:
+    """The author fields of an archived message (duck-types discord.User)."""
+
+    id: int
+    name: str
+    display_name: str
+    bot: bool
+
+
+@dataclass
+class ArchivedMessage:
+    """An archived message (duck-types the discord.Message fields tools use)."""
+
+    id: int
+    channel_id: int
+    author: ArchivedAuthor
+    content: str
+    created_at: datetime
+
+    @classmethod
+    def from_row(cls, row) -> "ArchivedMessage":
+        return cls(
+            id=row["message_id"],
+            channel_id=row["channel_id"],
+            author=ArchivedAuthor(
+                id=row["author_id"],
+                name=row["author_name"],
+                display_name=row["author_display_name"],
+                bot=row["author_is_bot"],
+            ),
+            content=row["content"],
+            created_at=row["created_at"],
+        )
+
+
+def _like_pattern(text: str) -> str:
+    """Substring ILIKE pattern with LIKE wildcards in `text` escaped."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class MessageArchive:
+    """Read/write access to the local message archive."""
+
+    def __init__(self, db_pool: asyncpg.Pool):
+        self.db = db_pool
+        self._available: bool | None = None  # Cache for schema check
+        # Channels whose head was caught up during this gateway session;
+        # with live events flowing, their archive is complete
+        self._live_channels: set[int] = set()
+
+    async def is_available(self) -> bool:
+        """True when migration 023 has been applied."""
+        if self._available is not None:
+            return self._available
+        try:
+            self._available = bool(await self.db.fetchval(
+                "SELECT to_regclass('message_archive') IS NOT NULL"
+            ))
+            if not self._available:
+                logger.warning(
+                    "Message archive unavailable: message_archive not found. "
+                    "Run migration 023. Searching live history instead."
+                )
+        except Exception as e:
+            logger.warning(f"Message archive schema check failed: {e}")
+            self._available = False
+        return self._available
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    async def record(self, message: discord.Message) -> None:
+        """Archive one guild message (DMs are never archived)."""
+        await self.record_many([message])
+
+    async def record_many(self, messages: Iterable[discord.Message]) -> int:
+        """
+        Upsert guild messages in one round-trip.
+
+        Returns:
+            Number of messages written
+        """
+        rows = [
+            (
+                m.id,
+                m.channel.id,
+                m.guild.id,
+                m.author.id,
+                m.author.name,
+                m.author.display_name or m.author.name,
+                m.author.bot,
+                m.content or "",
+                m.created_at,
+                m.edited_at,
+            )
+            for m in messages
+            if m.guild is not None
+        ]
+        if not rows:
+            return 0
+        await self.db.execute(_UPSERT_SQL, *(list(col) for col in zip(*rows)))
+        return len(rows)
+
+    async def apply_edit(self, message_id: int, content: str, edited_at: Optional[datetime]) -> None:
+        """Update an archived message's content after an edit."""
+        await self.db.execute(
+            "UPDATE message_archive SET content = $2, edited_at = $3 WHERE message_id = $1",
+            message_id,
+            content,
+            edited_at,
+        )
+
+    async def delete(self, message_ids: Iterable[int]) -> None:
+        """Remove deleted messages from the archive."""
+        ids = list(message_ids)
+        if ids:
+            await self.db.execute(
+                "DELETE FROM message_archive WHERE message_id = ANY($1::bigint[])", ids
+            )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def search(
+        self,
+        query: str,
+        channel_ids: Optional[list[int]] = None,
+        author_id: Optional[int] = None,
+        author_name: Optional[str] = None,
+        limit: int = 10,
+    ) -> list[ArchivedMessage]:
+        """
+        Find messages by content, newest first.
+
+        A message matches if it contains every word of `query` (any order)
+        or contains `query` as a case-insensitive substring.
+
+        Args:
+            query: Text to search for
+            channel_ids: Restrict to these channels (None = all archived)
+            author_id: Restrict to one author
+            author_name: Restrict by username/display name substring when
+                the author could not be resolved to an ID
+            limit: Maximum results
+        """
+        rows = await self.db.fetch(
+            f"""
+            SELECT {_COLUMNS}
+            FROM message_archive
+            WHERE (content_tsv @@ plainto_tsquery('simple', $1) OR content ILIKE $2)
+              AND ($3::bigint[] IS NULL OR channel_id = ANY($3))
+              AND ($4::bigint IS NULL OR author_id = $4)
+              AND ($5::text IS NULL OR author_name ILIKE $5 OR author_display_name ILIKE $5)
+            ORDER BY created_at DESC
+            LIMIT $6
+            """,
+            query,
+            _like_pattern(query),
+            channel_ids,
+            author_id,
+            _like_pattern(author_name) if author_name else None,
+            limit,
+        )
+        return [ArchivedMessage.from_row(r) for r in rows]
+
+    async def recent(self, channel_id: int, limit: int) -> Optional[list[ArchivedMessage]]:
+        """
+        Last `limit` messages of a channel, newest first.
+
+        Returns:
+            None if the channel isn't known to be complete this session
+        """
+        if channel_id not in self._live_channels:
+            return None
+        rows = await self.db.fetch(
+            f"""
+            SELECT {_COLUMNS}
+            FROM message_archive
+            WHERE channel_id = $1
+            ORDER BY created_at DESC
+            LIMIT $2
+            """,
+            channel_id,
+            limit,
+        )
+        return [ArchivedMessage.from_row(r) for r in rows]
+
+    # ------------------------------------------------------------------
+    # Session coverage and backfill cursors
+    # ------------------------------------------------------------------
+
+    def mark_live(self, channel_id: int) -> None:
+        self._live_channels.add(channel_id)
+
+    def is_live(self, channel_id: int) -> bool:
+        return channel_id in self._live_channels
+
+    def reset_live(self) -> None:
+        """Forget coverage (new gateway session: events may have been missed)."""
+        self._live_channels.clear()
+
+    async def get_cursors(self, channel_ids: list[int]) -> dict[int, asyncpg.Record]:
+        """Backfill state (oldest/newest_message_id, backfill_complete) per channel."""
+        rows = await self.db.fetch(
+            """
+            SELECT channel_id, oldest_message_id, newest_message_id, backfill_complete
+            FROM message_archive_channels
+            WHERE channel_id = ANY($1::bigint[])
+            """,
+            channel_ids,
+        )
+        return {r["channel_id"]: r for r in rows}
+
+    async def save_cursor(
+        self,
+        channel_id: int,
+        guild_id: int,
+        oldest_message_id: Optional[int],
+        complete: bool,
+        newest_message_id: Optional[int] = None,
+    ) -> None:
+        """Save walk progress; the head cursor only moves forward (NULL keeps it)."""
+        await self.db.execute(
+            """
+            INSERT INTO message_archive_channels
+                (channel_id, guild_id, oldest_message_id, newest_message_id,
+                 backfill_complete, updated_at)
+            VALUES ($1, $2, $3, $5, $4, NOW())
+            ON CONFLICT (channel_id) DO UPDATE SET
+                oldest_message_id = LEAST(
+                    message_archive_channels.oldest_message_id, EXCLUDED.oldest_message_id
+                ),
+                newest_message_id = GREATEST(
+                    message_archive_channels.newest_message_id, EXCLUDED.newest_message_id
+                ),
+                backfill_complete = EXCLUDED.backfill_complete,
+                updated_at = NOW()
+            """,
+            channel_id,
+            guild_id,
+            oldest_message_id,
+            complete,
+            newest_message_id,
+        )
+
+    async def advance_head(self, channel_id: int, newest_message_id: int) -> None:
+        """Move a channel's caught-up head cursor forward after a catch-up page."""
+        await self.db.execute(
+            """
+            UPDATE message_archive_channels
+            SET newest_message_id = GREATEST(newest_message_id, $2), updated_at = NOW()
+            WHERE channel_id = $1
+            """,
+            channel_id,
+            newest_message_id,
+        )
@@ -39,6 +39,7 @@ class GlobalProactiveConfig:
     cross_persona_lockout_seconds: int         # PROACTIVE_CROSS_PERSONA_LOCKOUT_SECONDS
     decider_model_default: str                 # PROACTIVE_DECIDER_MODEL
     actor_model_default: str                   # PROACTIVE_ACTOR_MODEL
+    reflection_interval_seconds: int = 300     # PROACTIVE_REFLECTION_INTERVAL_SECONDS
 
     @classmethod
     def from_env(cls) -> "GlobalProactiveConfig":
@@ -53,4 +54,5 @@ class GlobalProactiveConfig:
             actor_model_default=os.getenv(
                 "PROACTIVE_ACTOR_MODEL", "claude-sonnet-4-6"
             ),
+            reflection_interval_seconds=_int_env("PROACTIVE_REFLECTION_INTERVAL_SECONDS", 300),
         )
@@ -21,6 +21,7 @@ from typing import Any, Optional
 import anthropic
 
 from agents.persona_loader import PersonaConfig
+from prompt_layout import cache_hit_ratio, cached_text
 
 from .observer import DeciderInput
 from .store import BudgetSummary
@@ -48,10 +49,38 @@ class ValidatedDecision:
     output_tokens: int
     decider_model: str
     raw: Optional[dict[str, Any]] = None     # original JSON for audit
+    cache_read_tokens: int = 0
+    cache_hit_ratio: float = 0.0             # cached share of the prompt
 
 
-def _build_prompt(ctx: DeciderInput) -> tuple[str, str]:
-    """Returns (system_prompt, user_prompt)."""
+# Decider instructions and output schema. Identical for every persona and
+# tick, so it heads the request as the cached prefix.
+_DECIDER_SYSTEM = (
+    "You decide whether an AI persona should proactively act in a Discord channel. "
+    "You return strict JSON. You bias HARD toward 'none' — most ticks should be no-ops. "
+    "Reactions are the sweet spot: low-stakes, charming. Replies are sparing — only when "
+    "there's a clear opening. New topics are rare — only in genuinely quiet channels with "
+    "a real reason to engage. If a human conversation is active, prefer 'none' or a single "
+    "reaction. If another persona just acted, prefer 'none' — don't pile on."
+    """
+
+# Decide
+Respond with strict JSON only. No prose outside the JSON.
+
+Schema:
+{
+  "action": "none" | "react" | "reply" | "new_topic" | "engage_persona",
+  "target_message_id": <int or null>,
+  "target_persona_id": <string or null>,
+  "emoji": <string or null>,
+  "reasoning": <string, 1-2 sentences>,
+  "confidence": <float 0.0-1.0>
+}"""
+)
+
+
+def _build_prompt(ctx: DeciderInput) -> tuple[list[dict], list[dict]]:
+    """Returns (system_blocks, user_blocks), ordered for prompt caching."""
     persona = ctx.persona
 
     persona_summary = (
@@ -87,19 +116,15 @@ def _build_prompt(ctx: DeciderInput) -> tuple[str, str]:
         "new message arrived" if ctx.trigger == "activity" else "scheduled silence check"
     )
 
-    system = (
-        "You decide whether an AI persona should proactively act in a Discord channel. "
-        "You return strict JSON. You bias HARD toward 'none' — most ticks should be no-ops. "
-        "Reactions are the sweet spot: low-stakes, charming. Replies are sparing — only when "
-        "there's a clear opening. New topics are rare — only in genuinely quiet channels with "
-        "a real reason to engage. If a human conversation is active, prefer 'none' or a single "
-        "reaction. If another persona just acted, prefer 'none' — don't pile on."
-    )
+    # Stable → volatile: instructions and schema (shared by every persona),
+    # then the persona, then this tick's channel state. The first two carry
+    # cache breakpoints so only the channel state is uncached input.
+    system = [cached_text(_DECIDER_SYSTEM)]
 
-    user = f"""# Persona deciding
-{persona_summary}
+    persona_block = f"""# Persona deciding
+{persona_summary}"""
 
-# Channel state
+    state_block = f"""# Channel state
 Channel: #{ctx.channel_name}
 Time: {ctx.now_local}
 Trigger: {ctx.trigger} ({trigger_descr})
@@ -122,19 +147,9 @@ Other AI personas in this server: {other_personas}
 Personas that have acted in this channel within the last hour: {recent_acting}{active_thread}
 Human conversation active right now: {"yes" if ctx.is_human_conversation_active else "no"}
 
-# Decide
-Respond with strict JSON only. No prose outside the JSON.
+Decide now. Respond with strict JSON only, following the schema."""
 
-Schema:
-{{
-  "action": "none" | "react" | "reply" | "new_topic" | "engage_persona",
-  "target_message_id": <int or null>,
-  "target_persona_id": <string or null>,
-  "emoji": <string or null>,
-  "reasoning": <string, 1-2 sentences>,
-  "confidence": <float 0.0-1.0>
-}}
-"""
+    user = [cached_text(persona_block), {"type": "text", "text": state_block}]
     return system, user
 
 
@@ -221,13 +236,16 @@ class ProactiveDecider:
         in_tok = int(getattr(usage, "input_tokens", 0)) if usage else 0
         out_tok = int(getattr(usage, "output_tokens", 0)) if usage else 0
 
-        return self._sanitize(
+        decision = self._sanitize(
             text=text,
             ctx=ctx,
             input_tokens=in_tok,
             output_tokens=out_tok,
             decider_model=model,
         )
+        decision.cache_read_tokens = int(getattr(usage, "cache_read_input_tokens", 0) or 0) if usage else 0
+        decision.cache_hit_ratio = cache_hit_ratio(usage)
+        return decision
 
     def _sanitize(
         self,
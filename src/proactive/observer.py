@@ -220,6 +220,17 @@ class ProactiveObserver:
         }
 
     async def _fetch_recent(self, channel: discord.abc.Messageable) -> list[FormattedMsg]:
+        # Prefer the local message archive when it covers this channel's head
+        archive = getattr(self.bot, "message_archive", None)
+        if archive is not None and hasattr(channel, "id"):
+            try:
+                archived = await archive.recent(channel.id, RECENT_MESSAGE_LIMIT)
+            except Exception as e:
+                logger.warning(f"Archive read failed for {channel}, using history: {e}")
+                archived = None
+            if archived is not None:
+                return [self._format_message(m) for m in reversed(archived)]
+
         msgs: list[FormattedMsg] = []
         try:
             async for m in channel.history(limit=RECENT_MESSAGE_LIMIT):
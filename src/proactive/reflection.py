@@ -6,7 +6,7 @@
 Park-style reflection engine (Enhancement 015 / v0.16.4).
 
 Adopts Generative Agents (Park et al. 2023) prompts nearly verbatim:
-- Importance scoring (1-10 poignancy rating per observation)
+- Importance scoring (1-10 poignancy rating per observation, rated in batches)
 - Threshold-based reflection trigger (sum > 150 since last reflection)
 - Salient-questions then synthesis (5 insights with citation provenance)
 
@@ -35,6 +35,39 @@ PARK_IMPORTANCE_PROMPT = (
     "Rating:"
 )
 
+# Batched variant of the importance prompt: same scale, one rating per
+# numbered memory, returned through the record_ratings tool
+PARK_BATCH_IMPORTANCE_PROMPT = (
+    "On the scale of 1 to 10, where 1 is purely mundane (e.g., brushing teeth, "
+    "making bed) and 10 is extremely poignant (e.g., a break up, college "
+    "acceptance), rate the likely poignancy of each of the following pieces "
+    "of memory independently.\n"
+    "{numbered_memories}\n"
+    "Record one rating per memory number."
+)
+
+RECORD_RATINGS_TOOL = {
+    "name": "record_ratings",
+    "description": "Record a 1-10 poignancy rating for each numbered memory.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "ratings": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "memory": {"type": "integer", "description": "Memory number"},
+                        "rating": {"type": "integer", "minimum": 1, "maximum": 10},
+                    },
+                    "required": ["memory", "rating"],
+                },
+            }
+        },
+        "required": ["ratings"],
+    },
+}
+
 PARK_SALIENT_QUESTIONS_PROMPT = (
     "{statements}\n\n"
     "Given only the information above, what are 3 most salient high-level "
@@ -162,6 +195,28 @@ def parse_insights(text: str) -> list[dict[str, Any]]:
     return out
 
 
+def parse_batch_ratings(ratings: Any, count: int) -> list[int]:
+    """Map record_ratings tool input to one score per memory (1-based numbers).
+
+    Missing or malformed entries fall back to 5, the same default
+    parse_importance uses.
+    """
+    scores = [5] * count
+    if not isinstance(ratings, list):
+        return scores
+    for entry in ratings:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            index = int(entry.get("memory")) - 1
+            rating = int(entry.get("rating"))
+        except (TypeError, ValueError):
+            continue
+        if 0 <= index < count:
+            scores[index] = max(1, min(10, rating))
+    return scores
+
+
 def observation_text(action: dict[str, Any]) -> str:
     """Render a proactive_actions row as a 'memory' string for scoring/synthesis."""
     decision = action.get("decision", "?")
@@ -207,10 +262,12 @@ class ReflectionEngine:
         self,
         db_pool: asyncpg.Pool,
         threshold: int = DEFAULT_REFLECTION_THRESHOLD,
+        embeddings=None,
     ):
         self.db = db_pool
         self.threshold = threshold
         self._voyage = None  # lazy
+        self._embeddings = embeddings  # Shared memory.embeddings.EmbeddingService, if any
 
     # ------------------------------------------------------------------
     # Voyage embedding (lazy initialization)
@@ -218,6 +275,14 @@ class ReflectionEngine:
 
     async def _embed(self, text: str, input_type: str = "document") -> Optional[list[float]]:
         """Return a 1024-dim embedding via Voyage, or None if Voyage isn't configured."""
+        if self._embeddings is not None:
+            try:
+                return await self._embeddings.embed_one(
+                    text, model=EMBEDDING_MODEL, input_type=input_type
+                )
+            except Exception as e:
+                logger.warning(f"Voyage embed failed: {e}")
+                return None
         if self._voyage is None:
             try:
                 import voyageai
@@ -263,16 +328,44 @@ class ReflectionEngine:
             logger.warning(f"score_importance failed: {e}")
         return 5
 
+    async def score_importance_batch(self, texts: list[str], anthropic_client) -> list[int]:
+        """Rate several memories with one call (Park's scale). Returns 1-10 per text."""
+        if not texts:
+            return []
+        if anthropic_client is None:
+            return [5] * len(texts)
+        numbered = "\n".join(f"{i+1}. {text}" for i, text in enumerate(texts))
+        try:
+            resp = await anthropic_client.messages.create(
+                model=SCORING_MODEL_DEFAULT,
+                max_tokens=40 + 20 * len(texts),
+                system="You rate memories 1-10 by calling record_ratings. No explanation.",
+                tools=[RECORD_RATINGS_TOOL],
+                tool_choice={"type": "tool", "name": RECORD_RATINGS_TOOL["name"]},
+                messages=[
+                    {
+                        "role": "user",
+                        "content": PARK_BATCH_IMPORTANCE_PROMPT.format(numbered_memories=numbered),
+                    }
+                ],
+            )
+            for block in resp.content:
+                if getattr(block, "type", None) == "tool_use":
+                    return parse_batch_ratings(block.input.get("ratings"), len(texts))
+        except Exception as e:
+            logger.warning(f"score_importance_batch failed: {e}")
+        return [5] * len(texts)
+
     async def score_unscored_actions(
         self,
         persona_id: str,
         anthropic_client,
         batch_size: int = DEFAULT_SCORE_BATCH_SIZE,
     ) -> int:
-        """Score recent unscored proactive_actions for this persona.
+        """Score the oldest unscored proactive_actions for this persona.
 
-        Returns the number of rows newly scored. Bounded by batch_size to
-        keep heartbeat ticks short.
+        One batched rating call and one UPDATE for up to batch_size rows.
+        Returns the number of rows newly scored.
         """
         rows = await self.db.fetch(
             """
@@ -289,20 +382,21 @@ class ReflectionEngine:
         )
         if not rows:
             return 0
-        scored = 0
-        for row in rows:
-            action = dict(row)
-            try:
-                score = await self.score_importance(observation_text(action), anthropic_client)
-                await self.db.execute(
-                    "UPDATE proactive_actions SET importance = $2 WHERE id = $1",
-                    action["id"],
-                    score,
-                )
-                scored += 1
-            except Exception as e:
-                logger.warning(f"score_unscored_actions: failed on action {action['id']}: {e}")
-        return scored
+        actions = [dict(row) for row in rows]
+        scores = await self.score_importance_batch(
+            [observation_text(a) for a in actions], anthropic_client
+        )
+        await self.db.execute(
+            """
+            UPDATE proactive_actions AS pa
+            SET importance = s.importance
+            FROM unnest($1::bigint[], $2::int[]) AS s(id, importance)
+            WHERE pa.id = s.id
+            """,
+            [a["id"] for a in actions],
+            scores,
+        )
+        return len(actions)
 
     async def accumulated_importance_since_last_reflection(
         self, persona_id: str
@@ -311,34 +405,19 @@ class ReflectionEngine:
 
         If no reflection has been stored yet, sums everything scored.
         """
-        # Use the most recent reflection's created_at as the cutoff.
-        cutoff = await self.db.fetchval(
+        row = await self.db.fetchrow(
             """
-            SELECT MAX(created_at) FROM agent_reflections WHERE persona_id = $1
+            SELECT COALESCE(SUM(pa.importance), 0)::INT AS total
+            FROM proactive_actions pa
+            WHERE pa.persona_id = $1
+              AND pa.importance IS NOT NULL
+              AND pa.created_at > COALESCE(
+                  (SELECT MAX(created_at) FROM agent_reflections WHERE persona_id = $1),
+                  '-infinity'::timestamptz
+              )
             """,
             persona_id,
         )
-        if cutoff is None:
-            row = await self.db.fetchrow(
-                """
-                SELECT COALESCE(SUM(importance), 0)::INT AS total
-                FROM proactive_actions
-                WHERE persona_id = $1 AND importance IS NOT NULL
-                """,
-                persona_id,
-            )
-        else:
-            row = await self.db.fetchrow(
-                """
-                SELECT COALESCE(SUM(importance), 0)::INT AS total
-                FROM proactive_actions
-                WHERE persona_id = $1
-                  AND importance IS NOT NULL
-                  AND created_at > $2
-                """,
-                persona_id,
-                cutoff,
-            )
         return int(row["total"]) if row else 0
 
     async def should_reflect(self, persona_id: str) -> bool:
@@ -578,22 +657,24 @@ class ReflectionEngine:
         persona_id: str,
         anthropic_client,
         force: bool = False,
+        score: bool = True,
     ) -> ReflectStats:
         """Score recent actions, check threshold, synthesize + store reflections.
 
-        Called inline at the end of each heartbeat tick (try/except wraps it so
-        a reflection failure doesn't kill the heartbeat). Operators can also
-        force-trigger via /proactive reflect.
+        Called by the scheduler's reflection job after it has drained the
+        scoring backlog (score=False). Operators can also force-trigger via
+        /proactive reflect, which scores one batch first.
         """
         stats = ReflectStats(persona_id=persona_id, threshold=self.threshold)
 
         # 1. Retroactively score any unscored actions
-        try:
-            stats.scored_count = await self.score_unscored_actions(
-                persona_id, anthropic_client
-            )
-        except Exception as e:
-            logger.warning(f"[{persona_id}] score_unscored_actions failed: {e}")
+        if score:
+            try:
+                stats.scored_count = await self.score_unscored_actions(
+                    persona_id, anthropic_client
+                )
+            except Exception as e:
+                logger.warning(f"[{persona_id}] score_unscored_actions failed: {e}")
 
         # 2. Check threshold
         try:
@@ -620,46 +701,50 @@ class ReflectionEngine:
             stats.skipped_reason = "no_questions_generated"
             return stats
 
-        # 5. For each question, synthesize insights and store
+        # 5. For each question, synthesize insights
+        insights: list[dict[str, Any]] = []
         for question in questions:
-            insights = await self.synthesize_for_question(
+            insights.extend(await self.synthesize_for_question(
                 question=question,
                 candidate_memories=memories,
                 subject=persona_id,
                 anthropic_client=anthropic_client,
+            ))
+
+        # 6. Score the importance of every insight in one call, then store
+        importances = await self.score_importance_batch(
+            [insight["text"] for insight in insights], anthropic_client
+        )
+        for insight, importance in zip(insights, importances):
+            # Pick a representative source action from the cited indices
+            # (1-based) and use it to infer subject. Falls back to ('self', persona_id).
+            cite_indices = insight.get("cite_indices", [])
+            anchor_action = (
+                memories[cite_indices[0] - 1]
+                if cite_indices and 0 < cite_indices[0] <= len(memories)
+                else None
             )
-            for insight in insights:
-                # Pick a representative source action from the cited indices
-                # (1-based) and use it to infer subject. Falls back to ('self', persona_id).
-                cite_indices = insight.get("cite_indices", [])
-                anchor_action = (
-                    memories[cite_indices[0] - 1]
-                    if cite_indices and 0 < cite_indices[0] <= len(memories)
-                    else None
+            if anchor_action:
+                subject_type, subject_id = infer_subject(anchor_action)
+            else:
+                subject_type, subject_id = ("self", persona_id)
+
+            cites = [
+                {"type": "action", "id": memories[idx - 1]["id"]}
+                for idx in cite_indices
+                if 0 < idx <= len(memories)
+            ]
+            try:
+                await self.store_reflection(
+                    persona_id=persona_id,
+                    subject_type=subject_type,
+                    subject_id=subject_id,
+                    content=insight["text"],
+                    importance=importance,
+                    cites=cites,
                 )
-                if anchor_action:
-                    subject_type, subject_id = infer_subject(anchor_action)
-                else:
-                    subject_type, subject_id = ("self", persona_id)
-
-                cites = [
-                    {"type": "action", "id": memories[idx - 1]["id"]}
-                    for idx in cite_indices
-                    if 0 < idx <= len(memories)
-                ]
-                # Score the importance of the insight itself
-                importance = await self.score_importance(insight["text"], anthropic_client)
-                try:
-                    await self.store_reflection(
-                        persona_id=persona_id,
-                        subject_type=subject_type,
-                        subject_id=subject_id,
-                        content=insight["text"],
-                        importance=importance,
-                        cites=cites,
-                    )
-                    stats.reflections_stored += 1
-                except Exception as e:
-                    logger.warning(f"[{persona_id}] store_reflection failed: {e}")
+                stats.reflections_stored += 1
+            except Exception as e:
+                logger.warning(f"[{persona_id}] store_reflection failed: {e}")
 
         return stats
@@ -7,6 +7,7 @@ ProactiveScheduler — the entry point that ties everything together.
 
 One instance per persona. Owns:
   - the heartbeat tasks.loop (silence-breaker check across allowlisted channels)
+  - the reflection tasks.loop (batched importance scoring + reflection trigger)
   - the on_message_hook (activity path)
   - construction of pre-filter context, decider, actor
 
@@ -24,13 +25,14 @@ from discord.ext import tasks
 
 from agents.persona_loader import PersonaConfig
 from analytics import track
+from llm_gateway import LANE_REFLECTION, LaneClient
 
 from .actor import ProactiveActor
 from .config import GlobalProactiveConfig
 from .decider import ProactiveDecider
 from .observer import ProactiveObserver
 from .policy import PreFilterContext, can_consider_acting, remaining_budget
-from .reflection import ReflectionEngine
+from .reflection import DEFAULT_SCORE_BATCH_SIZE, ReflectionEngine
 from .store import ActionRecord, ProactiveStore
 from .threads import InterAgentThreads, ThreadState
 
@@ -41,6 +43,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger("slashAI.proactive.scheduler")
 
 HUMAN_LAST_MESSAGE_LOOKBACK = 50  # max messages to scan for "last human message"
+SCORE_BATCHES_PER_TICK = 5  # max scoring batches per reflection tick (DEFAULT_SCORE_BATCH_SIZE each)
 
 
 class ProactiveScheduler:
@@ -65,7 +68,9 @@ class ProactiveScheduler:
 
         self.store = ProactiveStore(db_pool)
         self.threads = InterAgentThreads(db_pool)
-        self.reflection = ReflectionEngine(db_pool)
+        self.reflection = ReflectionEngine(
+            db_pool, embeddings=getattr(memory_manager, "embeddings", None)
+        )
         self.observer = ProactiveObserver(
             persona, bot, memory_manager, self.store,
             threads=self.threads,
@@ -78,13 +83,18 @@ class ProactiveScheduler:
             threads=self.threads,
             resolve_persona_user_id=self.resolve_persona_user_id,
         )
-        # Stash the anthropic client for the reflection job
-        self._anthropic_client = anthropic_client
+        # Stash the anthropic client for the reflection job (in the gateway's
+        # background reflection lane when the client came from the gateway)
+        if isinstance(anthropic_client, LaneClient):
+            self._anthropic_client = anthropic_client.for_lane(LANE_REFLECTION)
+        else:
+            self._anthropic_client = anthropic_client
 
         self._started = False
         # Runtime-mutable schedule period: discord.ext.tasks.loop is decorated
         # at class level so we read interval out at start time.
         self._heartbeat.change_interval(seconds=global_config.heartbeat_interval_seconds)
+        self._reflection_loop.change_interval(seconds=global_config.reflection_interval_seconds)
 
     # ------------------------------------------------------------------
     # Lifecycle
@@ -106,6 +116,7 @@ class ProactiveScheduler:
             )
             return
         self._heartbeat.start()
+        self._reflection_loop.start()
         self._started = True
         logger.info(
             f"[{self.persona.name}] proactive scheduler started "
@@ -117,6 +128,7 @@ class ProactiveScheduler:
     def stop(self) -> None:
         if self._started:
             self._heartbeat.cancel()
+            self._reflection_loop.cancel()
             self._started = False
             logger.info(f"[{self.persona.name}] proactive scheduler stopped")
 
@@ -204,31 +216,57 @@ class ProactiveScheduler:
                     exc_info=True,
                 )
 
-        # End-of-tick reflection check (Enhancement 015 / v0.16.4).
-        # Wrapped in try/except so a reflection failure can't kill the loop.
+    @_heartbeat.before_loop
+    async def _before_heartbeat(self) -> None:
+        await self.bot.wait_until_ready()
+        logger.info(f"[{self.persona.name}] heartbeat ready, entering loop")
+
+    # ------------------------------------------------------------------
+    # Reflection path (Enhancement 015 / v0.16.4)
+    # ------------------------------------------------------------------
+
+    @tasks.loop(seconds=300)  # placeholder; actual interval set in __init__
+    async def _reflection_loop(self) -> None:
+        """Score the importance backlog in batches, then check the reflection threshold.
+
+        Runs on its own loop so heartbeat ticks don't grow with the backlog.
+        Wrapped in try/except so a reflection failure can't kill the loop.
+        """
         try:
+            scored = await self._score_backlog()
             stats = await self.reflection.maybe_reflect(
-                self.persona.name, self._anthropic_client
+                self.persona.name, self._anthropic_client, score=False
             )
             if stats.reflections_stored > 0:
                 logger.info(
                     f"[{self.persona.name}] reflection stored "
                     f"{stats.reflections_stored} insights "
-                    f"(scored {stats.scored_count} actions, "
+                    f"(scored {scored} actions, "
                     f"accumulated {stats.accumulated})"
                 )
-            elif stats.scored_count > 0:
+            elif scored > 0:
                 logger.debug(
-                    f"[{self.persona.name}] reflection scored {stats.scored_count} "
+                    f"[{self.persona.name}] reflection scored {scored} "
                     f"actions; accumulated={stats.accumulated} (threshold={stats.threshold})"
                 )
         except Exception as e:
-            logger.warning(f"[{self.persona.name}] heartbeat reflection failed: {e}")
+            logger.warning(f"[{self.persona.name}] reflection job failed: {e}")
 
-    @_heartbeat.before_loop
-    async def _before_heartbeat(self) -> None:
+    @_reflection_loop.before_loop
+    async def _before_reflection(self) -> None:
         await self.bot.wait_until_ready()
-        logger.info(f"[{self.persona.name}] heartbeat ready, entering loop")
+
+    async def _score_backlog(self) -> int:
+        """Score unscored actions one batch (one LLM call) at a time, bounded per tick."""
+        scored = 0
+        for _ in range(SCORE_BATCHES_PER_TICK):
+            batch = await self.reflection.score_unscored_actions(
+                self.persona.name, self._anthropic_client, batch_size=DEFAULT_SCORE_BATCH_SIZE
+            )
+            scored += batch
+            if batch < DEFAULT_SCORE_BATCH_SIZE:
+                break
+        return scored
 
     # ------------------------------------------------------------------
     # Core tick
@@ -345,6 +383,9 @@ class ProactiveScheduler:
                 "decider_model": decision.decider_model,
                 "input_tokens": decision.input_tokens,
                 "output_tokens": decision.output_tokens,
+                "cache_read": decision.cache_read_tokens,
+                "cache_hit_ratio": decision.cache_hit_ratio,
+                "call_site": "proactive_decider",
                 "reasoning_excerpt": (decision.reasoning or "")[:120],
                 "shadow_mode": self.global_config.shadow_mode,
                 "in_thread": ctx.active_inter_agent_thread is not None,
@@ -0,0 +1,161 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Commercial licensing: [slashdaemon@protonmail.com]
+
+"""
+Prompt-Cache Aware Request Layout
+
+Anthropic prompt caching matches request prefixes in the order
+tools → system → messages, up to a cache_control breakpoint. Anything that
+changes early in the request invalidates everything after it, so
+PromptLayout orders context from most to least stable:
+
+1. Tool definitions          (fixed per user tier)
+2. Persona system prompt     (fixed per client)
+3. Long-lived profile        (build context; changes rarely)
+4. Conversation history      (grows by one exchange per turn)
+5. Per-turn retrieval        (date, memories, images; new every turn)
+
+Per-turn retrieval rides in the current user message, ahead of the user's
+content, instead of in the system prompt where it would break the cache for
+the whole history.
+
+Breakpoints (the API allows at most MAX_BREAKPOINTS):
+- end of the stable system prefix (persona, then profile when present)
+- end of the history before the current turn, so the next turn can read
+  everything up to the previous reply
+- the final message, moved forward on every agentic-loop iteration so each
+  tool round trip reads the previous iteration's prefix from cache
+
+A breakpoint caches everything before it, so when the budget runs out the
+earliest stable breakpoints are dropped first: a later one still covers
+their prefix. The tool breakpoint only survives when there's room for it.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+# cache_control marker for a breakpoint (5-minute ephemeral cache)
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# Anthropic's per-request breakpoint limit
+MAX_BREAKPOINTS = 4
+
+
+def cached_text(text: str) -> dict:
+    """A text block ending in a cache breakpoint."""
+    return {"type": "text", "text": text, "cache_control": dict(CACHE_CONTROL)}
+
+
+def cache_hit_ratio(usage: Any) -> float:
+    """
+    Share of prompt tokens served from cache for one response.
+
+    cache_read / (uncached input + cache_read + cache_creation); 0.0 when the
+    response has no usage.
+    """
+    if usage is None:
+        return 0.0
+    cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+    total = (
+        (getattr(usage, "input_tokens", 0) or 0)
+        + cache_read
+        + (getattr(usage, "cache_creation_input_tokens", 0) or 0)
+    )
+    return round(cache_read / total, 4) if total else 0.0
+
+
+def _with_breakpoint(message: dict) -> dict:
+    """Copy of `message` whose last content block carries cache_control."""
+    content = message["content"]
+    if isinstance(content, str):
+        blocks = [cached_text(content)]
+    else:
+        blocks = list(content)
+        blocks[-1] = {**blocks[-1], "cache_control": dict(CACHE_CONTROL)}
+    return {**message, "content": blocks}
+
+
+def _with_turn_context(message: dict, turn_context: str) -> dict:
+    """Copy of the current user message with retrieval context prepended."""
+    content = message["content"]
+    if isinstance(content, str):
+        content = [{"type": "text", "text": content}]
+    # Tagged so the model doesn't read retrieved context as the user's words
+    context = {"type": "text", "text": f"<context>\n{turn_context}\n</context>"}
+    return {**message, "content": [context, *content]}
+
+
+@dataclass
+class PromptLayout:
+    """
+    Stable-to-volatile request layout for one conversation turn.
+
+    Build once per turn, then call request() on every agentic-loop
+    iteration with the growing message list. Nothing passed in is mutated:
+    tools, history and messages are copied before breakpoints are added.
+    """
+
+    persona: str
+    profile: str = ""
+    turn_context: str = ""
+    tools: list[dict] = field(default_factory=list)
+
+    def request(self, messages: list[dict], turn_start: Optional[int] = None) -> dict:
+        """
+        Build the system/tools/messages kwargs for one API call.
+
+        Args:
+            messages: Conversation so far (history, current user message,
+                and any tool round trips from this turn)
+            turn_start: Index of the current user message; defaults to the
+                last message. turn_context is prepended to it and the
+                history breakpoint goes on the message before it.
+
+        Returns:
+            Dict with "system", "messages" and (when tools are set) "tools"
+        """
+        if turn_start is None:
+            turn_start = len(messages) - 1
+
+        messages = list(messages)
+        if self.turn_context and 0 <= turn_start < len(messages):
+            messages[turn_start] = _with_turn_context(messages[turn_start], self.turn_context)
+
+        # Message breakpoints always win: they carry the growing prefix
+        message_marks = sorted({i for i in (turn_start - 1, len(messages) - 1) if i >= 0})
+        for i in message_marks:
+            messages[i] = _with_breakpoint(messages[i])
+        budget = MAX_BREAKPOINTS - len(message_marks)
+
+        system_texts = [self.persona] + ([self.profile] if self.profile else [])
+        # Latest stable breakpoints first; each covers everything before it
+        stable_marks = ["system"] * len(system_texts) + (["tools"] if self.tools else [])
+        stable_marks = stable_marks[:budget]
+        system_marks = stable_marks.count("system")
+
+        system = []
+        for i, text in enumerate(system_texts):
+            cached = i >= len(system_texts) - system_marks
+            system.append(cached_text(text) if cached else {"type": "text", "text": text})
+
+        request = {"system": system, "messages": messages}
+        if self.tools:
+            tools = list(self.tools)
+            if "tools" in stable_marks:
+                tools[-1] = {**tools[-1], "cache_control": dict(CACHE_CONTROL)}
+            request["tools"] = tools
+        return request
@@ -12,13 +12,15 @@ Analyzes Minecraft build screenshots for quality assessment:
 """
 
 import os
+import asyncio
 import base64
 import logging
 from typing import Optional
 from dataclasses import dataclass
 
 import httpx
-import anthropic
+
+from llm_gateway import LANE_RECOGNITION, get_llm_gateway
 
 from .api import Submission, PlayerProfile, OwnershipStats
 
@@ -27,6 +29,9 @@ logger = logging.getLogger(__name__)
 # Use Sonnet 4.6 for high-quality vision analysis
 VISION_MODEL = "claude-sonnet-4-6"
 
+# Screenshots sent per analysis
+MAX_ANALYSIS_IMAGES = 3
+
 
 @dataclass
 class BuildAnalysis:
@@ -131,12 +136,29 @@ Return null for title_recommendation unless they're clearly at a progression thr
 class BuildAnalyzer:
     """Analyzes Minecraft build screenshots using Claude Vision"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        """
+        Args:
+            api_key: Anthropic API key (defaults to ANTHROPIC_API_KEY)
+            http_client: Pooled client for screenshot downloads. If omitted,
+                the analyzer creates (and closes) its own.
+        """
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY required for build analysis")
 
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        self.client = get_llm_gateway(self.api_key).client(LANE_RECOGNITION)
+        self._owns_http = http_client is None
+        self.http = http_client or httpx.AsyncClient(timeout=30.0)
+
+    async def close(self) -> None:
+        """Close the download client if this analyzer created it"""
+        if self._owns_http:
+            await self.http.aclose()
 
     async def analyze(
         self,
@@ -179,7 +201,7 @@ class BuildAnalyzer:
 
         # Call Claude Vision
         try:
-            response = self.client.messages.create(
+            response = await self.client.messages.create(
                 model=VISION_MODEL,
                 max_tokens=1500,
                 messages=[
@@ -223,46 +245,45 @@ class BuildAnalyzer:
             raise
 
     async def _prepare_images(self, urls: list[str]) -> list[dict]:
-        """Download and encode images for Claude Vision API"""
-        image_content = []
-
-        async with httpx.AsyncClient() as client:
-            for url in urls[:3]:  # Max 3 images
-                try:
-                    response = await client.get(url, timeout=30.0)
-                    response.raise_for_status()
-
-                    # Determine media type
-                    content_type = response.headers.get("content-type", "image/png")
-                    if "jpeg" in content_type or "jpg" in content_type:
-                        media_type = "image/jpeg"
-                    elif "gif" in content_type:
-                        media_type = "image/gif"
-                    elif "webp" in content_type:
-                        media_type = "image/webp"
-                    else:
-                        media_type = "image/png"
-
-                    # Base64 encode
-                    image_data = base64.standard_b64encode(response.content).decode(
-                        "utf-8"
-                    )
-
-                    image_content.append(
-                        {
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": media_type,
-                                "data": image_data,
-                            },
-                        }
-                    )
-
-                except Exception as e:
-                    logger.warning(f"Failed to download image {url}: {e}")
-
-        return image_content
+        """Download (concurrently) and encode images for Claude Vision API"""
+        results = await asyncio.gather(
+            *(self._download_image(url) for url in urls[:MAX_ANALYSIS_IMAGES])
+        )
+        # gather preserves order, so screenshots keep the player's ordering
+        return [content for content in results if content is not None]
+
+    async def _download_image(self, url: str) -> Optional[dict]:
+        """Download one screenshot as an image content block, or None on failure"""
+        try:
+            response = await self.http.get(url, timeout=30.0)
+            response.raise_for_status()
+
+            # Determine media type
+            content_type = response.headers.get("content-type", "image/png")
+            if "jpeg" in content_type or "jpg" in content_type:
+                media_type = "image/jpeg"
+            elif "gif" in content_type:
+                media_type = "image/gif"
+            elif "webp" in content_type:
+                media_type = "image/webp"
+            else:
+                media_type = "image/png"
+
+            # Base64 encode
+            image_data = base64.standard_b64encode(response.content).decode("utf-8")
+
+            return {
+                "type": "image",
+                "source": {
+                    "type": "base64",
+                    "media_type": media_type,
+                    "data": image_data,
+                },
+            }
+
+        except Exception as e:
+            logger.warning(f"Failed to download image {url}: {e}")
+            return None
 
     def _format_player_context(self, profile: PlayerProfile) -> str:
         """Format player profile as context for the prompt"""
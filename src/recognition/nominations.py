@@ -16,7 +16,7 @@ import logging
 from dataclasses import dataclass
 from typing import Optional
 
-import anthropic
+from llm_gateway import LANE_RECOGNITION, get_llm_gateway
 
 from .api import Nomination, RecognitionAPIClient
 
@@ -104,7 +104,7 @@ class NominationReviewer:
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY required for nomination review")
 
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        self.client = get_llm_gateway(self.api_key).client(LANE_RECOGNITION)
         self.api_client: Optional[RecognitionAPIClient] = None
 
     async def review(
@@ -155,7 +155,7 @@ class NominationReviewer:
         )
 
         try:
-            response = self.client.messages.create(
+            response = await self.client.messages.create(
                 model=TEXT_MODEL,
                 max_tokens=500,
                 messages=[{"role": "user", "content": prompt}],
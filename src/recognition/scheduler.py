@@ -12,11 +12,12 @@ Includes DM approval flow - players receive a DM asking if they want to share
 their recognized build publicly before it's posted to #server-showcase.
 """
 
+import asyncio
 import io
 import logging
 import os
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Awaitable, Optional
 
 import discord
 import httpx
@@ -54,6 +55,9 @@ else:
 # Polling interval in seconds
 POLL_INTERVAL = int(os.getenv("RECOGNITION_POLL_INTERVAL", "60"))
 
+# Submissions, deletions and nominations processed at once per poll cycle
+RECOGNITION_CONCURRENCY = int(os.getenv("RECOGNITION_CONCURRENCY", "3"))
+
 
 @dataclass
 class PendingApproval:
@@ -89,10 +93,20 @@ class RecognitionScheduler:
         # Initialize API client
         self.api_client = RecognitionAPIClient()
 
+        # Pooled client for screenshot downloads (analysis and announcements)
+        self._http = httpx.AsyncClient(timeout=30.0)
+
+        # Work items processed at once per poll cycle
+        self.concurrency = max(1, RECOGNITION_CONCURRENCY)
+
+        # Player profiles fetched during the current poll cycle
+        # Maps player_uuid -> task resolving to Optional[PlayerProfile]
+        self._profile_cache: dict[str, asyncio.Task] = {}
+
         # Initialize analyzer (requires ANTHROPIC_API_KEY)
         api_key = os.getenv("ANTHROPIC_API_KEY")
         if api_key:
-            self.analyzer = BuildAnalyzer(api_key)
+            self.analyzer = BuildAnalyzer(api_key, http_client=self._http)
             self.nomination_reviewer = NominationReviewer(api_key)
         else:
             self.analyzer = None
@@ -126,6 +140,7 @@ class RecognitionScheduler:
         """Clean up resources."""
         self.stop()
         await self.api_client.close()
+        await self._http.aclose()
 
     @tasks.loop(seconds=POLL_INTERVAL)
     async def _process_submissions(self) -> None:
@@ -133,31 +148,33 @@ class RecognitionScheduler:
         try:
             self._loop_count += 1
 
+            # Profiles may change between cycles (titles, Discord links)
+            self._profile_cache.clear()
+
             # Fetch pending submissions and pending deletions (piggybacked on same request)
-            pending, pending_deletions = await self.api_client.get_pending_submissions(limit=5)
+            # alongside pending nominations
+            if self.nomination_reviewer:
+                (pending, pending_deletions), pending_nominations = await asyncio.gather(
+                    self.api_client.get_pending_submissions(limit=5),
+                    self.api_client.get_pending_nominations(limit=5),
+                )
+            else:
+                pending, pending_deletions = await self.api_client.get_pending_submissions(limit=5)
+                pending_nominations = []
 
             if pending:
                 logger.info(f"Processing {len(pending)} pending submission(s)")
-
-            for submission in pending:
-                await self._process_single_submission(submission)
-
-            # Process pending Discord message deletions
             if pending_deletions:
                 logger.info(f"Processing {len(pending_deletions)} pending deletion(s)")
-
-            for deletion in pending_deletions:
-                await self._process_pending_deletion(deletion)
-
-            # Fetch and process pending nominations
-            if self.nomination_reviewer:
-                pending_nominations = await self.api_client.get_pending_nominations(limit=5)
-
-                if pending_nominations:
-                    logger.info(f"Processing {len(pending_nominations)} pending nomination(s)")
-
-                for nomination in pending_nominations:
-                    await self._process_single_nomination(nomination)
+            if pending_nominations:
+                logger.info(f"Processing {len(pending_nominations)} pending nomination(s)")
+
+            # Each item handles its own errors; run them through a bounded pool
+            await self._run_bounded(
+                [self._process_single_submission(s) for s in pending]
+                + [self._process_pending_deletion(d) for d in pending_deletions]
+                + [self._process_single_nomination(n) for n in pending_nominations]
+            )
 
             # Process ended events every 5th iteration (~5 minutes)
             if self._loop_count % 5 == 0:
@@ -166,6 +183,35 @@ class RecognitionScheduler:
         except Exception as e:
             logger.error(f"Error in recognition scheduler loop: {e}", exc_info=True)
 
+    async def _run_bounded(self, jobs: list[Awaitable[None]]) -> None:
+        """Await jobs with at most self.concurrency running at once."""
+        if not jobs:
+            return
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(job: Awaitable[None]) -> None:
+            async with semaphore:
+                await job
+
+        results = await asyncio.gather(*(run(job) for job in jobs), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Recognition work item failed: {result}", exc_info=result)
+
+    async def _get_player_profile(self, player_uuid: str) -> Optional[PlayerProfile]:
+        """
+        Fetch a player profile once per poll cycle.
+
+        Concurrent callers for the same player share one request, so a
+        nomination's announcement and a submission by the same player
+        don't refetch the profile.
+        """
+        task = self._profile_cache.get(player_uuid)
+        if task is None:
+            task = asyncio.ensure_future(self.api_client.get_player_profile(player_uuid))
+            self._profile_cache[player_uuid] = task
+        return await task
+
     @_process_submissions.before_loop
     async def _before_process(self) -> None:
         """Wait for the bot to be ready before starting the loop."""
@@ -211,7 +257,7 @@ class RecognitionScheduler:
 
         try:
             # Get player profile for context
-            player_profile = await self.api_client.get_player_profile(
+            player_profile = await self._get_player_profile(
                 submission.player_uuid
             )
 
@@ -378,19 +424,17 @@ class RecognitionScheduler:
 
             message_content = "\n".join(message_parts)
 
-            # Download all screenshots and attach as files
-            files = []
-            async with httpx.AsyncClient() as client:
-                for i, url in enumerate(submission.screenshot_urls[:10]):  # Discord max 10 files
-                    try:
-                        response = await client.get(url)
-                        if response.status_code == 200:
-                            # Extract filename from URL or use index
-                            filename = url.split("/")[-1] or f"screenshot_{i+1}.jpg"
-                            file_data = io.BytesIO(response.content)
-                            files.append(discord.File(file_data, filename=filename))
-                    except Exception as e:
-                        logger.warning(f"Failed to download screenshot {i+1}: {e}")
+            # Download all screenshots (concurrently) and attach as files
+            files = [
+                f
+                for f in await asyncio.gather(
+                    *(
+                        self._download_screenshot(i, url)
+                        for i, url in enumerate(submission.screenshot_urls[:10])  # Discord max 10 files
+                    )
+                )
+                if f is not None
+            ]
 
             # Send single message with all attachments
             if files:
@@ -410,6 +454,19 @@ class RecognitionScheduler:
             logger.warning(f"Failed to announce recognition: {e}", exc_info=True)
             return None
 
+    async def _download_screenshot(self, index: int, url: str) -> Optional[discord.File]:
+        """Download one screenshot as a Discord attachment, or None on failure"""
+        try:
+            response = await self._http.get(url)
+            if response.status_code != 200:
+                return None
+            # Extract filename from URL or use index
+            filename = url.split("/")[-1] or f"screenshot_{index+1}.jpg"
+            return discord.File(io.BytesIO(response.content), filename=filename)
+        except Exception as e:
+            logger.warning(f"Failed to download screenshot {index+1}: {e}")
+            return None
+
     def _get_title_display(self, title_slug: str) -> Optional[str]:
         """Convert title slug to display name"""
         titles = {
@@ -757,10 +814,10 @@ class RecognitionScheduler:
                 return
 
             # Get player names
-            nominator_profile = await self.api_client.get_player_profile(
+            nominator_profile = await self._get_player_profile(
                 nomination.nominator_uuid
             )
-            nominee_profile = await self.api_client.get_player_profile(
+            nominee_profile = await self._get_player_profile(
                 nomination.nominee_uuid
             )
 
@@ -890,10 +947,10 @@ class RecognitionScheduler:
                 return
 
             # Get player names from API
-            nominator_profile = await self.api_client.get_player_profile(
+            nominator_profile = await self._get_player_profile(
                 nomination.nominator_uuid
             )
-            nominee_profile = await self.api_client.get_player_profile(
+            nominee_profile = await self._get_player_profile(
                 nomination.nominee_uuid
             )
 
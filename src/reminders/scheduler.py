@@ -29,13 +29,13 @@ import os
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-import anthropic
 import asyncpg
 import discord
 import pytz
 from discord.ext import tasks
 
 from analytics import track
+from llm_gateway import LANE_REMINDERS, get_llm_gateway
 
 if TYPE_CHECKING:
     from discord_bot import DiscordBot
@@ -69,9 +69,11 @@ class ReminderScheduler:
         self.manager = ReminderManager(db_pool)
         self._started = False
 
-        # Initialize Anthropic client for conversational message generation
+        # Shared LLM gateway client for conversational message generation
         api_key = os.getenv("ANTHROPIC_API_KEY")
-        self.anthropic_client = anthropic.AsyncAnthropic(api_key=api_key) if api_key else None
+        self.anthropic_client = (
+            get_llm_gateway(api_key).client(LANE_REMINDERS) if api_key else None
+        )
 
     def start(self) -> None:
         """Start the scheduler loop."""
@@ -0,0 +1,22 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Discord bot launcher.
+
+Image processing workers are spawned, and a spawned worker re-imports the
+parent's main module as __mp_main__. Started through discord_bot.py, every
+worker would import discord.py, the Anthropic SDK, asyncpg and the memory
+stack and re-run load_dotenv()/logging.basicConfig. This module is the main
+module instead, and its import is a no-op outside __main__.
+
+Usage:
+    python src/run_bot.py
+"""
+
+if __name__ == "__main__":
+    import asyncio
+
+    from discord_bot import main
+
+    asyncio.run(main())
@@ -0,0 +1,168 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Commercial licensing: [slashdaemon@protonmail.com]
+
+"""
+Concurrent Tool Execution
+
+When Claude returns several tool_use blocks in one turn, ClaudeClient.chat()
+hands them to execute_tool_calls(), which runs independent calls concurrently
+so a multi-tool turn takes as long as its slowest tool instead of the sum.
+
+Ordering rules:
+- Read-only tools (read_messages, list_github_docs, search_memories, ...) that
+  are adjacent in the turn run concurrently.
+- Side-effecting tools (SIDE_EFFECT_TOOLS: send/edit/delete, reminders,
+  events) are barriers: each one starts only after every earlier call has
+  finished, and later calls start only after it finishes. Side effects
+  therefore happen exactly in the order Claude requested them, and reads
+  never race a write from the same turn.
+
+Every call runs under a per-tool timeout; a call that times out (or raises)
+yields an error string as its tool_result rather than failing the turn.
+Results are returned in the original call order with per-call latencies.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Tools that change state outside the conversation; never run concurrently
+SIDE_EFFECT_TOOLS = frozenset({
+    "send_message",
+    "edit_message",
+    "delete_message",
+    "set_reminder",
+    "cancel_reminder",
+    "set_user_timezone",
+    "create_event",
+    "register_event_draft",
+})
+
+# Default per-call timeout (milliseconds)
+DEFAULT_TOOL_TIMEOUT_MS = int(os.getenv("TOOL_TIMEOUT_MS", "20000"))
+
+# Per-tool overrides (milliseconds). describe_message_image makes its own
+# Claude Vision call, so it gets more room than a Discord or GitHub read.
+TOOL_TIMEOUTS_MS = {
+    "describe_message_image": int(os.getenv("TOOL_TIMEOUT_VISION_MS", "45000")),
+}
+
+
+@dataclass
+class ToolCall:
+    """One tool_use block from a Claude response."""
+
+    id: str
+    name: str
+    input: dict[str, Any]
+
+    @property
+    def side_effecting(self) -> bool:
+        return self.name in SIDE_EFFECT_TOOLS
+
+
+@dataclass
+class ToolOutcome:
+    """Result of one tool call."""
+
+    call: ToolCall
+    result: str
+    latency_ms: int = 0
+    timed_out: bool = False
+
+
+@dataclass
+class ToolBatch:
+    """Outcomes of one turn's tool calls, in the order Claude issued them."""
+
+    outcomes: list[ToolOutcome] = field(default_factory=list)
+    wall_ms: int = 0
+
+    @property
+    def serial_ms(self) -> int:
+        """What the turn would have taken running the calls one by one."""
+        return sum(o.latency_ms for o in self.outcomes)
+
+
+def _stages(calls: list[ToolCall]) -> list[list[int]]:
+    """Group call indices: runs of read-only calls together, each side-effecting call alone."""
+    stages: list[list[int]] = []
+    for i, call in enumerate(calls):
+        if call.side_effecting or not stages or calls[stages[-1][0]].side_effecting:
+            stages.append([i])
+        else:
+            stages[-1].append(i)
+    return stages
+
+
+async def execute_tool_calls(
+    calls: list[ToolCall],
+    execute: Callable[[ToolCall], Awaitable[str]],
+    default_timeout_ms: int = DEFAULT_TOOL_TIMEOUT_MS,
+    timeouts_ms: dict[str, int] = TOOL_TIMEOUTS_MS,
+) -> ToolBatch:
+    """
+    Run one turn's tool calls, concurrently where it is safe.
+
+    Args:
+        calls: Tool calls in the order Claude issued them
+        execute: Runs a single call and returns its tool_result text
+        default_timeout_ms: Timeout for tools without an override
+        timeouts_ms: Per-tool timeout overrides
+
+    Returns:
+        ToolBatch with one outcome per call, in call order. Never raises
+        for a single call.
+    """
+    outcomes: list[ToolOutcome | None] = [None] * len(calls)
+    start = time.monotonic()
+
+    async def _run(index: int) -> None:
+        call = calls[index]
+        timeout = timeouts_ms.get(call.name, default_timeout_ms) / 1000
+        t0 = time.monotonic()
+        timed_out = False
+        try:
+            result = await asyncio.wait_for(execute(call), timeout=timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            logger.warning(f"Tool '{call.name}' exceeded {timeout:.0f}s; returning timeout error")
+            result = f"Error: {call.name} timed out after {timeout:.0f}s"
+            if call.side_effecting:
+                result += " (the action may still have completed; check before retrying)"
+        except Exception as e:
+            logger.warning(f"Tool '{call.name}' failed: {e}")
+            result = f"Error executing {call.name}: {e}"
+        outcomes[index] = ToolOutcome(
+            call=call,
+            result=result,
+            latency_ms=int((time.monotonic() - t0) * 1000),
+            timed_out=timed_out,
+        )
+
+    for stage in _stages(calls):
+        await asyncio.gather(*(_run(i) for i in stage))
+
+    return ToolBatch(
+        outcomes=[o for o in outcomes if o is not None],
+        wall_ms=int((time.monotonic() - start) * 1000),
+    )
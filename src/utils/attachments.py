@@ -0,0 +1,35 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Share attachment downloads between handlers of the same message.
+
+Chat vision and the background image-observation pipeline both need the
+bytes of a message's image attachments. ``AttachmentDownloads`` starts each
+download at most once and hands every caller the same result, so a
+screenshot is fetched from Discord's CDN once per message.
+"""
+
+import asyncio
+
+import discord
+
+
+class AttachmentDownloads:
+    """Per-message memo of ``attachment.read()`` results."""
+
+    def __init__(self):
+        self._tasks: dict[int, asyncio.Task] = {}
+
+    def read(self, attachment: discord.Attachment) -> "asyncio.Future[bytes]":
+        """Return the (shared) download of an attachment.
+
+        The first caller starts the download; later callers await the same
+        task. A failed download raises ``discord.HTTPException`` to every
+        awaiter.
+        """
+        task = self._tasks.get(attachment.id)
+        if task is None:
+            task = asyncio.ensure_future(attachment.read())
+            self._tasks[attachment.id] = task
+        return task
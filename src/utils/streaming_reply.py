@@ -0,0 +1,167 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Progressively post a streamed Claude reply to Discord.
+
+Text arrives from ``ClaudeClient.chat(on_text=...)`` a few tokens at a time.
+``StreamingReply`` posts the first message as soon as a paragraph or header
+boundary arrives, then edits it (and appends follow-up messages once the
+reply outgrows Discord's 2000-char limit) as more sections complete.
+
+- Only "settled" text is rendered mid-stream: everything before the last
+  paragraph break or header, never a half-written paragraph or an unclosed
+  code fence, so messages don't flicker.
+- The same chunker as the non-streaming path (``DiscordBot._chunk_message``)
+  splits the text, so the final layout matches ``_send_chunked``.
+- At most one render runs at a time and renders are spaced by
+  ``EDIT_INTERVAL_SECONDS``, which keeps edits under Discord's per-channel
+  rate limit even on fast streams.
+- ``finish()`` renders the authoritative final text, which also replaces any
+  interim text streamed before a tool call.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Callable, Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between renders (Discord allows ~5 message edits / 5s / channel)
+EDIT_INTERVAL_SECONDS = 1.0
+
+_HEADER_START = re.compile(r"\n(?=#{1,6}\s)")
+
+
+class StreamingReply:
+    """One streamed reply: a growing list of Discord messages."""
+
+    def __init__(
+        self,
+        channel: discord.abc.Messageable,
+        chunker: Callable[[str], list[str]],
+        reply_to: Optional[discord.Message] = None,
+        min_interval: float = EDIT_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            channel: Channel to post follow-up chunks in
+            chunker: Splits text into Discord-sized chunks
+            reply_to: Message the first chunk replies to
+            min_interval: Minimum seconds between mid-stream renders
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.channel = channel
+        self.chunker = chunker
+        self.reply_to = reply_to
+        self.min_interval = min_interval
+        self.clock = clock
+
+        self.messages: list[discord.Message] = []
+        self.first_sent_at: Optional[float] = None  # time.time() of the first post
+        self._text = ""
+        self._rendered: list[str] = []
+        self._rendered_source = ""
+        self._last_render = float("-inf")
+        self._render_task: Optional[asyncio.Task] = None
+
+    async def feed(self, delta: str) -> None:
+        """Append streamed text; renders in the background when due. Never blocks."""
+        self._text += delta
+        if self._render_task is not None and not self._render_task.done():
+            return
+        if self.clock() - self._last_render < self.min_interval:
+            return
+        settled = self._settled()
+        if not settled or settled == self._rendered_source:
+            return
+        self._render_task = asyncio.create_task(self._render_interim(settled))
+
+    async def finish(self, final_text: str) -> Optional[discord.Message]:
+        """
+        Render the complete reply, deleting surplus interim messages.
+
+        Returns:
+            The last message of the reply, or None if nothing was posted
+        """
+        await self._wait_for_render()
+        await self._render(final_text)
+        return self.messages[-1] if self.messages else None
+
+    async def cancel(self) -> None:
+        """Stop rendering (e.g. after an error). Posted messages are left as-is."""
+        if self._render_task is not None and not self._render_task.done():
+            self._render_task.cancel()
+        await self._wait_for_render()
+
+    @property
+    def chunk_count(self) -> int:
+        return len(self.messages)
+
+    def _settled(self) -> str:
+        """Text up to the last paragraph or header boundary, with fences balanced."""
+        text = self._text
+        cut = text.rfind("\n\n")
+        for match in _HEADER_START.finditer(text):
+            cut = max(cut, match.start())
+        if cut <= 0:
+            return ""
+        settled = text[:cut].rstrip()
+
+        # Don't show an unclosed code block; wait until its fence closes
+        if settled.count("```") % 2:
+            settled = settled[: settled.rfind("```")].rstrip()
+        return settled
+
+    async def _render_interim(self, text: str) -> None:
+        try:
+            await self._render(text)
+        except discord.HTTPException as e:
+            # finish() retries with the full text
+            logger.warning(f"Streaming edit failed, will retry on finish: {e}")
+
+    async def _render(self, text: str) -> None:
+        """Make the posted messages match chunker(text)."""
+        chunks = [chunk for chunk in self.chunker(text) if chunk]
+        for i, chunk in enumerate(chunks):
+            if i < len(self.messages):
+                if self._rendered[i] != chunk:
+                    await self.messages[i].edit(content=chunk)
+                    self._rendered[i] = chunk
+                continue
+
+            if i == 0 and self.reply_to is not None:
+                sent = await self.reply_to.reply(chunk)
+            else:
+                sent = await self.channel.send(chunk)
+            if self.first_sent_at is None:
+                self.first_sent_at = time.time()
+            self.messages.append(sent)
+            self._rendered.append(chunk)
+
+        # The final text can need fewer messages than an interim layout did
+        while len(self.messages) > len(chunks):
+            surplus = self.messages.pop()
+            self._rendered.pop()
+            try:
+                await surplus.delete()
+            except discord.HTTPException as e:
+                logger.warning(f"Failed to delete surplus streamed message: {e}")
+
+        self._rendered_source = text
+        self._last_render = self.clock()
+
+    async def _wait_for_render(self) -> None:
+        if self._render_task is None:
+            return
+        try:
+            await self._render_task
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._render_task = None
@@ -10,12 +10,14 @@ Feeds PCM frames from an async producer (TTS) to discord.py's AudioPlayer thread
 import collections
 import threading
 
-import audioop
 from discord import AudioSource
 
+from voice.dsp import apply_gain
+
 
 # Discord expects 48kHz stereo s16le, 20ms frames
 FRAME_SIZE = 3840  # 48000 * 2 channels * 2 bytes * 0.020 seconds
+FRAME_MS = 20
 
 
 class StreamingAudioSource(AudioSource):
@@ -31,6 +33,7 @@ class StreamingAudioSource(AudioSource):
         self._lock = threading.Lock()
         self._finished = threading.Event()
         self._volume = max(0.0, min(2.0, volume))
+        self._frames_played = 0  # Audio frames handed to the player (not silence)
 
     def feed(self, pcm_48k_stereo: bytes) -> None:
         """Push resampled TTS audio. Chunks into FRAME_SIZE pieces.
@@ -65,6 +68,13 @@ class StreamingAudioSource(AudioSource):
                 self._remainder = b""
         self._finished.set()
 
+    def interrupt(self) -> None:
+        """Drop all queued audio and end playback at the next read()."""
+        with self._lock:
+            self._buffer.clear()
+            self._remainder = b""
+        self._finished.set()
+
     def read(self) -> bytes:
         """Called by AudioPlayer thread every 20ms.
 
@@ -73,8 +83,9 @@ class StreamingAudioSource(AudioSource):
         with self._lock:
             if self._buffer:
                 frame = self._buffer.popleft()
+                self._frames_played += 1
                 if self._volume != 1.0:
-                    frame = audioop.mul(frame, 2, self._volume)
+                    frame = apply_gain(frame, self._volume)
                 return frame
 
         # Buffer empty
@@ -98,6 +109,11 @@ class StreamingAudioSource(AudioSource):
         with self._lock:
             return sum(len(f) for f in self._buffer)
 
+    @property
+    def played_ms(self) -> int:
+        """Milliseconds of fed audio that have been handed to the player."""
+        return self._frames_played * FRAME_MS
+
     @property
     def is_speaking(self) -> bool:
         """True if there is still audio to play."""
@@ -4,28 +4,180 @@
 
 """Cartesia Speech-to-Text client.
 
-Ported from SoulCraft's SttClient.java. REST multipart upload.
+Ported from SoulCraft's SttClient.java. REST multipart upload, plus a
+streaming mode: PCM frames go over a WebSocket while the user is still
+talking and partial/final transcripts come back as they are recognized.
 """
 
+import asyncio
+import json
 import logging
-from typing import Optional
+import os
+import time
+from typing import Callable, Optional
+from urllib.parse import urlencode
 
 import aiohttp
 
 logger = logging.getLogger(__name__)
 
 STT_URL = "https://api.cartesia.ai/stt"
+# Overridable so the streaming path can run against a local fake server
+STT_WS_URL = os.getenv("CARTESIA_STT_WS_URL", "wss://api.cartesia.ai/stt/websocket")
 API_VERSION = "2026-03-01"
 STT_MODEL = "ink-whisper"
 TIMEOUT_SECONDS = 10
+FINALIZE_TIMEOUT_SECONDS = 3.0
+
+TERMINAL_PUNCTUATION = (".", "?", "!")
+
+_FINALIZE = object()  # Queue marker: no more audio for this stream
+
+
+class STTStream:
+    """One streaming recognition session, covering a single utterance.
+
+    Created unconnected: audio fed before the WebSocket is up is queued
+    and sent once it connects. Transcripts arrive as partials (revised as
+    more audio comes in) and finals (settled segments).
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        headers: Optional[dict[str, str]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._clock = clock
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._finals: list[str] = []
+        self._flushed = asyncio.Event()
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._finalizing = False
+        self.partial = ""
+        self.changed_at = clock()
+        self.error: Optional[str] = None
+        self._task = asyncio.create_task(self._run(session, url, headers), name="stt-stream")
+
+    @property
+    def text(self) -> str:
+        """Settled segments plus the current partial."""
+        return " ".join(t for t in (*self._finals, self.partial) if t)
+
+    def feed(self, pcm_16k_mono: bytes) -> None:
+        """Queue a 16kHz mono s16le frame. Must be called on the event loop."""
+        if not self._finalizing:
+            self._queue.put_nowait(pcm_16k_mono)
+
+    def is_stable(self, stable_ms: int, now: Optional[float] = None) -> bool:
+        """Whether the transcript is unchanged for stable_ms and ends a sentence."""
+        text = self.text.rstrip()
+        if not text or not text.endswith(TERMINAL_PUNCTUATION):
+            return False
+        now = self._clock() if now is None else now
+        return (now - self.changed_at) * 1000 >= stable_ms
+
+    async def finalize(self, timeout: float = FINALIZE_TIMEOUT_SECONDS) -> Optional[str]:
+        """End the utterance and wait for its final transcript.
+
+        Returns:
+            The transcript ("" if nothing was recognized), or None if the
+            stream failed and the caller should fall back to batch STT.
+        """
+        if not self._finalizing:
+            self._finalizing = True
+            self._queue.put_nowait(_FINALIZE)
+        try:
+            await asyncio.wait_for(self._flushed.wait(), timeout)
+        except asyncio.TimeoutError:
+            self.error = self.error or "finalize timed out"
+        await self.close()
+        if self.error:
+            logger.warning(f"Streaming STT failed: {self.error}")
+            return None
+        return self.text.strip()
+
+    async def close(self) -> None:
+        """Abandon the stream and close the WebSocket."""
+        self._finalizing = True
+        if not self._task.done():
+            self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(
+        self, session: aiohttp.ClientSession, url: str, headers: Optional[dict[str, str]]
+    ) -> None:
+        sender = None
+        try:
+            self._ws = await session.ws_connect(url, headers=headers)
+            sender = asyncio.create_task(self._send_audio())
+            await self._receive()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.error = str(e) or type(e).__name__
+        finally:
+            if sender is not None:
+                sender.cancel()
+                await asyncio.gather(sender, return_exceptions=True)
+            if self._ws is not None and not self._ws.closed:
+                await self._ws.close()
+            self._flushed.set()
+
+    async def _send_audio(self) -> None:
+        while True:
+            item = await self._queue.get()
+            # Coalesce frames that queued up while we were sending
+            frames = []
+            while item is not _FINALIZE:
+                frames.append(item)
+                if self._queue.empty():
+                    break
+                item = self._queue.get_nowait()
+            if frames:
+                await self._ws.send_bytes(b"".join(frames))
+            if item is _FINALIZE:
+                await self._ws.send_str("finalize")
+                return
+
+    async def _receive(self) -> None:
+        async for msg in self._ws:
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                if msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    break
+                continue
+            data = json.loads(msg.data)
+            kind = data.get("type")
+            if kind == "transcript":
+                text = data.get("text", "").strip()
+                if data.get("is_final"):
+                    if text:
+                        self._finals.append(text)
+                    self.partial = ""
+                    self.changed_at = self._clock()
+                elif text != self.partial:
+                    self.partial = text
+                    self.changed_at = self._clock()
+            elif kind in ("flush_done", "done"):
+                self._flushed.set()
+                return
+            elif kind == "error":
+                self.error = data.get("message", "unknown error")
+                return
+        if not self._flushed.is_set():
+            self.error = self.error or "connection closed before final transcript"
 
 
 class CartesiaSTTClient:
     """Cartesia STT via REST. Sends WAV audio, receives transcript."""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, ws_url: str = STT_WS_URL):
         self._api_key = api_key
+        self._ws_url = ws_url
         self._session: Optional[aiohttp.ClientSession] = None
+        # Separate session: the REST session's total timeout would cut streams
+        self._ws_session: Optional[aiohttp.ClientSession] = None
 
     async def _ensure_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
@@ -70,8 +222,33 @@ class CartesiaSTTClient:
             logger.error(f"STT transcription failed: {e}")
             return ""
 
+    def open_stream(self, language: str = "en") -> STTStream:
+        """Start a streaming transcription for one utterance.
+
+        Must be called on the event loop. The WebSocket connects in the
+        background; feed() audio immediately.
+        """
+        if self._ws_session is None or self._ws_session.closed:
+            self._ws_session = aiohttp.ClientSession()
+        params = urlencode({
+            "model": STT_MODEL,
+            "language": language,
+            "encoding": "pcm_s16le",
+            "sample_rate": 16000,
+            "cartesia_version": API_VERSION,
+        })
+        # The key goes in a header: handshake errors echo the URL into logs
+        return STTStream(
+            self._ws_session,
+            f"{self._ws_url}?{params}",
+            headers={"X-API-Key": self._api_key},
+        )
+
     async def close(self) -> None:
-        """Close the HTTP session."""
+        """Close the HTTP sessions."""
         if self._session and not self._session.closed:
             await self._session.close()
             self._session = None
+        if self._ws_session and not self._ws_session.closed:
+            await self._ws_session.close()
+            self._ws_session = None
@@ -7,10 +7,11 @@
 Ported from SoulCraft's CartesiaTtsEngine.java. Streams text to PCM audio.
 """
 
+import asyncio
 import base64
 import json
 import logging
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, Callable, Optional
 
 import aiohttp
 
@@ -62,6 +63,51 @@ class CartesiaTTSClient:
                 pass
         await self.connect()
 
+    def _build_request(
+        self,
+        text: str,
+        context_id: str,
+        *,
+        cont: bool,
+        emotion: Optional[str],
+        speed: float,
+        language: str,
+        timestamps: bool = False,
+    ) -> dict:
+        """Generation request for one transcript segment of a context."""
+        gen_config: dict = {"speed": speed}
+        if emotion:
+            gen_config["emotions"] = [emotion]
+        request = {
+            "model_id": self._model,
+            "transcript": text,
+            "context_id": context_id,
+            "continue": cont,
+            "language": language,
+            "voice": {
+                "mode": "id",
+                "id": self._voice_id,
+            },
+            "output_format": {
+                "container": "raw",
+                "encoding": "pcm_s16le",
+                "sample_rate": 24000,
+            },
+            "generation_config": gen_config,
+        }
+        if timestamps:
+            request["add_timestamps"] = True
+        return request
+
+    async def _send_request(self, request: dict) -> None:
+        """Send a request, reconnecting once if the socket was silently dropped."""
+        try:
+            await self._ws.send_json(request)
+        except (aiohttp.ClientConnectionResetError, ConnectionResetError) as e:
+            logger.warning(f"Cartesia TTS send failed ({e}), reconnecting...")
+            await self.connect()
+            await self._ws.send_json(request)
+
     async def synthesize(
         self,
         text: str,
@@ -89,36 +135,10 @@ class CartesiaTTSClient:
         # Clamp speed
         speed = max(0.6, min(1.5, speed))
 
-        # Build request
-        request = {
-            "model_id": self._model,
-            "transcript": text,
-            "context_id": context_id,
-            "continue": False,
-            "language": language,
-            "voice": {
-                "mode": "id",
-                "id": self._voice_id,
-            },
-            "output_format": {
-                "container": "raw",
-                "encoding": "pcm_s16le",
-                "sample_rate": 24000,
-            },
-        }
-
-        # Generation config
-        gen_config: dict = {"speed": speed}
-        if emotion:
-            gen_config["emotions"] = [emotion]
-        request["generation_config"] = gen_config
-
-        try:
-            await self._ws.send_json(request)
-        except (aiohttp.ClientConnectionResetError, ConnectionResetError) as e:
-            logger.warning(f"Cartesia TTS send failed ({e}), reconnecting...")
-            await self.connect()
-            await self._ws.send_json(request)
+        request = self._build_request(
+            text, context_id, cont=False, emotion=emotion, speed=speed, language=language
+        )
+        await self._send_request(request)
 
         # Read response chunks
         async for msg in self._ws:
@@ -180,34 +200,11 @@ class CartesiaTTSClient:
         speed = max(0.6, min(1.5, speed))
 
         for i, chunk_text in enumerate(chunks):
-            request = {
-                "model_id": self._model,
-                "transcript": chunk_text,
-                "context_id": context_id,
-                "continue": i > 0,
-                "language": language,
-                "voice": {
-                    "mode": "id",
-                    "id": self._voice_id,
-                },
-                "output_format": {
-                    "container": "raw",
-                    "encoding": "pcm_s16le",
-                    "sample_rate": 24000,
-                },
-            }
-
-            gen_config: dict = {"speed": speed}
-            if emotion:
-                gen_config["emotions"] = [emotion]
-            request["generation_config"] = gen_config
-
-            try:
-                await self._ws.send_json(request)
-            except (aiohttp.ClientConnectionResetError, ConnectionResetError) as e:
-                logger.warning(f"Cartesia TTS send failed ({e}), reconnecting...")
-                await self.connect()
-                await self._ws.send_json(request)
+            request = self._build_request(
+                chunk_text, context_id, cont=i > 0,
+                emotion=emotion, speed=speed, language=language,
+            )
+            await self._send_request(request)
 
             # Read audio chunks until "done" for this segment
             async for msg in self._ws:
@@ -231,6 +228,118 @@ class CartesiaTTSClient:
                     logger.error("Cartesia TTS WebSocket closed unexpectedly")
                     return
 
+    async def synthesize_incremental(
+        self,
+        segments: AsyncIterator[str],
+        *,
+        emotion: Optional[str] = None,
+        speed: float = 1.0,
+        language: str = "en",
+        on_timestamps: Optional[Callable[[list[str], list[float]], None]] = None,
+    ) -> AsyncIterator[bytes]:
+        """Synthesize text that is still being produced, as one continuous context.
+
+        Segments are sent with ``continue=True`` as they arrive, while audio
+        for earlier segments is already being yielded, so synthesis overlaps
+        generation and prosody carries across segment boundaries. When
+        `segments` is exhausted an empty ``continue=False`` request closes
+        the context and the stream ends at Cartesia's "done".
+
+        If the consumer stops early (or is cancelled) the sender is cancelled
+        and the context is cancelled server-side. An exception raised by
+        `segments` is re-raised after the audio already requested has been
+        yielded.
+
+        If `on_timestamps` is given, word timestamps are requested and it is
+        called with (words, end_seconds) as they arrive; times are measured
+        from the start of the context's audio.
+
+        Yields:
+            Bytes of PCM audio data (24kHz mono s16le).
+        """
+        first = await anext(segments, None)
+        if first is None:
+            return
+
+        await self._ensure_connected()
+        self._context_counter += 1
+        context_id = f"slashai-{self._context_counter}"
+        speed = max(0.6, min(1.5, speed))
+
+        def request(text: str, cont: bool) -> dict:
+            return self._build_request(
+                text, context_id, cont=cont, emotion=emotion, speed=speed,
+                language=language, timestamps=on_timestamps is not None,
+            )
+
+        await self._send_request(request(first, True))
+        ws = self._ws
+
+        async def send_rest() -> None:
+            cancelled = False
+            try:
+                async for text in segments:
+                    if text:
+                        await ws.send_json(request(text, True))
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                # Close the context (also on producer error) so "done" arrives;
+                # skipped on cancellation, where the context is cancelled instead
+                if not cancelled:
+                    await ws.send_json(request("", False))
+
+        sender = asyncio.create_task(send_rest())
+        finished = False
+        try:
+            async for msg in ws:
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    data = json.loads(msg.data)
+                    if data.get("context_id") != context_id:
+                        continue
+
+                    msg_type = data.get("type", "")
+                    if msg_type == "chunk":
+                        audio_b64 = data.get("data", "")
+                        if audio_b64:
+                            yield base64.b64decode(audio_b64)
+                    elif msg_type == "timestamps" and on_timestamps is not None:
+                        words = data.get("word_timestamps") or {}
+                        on_timestamps(words.get("words", []), words.get("end", []))
+                    elif msg_type == "done":
+                        finished = True
+                        break
+                    elif msg_type == "error":
+                        logger.error(f"Cartesia TTS error: {data.get('error')}")
+                        break
+
+                elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    logger.error("Cartesia TTS WebSocket closed unexpectedly")
+                    break
+        finally:
+            if not sender.done():
+                sender.cancel()
+            try:
+                await sender
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                if finished:
+                    raise  # Producer failed; the text it did produce was spoken
+                logger.warning(f"Cartesia TTS segment sender failed: {e}")
+            if not finished:
+                await self._cancel_context(context_id)
+
+    async def _cancel_context(self, context_id: str) -> None:
+        """Ask Cartesia to stop generating for a context (best effort)."""
+        if not self._ws or self._ws.closed:
+            return
+        try:
+            await self._ws.send_json({"context_id": context_id, "cancel": True})
+        except Exception as e:
+            logger.debug(f"Cartesia TTS cancel failed for {context_id}: {e}")
+
     async def close(self) -> None:
         """Close WebSocket and HTTP session."""
         if self._ws and not self._ws.closed:
@@ -7,11 +7,13 @@
 Cartesia TTS outputs 24kHz mono PCM s16le.
 Cartesia STT expects 16kHz mono PCM s16le (in WAV).
 Discord sends/receives 48kHz stereo PCM s16le.
+
+Resampling runs on the NumPy polyphase filters in voice.dsp.
 """
 
 import struct
 
-import audioop
+from voice.dsp import Downmixer, Upmixer
 
 
 class AudioResampler:
@@ -23,26 +25,23 @@ class AudioResampler:
 
         24kHz mono s16le -> 48kHz stereo s16le (4x size increase).
         Note: For streaming TTS, use StreamResampler instead to maintain
-        interpolation state across chunks.
+        filter state across chunks.
         """
         if not pcm_24k_mono:
             return b""
-        upsampled, _ = audioop.ratecv(pcm_24k_mono, 2, 1, 24000, 48000, None)
-        return audioop.tostereo(upsampled, 2, 1, 1)
+        return Upmixer().process(pcm_24k_mono)
 
     @staticmethod
     def discord_to_stt(pcm_48k_stereo: bytes) -> bytes:
         """Convert Discord received audio to Cartesia STT input format.
 
         48kHz stereo s16le -> 16kHz mono s16le (1/6 size).
+        Note: For a continuous receive stream, use StreamResampler so the
+        anti-aliasing filter keeps its history across 20ms frames.
         """
         if not pcm_48k_stereo:
             return b""
-        # Stereo -> mono
-        mono = audioop.tomono(pcm_48k_stereo, 2, 1, 0)
-        # Downsample 48kHz -> 16kHz
-        downsampled, _ = audioop.ratecv(mono, 2, 1, 48000, 16000, None)
-        return downsampled
+        return Downmixer().process(pcm_48k_stereo)
 
     @staticmethod
     def pcm_to_wav(pcm_16k_mono: bytes) -> bytes:
@@ -79,27 +78,33 @@ class AudioResampler:
 
 
 class StreamResampler:
-    """Stateful resampler that maintains audioop.ratecv state across calls.
+    """Stateful resampler that keeps filter state across calls.
 
-    Use one instance per speech utterance to avoid clicks/pops at chunk
-    boundaries caused by interpolation state resets.
+    Use one instance per speech utterance (playback) or per speaker
+    (receive) to avoid clicks/pops at chunk boundaries caused by filter
+    state resets.
     """
 
     def __init__(self):
-        self._upsample_state = None
+        self._upmixer = Upmixer()
+        self._downmixer = Downmixer()
 
     def tts_to_discord(self, pcm_24k_mono: bytes) -> bytes:
         """Convert Cartesia TTS output to Discord playback format.
 
-        Maintains ratecv interpolation state for smooth audio across chunks.
+        Maintains filter state for smooth audio across chunks.
         """
         if not pcm_24k_mono:
             return b""
-        upsampled, self._upsample_state = audioop.ratecv(
-            pcm_24k_mono, 2, 1, 24000, 48000, self._upsample_state
-        )
-        return audioop.tostereo(upsampled, 2, 1, 1)
+        return self._upmixer.process(pcm_24k_mono)
+
+    def discord_to_stt(self, pcm_48k_stereo: bytes) -> bytes:
+        """Convert one received Discord frame to STT format, keeping filter state."""
+        if not pcm_48k_stereo:
+            return b""
+        return self._downmixer.process(pcm_48k_stereo)
 
     def reset(self):
-        """Reset interpolation state (e.g., between utterances)."""
-        self._upsample_state = None
+        """Reset filter state (e.g., between utterances)."""
+        self._upmixer.reset()
+        self._downmixer.reset()
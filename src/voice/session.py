@@ -12,24 +12,83 @@ import asyncio
 import logging
 import os
 import time
+from collections import deque
+from dataclasses import dataclass, field
 from typing import Optional
 
 import discord
 
 from agents.persona_loader import PersonaConfig
+from analytics import track
 from claude_client import ClaudeClient
 from voice.audio_source import StreamingAudioSource
-from voice.cartesia_stt import CartesiaSTTClient
+from voice.cartesia_stt import CartesiaSTTClient, STTStream
 from voice.cartesia_tts import CartesiaTTSClient
 from voice.echo_guard import EchoGuard
 from voice.name_filter import NameFilter
 from voice.receiver import AudioReceiver
 from voice.resampler import AudioResampler, StreamResampler
+from voice.speech_pipeline import SpeechPipeline
 from voice.text_processor import EmotionInference, TextPreprocessor
-from voice.vad import VADConfig, VoiceActivityDetector
+from voice.vad import BargeInConfig, BargeInDetector, VADConfig, VoiceActivityDetector
 
 logger = logging.getLogger(__name__)
 
+# Stream audio to STT while the user talks instead of uploading after VAD
+STT_STREAMING = os.getenv("VOICE_STT_STREAMING", "false").lower() == "true"
+
+# Early endpointing: with streaming STT, end the turn after this much silence
+# (instead of the VAD's full timeout) once the transcript has been stable for
+# PARTIAL_STABLE_MS and ends with terminal punctuation
+EARLY_ENDPOINT_MS = int(os.getenv("VOICE_EARLY_ENDPOINT_MS", "500"))
+PARTIAL_STABLE_MS = int(os.getenv("VOICE_PARTIAL_STABLE_MS", "300"))
+
+# Answer utterances that ended within this many ms of each other as one LLM
+# turn (0 disables batching; each utterance gets its own reply)
+TURN_BATCH_MS = int(os.getenv("VOICE_TURN_BATCH_MS", "0"))
+
+# Barge-in: sustained speech from a human during playback stops the bot
+BARGE_IN_ENABLED = os.getenv("VOICE_BARGE_IN", "true").lower() == "true"
+BARGE_IN_CONFIG = BargeInConfig(
+    rms_threshold=float(os.getenv("VOICE_BARGE_IN_RMS", "1500")),
+    min_speech_ms=int(os.getenv("VOICE_BARGE_IN_MIN_SPEECH_MS", "300")),
+    grace_ms=int(os.getenv("VOICE_BARGE_IN_GRACE_MS", "800")),
+)
+
+# Seconds of speech before an interruption offered to the echo guard: if
+# the "interruption" was the bot's own voice picked up by a mic, its
+# transcript matches this tail and is rejected
+ECHO_TAIL_SECONDS = 4.0
+
+
+@dataclass
+class _Turn:
+    """The reply currently being spoken, kept until playback ends."""
+
+    user_id: str
+    channel_id: str
+    pipeline: SpeechPipeline
+    source: StreamingAudioSource
+    play_started_at: Optional[float] = None
+    synthesis_done: bool = False
+    interrupted_ms: Optional[int] = None  # Audio played when barged in
+    interrupted_by: Optional[int] = None
+    barged: bool = False  # Event-loop side: _barge_in has run
+
+
+@dataclass(eq=False)
+class _Utterance:
+    """A finished utterance in the turn queue, in the order utterances ended."""
+
+    user_id: int
+    t0: float
+    after: Optional["_Utterance"]  # Previous utterance; its turn goes first
+    text: Optional[str] = None  # Filtered transcript; None if nothing to answer
+    t_stt: float = 0.0
+    absorbed: bool = False  # Answered in an earlier utterance's batch
+    ready: asyncio.Event = field(default_factory=asyncio.Event)  # STT finished
+    done: asyncio.Event = field(default_factory=asyncio.Event)  # Turn finished
+
 
 def _ms(seconds: float) -> str:
     """Format seconds as milliseconds string."""
@@ -74,14 +133,26 @@ class VoiceSession:
 
         # Per-user VAD instances
         self._user_vads: dict[int, VoiceActivityDetector] = {}
+        # Per-user receive resamplers (filter state spans that user's frames)
+        self._user_resamplers: dict[int, StreamResampler] = {}
+        # Per-user streaming transcription of the utterance in progress
+        self._streaming = STT_STREAMING
+        self._user_streams: dict[int, STTStream] = {}
 
         # State
         self._voice_client: Optional[discord.VoiceClient] = None
         self._receiver: Optional[AudioReceiver] = None
         self._running = False
         self._is_speaking = False  # Mute reception while bot is playing
-        self._processing_lock = asyncio.Lock()
+        self._barge_in_enabled = BARGE_IN_ENABLED
+        self._user_barge_ins: dict[int, BargeInDetector] = {}
+        self._turn: Optional[_Turn] = None  # Reply being spoken (for barge-in)
+        self._utterances: deque[_Utterance] = deque()  # Turn queue
+        self._batch_ms = TURN_BATCH_MS
+        self._playback_idle = asyncio.Event()
+        self._playback_idle.set()
         self._flush_task: Optional[asyncio.Task] = None
+        self._pipeline: Optional[SpeechPipeline] = None  # Turn being spoken
 
     async def join(self, channel: discord.VoiceChannel) -> None:
         """Join a voice channel and start the listening loop."""
@@ -109,13 +180,26 @@ class VoiceSession:
         """Called from SocketReader thread. Must be fast.
 
         Downsample, feed to per-user VAD, and schedule async processing.
+        While the bot is speaking, audio only goes to barge-in detection.
         """
-        if not self._running or self._is_speaking:
+        if not self._running:
+            return
+        if self._is_speaking:
+            self._detect_barge_in(user_id, pcm_48k_stereo)
             return
 
-        # Downsample for STT
-        pcm_16k_mono = self._resampler.discord_to_stt(pcm_48k_stereo)
+        self._feed_vad(user_id, self._downsample(user_id, pcm_48k_stereo))
 
+    def _downsample(self, user_id: int, pcm_48k_stereo: bytes) -> bytes:
+        """Per-user 48kHz stereo -> 16kHz mono for STT and detection."""
+        resampler = self._user_resamplers.get(user_id)
+        if resampler is None:
+            resampler = StreamResampler()
+            self._user_resamplers[user_id] = resampler
+        return resampler.discord_to_stt(pcm_48k_stereo)
+
+    def _feed_vad(self, user_id: int, pcm_16k_mono: bytes) -> None:
+        """Feed the user's VAD (and STT stream); dispatch finished utterances."""
         # Get or create VAD for this user
         vad = self._user_vads.get(user_id)
         if vad is None:
@@ -124,16 +208,91 @@ class VoiceSession:
 
         # Feed to VAD
         utterance = vad.process(pcm_16k_mono, time.monotonic())
+        loop = self._client.loop
+        if self._streaming and (vad.is_speaking or utterance is not None):
+            # Scheduled before the utterance handler, so it sees every frame
+            loop.call_soon_threadsafe(self._stream_audio, user_id, pcm_16k_mono)
         if utterance is not None:
             vad_trigger_time = time.monotonic()
             logger.info(f"[{self._persona.display_name}] VAD triggered: {len(utterance)} bytes audio")
             # Schedule async processing on the event loop
-            loop = self._client.loop
             asyncio.run_coroutine_threadsafe(
                 self._handle_utterance(user_id, utterance, vad_trigger_time),
                 loop,
             )
 
+    def _detect_barge_in(self, user_id: int, pcm_48k_stereo: bytes) -> None:
+        """Socket thread, during playback: interrupt on sustained speech."""
+        turn = self._turn
+        if (
+            not self._barge_in_enabled
+            or turn is None
+            or turn.play_started_at is None
+            or turn.interrupted_ms is not None
+            or (time.monotonic() - turn.play_started_at) * 1000 < BARGE_IN_CONFIG.grace_ms
+        ):
+            return
+
+        detector = self._user_barge_ins.get(user_id)
+        if detector is None:
+            detector = BargeInDetector(BARGE_IN_CONFIG)
+            self._user_barge_ins[user_id] = detector
+        speech = detector.process(self._downsample(user_id, pcm_48k_stereo))
+        if speech is None:
+            return
+
+        # Unmute now so the rest of the user's speech reaches their VAD; the
+        # speech that triggered barge-in seeds the utterance
+        turn.interrupted_ms = turn.source.played_ms
+        turn.interrupted_by = user_id
+        self._is_speaking = False
+        for d in self._user_barge_ins.values():
+            d.reset()
+        self._client.loop.call_soon_threadsafe(self._barge_in, turn)
+        self._feed_vad(user_id, speech)
+
+    def _barge_in(self, turn: _Turn) -> None:
+        """Stop the interrupted reply: playback, TTS context and LLM stream."""
+        logger.info(
+            f"[{self._persona.display_name}] Barge-in by user {turn.interrupted_by} "
+            f"after {turn.interrupted_ms}ms of playback"
+        )
+        turn.barged = True
+        turn.source.interrupt()
+        if self._voice_client and self._voice_client.is_playing():
+            self._voice_client.stop()
+        if turn.synthesis_done:
+            asyncio.create_task(self._record_interruption(turn))
+        else:
+            # _speak_streaming records it once the cancelled pipeline returns
+            turn.pipeline.cancel()
+
+    async def _record_interruption(self, turn: _Turn) -> None:
+        """Make history, echo guard and analytics reflect what was heard."""
+        played = turn.interrupted_ms / 1000
+        spoken = turn.pipeline.spoken_text(played)
+        self._echo_guard.add_bot_text(
+            turn.pipeline.spoken_text(played, from_seconds=played - ECHO_TAIL_SECONDS)
+        )
+        try:
+            await self._claude.amend_interrupted_reply(turn.user_id, turn.channel_id, spoken)
+        except Exception as e:
+            logger.warning(f"[{self._persona.display_name}] Failed to amend history: {e}")
+        track(
+            "voice_barge_in",
+            "api",
+            user_id=int(turn.interrupted_by),
+            channel_id=int(turn.channel_id),
+            properties={
+                "persona_id": self._persona.name,
+                "played_ms": turn.interrupted_ms,
+                "audio_ms": int(turn.pipeline.audio_seconds * 1000),
+                "spoken_chars": len(spoken),
+                "reply_chars": len(turn.pipeline.text),
+                "during_synthesis": not turn.synthesis_done,
+            },
+        )
+
     async def _vad_flush_loop(self) -> None:
         """Periodically flush VAD buffers that Discord left hanging.
 
@@ -149,88 +308,206 @@ class VoiceSession:
             now = time.monotonic()
             for user_id, vad in list(self._user_vads.items()):
                 utterance = vad.flush(now)
+                trigger = "VAD flush"
+                if utterance is None and self._should_endpoint_early(user_id, vad, now):
+                    utterance = vad.take_utterance()
+                    trigger = "Early endpoint"
                 if utterance is not None:
                     vad_trigger_time = time.monotonic()
                     logger.info(
-                        f"[{self._persona.display_name}] VAD flush triggered: "
+                        f"[{self._persona.display_name}] {trigger} triggered: "
                         f"{len(utterance)} bytes audio"
                     )
-                    await self._handle_utterance(user_id, utterance, vad_trigger_time)
+                    asyncio.create_task(
+                        self._handle_utterance(user_id, utterance, vad_trigger_time)
+                    )
+                elif not vad.is_speaking and user_id in self._user_streams:
+                    # Too short to be an utterance; the VAD discarded it
+                    await self._user_streams.pop(user_id).close()
+
+    def _stream_audio(self, user_id: int, pcm_16k_mono: bytes) -> None:
+        """Feed a frame to the user's STT stream, opening one on speech onset."""
+        if not self._running or self._is_speaking:
+            return
+        stream = self._user_streams.get(user_id)
+        if stream is None:
+            stream = self._stt.open_stream()
+            self._user_streams[user_id] = stream
+        stream.feed(pcm_16k_mono)
+
+    def _should_endpoint_early(
+        self, user_id: int, vad: VoiceActivityDetector, now: float
+    ) -> bool:
+        """Whether a stable, sentence-final partial lets us skip the silence wait."""
+        stream = self._user_streams.get(user_id)
+        return (
+            stream is not None
+            and vad.silence_ms(now) >= EARLY_ENDPOINT_MS
+            and stream.is_stable(PARTIAL_STABLE_MS, now)
+        )
+
+    async def _close_streams(self) -> None:
+        streams = list(self._user_streams.values())
+        self._user_streams.clear()
+        await asyncio.gather(*(s.close() for s in streams), return_exceptions=True)
 
     async def _handle_utterance(self, user_id: int, pcm_16k_mono: bytes, t0: float = 0) -> None:
-        """Process a completed utterance: STT → echo check → LLM → TTS → play."""
+        """Process a completed utterance: STT → echo check → LLM → TTS → play.
+
+        STT starts as soon as the utterance ends, concurrently with other
+        speakers' STT and with the reply being spoken. Replies are then taken
+        one at a time, in the order the utterances ended.
+        """
         logger.info(f"[{self._persona.display_name}] Processing utterance: {len(pcm_16k_mono)} bytes")
+        # Detach the stream now so a new utterance from this user gets its own
+        stream = self._user_streams.pop(user_id, None)
+        utterance = _Utterance(
+            user_id, t0, after=self._utterances[-1] if self._utterances else None
+        )
+        self._utterances.append(utterance)
         try:
-            await self._handle_utterance_inner(user_id, pcm_16k_mono, t0)
+            utterance.text = await self._recognize(user_id, pcm_16k_mono, stream)
         except Exception as e:
             logger.error(f"[{self._persona.display_name}] Utterance pipeline error: {e}", exc_info=True)
+        finally:
+            utterance.t_stt = time.monotonic()
+            utterance.ready.set()
 
-    async def _handle_utterance_inner(self, user_id: int, pcm_16k_mono: bytes, t0: float) -> None:
-        # Acquire lock only for STT + LLM + TTS synthesis (not playback)
-        async with self._processing_lock:
-            if not self._running:
-                return
-
-            t_lock = time.monotonic()
-
-            # Wrap PCM in WAV for STT
-            wav_data = self._resampler.pcm_to_wav(pcm_16k_mono)
-
-            # Transcribe
-            transcript = await self._stt.transcribe(wav_data)
-            t_stt = time.monotonic()
-
-            if not transcript:
-                return
-
-            # Echo guard
-            if self._echo_guard.should_reject(transcript):
-                return
-
-            # Clean transcript
-            cleaned = self._preprocessor.clean_for_tts(transcript)
-            if not cleaned:
-                return
+        try:
+            if utterance.after is not None:
+                await utterance.after.done.wait()
+            if utterance.text and not utterance.absorbed:
+                await self._take_turn(utterance)
+        except Exception as e:
+            logger.error(f"[{self._persona.display_name}] Utterance pipeline error: {e}", exc_info=True)
+        finally:
+            utterance.done.set()
+            self._utterances.remove(utterance)
+
+    async def _recognize(
+        self, user_id: int, pcm_16k_mono: bytes, stream: Optional[STTStream]
+    ) -> Optional[str]:
+        """Transcript to answer for an utterance, or None if it should be ignored."""
+        if not self._running:
+            if stream is not None:
+                await stream.close()
+            return None
+
+        transcript = await self._transcribe(pcm_16k_mono, stream)
+        if not transcript:
+            return None
+
+        # Echo guard
+        if self._echo_guard.should_reject(transcript):
+            return None
+
+        # Clean transcript
+        cleaned = self._preprocessor.clean_for_tts(transcript)
+        if not cleaned:
+            return None
+
+        # Name-address filter: in multi-user channels, only respond when addressed
+        if self._human_count() >= 2 and not self._name_filter.is_addressed(cleaned):
+            logger.debug(
+                f"[{self._persona.display_name}] Skipped (not addressed) "
+                f"from user {user_id}: {cleaned!r}"
+            )
+            return None
 
-            # Name-address filter: in multi-user channels, only respond when addressed
-            if self._human_count() >= 2 and not self._name_filter.is_addressed(cleaned):
-                logger.debug(
-                    f"[{self._persona.display_name}] Skipped (not addressed) "
-                    f"from user {user_id}: {cleaned!r}"
-                )
-                return
+        logger.info(
+            f"[{self._persona.display_name}] Voice from user {user_id}: {cleaned}"
+        )
+        return cleaned
 
-            logger.info(
-                f"[{self._persona.display_name}] Voice from user {user_id}: {cleaned}"
-            )
+    async def _take_turn(self, utterance: _Utterance) -> None:
+        """Answer an utterance (and any batched with it) once playback is idle."""
+        # Wait for the previous reply to finish playing
+        await self._playback_idle.wait()
+        if not self._running:
+            return
+        t_turn = time.monotonic()
+        batch = await self._collect_batch(utterance)
+
+        # Streaming LLM → TTS → start playback (returns after synthesis)
+        channel_id = (
+            str(self._voice_client.channel.id)
+            if self._voice_client
+            else "0"
+        )
+        await self._speak_streaming(
+            user_id=str(utterance.user_id),
+            channel_id=channel_id,
+            content=self._merge_batch(batch),
+            t0=utterance.t0,
+            t_stt=utterance.t_stt,
+            t_turn=t_turn,
+            batched=len(batch),
+            speakers=self._batch_speakers(batch),
+        )
+        # Playback continues via AudioPlayer thread;
+        # _is_speaking cleared by _on_playback_done callback
 
-            # Streaming LLM → TTS → start playback (lock released after synthesis)
-            channel_id = (
-                str(self._voice_client.channel.id)
-                if self._voice_client
-                else "0"
-            )
-            await self._speak_streaming(
-                user_id=str(user_id),
-                channel_id=channel_id,
-                content=cleaned,
-                t0=t0,
-                t_stt=t_stt,
-                t_lock=t_lock,
+    async def _collect_batch(self, first: _Utterance) -> list[_Utterance]:
+        """`first` plus queued utterances that ended within the batch window of it."""
+        if self._batch_ms <= 0:
+            return [first]
+        deadline = first.t0 + self._batch_ms / 1000
+        # Let utterances that end inside the window reach the queue
+        await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+
+        batch = [first]
+        queued = list(self._utterances)
+        for utterance in queued[queued.index(first) + 1:]:
+            if utterance.t0 > deadline:
+                break
+            await utterance.ready.wait()
+            if utterance.text:
+                utterance.absorbed = True
+                batch.append(utterance)
+        return batch
+
+    def _merge_batch(self, batch: list[_Utterance]) -> str:
+        """One LLM message for a batch, naming speakers when there are several."""
+        if len({u.user_id for u in batch}) == 1:
+            return " ".join(u.text for u in batch)
+        return "\n".join(f"{self._speaker_name(u.user_id)}: {u.text}" for u in batch)
+
+    @staticmethod
+    def _batch_speakers(batch: list[_Utterance]) -> Optional[list[tuple[str, str]]]:
+        """(user_id, what they said) per speaker of a multi-speaker batch, else None."""
+        said: dict[int, list[str]] = {}
+        for u in batch:
+            said.setdefault(u.user_id, []).append(u.text)
+        if len(said) == 1:
+            return None
+        return [(str(uid), " ".join(texts)) for uid, texts in said.items()]
+
+    async def _transcribe(
+        self, pcm_16k_mono: bytes, stream: Optional[STTStream]
+    ) -> str:
+        """Final transcript from the utterance's stream, else batch STT."""
+        if stream is not None:
+            transcript = await stream.finalize()
+            if transcript is not None:
+                return transcript
+            logger.warning(
+                f"[{self._persona.display_name}] Streaming STT failed, using batch"
             )
-        # Lock released here — playback continues via AudioPlayer thread
-        # _is_speaking cleared by _on_playback_done callback
+        # Wrap PCM in WAV for STT
+        wav_data = self._resampler.pcm_to_wav(pcm_16k_mono)
+        return await self._stt.transcribe(wav_data)
 
     def _on_playback_done(self, error) -> None:
         """Called by discord.py AudioPlayer thread when playback finishes."""
         self._is_speaking = False
+        self._client.loop.call_soon_threadsafe(self._playback_idle.set)
         if error:
             logger.error(f"Playback error: {error}")
 
     async def _track_memory_async(
         self, user_id: str, channel_id: str, content: str, response: str
     ) -> None:
-        """Fire-and-forget memory tracking. Runs outside the processing lock."""
+        """Fire-and-forget memory tracking. Runs outside the turn queue."""
         try:
             channel = self._voice_client.channel if self._voice_client else None
             await self._claude.memory.track_message(
@@ -251,14 +528,21 @@ class VoiceSession:
         content: str,
         t0: float = 0,
         t_stt: float = 0,
-        t_lock: float = 0,
+        t_turn: float = 0,
+        batched: int = 1,
+        speakers: Optional[list[tuple[str, str]]] = None,
     ) -> None:
         """Stream LLM response sentence-by-sentence through TTS to voice.
 
-        Starts playback and returns after all TTS audio is fed to the buffer.
+        `speakers` splits a multi-speaker batch into (user_id, text) pairs so
+        each speaker's memories are tracked under their own user_id.
+
+        Runs a SpeechPipeline (LLM reader and TTS writer overlap), starts
+        playback on the first audio chunk, and returns after all TTS audio
+        is fed to the buffer.
         Does NOT wait for playback to complete — that happens via the
-        _on_playback_done callback. This keeps the processing lock held
-        only during synthesis, not during the 10-20s playback.
+        _on_playback_done callback; the next turn waits for that, but its
+        STT has already run during this one.
         """
         if not self._voice_client or not self._voice_client.is_connected():
             return
@@ -268,83 +552,129 @@ class VoiceSession:
         emotion = cartesia_voice.default_emotion if cartesia_voice else None
         speed = cartesia_voice.speed if cartesia_voice else 1.0
 
+        # The previous reply is over: barge-in must not target it while this
+        # one is still being set up
+        self._turn = None
+
         # Mute audio reception while speaking (prevents echo feedback)
         self._is_speaking = True
         for vad in self._user_vads.values():
             vad.reset()
+        await self._close_streams()
 
         resampler = StreamResampler()
         source = StreamingAudioSource()
         play_started = False
-        sentences = []
-        sentence_count = 0
 
-        try:
-            async for sentence in self._claude.chat_streaming(
+        def on_audio(pcm_24k: bytes) -> None:
+            nonlocal play_started
+            if turn.interrupted_ms is not None:
+                return  # Barged in; the pipeline is being cancelled
+            source.feed(resampler.tts_to_discord(pcm_24k))
+            if not play_started and self._voice_client:
+                # Use after callback to clear _is_speaking when done
+                self._voice_client.play(
+                    source, signal_type="voice",
+                    after=self._on_playback_done,
+                )
+                play_started = True
+                turn.play_started_at = time.monotonic()
+                self._playback_idle.clear()
+
+        # LLM reader and TTS writer run concurrently: the next sentence is
+        # generated while the previous one is synthesized and played
+        pipeline = SpeechPipeline(
+            self._tts,
+            self._claude.chat_streaming(
                 user_id=user_id,
                 channel_id=channel_id,
                 content=content,
                 channel=self._voice_client.channel if self._voice_client else None,
-            ):
-                sentence_count += 1
-                sentences.append(sentence)
-
-                # Infer emotion from this sentence
-                sent_emotion = self._emotion.infer(sentence) or emotion
-
-                # TTS this sentence immediately
-                async for pcm_24k in self._tts.synthesize(
-                    sentence, emotion=sent_emotion, speed=speed
-                ):
-                    pcm_48k = resampler.tts_to_discord(pcm_24k)
-                    source.feed(pcm_48k)
-
-                    if not play_started and self._voice_client:
-                        # Use after callback to clear _is_speaking when done
-                        self._voice_client.play(
-                            source, signal_type="voice",
-                            after=self._on_playback_done,
-                        )
-                        play_started = True
-
-                        if t0:
-                            t_play = time.monotonic()
-                            logger.info(
-                                f"LATENCY: lock_wait={_ms(t_lock - t0)} "
-                                f"stt={_ms(t_stt - t_lock)} "
-                                f"llm_first_sentence={_ms(t_play - t_stt)} "
-                                f"TOTAL={_ms(t_play - t0)}"
-                            )
+            ),
+            on_audio,
+            emotion_for=lambda sentence: self._emotion.infer(sentence) or emotion,
+            speed=speed,
+            started=t0 or None,
+        )
+        self._pipeline = pipeline
+        turn = _Turn(user_id, channel_id, pipeline, source)
+        self._turn = turn
 
+        try:
+            timing = await pipeline.run()
+        except Exception:
+            # If generation or synthesis fails, make sure we unmute
+            self._is_speaking = False
+            raise
+        finally:
+            self._pipeline = None
+            # Ends playback after buffered audio (or immediately if cancelled)
             source.finish()
+            # From here a barge-in records itself; before, it's recorded below
+            turn.synthesis_done = True
+            barged = turn.barged
 
+        full_text = pipeline.text
+        if t0 and timing.first_audio is not None:
+            logger.info(
+                f"LATENCY: stt={_ms(t_stt - t0)} "
+                f"queue_wait={_ms(t_turn - t_stt)} "
+                f"llm_first_sentence={_ms(timing.first_segment - t_turn)} "
+                f"tts_first_audio={_ms(timing.first_audio - timing.first_segment)} "
+                f"TOTAL={_ms(timing.first_audio - t0)}"
+            )
+        track(
+            "voice_turn",
+            "api",
+            user_id=int(user_id),
+            channel_id=int(channel_id),
+            properties={
+                "persona_id": self._persona.name,
+                "ttfa_ms": timing.ttfa_ms,
+                "llm_first_sentence_ms": timing.first_segment_ms,
+                "stt_ms": int((t_stt - t0) * 1000) if t0 else None,
+                "queue_ms": int((t_turn - t_stt) * 1000) if t0 else None,
+                "batched": batched,
+                "sentences": timing.segments,
+                "chars": timing.chars,
+                "cancelled": timing.cancelled,
+                "interrupted": barged,
+            },
+        )
+
+        if barged:
+            # Only what was heard goes to history, echo guard and memory
+            await self._record_interruption(turn)
+            full_text = pipeline.spoken_text(turn.interrupted_ms / 1000)
+        else:
             # Echo guard with full response
-            full_text = " ".join(sentences)
             self._echo_guard.add_bot_text(full_text)
 
-            logger.info(f"TTS: {sentence_count} sentence(s), {len(full_text)} chars")
+        logger.info(
+            f"TTS: {timing.segments} sentence(s), {len(full_text)} chars, "
+            f"ttfa={timing.ttfa_ms}ms"
+        )
 
-            # If no audio was produced (TTS error, single-char response, etc.),
-            # playback never started so _on_playback_done won't fire.
-            # Clear _is_speaking now or all future audio is silently dropped.
-            if not play_started:
-                self._is_speaking = False
+        # If no audio was produced (TTS error, single-char response, etc.),
+        # playback never started so _on_playback_done won't fire.
+        # Clear _is_speaking now or all future audio is silently dropped.
+        if not play_started:
+            self._is_speaking = False
 
-            # Fire-and-forget memory tracking (don't block the pipeline)
-            if self._claude.memory and full_text:
+        # Fire-and-forget memory tracking (don't block the pipeline)
+        if self._claude.memory and full_text:
+            for speaker_id, said in speakers or [(user_id, content)]:
                 asyncio.create_task(
-                    self._track_memory_async(user_id, channel_id, content, full_text)
+                    self._track_memory_async(speaker_id, channel_id, said, full_text)
                 )
 
-        except Exception:
-            # If synthesis fails, make sure we unmute
-            self._is_speaking = False
-            raise
-
     async def leave(self) -> None:
         """Disconnect from voice and clean up all resources."""
         self._running = False
 
+        if self._pipeline:
+            self._pipeline.cancel()
+
         if self._flush_task:
             self._flush_task.cancel()
             self._flush_task = None
@@ -359,9 +689,14 @@ class VoiceSession:
             await self._voice_client.disconnect()
             self._voice_client = None
 
+        self._turn = None
+        self._playback_idle.set()  # Release queued turns; they see _running is off
+        await self._close_streams()
         await self._tts.close()
         await self._stt.close()
         self._user_vads.clear()
+        self._user_resamplers.clear()
+        self._user_barge_ins.clear()
 
         logger.info(f"[{self._persona.display_name}] Left voice channel")
 
@@ -371,6 +706,14 @@ class VoiceSession:
             return 0
         return sum(1 for m in self._voice_client.channel.members if not m.bot)
 
+    def _speaker_name(self, user_id: int) -> str:
+        """Display name of a voice channel member, for multi-speaker turns."""
+        if self._voice_client and self._voice_client.channel:
+            for member in self._voice_client.channel.members:
+                if member.id == user_id:
+                    return member.display_name
+        return f"User {user_id}"
+
     @property
     def is_connected(self) -> bool:
         """Whether the bot is currently in a voice channel."""
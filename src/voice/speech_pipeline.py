@@ -0,0 +1,230 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Pipelined LLM → TTS for one spoken turn.
+
+Two cancellable tasks joined by a bounded queue:
+
+- reader: pulls sentences from the LLM stream and queues them. When the
+  queue is full (TTS is behind) it stops reading, so generation can't run
+  arbitrarily far ahead of speech.
+- writer: feeds queued sentences into a single Cartesia context
+  (``continue=True``) and hands audio to the caller as it arrives.
+
+Sentence two is therefore generated while sentence one is being synthesized
+and played, and prosody carries across sentences because they share one
+context. The emotion is inferred from the first sentence and held for the
+turn (a context can't change voice settings midway).
+
+Word timestamps from TTS let spoken_text() say how much of the reply a
+listener actually heard when playback is cut short (barge-in).
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Optional
+
+from voice.cartesia_tts import CartesiaTTSClient
+
+logger = logging.getLogger(__name__)
+
+# Sentences buffered between the LLM reader and the TTS writer
+SEGMENT_QUEUE_SIZE = int(os.getenv("VOICE_SEGMENT_QUEUE_SIZE", "8"))
+
+TTS_BYTES_PER_SECOND = 24000 * 2  # 24kHz mono s16le
+
+_END = object()  # Reader finished (normally or with an error)
+
+
+@dataclass
+class TurnTiming:
+    """Monotonic timestamps and counts for one spoken turn."""
+
+    started: float
+    first_segment: Optional[float] = None
+    first_audio: Optional[float] = None
+    finished: Optional[float] = None
+    segments: int = 0
+    chars: int = 0
+    cancelled: bool = False
+
+    @property
+    def ttfa_ms(self) -> Optional[int]:
+        """Time to first audio, from `started`."""
+        if self.first_audio is None:
+            return None
+        return int((self.first_audio - self.started) * 1000)
+
+    @property
+    def first_segment_ms(self) -> Optional[int]:
+        """Time until the LLM produced the first sentence, from `started`."""
+        if self.first_segment is None:
+            return None
+        return int((self.first_segment - self.started) * 1000)
+
+
+class SpeechPipeline:
+    """Producer/consumer pipeline from an LLM sentence stream to TTS audio."""
+
+    def __init__(
+        self,
+        tts: CartesiaTTSClient,
+        segments: AsyncIterator[str],
+        on_audio: Callable[[bytes], None],
+        *,
+        emotion_for: Callable[[str], Optional[str]] = lambda _: None,
+        speed: float = 1.0,
+        started: Optional[float] = None,
+        queue_size: int = SEGMENT_QUEUE_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            tts: Connected TTS client
+            segments: LLM output, one sentence per item
+            on_audio: Receives each 24kHz mono PCM chunk as it arrives
+            emotion_for: Emotion for the turn, from its first sentence
+            speed: Speech speed multiplier
+            started: Turn start for latency (defaults to now)
+            queue_size: Sentences buffered ahead of TTS
+        """
+        self._tts = tts
+        self._segments = segments
+        self._on_audio = on_audio
+        self._emotion_for = emotion_for
+        self._speed = speed
+        self._clock = clock
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._spoken: list[str] = []
+        self._synthesized: list[str] = []  # Segments handed to TTS
+        self._word_ends: list[tuple[str, float]] = []  # From TTS timestamps
+        self._audio_bytes = 0
+        self._error: Optional[BaseException] = None
+        self._tasks: list[asyncio.Task] = []
+        self._cancelled = False
+        self.timing = TurnTiming(started=started if started is not None else clock())
+
+    @property
+    def text(self) -> str:
+        """Everything the LLM produced for this turn so far."""
+        return " ".join(self._spoken)
+
+    @property
+    def audio_seconds(self) -> float:
+        """Duration of the audio synthesized so far."""
+        return self._audio_bytes / TTS_BYTES_PER_SECOND
+
+    def spoken_text(self, played_seconds: float, from_seconds: float = 0.0) -> str:
+        """The part of the reply heard between `from_seconds` and `played_seconds` of audio.
+
+        Uses TTS word timestamps when available, else assumes speech is
+        spread evenly over the synthesized text. Only whole words are kept.
+        """
+        text = " ".join(self._synthesized)
+        total = self.audio_seconds
+        if from_seconds <= 0 and played_seconds >= total:
+            return text
+        if self._word_ends:
+            return " ".join(
+                word for word, end in self._word_ends if from_seconds < end <= played_seconds
+            )
+        if not text or total <= 0:
+            return ""
+        lo, hi = len(text) * from_seconds / total, len(text) * played_seconds / total
+        return " ".join(
+            m.group() for m in re.finditer(r"\S+", text) if m.start() >= lo and m.end() <= hi
+        )
+
+    async def run(self) -> TurnTiming:
+        """
+        Run the turn until all audio has been handed to on_audio.
+
+        Returns normally (with timing.cancelled set) if cancel() stopped it;
+        re-raises an LLM stream error after speaking what arrived before it.
+        """
+        self._tasks = [
+            asyncio.create_task(self._read(), name="voice-llm-reader"),
+            asyncio.create_task(self._write(), name="voice-tts-writer"),
+        ]
+        try:
+            await asyncio.gather(*self._tasks)
+        except asyncio.CancelledError:
+            self._cancel_tasks()
+            if not self._cancelled:
+                raise  # Our caller was cancelled, not just this turn
+        except Exception:
+            self._cancel_tasks()
+            raise
+        finally:
+            # Let cancelled tasks run their cleanup (closing the LLM stream)
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self.timing.finished = self._clock()
+            self.timing.cancelled = self._cancelled
+
+        if self._error is not None:
+            raise self._error
+        return self.timing
+
+    def cancel(self) -> None:
+        """Stop generation and synthesis for this turn."""
+        self._cancelled = True
+        self._cancel_tasks()
+
+    def _cancel_tasks(self) -> None:
+        for task in self._tasks:
+            if not task.done():
+                task.cancel()
+
+    async def _read(self) -> None:
+        try:
+            async for segment in self._segments:
+                if not segment:
+                    continue
+                if self.timing.first_segment is None:
+                    self.timing.first_segment = self._clock()
+                self.timing.segments += 1
+                self.timing.chars += len(segment)
+                self._spoken.append(segment)
+                await self._queue.put(segment)  # Blocks while TTS is behind
+        except asyncio.CancelledError:
+            aclose = getattr(self._segments, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            raise
+        except Exception as e:
+            self._error = e  # Speak what we have, then surface it from run()
+        await self._queue.put(_END)
+
+    async def _drain(self, first: str) -> AsyncIterator[str]:
+        self._synthesized.append(first)
+        yield first
+        while (segment := await self._queue.get()) is not _END:
+            self._synthesized.append(segment)
+            yield segment
+
+    def _on_timestamps(self, words: list[str], ends: list[float]) -> None:
+        self._word_ends.extend(zip(words, ends))
+
+    async def _write(self) -> None:
+        first = await self._queue.get()
+        if first is _END:
+            return
+        audio = self._tts.synthesize_incremental(
+            self._drain(first),
+            emotion=self._emotion_for(first),
+            speed=self._speed,
+            on_timestamps=self._on_timestamps,
+        )
+        try:
+            async for pcm in audio:
+                if self.timing.first_audio is None:
+                    self.timing.first_audio = self._clock()
+                self._audio_bytes += len(pcm)
+                self._on_audio(pcm)
+        finally:
+            await audio.aclose()
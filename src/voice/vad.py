@@ -11,7 +11,7 @@ Accumulates per-user audio and detects speech boundaries via RMS energy.
 from dataclasses import dataclass
 from typing import Optional
 
-import audioop
+from voice.dsp import rms as frame_rms
 
 
 @dataclass
@@ -45,7 +45,7 @@ class VoiceActivityDetector:
         if not pcm_chunk or len(pcm_chunk) < 2:
             return None
 
-        rms = audioop.rms(pcm_chunk, 2)
+        rms = frame_rms(pcm_chunk)
 
         if rms >= self._config.rms_threshold:
             # Voice detected
@@ -79,6 +79,29 @@ class VoiceActivityDetector:
             return None
         return self._check_silence_timeout(timestamp)
 
+    @property
+    def is_speaking(self) -> bool:
+        """Whether an utterance is in progress (voice seen, not yet finalized)."""
+        return self._is_speaking
+
+    def silence_ms(self, timestamp: float) -> float:
+        """Milliseconds since the last voiced chunk of the current utterance."""
+        if not self._is_speaking:
+            return 0.0
+        return (timestamp - self._last_voice_time) * 1000
+
+    def take_utterance(self) -> Optional[bytes]:
+        """End the current utterance now, before the silence timeout.
+
+        Used for early endpointing when a streaming transcript already shows
+        the user finished a sentence. Skips the minimum-length check.
+        """
+        if not self._is_speaking:
+            return None
+        result = bytes(self._audio_buffer)
+        self.reset()
+        return result
+
     def _check_silence_timeout(self, timestamp: float) -> Optional[bytes]:
         """Return utterance bytes if silence timeout has elapsed, else None."""
         elapsed_ms = (timestamp - self._last_voice_time) * 1000
@@ -97,3 +120,60 @@ class VoiceActivityDetector:
         self._audio_buffer.clear()
         self._is_speaking = False
         self._last_voice_time = 0.0
+
+
+@dataclass
+class BargeInConfig:
+    """Sensitivity of barge-in detection while the bot is speaking."""
+
+    rms_threshold: float = 1500.0  # Above VAD: bleed of the bot's voice into a mic must not trip it
+    min_speech_ms: int = 300  # Sustained speech needed to interrupt
+    max_gap_ms: int = 120  # Quieter stretches up to this long don't break the run
+    grace_ms: int = 800  # No barge-in this soon after playback starts
+
+
+class BargeInDetector:
+    """Detects sustained speech from one user during bot playback.
+
+    Works on 16kHz mono s16le like VoiceActivityDetector, but needs louder
+    and longer speech, so a cough or the bot's own voice leaking through a
+    speaker doesn't cut it off. The speech that triggered it is returned,
+    so it can seed the user's next utterance.
+    """
+
+    BYTES_PER_MS = 32  # 16kHz mono s16le
+
+    def __init__(self, config: BargeInConfig | None = None):
+        self._config = config or BargeInConfig()
+        self._buffer = bytearray()
+        self._voiced_bytes = 0
+        self._quiet_bytes = 0
+
+    def process(self, pcm_chunk: bytes) -> Optional[bytes]:
+        """Feed a chunk; returns the captured speech once barge-in triggers."""
+        if not pcm_chunk or len(pcm_chunk) < 2:
+            return None
+
+        if frame_rms(pcm_chunk) >= self._config.rms_threshold:
+            self._quiet_bytes = 0
+            self._voiced_bytes += len(pcm_chunk)
+            self._buffer.extend(pcm_chunk)
+            if self._voiced_bytes >= self._config.min_speech_ms * self.BYTES_PER_MS:
+                result = bytes(self._buffer)
+                self.reset()
+                return result
+            return None
+
+        if self._buffer:
+            self._quiet_bytes += len(pcm_chunk)
+            if self._quiet_bytes > self._config.max_gap_ms * self.BYTES_PER_MS:
+                self.reset()
+            else:
+                self._buffer.extend(pcm_chunk)
+        return None
+
+    def reset(self) -> None:
+        """Forget any partial run of speech."""
+        self._buffer.clear()
+        self._voiced_bytes = 0
+        self._quiet_bytes = 0
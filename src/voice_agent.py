@@ -28,6 +28,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from agents.agent_client import AgentClient
 from agents.persona_loader import PersonaConfig
+from llm_gateway import LANE_MEMORY, get_llm_gateway, shutdown_llm_gateway
 
 logging.basicConfig(
     level=logging.INFO,
@@ -55,12 +56,10 @@ async def _init_memory():
 
     try:
         import asyncpg
-        from anthropic import AsyncAnthropic
         from memory.manager import MemoryManager
 
         pool = await asyncpg.create_pool(db_url, min_size=1, max_size=3)
-        anthropic_client = AsyncAnthropic(api_key=api_key)
-        memory_manager = MemoryManager(pool, anthropic_client)
+        memory_manager = MemoryManager(pool, get_llm_gateway(api_key).client(LANE_MEMORY))
         logger.info("Memory system initialized for voice agent")
         return memory_manager, pool
     except Exception as e:
@@ -129,6 +128,7 @@ async def main():
         if db_pool:
             await db_pool.close()
             logger.info("Database pool closed")
+        await shutdown_llm_gateway()
 
 
 if __name__ == "__main__":
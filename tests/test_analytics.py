@@ -0,0 +1,97 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the buffered analytics writer."""
+
+import asyncio
+import json
+import sys
+from collections import deque
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import analytics
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Fresh analytics state writing through a mock pool."""
+    monkeypatch.setattr(analytics, "_enabled", True)
+    monkeypatch.setattr(analytics, "_buffer", deque(maxlen=5))
+    monkeypatch.setattr(analytics, "_flusher", None)
+    monkeypatch.setattr(analytics, "_wakeup", None)
+    monkeypatch.setattr(analytics, "_stats", dict.fromkeys(analytics._stats, 0))
+    monkeypatch.setattr(analytics, "BATCH_SIZE", 2)
+    pool = MagicMock()
+    pool.copy_records_to_table = AsyncMock()
+    pool.close = AsyncMock()
+    analytics.use_pool(pool)
+    yield pool
+    monkeypatch.setattr(analytics, "_pool", None)
+
+
+class TestAnalyticsBuffer:
+    def test_track_without_loop_buffers(self, pool):
+        analytics.track("message_received", "message", user_id=1, properties={"a": 1})
+
+        assert analytics.stats()["buffered"] == 1
+        record = analytics._buffer[0]
+        assert record[:5] == ("message_received", "message", 1, None, None)
+        assert json.loads(record[5]) == {"a": 1}
+        assert record[6].tzinfo is not None
+
+    def test_full_buffer_drops_oldest_and_counts(self, pool):
+        for i in range(7):
+            analytics.track(f"event_{i}", "system")
+
+        stats = analytics.stats()
+        assert stats["buffered"] == 5
+        assert stats["dropped"] == 2
+        assert analytics._buffer[0][0] == "event_2"
+
+    @pytest.mark.asyncio
+    async def test_flush_copies_in_batches(self, pool):
+        for i in range(5):
+            analytics.track(f"event_{i}", "system")
+
+        assert await analytics.flush() == 5
+
+        assert pool.copy_records_to_table.await_count == 3  # 2 + 2 + 1
+        call = pool.copy_records_to_table.await_args_list[0]
+        assert call.args == ("analytics_events",)
+        assert call.kwargs["columns"] == analytics._COLUMNS
+        assert [r[0] for r in call.kwargs["records"]] == ["event_0", "event_1"]
+        assert analytics.stats()["written"] == 5
+
+    @pytest.mark.asyncio
+    async def test_full_batch_wakes_flusher(self, pool):
+        analytics.track("a", "system")
+        analytics.track("b", "system")  # Reaches BATCH_SIZE
+
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        pool.copy_records_to_table.assert_awaited_once()
+        await analytics.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_write_failure_counted(self, pool):
+        pool.copy_records_to_table.side_effect = RuntimeError("db down")
+
+        assert await analytics.track_async("a", "system") is False
+        assert analytics.stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_shutdown_flushes_and_keeps_shared_pool_open(self, pool):
+        analytics.track("a", "system")
+
+        await analytics.shutdown()
+
+        pool.copy_records_to_table.assert_awaited_once()
+        pool.close.assert_not_awaited()
+        assert analytics.stats()["buffered"] == 0
@@ -9,12 +9,12 @@ import sys
 import threading
 from pathlib import Path
 
-import audioop
 import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from voice.audio_source import FRAME_SIZE, StreamingAudioSource
+from voice.dsp import rms
 
 
 class TestStreamingAudioSource:
@@ -85,8 +85,8 @@ class TestStreamingAudioSource:
         source.feed(samples)
         frame = source.read()
         # Check RMS is roughly halved
-        original_rms = audioop.rms(samples, 2)
-        scaled_rms = audioop.rms(frame, 2)
+        original_rms = rms(samples)
+        scaled_rms = rms(frame)
         assert scaled_rms < original_rms
         assert scaled_rms > 0
 
@@ -132,3 +132,20 @@ class TestStreamingAudioSource:
         reader_thread.join(timeout=5.0)
         assert not reader_thread.is_alive()
         assert len(frames_read) == num_frames
+
+    def test_played_ms_counts_audio_frames_only(self):
+        source = StreamingAudioSource()
+        source.read()  # Silence while waiting doesn't count
+        source.feed(b"\x01" * FRAME_SIZE * 3)
+        source.read()
+        source.read()
+        assert source.played_ms == 40
+
+    def test_interrupt_drops_queued_audio(self):
+        source = StreamingAudioSource()
+        source.feed(b"\x01" * FRAME_SIZE * 5 + b"\x01" * 10)
+
+        source.interrupt()
+
+        assert source.read() == b""
+        assert not source.is_speaking
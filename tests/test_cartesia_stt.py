@@ -2,17 +2,23 @@
 # Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
 # SPDX-License-Identifier: AGPL-3.0-only
 
-"""Tests for Cartesia STT client (mocked HTTP)."""
+"""Tests for Cartesia STT client (mocked HTTP, local fake streaming server)."""
 
+import asyncio
+import math
+import struct
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from aiohttp import WSMsgType, web
+from aiohttp.test_utils import TestServer
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from voice.cartesia_stt import API_VERSION, STT_MODEL, STT_URL, CartesiaSTTClient
+from voice.cartesia_stt import API_VERSION, STT_MODEL, STT_URL, CartesiaSTTClient, STTStream
 
 
 @pytest.fixture
@@ -118,3 +124,154 @@ class TestCartesiaSTT:
         await client.close()
         mock_session.close.assert_awaited_once()
         assert client._session is None
+
+
+# --- Streaming -------------------------------------------------------------
+
+SAMPLE_RATE = 16000
+SCRIPT = "Hey Lena, how are you today?".split()
+
+
+def _speech(ms: int) -> bytes:
+    """PCM fixture standing in for recorded speech: a 220Hz tone, 16kHz mono s16le."""
+    n = SAMPLE_RATE * ms // 1000
+    return b"".join(
+        struct.pack("<h", int(8000 * math.sin(2 * math.pi * 220 * i / SAMPLE_RATE)))
+        for i in range(n)
+    )
+
+
+def _silence(ms: int) -> bytes:
+    return b"\x00\x00" * (SAMPLE_RATE * ms // 1000)
+
+
+class _FakeSTTServer:
+    """Local stand-in for Cartesia's STT WebSocket.
+
+    "Recognizes" one word of SCRIPT per 100ms of voiced audio, sending a
+    partial after each, and answers "finalize" with a final transcript and
+    flush_done.
+    """
+
+    def __init__(self, error: str | None = None, reject_status: int | None = None):
+        self.error = error
+        self.reject_status = reject_status
+        self.query: dict = {}
+        self.headers: dict = {}
+        self.audio = bytearray()
+
+    async def handler(self, request: web.Request) -> web.StreamResponse:
+        self.query = dict(request.query)
+        self.headers = dict(request.headers)
+        if self.reject_status:
+            return web.Response(status=self.reject_status)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        if self.error:
+            await ws.send_json({"type": "error", "message": self.error})
+            await ws.close()
+            return ws
+        voiced = 0
+        async for msg in ws:
+            if msg.type == WSMsgType.BINARY:
+                self.audio.extend(msg.data)
+                samples = memoryview(msg.data).cast("h")
+                for i in range(0, len(samples), 1600):  # 100ms windows
+                    if max(map(abs, samples[i:i + 1600])) > 500:
+                        voiced += 1
+                        await ws.send_json({
+                            "type": "transcript", "is_final": False,
+                            "text": " ".join(SCRIPT[:voiced]),
+                        })
+            elif msg.type == WSMsgType.TEXT and msg.data == "finalize":
+                await ws.send_json({
+                    "type": "transcript", "is_final": True,
+                    "text": " ".join(SCRIPT[:voiced]),
+                })
+                await ws.send_json({"type": "flush_done"})
+        return ws
+
+
+@asynccontextmanager
+async def _fake_client(fake: _FakeSTTServer):
+    app = web.Application()
+    app.router.add_get("/stt/websocket", fake.handler)
+    server = TestServer(app)
+    await server.start_server()
+    url = str(server.make_url("/stt/websocket")).replace("http://", "ws://")
+    client = CartesiaSTTClient(api_key="test-key-123", ws_url=url)
+    try:
+        yield client
+    finally:
+        await client.close()
+        await server.close()
+
+
+async def _until(predicate, timeout: float = 2.0) -> None:
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+class TestSTTStream:
+    @pytest.mark.asyncio
+    async def test_partials_then_final_transcript(self):
+        fake = _FakeSTTServer()
+        async with _fake_client(fake) as client:
+            stream = client.open_stream()
+            stream.feed(_speech(300))  # Queued before the socket is up
+
+            await _until(lambda: stream.partial == "Hey Lena, how")
+            for _ in range(3):
+                stream.feed(_speech(100))
+            stream.feed(_silence(200))
+
+            assert await stream.finalize() == "Hey Lena, how are you today?"
+            assert len(fake.audio) == len(_speech(600)) + len(_silence(200))
+            assert fake.query["model"] == STT_MODEL
+            assert fake.query["sample_rate"] == "16000"
+            assert fake.headers["X-API-Key"] == "test-key-123"
+            assert "api_key" not in fake.query
+
+    @pytest.mark.asyncio
+    async def test_rejected_handshake_error_omits_api_key(self):
+        async with _fake_client(_FakeSTTServer(reject_status=401)) as client:
+            stream = client.open_stream()
+            stream.feed(_speech(100))
+
+            assert await stream.finalize() is None
+            assert "401" in stream.error
+            assert "test-key-123" not in stream.error
+
+    @pytest.mark.asyncio
+    async def test_server_error_returns_none(self):
+        async with _fake_client(_FakeSTTServer(error="bad audio")) as client:
+            stream = client.open_stream()
+            stream.feed(_speech(100))
+
+            assert await stream.finalize() is None
+            assert stream.error == "bad audio"
+
+    @pytest.mark.asyncio
+    async def test_unreachable_server_returns_none(self):
+        client = CartesiaSTTClient(api_key="k", ws_url="ws://127.0.0.1:9/stt/websocket")
+        stream = client.open_stream()
+        stream.feed(_speech(100))
+
+        assert await stream.finalize(timeout=1.0) is None
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_stability_needs_time_and_terminal_punctuation(self):
+        session = MagicMock()
+        session.ws_connect = AsyncMock(side_effect=OSError("offline"))
+        stream = STTStream(session, "ws://unused", clock=lambda: 10.0)
+
+        stream.partial, stream.changed_at = "how are you", 9.0
+        assert not stream.is_stable(300)  # No terminal punctuation
+        stream.partial, stream.changed_at = "how are you?", 9.9
+        assert not stream.is_stable(300)  # Still changing
+        stream.changed_at = 9.5
+        assert stream.is_stable(300)
+        await stream.close()
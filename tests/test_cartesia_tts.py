@@ -4,6 +4,7 @@
 
 """Tests for Cartesia TTS client (mocked WebSocket)."""
 
+import asyncio
 import base64
 import json
 import sys
@@ -181,3 +182,106 @@ class TestCartesiaTTS:
             chunks.append(chunk)
 
         assert chunks == []
+
+
+class _GatedWs:
+    """WebSocket stand-in that releases its messages once the context is closed."""
+
+    def __init__(self, messages):
+        self.closed = False
+        self.sent = []
+        self._messages = messages
+        self._closed_context = asyncio.Event()
+
+    async def send_json(self, payload):
+        self.sent.append(payload)
+        if payload.get("continue") is False or payload.get("cancel"):
+            self._closed_context.set()
+
+    async def __aiter__(self):
+        await self._closed_context.wait()
+        for msg in self._messages:
+            yield msg
+
+
+async def _segments(*texts, error=None):
+    for text in texts:
+        yield text
+    if error:
+        raise error
+
+
+class TestSynthesizeIncremental:
+    @pytest.mark.asyncio
+    async def test_segments_share_one_continued_context(self, client):
+        pcm = b"\x01\x02" * 50
+        ws = _GatedWs([
+            _make_ws_text_msg({"context_id": "slashai-1", "type": "chunk",
+                               "data": base64.b64encode(pcm).decode()}),
+            _make_ws_text_msg({"context_id": "slashai-1", "type": "done"}),
+        ])
+        client._ws = ws
+
+        chunks = [c async for c in client.synthesize_incremental(_segments("One.", "Two."))]
+
+        assert chunks == [pcm]
+        assert [(p["transcript"], p["continue"]) for p in ws.sent] == [
+            ("One.", True), ("Two.", True), ("", False),
+        ]
+        assert {p["context_id"] for p in ws.sent} == {"slashai-1"}
+
+    @pytest.mark.asyncio
+    async def test_producer_error_closes_context_then_raises(self, client):
+        ws = _GatedWs([_make_ws_text_msg({"context_id": "slashai-1", "type": "done"})])
+        client._ws = ws
+
+        with pytest.raises(ValueError):
+            async for _ in client.synthesize_incremental(
+                _segments("One.", error=ValueError("stream broke"))
+            ):
+                pass
+
+        assert ws.sent[-1]["continue"] is False
+
+    @pytest.mark.asyncio
+    async def test_early_close_cancels_context(self, client):
+        pcm = base64.b64encode(b"\x00\x00").decode()
+        ws = _GatedWs([
+            _make_ws_text_msg({"context_id": "slashai-1", "type": "chunk", "data": pcm}),
+            _make_ws_text_msg({"context_id": "slashai-1", "type": "chunk", "data": pcm}),
+        ])
+        client._ws = ws
+
+        audio = client.synthesize_incremental(_segments("One."))
+        await anext(audio)
+        await audio.aclose()
+
+        assert ws.sent[-1] == {"context_id": "slashai-1", "cancel": True}
+
+    @pytest.mark.asyncio
+    async def test_word_timestamps_requested_and_dispatched(self, client):
+        ws = _GatedWs([
+            _make_ws_text_msg({
+                "context_id": "slashai-1", "type": "timestamps",
+                "word_timestamps": {"words": ["Hi", "there."], "start": [0.0, 0.3], "end": [0.25, 0.7]},
+            }),
+            _make_ws_text_msg({"context_id": "slashai-1", "type": "done"}),
+        ])
+        client._ws = ws
+        received = []
+
+        async for _ in client.synthesize_incremental(
+            _segments("Hi there."), on_timestamps=lambda w, e: received.append((w, e))
+        ):
+            pass
+
+        assert received == [(["Hi", "there."], [0.25, 0.7])]
+        assert all(p["add_timestamps"] for p in ws.sent)
+
+    @pytest.mark.asyncio
+    async def test_empty_stream_sends_nothing(self, client):
+        ws = _GatedWs([])
+        client._ws = ws
+
+        assert [c async for c in client.synthesize_incremental(_segments())] == []
+        assert ws.sent == []
@@ -0,0 +1,73 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for concurrent context assembly (context_assembly.py)."""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from context_assembly import ContextSource, assemble_context
+
+
+async def _after(seconds: float, value):
+    await asyncio.sleep(seconds)
+    return value
+
+
+async def _boom():
+    raise RuntimeError("db down")
+
+
+class TestAssembleContext:
+    @pytest.mark.asyncio
+    async def test_sources_run_concurrently(self):
+        start = time.monotonic()
+        assembled = await assemble_context([
+            ContextSource("a", _after(0.1, "A"), 1000),
+            ContextSource("b", _after(0.1, "B"), 1000),
+            ContextSource("c", _after(0.1, "C"), 1000),
+        ])
+        elapsed = time.monotonic() - start
+
+        assert assembled.results == {"a": "A", "b": "B", "c": "C"}
+        assert elapsed < 0.25  # ~slowest source, not the sum
+        assert assembled.dropped == []
+        assert set(assembled.timings_ms) == {"a", "b", "c"}
+
+    @pytest.mark.asyncio
+    async def test_slow_source_dropped_with_default(self):
+        assembled = await assemble_context([
+            ContextSource("fast", _after(0.0, "ok"), 1000),
+            ContextSource("slow", _after(5.0, "late"), 50, default=[]),
+        ])
+        assert assembled.get("fast") == "ok"
+        assert assembled.get("slow") == []
+        assert assembled.dropped == ["slow"]
+
+    @pytest.mark.asyncio
+    async def test_budget_caps_source_timeout(self):
+        start = time.monotonic()
+        assembled = await assemble_context(
+            [ContextSource("slow", _after(5.0, "late"), 10_000, default="")],
+            budget_ms=50,
+        )
+        assert time.monotonic() - start < 1.0
+        assert assembled.get("slow") == ""
+        assert assembled.dropped == ["slow"]
+
+    @pytest.mark.asyncio
+    async def test_failing_source_uses_default(self):
+        assembled = await assemble_context([
+            ContextSource("memories", _boom(), 1000),
+            ContextSource("date", _after(0.0, "today"), 1000),
+        ])
+        assert assembled.get("memories") is None
+        assert assembled.get("date") == "today"
+        assert assembled.dropped == ["memories"]
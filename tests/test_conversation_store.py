@@ -0,0 +1,180 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the bounded, persistent conversation store."""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from conversation_store import ConversationHistory, ConversationStore, estimate_tokens
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _pool(payload=None):
+    pool = MagicMock()
+    pool.execute = AsyncMock()
+    pool.fetchval = AsyncMock(return_value=payload)
+    return pool
+
+
+class TestConversationHistory:
+    def test_trims_to_low_water_mark_by_tokens(self):
+        history = ConversationHistory(token_budget=estimate_tokens("x" * 400) * 4)
+        for i in range(4):
+            history.add_message("user" if i % 2 == 0 else "assistant", "x" * 400)
+        assert len(history) == 4  # Exactly at budget
+
+        history.add_message("user", "x" * 400)
+
+        # Trimmed below 75% of budget, not just by one message
+        assert len(history) == 3
+        assert history.token_count <= history.token_budget * 0.75
+
+    def test_history_starts_with_user_turn_after_trim(self):
+        history = ConversationHistory(token_budget=10_000, max_messages=4)
+        for i in range(5):
+            history.add_message("user", f"q{i}")
+            history.add_message("assistant", f"a{i}")
+
+        messages = history.get_messages()
+        assert messages[0]["role"] == "user"
+        assert messages[-1] == {"role": "assistant", "content": "a4"}
+        assert len(messages) <= 4
+
+    def test_oversized_message_is_kept(self):
+        history = ConversationHistory(token_budget=10)
+
+        history.add_message("user", "x" * 1000)
+
+        assert len(history) == 1
+
+    def test_json_round_trip(self):
+        history = ConversationHistory()
+        history.add_message("user", "hi")
+        history.add_message("assistant", "hello")
+
+        restored = ConversationHistory()
+        restored.load_json(history.to_json())
+
+        assert restored.get_messages() == history.get_messages()
+        assert restored.token_count == history.token_count
+
+    def test_replace_last_only_matching_role(self):
+        history = ConversationHistory()
+        history.add_message("user", "hi")
+        history.add_message("assistant", "x" * 400)
+
+        assert not history.replace_last("user", "changed")
+        assert history.replace_last("assistant", "short")
+
+        assert history.get_messages()[-1] == {"role": "assistant", "content": "short"}
+        assert history.token_count == estimate_tokens("hi") + estimate_tokens("short")
+
+
+class TestConversationStore:
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        store = ConversationStore("slashai", max_conversations=2)
+
+        await store.get(("1", "a"))
+        await store.get(("2", "a"))
+        await store.get(("1", "a"))  # Touch: ("2", "a") is now least recent
+        await store.get(("3", "a"))
+
+        assert len(store) == 2
+        assert ("2", "a") not in store._entries
+
+    @pytest.mark.asyncio
+    async def test_idle_conversations_expire(self):
+        clock = _Clock()
+        store = ConversationStore("slashai", ttl_seconds=60, clock=clock)
+        history = await store.get(("1", "a"))
+        history.add_message("user", "hi")
+
+        clock.now += 61
+        fresh = await store.get(("2", "a"))
+
+        assert ("1", "a") not in store._entries
+        assert len(fresh) == 0
+
+    @pytest.mark.asyncio
+    async def test_miss_loads_persisted_history(self):
+        pool = _pool(json.dumps([["user", "hi"], ["assistant", "hello"]]))
+        store = ConversationStore("lena", db_pool=pool)
+
+        history = await store.get(("1", "a"))
+
+        assert history.get_messages()[1]["content"] == "hello"
+        assert pool.fetchval.await_args.args[1:4] == ("lena", "1", "a")
+        await store.get(("1", "a"))
+        pool.fetchval.assert_awaited_once()  # Cached after the first load
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_dirty_histories_in_one_upsert(self):
+        pool = _pool()
+        store = ConversationStore("slashai", db_pool=pool)
+        store._start = lambda: None  # No background loop in tests
+        for user in ("1", "2"):
+            history = await store.get((user, "a"))
+            history.add_message("user", f"from {user}")
+            store.save((user, "a"))
+
+        assert await store.flush() == 2
+
+        upsert = pool.execute.await_args_list[0].args
+        assert "ON CONFLICT (scope, user_id, channel_id)" in upsert[0]
+        assert upsert[1:4] == ("slashai", ["1", "2"], ["a", "a"])
+        assert json.loads(upsert[4][0]) == [["user", "from 1"]]
+        assert await store.flush() == 0  # Nothing left queued
+
+    @pytest.mark.asyncio
+    async def test_evicted_dirty_history_survives_until_flush(self):
+        pool = _pool()
+        store = ConversationStore("slashai", db_pool=pool, max_conversations=1)
+        store._start = lambda: None
+        history = await store.get(("1", "a"))
+        history.add_message("user", "unsaved")
+        store.save(("1", "a"))
+
+        await store.get(("2", "a"))  # Evicts ("1", "a")
+        pool.fetchval.reset_mock()
+        again = await store.get(("1", "a"))
+
+        assert again is history
+        pool.fetchval.assert_not_awaited()  # Served from the write-behind queue
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_requeues(self):
+        pool = _pool()
+        pool.execute.side_effect = RuntimeError("db down")
+        store = ConversationStore("slashai", db_pool=pool)
+        store._start = lambda: None
+        await store.get(("1", "a"))
+        store.save(("1", "a"))
+
+        assert await store.flush() == 0
+        assert ("1", "a") in store._dirty
+
+    @pytest.mark.asyncio
+    async def test_without_pool_nothing_is_persisted(self):
+        store = ConversationStore("slashai")
+        history = await store.get(("1", "a"))
+        history.add_message("user", "hi")
+        store.save(("1", "a"))
+
+        assert await store.flush() == 0
+        assert store._dirty == {}
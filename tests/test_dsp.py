@@ -0,0 +1,148 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the NumPy DSP core, checked against audioop where it still exists."""
+
+import sys
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from voice import dsp
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    try:
+        import audioop
+    except ImportError:  # Python 3.13+
+        audioop = None
+
+needs_audioop = pytest.mark.skipif(audioop is None, reason="audioop reference unavailable")
+
+FRAME_48K_STEREO = 1920  # Samples in one 20ms Discord frame
+
+
+def _noise(n: int, seed: int = 0, amplitude: int = 32767) -> bytes:
+    rng = np.random.default_rng(seed)
+    return rng.integers(-amplitude, amplitude, n, dtype=np.int16).tobytes()
+
+
+def _tone(freq: float, rate: int, seconds: float, amplitude: int = 8000) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+
+
+def _best_correlation(a: np.ndarray, b: np.ndarray, max_lag: int = 32) -> float:
+    """Highest correlation of a against b delayed by 0..max_lag samples."""
+    n = min(a.size, b.size) - max_lag
+    return max(np.corrcoef(a[lag:lag + n], b[:n])[0, 1] for lag in range(max_lag + 1))
+
+
+class TestFeatures:
+    @needs_audioop
+    @pytest.mark.parametrize("size", [0, 1, 320, 1920, 4801])
+    def test_rms_matches_audioop(self, size):
+        pcm = _noise(size, seed=size)
+        assert dsp.rms(pcm) == audioop.rms(pcm, 2)
+
+    def test_zero_crossing_rate(self):
+        alternating = np.array([100, -100] * 50, dtype=np.int16).tobytes()
+        constant = np.full(100, 100, dtype=np.int16).tobytes()
+
+        assert dsp.zero_crossing_rate(alternating) == 1.0
+        assert dsp.zero_crossing_rate(constant) == 0.0
+
+    def test_frame_features_match_per_frame_scalars(self):
+        pcm = _noise(320 * 5 + 17, amplitude=5000)
+
+        energy, zcr = dsp.frame_features(pcm, 320)
+
+        assert energy.shape == zcr.shape == (5,)  # Partial frame ignored
+        for i in range(5):
+            frame = pcm[i * 640:(i + 1) * 640]
+            assert energy[i] == dsp.rms(frame)
+            assert zcr[i] == pytest.approx(dsp.zero_crossing_rate(frame))
+
+
+class TestGain:
+    @needs_audioop
+    @pytest.mark.parametrize("gain", [0.0, 0.33, 0.5, 1.0, 1.5, 2.0])
+    def test_byte_identical_to_audioop_mul(self, gain):
+        pcm = _noise(FRAME_48K_STEREO)
+        assert dsp.apply_gain(pcm, gain) == audioop.mul(pcm, 2, gain)
+
+    def test_clips_instead_of_wrapping(self):
+        pcm = np.array([30000, -30000], dtype=np.int16).tobytes()
+        assert list(dsp.to_samples(dsp.apply_gain(pcm, 2.0))) == [32767, -32768]
+
+
+class TestChannels:
+    @needs_audioop
+    def test_stereo_mono_match_audioop(self):
+        stereo = _noise(FRAME_48K_STEREO)
+        mono = dsp.stereo_to_mono(dsp.to_samples(stereo))
+
+        assert mono.tobytes() == audioop.tomono(stereo, 2, 1, 0)
+        assert dsp.mono_to_stereo(mono).tobytes() == audioop.tostereo(mono.tobytes(), 2, 1, 1)
+
+
+class TestPolyphaseResampler:
+    @pytest.mark.parametrize("rates", [(48000, 16000), (24000, 48000), (44100, 16000)])
+    def test_chunked_output_equals_one_shot(self, rates):
+        samples = dsp.to_samples(_noise(4801, amplitude=8000))
+
+        whole = dsp.PolyphaseResampler(*rates).process(samples)
+        stream = dsp.PolyphaseResampler(*rates)
+        parts = np.concatenate([stream.process(samples[i:i + 317]) for i in range(0, 4801, 317)])
+
+        np.testing.assert_allclose(parts, whole)
+
+    def test_output_length_tracks_rate(self):
+        down = dsp.Downmixer()
+        out = b"".join(down.process(_noise(FRAME_48K_STEREO, seed=i)) for i in range(50))
+
+        assert len(out) == 16000 * 2  # 1s of 16kHz mono, exactly
+
+    def test_rejects_aliasing(self):
+        # 12kHz is above the 8kHz Nyquist of the 16kHz output
+        stereo = dsp.mono_to_stereo(_tone(12000, 48000, 0.5)).tobytes()
+
+        out = dsp.Downmixer().process(stereo)
+
+        assert dsp.rms(out[200:]) < 0.01 * dsp.rms(stereo)
+
+    @needs_audioop
+    def test_downmix_within_tolerance_of_audioop(self):
+        stereo = dsp.mono_to_stereo(_tone(440, 48000, 1.0)).tobytes()
+        frames = [stereo[i:i + FRAME_48K_STEREO * 2] for i in range(0, len(stereo), FRAME_48K_STEREO * 2)]
+        down = dsp.Downmixer()
+
+        ours = b"".join(down.process(f) for f in frames)
+        ref = b"".join(
+            audioop.ratecv(audioop.tomono(f, 2, 1, 0), 2, 1, 48000, 16000, None)[0] for f in frames
+        )
+
+        assert len(ours) == len(ref)
+        assert dsp.rms(ours) == pytest.approx(dsp.rms(ref), rel=0.01)
+        assert _best_correlation(dsp.to_samples(ours), dsp.to_samples(ref)) > 0.99
+
+    @needs_audioop
+    def test_upmix_within_tolerance_of_audioop(self):
+        mono = _tone(440, 24000, 1.0).tobytes()
+        chunks = [mono[i:i + 4800] for i in range(0, len(mono), 4800)]
+        up, state, ref = dsp.Upmixer(), None, []
+        for chunk in chunks:
+            converted, state = audioop.ratecv(chunk, 2, 1, 24000, 48000, state)
+            ref.append(audioop.tostereo(converted, 2, 1, 1))
+
+        ours = b"".join(up.process(c) for c in chunks)
+        ref = b"".join(ref)
+
+        assert abs(len(ours) - len(ref)) <= 8
+        assert dsp.rms(ours) == pytest.approx(dsp.rms(ref), rel=0.01)
+        assert _best_correlation(dsp.to_samples(ours)[0::2], dsp.to_samples(ref)[0::2]) > 0.99
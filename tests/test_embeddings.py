@@ -0,0 +1,170 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the shared embedding cache (memory.embeddings)."""
+
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from memory.config import MemoryConfig
+from memory.embeddings import EmbeddingService
+from memory.expander import _BROAD_PERSONAL_SUBQUERIES, expand_query, fixed_subqueries
+
+
+def _fake_embed(texts, **kwargs):
+    """Deterministic embedding: [len(text), index-in-batch]."""
+    result = MagicMock()
+    result.embeddings = [[float(len(t)), float(i)] for i, t in enumerate(texts)]
+    return result
+
+
+@pytest.fixture
+def client():
+    mock = MagicMock()
+    mock.embed = AsyncMock(side_effect=_fake_embed)
+    mock.multimodal_embed = AsyncMock(
+        side_effect=lambda inputs, **kw: _fake_embed([i[0] for i in inputs])
+    )
+    return mock
+
+
+class TestEmbeddingService:
+    @pytest.mark.asyncio
+    async def test_repeat_text_served_from_cache(self, client):
+        service = EmbeddingService(client)
+        first = await service.embed_one("hello", "voyage-3.5-lite", "query")
+        second = await service.embed_one("hello", "voyage-3.5-lite", "query")
+        assert first == second
+        assert client.embed.call_count == 1
+        assert service.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_key_includes_model_and_input_type(self, client):
+        service = EmbeddingService(client)
+        await service.embed_one("hello", "voyage-3.5-lite", "query")
+        await service.embed_one("hello", "voyage-3.5-lite", "document")
+        await service.embed_one("hello", "other-model", "query")
+        assert client.embed.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_batch_only_fetches_misses(self, client):
+        service = EmbeddingService(client)
+        await service.embed(["a", "bb"], "m", "query")
+        vectors = await service.embed(["bb", "ccc", "a", "ccc"], "m", "query")
+        assert client.embed.call_args_list[-1][0][0] == ["ccc"]
+        assert [v[0] for v in vectors] == [2.0, 3.0, 1.0, 3.0]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_coalesce(self):
+        gate = asyncio.Event()
+        mock = MagicMock()
+
+        async def slow_embed(texts, **kwargs):
+            await gate.wait()
+            return _fake_embed(texts)
+
+        mock.embed = AsyncMock(side_effect=slow_embed)
+        service = EmbeddingService(mock)
+
+        tasks = [asyncio.create_task(service.embed_one("same", "m", "query")) for _ in range(5)]
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(*tasks)
+
+        assert mock.embed.call_count == 1
+        assert all(r == results[0] for r in results)
+        assert service.coalesced == 4
+
+    @pytest.mark.asyncio
+    async def test_failure_propagates_and_is_not_cached(self, client):
+        client.embed.side_effect = [RuntimeError("boom"), _fake_embed(["x"])]
+        service = EmbeddingService(client)
+        with pytest.raises(RuntimeError):
+            await service.embed_one("x", "m", "query")
+        assert await service.embed_one("x", "m", "query") == [1.0, 0.0]
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_spares_pinned(self, client):
+        service = EmbeddingService(client, max_entries=1)
+        await service.embed(["pinned"], "m", "query", pin=True)
+        await service.embed_one("a", "m", "query")
+        await service.embed_one("b", "m", "query")
+        calls = client.embed.call_count
+
+        await service.embed_one("pinned", "m", "query")
+        assert client.embed.call_count == calls
+        await service.embed_one("a", "m", "query")
+        assert client.embed.call_count == calls + 1
+
+    @pytest.mark.asyncio
+    async def test_disk_store_survives_restart(self, client, tmp_path):
+        path = str(tmp_path / "cache" / "embeddings.sqlite")
+        service = EmbeddingService(client, store_path=path)
+        await service.embed_one("persist me", "m", "query")
+        service.close()
+
+        restarted = EmbeddingService(client, store_path=path)
+        vector = await restarted.embed_one("persist me", "m", "query")
+        assert client.embed.call_count == 1
+        assert restarted.disk_hits == 1
+        assert vector == [10.0, 0.0]
+        restarted.close()
+
+    @pytest.mark.asyncio
+    async def test_multimodal_text_uses_separate_key(self, client):
+        service = EmbeddingService(client)
+        await service.embed_one("castle", "voyage-multimodal-3", "query")
+        (vector,) = await service.embed_multimodal_text(["castle"], "voyage-multimodal-3")
+        await service.embed_multimodal_text(["castle"], "voyage-multimodal-3")
+        assert client.multimodal_embed.call_count == 1
+        assert client.multimodal_embed.call_args.kwargs["inputs"] == [["castle"]]
+        assert vector == [6.0, 0.0]
+
+    @pytest.mark.asyncio
+    async def test_disabled_passes_through(self, client):
+        service = EmbeddingService(client, enabled=False)
+        await service.embed_one("x", "m", "query")
+        await service.embed_one("x", "m", "query")
+        assert client.embed.call_count == 2
+
+
+class TestExpansionWarmup:
+    def test_fixed_subqueries_cover_all_patterns(self):
+        queries = fixed_subqueries()
+        assert set(_BROAD_PERSONAL_SUBQUERIES) <= set(queries)
+        assert "milestones achievements" in queries
+        assert len(queries) == len(set(queries))
+
+    @pytest.mark.asyncio
+    async def test_expanded_retrieval_only_embeds_user_query(self, client):
+        channel = MagicMock()
+        channel.guild.id = 100
+        channel.id = 200
+        pool = MagicMock()
+        pool.fetch = AsyncMock(return_value=[])
+        pool.fetchval = AsyncMock(return_value=True)
+
+        with patch("memory.retriever.voyageai") as mock_voyageai, \
+             patch("memory.retriever.classify_channel_privacy", new_callable=AsyncMock) as mock_privacy:
+            from memory.privacy import PrivacyLevel
+            from memory.retriever import MemoryRetriever
+
+            mock_privacy.return_value = PrivacyLevel.GUILD_PUBLIC
+            mock_voyageai.AsyncClient.return_value = client
+            config = MemoryConfig()
+            retriever = MemoryRetriever(pool, config)
+
+            await retriever.warm_expansion_embeddings()
+            assert client.embed.call_count == 1
+
+            expanded = expand_query("who am I?", config)
+            await retriever.retrieve_multi(111, expanded.queries, channel, agent_id="slashai")
+
+            assert client.embed.call_args_list[-1][0][0] == ["who am I?"]
@@ -0,0 +1,209 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the durable memory extraction job queue."""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from memory.config import MemoryConfig
+from memory.extraction_queue import ExtractionQueue
+from memory.privacy import PrivacyLevel
+
+
+def _job(job_id=1, user_id=111, channel_id=222, attempts=1):
+    return {"id": job_id, "user_id": user_id, "channel_id": channel_id,
+            "trigger": "threshold", "attempts": attempts}
+
+
+@pytest.fixture
+def mock_db():
+    pool = MagicMock()
+    pool.fetch = AsyncMock(return_value=[])
+    pool.fetchrow = AsyncMock(return_value=None)
+    pool.fetchval = AsyncMock(return_value=True)
+    pool.execute = AsyncMock()
+    return pool
+
+
+class TestExtractionQueue:
+    @pytest.mark.asyncio
+    async def test_enqueue_reports_dedup(self, mock_db):
+        queue = ExtractionQueue(mock_db, AsyncMock(), MemoryConfig())
+        mock_db.fetchval.return_value = 7
+        assert await queue.enqueue(111, 222) is True
+        mock_db.fetchval.return_value = None  # ON CONFLICT DO NOTHING
+        assert await queue.enqueue(111, 222) is False
+        assert "ON CONFLICT" in mock_db.fetchval.call_args[0][0]
+
+    @pytest.mark.asyncio
+    async def test_disabled_queue_is_unavailable(self, mock_db):
+        queue = ExtractionQueue(mock_db, AsyncMock(), MemoryConfig(extraction_queue_enabled=False))
+        assert await queue.is_available() is False
+        mock_db.fetchval.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_missing_table_is_unavailable(self, mock_db):
+        mock_db.fetchval.return_value = False
+        queue = ExtractionQueue(mock_db, AsyncMock(), MemoryConfig())
+        assert await queue.is_available() is False
+
+    @pytest.mark.asyncio
+    async def test_run_once_processes_claimed_jobs(self, mock_db):
+        process = AsyncMock()
+        mock_db.fetch.return_value = [_job(1, 111), _job(2, 333)]
+        queue = ExtractionQueue(mock_db, process, MemoryConfig(extraction_worker_concurrency=2))
+
+        assert await queue.run_once() == 2
+        assert {c.args for c in process.call_args_list} == {(111, 222), (333, 222)}
+        claim_sql, limit = mock_db.fetch.call_args[0][:2]
+        assert "SKIP LOCKED" in claim_sql
+        assert limit == 2
+        done = [c for c in mock_db.execute.call_args_list if "'done'" in c[0][0]]
+        assert len(done) == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_retries_with_backoff(self, mock_db):
+        process = AsyncMock(side_effect=RuntimeError("claude timeout"))
+        mock_db.fetch.return_value = [_job(attempts=2)]
+        config = MemoryConfig(extraction_retry_base_seconds=30, extraction_max_attempts=5)
+        queue = ExtractionQueue(mock_db, process, config)
+
+        await queue.run_once()
+        args = mock_db.execute.call_args[0]
+        assert args[2] == "pending"
+        assert "claude timeout" in args[3]
+        assert args[4] == 60
+
+    @pytest.mark.asyncio
+    async def test_failure_at_max_attempts_is_final(self, mock_db):
+        process = AsyncMock(side_effect=RuntimeError("boom"))
+        mock_db.fetch.return_value = [_job(attempts=5)]
+        queue = ExtractionQueue(mock_db, process, MemoryConfig(extraction_max_attempts=5))
+
+        await queue.run_once()
+        assert mock_db.execute.call_args[0][2] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_enqueue_inactive_uses_config_minutes(self, mock_db):
+        mock_db.fetch.return_value = [{"id": 1}, {"id": 2}]
+        queue = ExtractionQueue(mock_db, AsyncMock(), MemoryConfig(extraction_inactivity_minutes=45))
+
+        assert await queue.enqueue_inactive() == 2
+        sql, minutes = mock_db.fetch.call_args[0]
+        assert "'inactivity'" in sql
+        assert minutes == 45
+
+
+class TestManagerIntegration:
+    def _manager(self, mock_db):
+        with patch("memory.retriever.voyageai"), \
+             patch("memory.manager.MemoryExtractor") as mock_extractor_cls:
+            from memory.manager import MemoryManager
+
+            manager = MemoryManager(mock_db, MagicMock(), MemoryConfig(extraction_message_threshold=1))
+        manager.extractor = mock_extractor_cls.return_value
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_track_message_only_enqueues(self, mock_db):
+        manager = self._manager(mock_db)
+        manager.extraction_queue._available = True
+        mock_db.fetchval.return_value = 2  # jsonb_array_length after append
+        manager.extraction_queue.enqueue = AsyncMock(return_value=True)
+        manager._trigger_extraction = AsyncMock()
+
+        channel = MagicMock()
+        channel.guild.id = 100
+        with patch("memory.manager.classify_channel_privacy", new_callable=AsyncMock) as mock_privacy:
+            mock_privacy.return_value = PrivacyLevel.GUILD_PUBLIC
+            await manager.track_message(111, 222, channel, "hi", "hello", agent_id="slashai")
+
+        manager.extraction_queue.enqueue.assert_awaited_once_with(111, 222)
+        manager._trigger_extraction.assert_not_called()
+        session_upsert = mock_db.fetchval.call_args[0]
+        assert "agent_id = COALESCE" in session_upsert[0]
+        assert session_upsert[6] == "slashai"
+
+    @pytest.mark.asyncio
+    async def test_track_message_is_single_append_round_trip(self, mock_db):
+        manager = self._manager(mock_db)
+        manager.extraction_queue._available = True
+        mock_db.fetchval.return_value = 2
+        manager.config.extraction_message_threshold = 5
+        manager.extraction_queue.enqueue = AsyncMock()
+
+        channel = MagicMock()
+        channel.guild.id = 100
+        with patch("memory.manager.classify_channel_privacy", new_callable=AsyncMock) as mock_privacy:
+            mock_privacy.return_value = PrivacyLevel.GUILD_PUBLIC
+            await manager.track_message(111, 222, channel, "hi", "hello", user_message_id=9)
+
+        assert mock_db.fetchval.call_count == 1
+        mock_db.fetchrow.assert_not_called()
+        mock_db.execute.assert_not_called()
+        manager.extraction_queue.enqueue.assert_not_called()
+        sql, *params = mock_db.fetchval.call_args[0]
+        assert "ON CONFLICT (user_id, channel_id) DO UPDATE" in sql
+        assert "|| EXCLUDED.messages" in sql
+        appended = json.loads(params[4])
+        assert [m["role"] for m in appended] == ["user", "assistant"]
+        assert appended[0]["message_id"] == 9
+
+    def test_decode_legacy_double_encoded_messages(self):
+        from memory.manager import MemoryManager
+
+        legacy = json.dumps(json.dumps([{"role": "user", "content": "x"}]))
+        assert MemoryManager._decode_session_messages(legacy) == [{"role": "user", "content": "x"}]
+        assert MemoryManager._decode_session_messages(None) == []
+
+    @pytest.mark.asyncio
+    async def test_process_job_uses_stored_session_context(self, mock_db):
+        manager = self._manager(mock_db)
+        messages = [{"role": "user", "content": "I build castles"},
+                    {"role": "assistant", "content": "Nice"}]
+        mock_db.fetchrow.return_value = {
+            "guild_id": 100, "channel_privacy_level": "channel_restricted",
+            "agent_id": "lena", "messages": json.dumps(messages),
+        }
+        manager.extractor.extract_for_channel_privacy = AsyncMock(return_value=[])
+
+        await manager._process_extraction_job(111, 222)
+
+        call = manager.extractor.extract_for_channel_privacy.call_args
+        assert call[0][1] == PrivacyLevel.CHANNEL_RESTRICTED
+        trim_sql, user_id, channel_id, processed = mock_db.execute.call_args[0]
+        assert "WITH ORDINALITY" in trim_sql
+        assert processed == 2
+
+    @pytest.mark.asyncio
+    async def test_process_job_raises_for_retry(self, mock_db):
+        manager = self._manager(mock_db)
+        mock_db.fetchrow.return_value = {
+            "guild_id": None, "channel_privacy_level": "dm",
+            "agent_id": None, "messages": [{"role": "user", "content": "x"}],
+        }
+        manager.extractor.extract_for_channel_privacy = AsyncMock(side_effect=RuntimeError("api"))
+
+        with pytest.raises(RuntimeError):
+            await manager._process_extraction_job(111, 222)
+
+
+class TestConfigFields:
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("MEMORY_EXTRACTION_CONCURRENCY", "4")
+        monkeypatch.setenv("MEMORY_EXTRACTION_MAX_ATTEMPTS", "3")
+        monkeypatch.setenv("MEMORY_EXTRACTION_RETRY_BASE_SECONDS", "10")
+        monkeypatch.setenv("MEMORY_EXTRACTION_POLL_SECONDS", "0.5")
+        config = MemoryConfig.from_env()
+        assert config.extraction_worker_concurrency == 4
+        assert config.extraction_max_attempts == 3
+        assert config.extraction_retry_base_seconds == 10
+        assert config.extraction_poll_seconds == 0.5
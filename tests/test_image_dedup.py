@@ -0,0 +1,207 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for perceptual hashing and dedup-before-analysis in ImageObserver."""
+
+import hashlib
+import io
+import json
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from image_processing import ImageProcessor, dhash_image
+from memory.images.analyzer import ModerationResult
+from memory.images.observer import ImageObserver
+from memory.images.phash import BKTree, from_signed64, hamming, to_signed64
+from memory.privacy import PrivacyLevel
+
+
+def _png(pattern="castle", size=(640, 480), fmt="PNG"):
+    img = Image.new("RGB", size, (40, 120, 200))
+    draw = ImageDraw.Draw(img)
+    w, h = size
+    if pattern == "castle":
+        draw.rectangle([w * 0.2, h * 0.4, w * 0.8, h * 0.9], fill=(150, 150, 150))
+        draw.rectangle([w * 0.25, h * 0.2, w * 0.35, h * 0.4], fill=(120, 120, 120))
+        draw.rectangle([w * 0.65, h * 0.2, w * 0.75, h * 0.4], fill=(120, 120, 120))
+    else:
+        for i in range(0, w, w // 8):
+            draw.rectangle([i, 0, i + w // 16, h], fill=(20, 160, 40))
+    buffer = io.BytesIO()
+    img.save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def _dhash(image_bytes):
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        return dhash_image(img)
+
+
+class TestPerceptualHash:
+    def test_reencoded_and_rescaled_copy_is_near(self):
+        original = _dhash(_png("castle"))
+        repost = _dhash(_png("castle", size=(1280, 960), fmt="JPEG"))
+        other = _dhash(_png("stripes"))
+
+        assert hamming(original, repost) <= 6
+        assert hamming(original, other) > 6
+
+    def test_signed_round_trip(self):
+        value = (1 << 64) - 5
+        assert -(1 << 63) <= to_signed64(value) < (1 << 63)
+        assert from_signed64(to_signed64(value)) == value
+
+    def test_bk_tree_radius_search(self):
+        tree = BKTree()
+        tree.add(0b0000, "a")
+        tree.add(0b0001, "b")
+        tree.add(0b0111, "c")
+        tree.add(0b1111_0000, "d")
+        tree.add(0b0000, "a2")
+
+        assert tree.search(0b0000, 1) == [(0, "a"), (0, "a2"), (1, "b")]
+        assert sorted(item for _, item in tree.search(0b0011, 1)) == ["b", "c"]
+        assert len(tree) == 5
+
+
+@pytest.fixture
+def observer():
+    db = MagicMock()
+    db.fetchval = AsyncMock(return_value=True)
+    db.fetch = AsyncMock(return_value=[])
+    db.fetchrow = AsyncMock(return_value=None)
+    db.execute = AsyncMock()
+    analyzer = MagicMock()
+    analyzer.moderate = AsyncMock()
+    analyzer.analyze = AsyncMock()
+    storage = MagicMock()
+    storage.upload = AsyncMock(return_value=("key", "https://cdn/key"))
+    clusterer = MagicMock()
+    clusterer.assign_to_cluster = AsyncMock()
+    return ImageObserver(
+        db, MagicMock(), storage, analyzer=analyzer, clusterer=clusterer, narrator=MagicMock(),
+        processor=ImageProcessor(workers=0),
+    )
+
+
+def _message(author_id=111):
+    message = MagicMock()
+    message.author.id = author_id
+    message.guild.id = 555
+    message.content = "new wing"
+    attachment = MagicMock()
+    attachment.filename = "castle.png"
+    attachment.read = AsyncMock(return_value=_png("castle"))
+    return message, attachment
+
+
+def _stored_row(exact_match, moderation="safe"):
+    verdict = {"is_safe": True, "confidence": 0.95, "flags": [], "violation_type": None,
+               "description": "No policy violations detected"}
+    return {"id": 7, "description": "A stone castle", "summary": "Castle",
+            "tags": ["castle"], "detected_elements": json.dumps({"biome": "plains"}),
+            "embedding": "[0.1,0.2,0.3]", "observation_type": "build_progress",
+            "moderation": json.dumps(verdict) if moderation else None,
+            "exact_match": exact_match}
+
+
+class TestObserverDedup:
+    @pytest.mark.asyncio
+    async def test_exact_reupload_skips_all_paid_calls(self, observer):
+        observer.db.fetchrow.return_value = {"id": 42}
+        message, attachment = _message()
+
+        assert await observer.handle_image(message, attachment) == 42
+        observer.analyzer.moderate.assert_not_called()
+        observer.analyzer.analyze.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_reuses_analysis_but_is_moderated(self, observer):
+        stored_hash = _dhash(_png("castle", size=(1280, 960), fmt="JPEG"))
+        observer.db.fetch.return_value = [{"id": 7, "phash": to_signed64(stored_hash)}]
+        observer.db.fetchrow.side_effect = [
+            None,  # no exact duplicate for this user
+            _stored_row(exact_match=False),
+            {"id": 8},  # insert
+        ]
+        observer.analyzer.moderate.return_value = ModerationResult(
+            is_safe=True, confidence=0.8, flags=[], violation_type=None, description="ok",
+        )
+        message, attachment = _message()
+
+        with patch("memory.images.observer.classify_channel_privacy", new_callable=AsyncMock) as privacy:
+            privacy.return_value = PrivacyLevel.GUILD_PUBLIC
+            assert await observer.handle_image(message, attachment) == 8
+
+        observer.analyzer.moderate.assert_awaited_once()
+        observer.analyzer.analyze.assert_not_called()
+        reuse_sql, _, near_ids, user_id, guild_id = observer.db.fetchrow.call_args_list[1][0]
+        assert near_ids == [7]
+        assert (user_id, guild_id) == (111, 555)
+        assert "privacy_level = 'guild_public' AND guild_id = $4" in reuse_sql
+
+        insert_args = observer.db.fetchrow.call_args_list[2][0]
+        assert insert_args[8] == hashlib.sha256(_png("castle")).hexdigest()
+        assert insert_args[11] == "A stone castle"
+        assert insert_args[15] == "[0.1,0.2,0.3]"
+        assert json.loads(insert_args[21])["confidence"] == 0.8
+        assert observer.clusterer.assign_to_cluster.call_args[1]["embedding"] == [0.1, 0.2, 0.3]
+        assert len(observer._phash_index) == 2
+
+    @pytest.mark.asyncio
+    async def test_exact_copy_reuses_stored_verdict(self, observer):
+        observer.db.fetchrow.side_effect = [
+            None,  # another user's upload, not this user's
+            _stored_row(exact_match=True),
+            {"id": 9},
+        ]
+        message, attachment = _message(author_id=222)
+
+        with patch("memory.images.observer.classify_channel_privacy", new_callable=AsyncMock) as privacy:
+            privacy.return_value = PrivacyLevel.GUILD_PUBLIC
+            assert await observer.handle_image(message, attachment) == 9
+
+        observer.analyzer.moderate.assert_not_called()
+        observer.analyzer.analyze.assert_not_called()
+        insert_args = observer.db.fetchrow.call_args_list[2][0]
+        assert json.loads(insert_args[21])["confidence"] == 0.95
+
+    @pytest.mark.asyncio
+    async def test_exact_copy_without_verdict_is_moderated(self, observer):
+        observer.db.fetchrow.side_effect = [
+            None,
+            _stored_row(exact_match=True, moderation=None),
+        ]
+        observer.analyzer.moderate.return_value = ModerationResult(
+            is_safe=False, confidence=0.9, flags=["nsfw"], violation_type="nsfw", description="x",
+        )
+        message, attachment = _message()
+        message.delete = AsyncMock()
+        message.author.send = AsyncMock()
+
+        assert await observer.handle_image(message, attachment) is None
+        observer.analyzer.moderate.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_new_image_is_moderated_and_analyzed(self, observer):
+        observer.analyzer.moderate.return_value = ModerationResult(
+            is_safe=False, confidence=0.9, flags=["nsfw"], violation_type="nsfw", description="x",
+        )
+        message, attachment = _message()
+        message.delete = AsyncMock()
+        message.author.send = AsyncMock()
+
+        assert await observer.handle_image(message, attachment) is None
+        observer.analyzer.moderate.assert_awaited_once()
+        # Moderation gets the off-loop derivatives instead of re-decoding
+        processed = observer.analyzer.moderate.call_args[0][2]
+        assert processed.api_media_type == "image/jpeg"
+        assert processed.phash == _dhash(_png("castle"))
+        observer.analyzer.analyze.assert_not_called()
@@ -0,0 +1,174 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the background image observation pipeline."""
+
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from memory.config import ImageMemoryConfig
+from memory.images.pipeline import ImageObservationPipeline
+from utils.attachments import AttachmentDownloads
+
+
+def _attachment(attachment_id, filename="build.png", data=b"png-bytes"):
+    attachment = MagicMock()
+    attachment.id = attachment_id
+    attachment.filename = filename
+    attachment.read = AsyncMock(return_value=data)
+    return attachment
+
+
+def _message(message_id, attachments, guild_id=1):
+    message = MagicMock()
+    message.id = message_id
+    message.attachments = attachments
+    message.author.id = 42
+    message.guild = MagicMock(id=guild_id) if guild_id else None
+    return message
+
+
+def _pipeline(observer, concurrency=2, queue_size=20):
+    config = ImageMemoryConfig(
+        observation_concurrency=concurrency, observation_queue_size=queue_size
+    )
+    return ImageObservationPipeline(observer, bot=MagicMock(), config=config)
+
+
+class TestAttachmentDownloads:
+    @pytest.mark.asyncio
+    async def test_download_shared_between_readers(self):
+        downloads = AttachmentDownloads()
+        attachment = _attachment(1)
+
+        first, second = await asyncio.gather(
+            downloads.read(attachment), downloads.read(attachment)
+        )
+
+        assert first == second == b"png-bytes"
+        attachment.read.assert_awaited_once()
+
+
+class TestImageObservationPipeline:
+    @pytest.mark.asyncio
+    async def test_submit_does_not_wait_for_observation(self):
+        release = asyncio.Event()
+        observer = MagicMock()
+
+        async def slow_handle(*args, **kwargs):
+            await release.wait()
+            return 7
+
+        observer.handle_image = AsyncMock(side_effect=slow_handle)
+        pipeline = _pipeline(observer)
+
+        assert pipeline.submit(_message(1, [_attachment(1)])) is True
+        await asyncio.sleep(0)
+        assert pipeline.stats()["stored"] == 0
+
+        release.set()
+        await pipeline.join()
+        assert pipeline.stats()["stored"] == 1
+        await pipeline.close()
+
+    @pytest.mark.asyncio
+    async def test_attachments_run_concurrently_within_cap(self):
+        active = 0
+        peak = 0
+        observer = MagicMock()
+
+        async def handle(*args, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return 1
+
+        observer.handle_image = AsyncMock(side_effect=handle)
+        pipeline = _pipeline(observer, concurrency=2)
+
+        pipeline.submit(_message(1, [_attachment(i) for i in range(5)]))
+        await pipeline.join()
+
+        assert peak == 2
+        assert observer.handle_image.await_count == 5
+        await pipeline.close()
+
+    @pytest.mark.asyncio
+    async def test_handle_image_receives_shared_bytes(self):
+        observer = MagicMock()
+        observer.handle_image = AsyncMock(return_value=1)
+        pipeline = _pipeline(observer)
+        attachment = _attachment(1, data=b"shared")
+        downloads = AttachmentDownloads()
+        message = _message(1, [attachment])
+
+        pipeline.submit(message, downloads)
+        chat_bytes = await downloads.read(attachment)
+        await pipeline.join()
+
+        assert chat_bytes == b"shared"
+        attachment.read.assert_awaited_once()
+        assert observer.handle_image.await_args.kwargs["image_bytes"] == b"shared"
+        await pipeline.close()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_message(self):
+        release = asyncio.Event()
+        observer = MagicMock()
+
+        async def blocked(*args, **kwargs):
+            await release.wait()
+            return 1
+
+        observer.handle_image = AsyncMock(side_effect=blocked)
+        pipeline = _pipeline(observer, queue_size=1)
+
+        assert pipeline.submit(_message(1, [_attachment(1)])) is True
+        await asyncio.sleep(0)  # worker takes message 1
+        assert pipeline.submit(_message(2, [_attachment(2)])) is True
+        assert pipeline.submit(_message(3, [_attachment(3)])) is False
+        assert pipeline.stats()["dropped"] == 1
+
+        # Other guilds have their own queue
+        assert pipeline.submit(_message(4, [_attachment(4)], guild_id=2)) is True
+
+        release.set()
+        await pipeline.join()
+        assert observer.handle_image.await_count == 3
+        await pipeline.close()
+
+    @pytest.mark.asyncio
+    async def test_unsupported_files_ignored(self):
+        observer = MagicMock()
+        observer.handle_image = AsyncMock(return_value=1)
+        pipeline = _pipeline(observer)
+
+        queued = pipeline.submit(_message(1, [_attachment(1, "notes.txt"), _attachment(2, "noext")]))
+
+        assert queued is False
+        observer.handle_image.assert_not_called()
+        await pipeline.close()
+
+    @pytest.mark.asyncio
+    async def test_failure_counted_and_worker_continues(self):
+        observer = MagicMock()
+        observer.handle_image = AsyncMock(side_effect=[RuntimeError("vision down"), 5])
+        pipeline = _pipeline(observer, concurrency=1)
+
+        pipeline.submit(_message(1, [_attachment(1)], guild_id=None))
+        pipeline.submit(_message(2, [_attachment(2)], guild_id=None))
+        await pipeline.join()
+
+        stats = pipeline.stats()
+        assert stats["failed"] == 1
+        assert stats["stored"] == 1
+        await pipeline.close()
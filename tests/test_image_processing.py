@@ -0,0 +1,108 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the shared off-loop image processing service."""
+
+import io
+import os
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from image_processing import (
+    EMBED_MAX_DIMENSION,
+    MAX_IMAGE_DIMENSION,
+    ImageProcessor,
+    dhash_image,
+    process_image,
+)
+
+
+def _image(size, mode="RGB", fmt="PNG", noise=False):
+    if noise:
+        img = Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3))
+    else:
+        img = Image.new(mode, size, (200, 30, 30, 128) if mode == "RGBA" else (200, 30, 30))
+    buffer = io.BytesIO()
+    img.save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+class TestProcessImage:
+    def test_one_decode_builds_every_derivative(self):
+        data = _image((4000, 3000), mode="RGBA")
+        result = process_image(data, "image/png", embed=True, phash=True)
+
+        api = Image.open(io.BytesIO(result.api_bytes))
+        assert result.api_media_type == "image/jpeg"
+        assert api.mode == "RGB"
+        assert max(api.size) == MAX_IMAGE_DIMENSION
+        assert (result.width, result.height) == (4000, 3000)
+        assert max(result.embed_image.size) == EMBED_MAX_DIMENSION
+        assert result.phash == dhash_image(Image.open(io.BytesIO(data)))
+        assert set(result.timings_ms) == {"decode", "api", "embed", "phash", "total"}
+
+    def test_api_copy_fits_byte_budget(self):
+        data = _image((1500, 1500), noise=True)
+        result = process_image(data, "image/png", max_bytes=200_000)
+        assert len(result.api_bytes) <= 200_000
+
+    def test_undecodable_image_passes_through(self):
+        result = process_image(b"garbage", "image/png", embed=True, phash=True)
+        assert result.api_bytes == b"garbage"
+        assert result.api_media_type == "image/png"
+        assert result.embed_image is None and result.phash is None
+
+
+class TestImageProcessor:
+    @pytest.mark.asyncio
+    async def test_thread_mode_tracks_stats(self):
+        processor = ImageProcessor(workers=0)
+        await processor.process(_image((800, 600)), "image/png", phash=True)
+
+        stats = processor.stats()
+        assert stats["images"] == 1
+        assert "decode" in stats["avg_stage_ms"]
+        assert stats["avg_wall_ms"] >= stats["avg_stage_ms"]["total"]
+
+    @pytest.mark.asyncio
+    async def test_process_pool_round_trip(self):
+        processor = ImageProcessor(workers=1)
+        try:
+            result = await processor.process(_image((3000, 1000)), "image/png", embed=True)
+        finally:
+            processor.shutdown()
+        assert max(result.embed_image.size) == EMBED_MAX_DIMENSION
+        assert Image.open(io.BytesIO(result.api_bytes)).size == (2048, 682)
+
+
+class TestAnalyzerUsesProcessor:
+    @pytest.mark.asyncio
+    async def test_analyze_reuses_supplied_derivatives(self):
+        from memory.images.analyzer import ImageAnalyzer
+
+        processed = process_image(_image((1000, 1000)), "image/png", embed=True)
+        processor = MagicMock()
+        processor.process = AsyncMock()
+        voyage = MagicMock()
+        voyage.multimodal_embed = AsyncMock(return_value=MagicMock(embeddings=[[0.1, 0.2]]))
+        anthropic = MagicMock()
+        anthropic.messages.create = AsyncMock(
+            return_value=MagicMock(content=[MagicMock(text='{"summary": "Castle"}')])
+        )
+        analyzer = ImageAnalyzer(anthropic, voyage_client=voyage, embeddings=MagicMock(), processor=processor)
+
+        result = await analyzer.analyze(b"raw", "image/png", processed)
+
+        processor.process.assert_not_called()
+        assert result.summary == "Castle"
+        assert result.embedding == [0.1, 0.2]
+        sent = anthropic.messages.create.call_args[1]["messages"][0]["content"][0]["source"]
+        assert sent["media_type"] == "image/jpeg"
+        assert voyage.multimodal_embed.call_args[1]["inputs"][0][0].size == (512, 512)
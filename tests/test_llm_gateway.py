@@ -0,0 +1,220 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the process-wide LLM gateway."""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import anthropic
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from llm_gateway import LANE_CHAT, LANE_MEMORY, AdaptiveLimiter, LLMGateway
+
+
+def _response(input_tokens=100, output_tokens=20, cache_read=0):
+    usage = SimpleNamespace(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_creation_input_tokens=0,
+        cache_read_input_tokens=cache_read,
+    )
+    return SimpleNamespace(content=[], usage=usage)
+
+
+def _rate_limited(retry_after="0"):
+    response = httpx.Response(
+        429,
+        headers={"retry-after": retry_after},
+        request=httpx.Request("POST", "https://api.anthropic.com/v1/messages"),
+    )
+    return anthropic.RateLimitError("rate limited", response=response, body=None)
+
+
+def _gateway(create=None, stream=None):
+    client = MagicMock()
+    client.messages.create = create or AsyncMock(return_value=_response())
+    if stream is not None:
+        client.messages.stream = stream
+    return LLMGateway(client=client), client
+
+
+class TestAdaptiveLimiter:
+    @pytest.mark.asyncio
+    async def test_background_cannot_take_reserved_slots(self):
+        limiter = AdaptiveLimiter(max_limit=2, reserve=1)
+        await limiter.acquire(2)
+
+        background = asyncio.ensure_future(limiter.acquire(2))
+        await asyncio.sleep(0)
+        assert not background.done()
+
+        await asyncio.wait_for(limiter.acquire(0), timeout=1)  # Interactive uses the reserve
+        assert limiter.in_flight == 2
+
+        limiter.release()
+        limiter.release()
+        await asyncio.wait_for(background, timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_waiters_admitted_by_priority(self):
+        limiter = AdaptiveLimiter(max_limit=1)
+        await limiter.acquire(0)
+        order = []
+
+        async def waiter(priority, name):
+            await limiter.acquire(priority)
+            order.append(name)
+            limiter.release()
+
+        tasks = [
+            asyncio.ensure_future(waiter(2, "background")),
+            asyncio.ensure_future(waiter(0, "chat")),
+        ]
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(*tasks)
+
+        assert order == ["chat", "background"]
+
+    @pytest.mark.asyncio
+    async def test_throttle_halves_and_success_grows(self):
+        limiter = AdaptiveLimiter(max_limit=8, min_limit=2)
+
+        limiter.on_throttle(0)
+        assert int(limiter.limit) == 4
+        limiter.on_throttle(0)
+        limiter.on_throttle(0)
+        assert int(limiter.limit) == 2  # Floor
+
+        for _ in range(10):
+            limiter.on_success()
+        assert limiter.limit > 2
+
+
+class TestLLMGateway:
+    @pytest.mark.asyncio
+    async def test_lane_client_records_usage_per_lane(self):
+        gateway, _ = _gateway()
+
+        await gateway.client(LANE_CHAT).messages.create(model="claude-sonnet-4-6", messages=[1])
+        await gateway.client(LANE_MEMORY).messages.create(model="claude-haiku-4-5", messages=[2])
+
+        stats = gateway.usage_stats()
+        assert stats["calls"] == 2
+        assert stats["total_input_tokens"] == 200
+        assert stats["lanes"]["chat"]["output_tokens"] == 20
+        assert stats["lanes"]["memory"]["calls"] == 1
+        # Sonnet: 100*3 + 20*15; Haiku: 100*1 + 20*5 (per million)
+        assert stats["estimated_cost_usd"] == round((600 + 200) / 1_000_000, 4)
+        assert gateway.usage_stats(LANE_MEMORY)["calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_ratio_per_lane(self):
+        create = AsyncMock(side_effect=[_response(cache_read=300), _response()])
+        gateway, _ = _gateway(create)
+
+        await gateway.client(LANE_CHAT).messages.create(model="m", messages=[1])
+        await gateway.client(LANE_MEMORY).messages.create(model="m", messages=[2])
+
+        stats = gateway.usage_stats()
+        assert stats["lanes"]["chat"]["cache_hit_ratio"] == 0.75  # 300 / (100 + 300)
+        assert stats["lanes"]["memory"]["cache_hit_ratio"] == 0.0
+        assert stats["cache_hit_ratio"] == 0.6
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_retries_and_shrinks_concurrency(self):
+        create = AsyncMock(side_effect=[_rate_limited("0"), _response()])
+        gateway, _ = _gateway(create)
+        start_limit = gateway.limiter.limit
+
+        response = await gateway.client(LANE_CHAT).messages.create(model="m", messages=[])
+
+        assert response.usage.input_tokens == 100
+        assert create.await_count == 2
+        assert gateway.limiter.limit < start_limit
+        assert gateway.usage_stats()["throttled"] == 1
+        assert gateway.limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_raises(self):
+        error = anthropic.BadRequestError(
+            "bad",
+            response=httpx.Response(400, request=httpx.Request("POST", "https://x")),
+            body=None,
+        )
+        gateway, client = _gateway(AsyncMock(side_effect=error))
+
+        with pytest.raises(anthropic.BadRequestError):
+            await gateway.client(LANE_CHAT).messages.create(model="m", messages=[])
+
+        client.messages.create.assert_awaited_once()
+        assert gateway.usage_stats()["errors"] == 1
+        assert gateway.limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_requests_coalesce(self):
+        release = asyncio.Event()
+
+        async def slow_create(**kwargs):
+            await release.wait()
+            return _response()
+
+        create = AsyncMock(side_effect=slow_create)
+        gateway, _ = _gateway(create)
+        lane = gateway.client(LANE_MEMORY)
+
+        calls = [
+            asyncio.ensure_future(lane.messages.create(model="m", messages=[{"role": "user", "content": "x"}]))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*calls)
+
+        create.assert_awaited_once()
+        assert results[0] is results[1] is results[2]
+        assert gateway.usage_stats()["coalesced"] == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_holds_slot_until_closed(self):
+        stream = SimpleNamespace(current_message_snapshot=_response(input_tokens=7))
+        manager = MagicMock()
+        manager.__aenter__ = AsyncMock(return_value=stream)
+        manager.__aexit__ = AsyncMock(return_value=None)
+        gateway, _ = _gateway(stream=MagicMock(return_value=manager))
+
+        async with gateway.client(LANE_CHAT).messages.stream(model="m", messages=[]) as opened:
+            assert opened is stream
+            assert gateway.limiter.in_flight == 1
+
+        assert gateway.limiter.in_flight == 0
+        assert gateway.usage_stats()["total_input_tokens"] == 7
+
+    @pytest.mark.asyncio
+    async def test_cancelled_stream_is_not_an_error(self):
+        manager = MagicMock()
+        manager.__aenter__ = AsyncMock(return_value=SimpleNamespace())
+        manager.__aexit__ = AsyncMock(return_value=None)
+        gateway, _ = _gateway(stream=MagicMock(return_value=manager))
+        limit = gateway.limiter.limit
+
+        with pytest.raises(asyncio.CancelledError):
+            async with gateway.client(LANE_CHAT).messages.stream(model="m", messages=[]):
+                raise asyncio.CancelledError
+
+        stats = gateway.usage_stats()
+        assert (stats["errors"], stats["in_flight"]) == (0, 0)
+        assert gateway.limiter.limit == limit
+
+    def test_unknown_lane_rejected(self):
+        gateway, _ = _gateway()
+        with pytest.raises(ValueError):
+            gateway.client("nope")
@@ -0,0 +1,76 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for bulk memory_message_links inserts."""
+
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from memory.config import MemoryConfig
+from memory.reactions.store import ReactionStore, insert_memory_links
+
+
+@pytest.fixture
+def mock_db():
+    pool = MagicMock()
+    pool.fetchval = AsyncMock(return_value=0)
+    pool.execute = AsyncMock()
+    return pool
+
+
+class TestInsertMemoryLinks:
+    @pytest.mark.asyncio
+    async def test_single_unnest_statement(self, mock_db):
+        mock_db.fetchval.return_value = 4
+        links = [(1, 10, 5, "source"), (1, 11, 5, "source"), (2, 10, 5, "source"), (2, 11, 5, "source")]
+
+        assert await insert_memory_links(mock_db, links) == 4
+        assert mock_db.fetchval.call_count == 1
+        sql, memory_ids, message_ids, channel_ids, types = mock_db.fetchval.call_args[0]
+        assert "unnest" in sql
+        assert "ON CONFLICT (memory_id, message_id) DO NOTHING" in sql
+        assert memory_ids == [1, 1, 2, 2]
+        assert message_ids == [10, 11, 10, 11]
+        assert channel_ids == [5, 5, 5, 5]
+        assert types == ["source"] * 4
+        mock_db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_duplicate_pairs_keep_first(self, mock_db):
+        await insert_memory_links(mock_db, [(1, 10, 5, "source"), (1, 10, 6, "reaction")])
+        _, memory_ids, message_ids, channel_ids, types = mock_db.fetchval.call_args[0]
+        assert (memory_ids, message_ids, channel_ids, types) == ([1], [10], [5], ["source"])
+
+    @pytest.mark.asyncio
+    async def test_empty_is_noop(self, mock_db):
+        assert await insert_memory_links(mock_db, []) == 0
+        mock_db.fetchval.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_store_swallows_errors(self, mock_db):
+        mock_db.fetchval.side_effect = RuntimeError("db down")
+        assert await ReactionStore(mock_db).create_memory_links([(1, 10, 5, "source")]) == 0
+
+
+class TestManagerLinks:
+    @pytest.mark.asyncio
+    async def test_extraction_links_in_one_round_trip(self, mock_db):
+        with patch("memory.retriever.voyageai"), patch("memory.manager.MemoryExtractor"):
+            from memory.manager import MemoryManager
+
+            manager = MemoryManager(mock_db, MagicMock(), MemoryConfig())
+
+        # Merged memories can repeat an id; it is linked once
+        await manager._create_memory_message_links([7, 8, 7], [100, 101, 102], 5)
+
+        assert mock_db.fetchval.call_count == 1
+        _, memory_ids, message_ids, _, _ = mock_db.fetchval.call_args[0]
+        assert memory_ids == [7, 7, 7, 8, 8, 8]
+        assert message_ids == [100, 101, 102] * 2
+        mock_db.execute.assert_not_called()
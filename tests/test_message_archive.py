@@ -0,0 +1,268 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the local message archive and its history backfill."""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from message_archive import ArchiveBackfill, MessageArchive
+from message_archive.backfill import PAGE_SIZE
+
+NOW = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def _pool():
+    pool = MagicMock()
+    pool.execute = AsyncMock()
+    pool.fetch = AsyncMock(return_value=[])
+    pool.fetchval = AsyncMock(return_value=True)
+    return pool
+
+
+def _message(message_id, channel_id=10, guild_id=1, content="hello"):
+    message = MagicMock()
+    message.id = message_id
+    message.channel.id = channel_id
+    message.guild = MagicMock(id=guild_id) if guild_id else None
+    message.author.id = 42
+    message.author.name = "builder"
+    message.author.display_name = "Builder"
+    message.author.bot = False
+    message.content = content
+    message.created_at = NOW
+    message.edited_at = None
+    return message
+
+
+def _row(message_id, channel_id=10, content="hello"):
+    return {
+        "message_id": message_id,
+        "channel_id": channel_id,
+        "author_id": 42,
+        "author_name": "builder",
+        "author_display_name": "Builder",
+        "author_is_bot": False,
+        "content": content,
+        "created_at": NOW,
+    }
+
+
+class _History:
+    """Async iterator standing in for channel.history()."""
+
+    def __init__(self, messages):
+        self._messages = iter(messages)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._messages)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def _channel(channel_id, pages):
+    """TextChannel mock whose successive history() calls return `pages`."""
+    channel = MagicMock(spec=discord.TextChannel)
+    channel.id = channel_id
+    channel.name = f"channel-{channel_id}"
+    channel.guild = MagicMock(id=1)
+    channel.permissions_for.return_value = MagicMock(read_messages=True, read_message_history=True)
+    remaining = list(pages)
+    channel.history = MagicMock(side_effect=lambda **kw: _History(remaining.pop(0)))
+    return channel
+
+
+def _bot(channels):
+    guild = MagicMock()
+    guild.channels = channels
+    bot = MagicMock()
+    bot.guilds = [guild]
+    return bot
+
+
+class TestMessageArchiveStore:
+    @pytest.mark.asyncio
+    async def test_record_many_skips_dms_and_writes_columns(self):
+        pool = _pool()
+        archive = MessageArchive(pool)
+
+        written = await archive.record_many([_message(1), _message(2, guild_id=None), _message(3)])
+
+        assert written == 2
+        args = pool.execute.await_args.args
+        assert "ON CONFLICT (message_id)" in args[0]
+        assert args[1] == [1, 3]  # message ids
+        assert args[8] == ["hello", "hello"]  # content
+
+    @pytest.mark.asyncio
+    async def test_record_many_without_guild_messages_skips_query(self):
+        pool = _pool()
+
+        assert await MessageArchive(pool).record_many([_message(1, guild_id=None)]) == 0
+        pool.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_search_escapes_like_wildcards_and_maps_rows(self):
+        pool = _pool()
+        pool.fetch.return_value = [_row(5, content="50% off_sale")]
+        archive = MessageArchive(pool)
+
+        results = await archive.search("50% off_", channel_ids=[10], author_name="bui", limit=3)
+
+        args = pool.fetch.await_args.args
+        assert args[1] == "50% off_"
+        assert args[2] == "%50\\% off\\_%"
+        assert args[3] == [10]
+        assert args[4] is None
+        assert args[5] == "%bui%"
+        assert args[6] == 3
+        assert results[0].id == 5
+        assert results[0].author.display_name == "Builder"
+        assert results[0].content == "50% off_sale"
+
+    @pytest.mark.asyncio
+    async def test_recent_only_serves_live_channels(self):
+        pool = _pool()
+        pool.fetch.return_value = [_row(2), _row(1)]
+        archive = MessageArchive(pool)
+
+        assert await archive.recent(10, 5) is None
+        pool.fetch.assert_not_awaited()
+
+        archive.mark_live(10)
+        assert [m.id for m in await archive.recent(10, 5)] == [2, 1]
+
+        archive.reset_live()
+        assert await archive.recent(10, 5) is None
+
+    @pytest.mark.asyncio
+    async def test_is_available_is_cached(self):
+        pool = _pool()
+        pool.fetchval.return_value = False
+        archive = MessageArchive(pool)
+
+        assert await archive.is_available() is False
+        assert await archive.is_available() is False
+        pool.fetchval.assert_awaited_once()
+
+
+class TestArchiveBackfill:
+    def _archive(self, cursors=None):
+        archive = MessageArchive(_pool())
+        archive.get_cursors = AsyncMock(return_value=cursors or {})
+        archive.save_cursor = AsyncMock()
+        archive.advance_head = AsyncMock()
+        archive.record_many = AsyncMock(side_effect=lambda msgs: len(msgs))
+        return archive
+
+    @pytest.mark.asyncio
+    async def test_new_channel_takes_latest_page_and_goes_live(self):
+        page = [_message(i) for i in range(300, 300 - PAGE_SIZE, -1)]
+        channel = _channel(10, [page])
+        archive = self._archive()
+        backfill = ArchiveBackfill(_bot([channel]), archive, pages_per_tick=1)
+
+        stats = await backfill.run_once()
+
+        assert stats["pages"] == 1
+        assert archive.is_live(10)
+        archive.save_cursor.assert_awaited_once_with(
+            10, 1, page[-1].id, False, newest_message_id=page[0].id
+        )
+
+    @pytest.mark.asyncio
+    async def test_catch_up_pages_forward_until_short_page(self):
+        full = [_message(i) for i in range(101, 101 + PAGE_SIZE)]
+        short = [_message(500)]
+        channel = _channel(10, [full, short])
+        archive = self._archive(
+            cursors={10: {"oldest_message_id": 1, "newest_message_id": 100, "backfill_complete": True}}
+        )
+        backfill = ArchiveBackfill(_bot([channel]), archive, pages_per_tick=0)
+
+        await backfill.run_once()
+
+        calls = channel.history.call_args_list
+        assert calls[0].kwargs["after"].id == 100
+        assert calls[0].kwargs["oldest_first"] is True
+        assert calls[1].kwargs["after"].id == full[-1].id
+        assert [c.args for c in archive.advance_head.await_args_list] == [
+            (10, full[-1].id),
+            (10, 500),
+        ]
+        assert archive.is_live(10)
+
+    @pytest.mark.asyncio
+    async def test_catch_up_starts_from_head_cursor_not_live_messages(self):
+        # Offline gap is 101..120; on_message archives 121 before the tick
+        pool = _pool()
+        pool.fetch.return_value = [
+            {"channel_id": 10, "oldest_message_id": 1, "newest_message_id": 100, "backfill_complete": True}
+        ]
+        archive = MessageArchive(pool)
+        await archive.record(_message(121))
+        gap = [_message(i) for i in range(101, 122)]
+        channel = _channel(10, [gap])
+        backfill = ArchiveBackfill(_bot([channel]), archive, pages_per_tick=0)
+
+        stats = await backfill.run_once()
+
+        assert channel.history.call_args.kwargs["after"].id == 100
+        assert stats["messages"] == len(gap)
+        head_sql, channel_id, head = pool.execute.await_args.args
+        assert "newest_message_id" in head_sql
+        assert (channel_id, head) == (10, 121)
+        assert archive.is_live(10)
+
+    @pytest.mark.asyncio
+    async def test_walk_back_resumes_from_cursor_and_marks_complete(self):
+        channel = _channel(10, [[_message(49), _message(48)]])
+        archive = self._archive(cursors={10: {"oldest_message_id": 50, "backfill_complete": False}})
+        archive.mark_live(10)
+        backfill = ArchiveBackfill(_bot([channel]), archive, pages_per_tick=5)
+
+        stats = await backfill.run_once()
+
+        assert channel.history.call_args.kwargs["before"].id == 50
+        archive.save_cursor.assert_awaited_once_with(10, 1, 48, True)
+        assert stats["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_walk_back_respects_page_budget(self):
+        full = lambda start: [_message(i) for i in range(start, start - PAGE_SIZE, -1)]
+        channel = _channel(10, [full(999), full(899), full(799)])
+        archive = self._archive(cursors={10: {"oldest_message_id": 1000, "backfill_complete": False}})
+        archive.mark_live(10)
+        backfill = ArchiveBackfill(_bot([channel]), archive, pages_per_tick=2)
+
+        stats = await backfill.run_once()
+
+        assert stats["pages"] == 2
+        assert archive.save_cursor.await_args.args == (10, 1, 800, False)
+
+    @pytest.mark.asyncio
+    async def test_skips_unreadable_and_complete_channels(self):
+        hidden = _channel(11, [])
+        hidden.permissions_for.return_value = MagicMock(read_messages=True, read_message_history=False)
+        done = _channel(10, [])
+        archive = self._archive(cursors={10: {"oldest_message_id": 5, "backfill_complete": True}})
+        archive.mark_live(10)
+        backfill = ArchiveBackfill(_bot([hidden, done]), archive)
+
+        stats = await backfill.run_once()
+
+        assert stats["pages"] == 0
+        hidden.history.assert_not_called()
+        done.history.assert_not_called()
@@ -27,6 +27,7 @@ from agents.persona_loader import (
 )
 from proactive.decider import (
     ProactiveDecider,
+    _build_prompt,
     _extract_json_block,
     _looks_like_emoji,
 )
@@ -352,3 +353,27 @@ class TestSanitize:
         # Could be json_not_object OR no_json_in_response depending on extract path;
         # what matters is it didn't crash and fell back safely.
         assert decision.action == "none"
+
+
+# ---------------------------------------------------------------
+# Prompt layout
+# ---------------------------------------------------------------
+
+class TestBuildPrompt:
+    def test_stable_blocks_cached_channel_state_last(self):
+        system, user = _build_prompt(_ctx())
+
+        assert "cache_control" in system[-1]
+        assert "Schema:" in system[-1]["text"]
+        assert "cache_control" in user[0]
+        assert user[0]["text"].startswith("# Persona deciding")
+        assert "cache_control" not in user[-1]
+        assert "message 103" in user[-1]["text"]
+
+    def test_persona_prefix_independent_of_channel_state(self):
+        quiet = _build_prompt(_ctx(recent_message_ids=[]))
+        busy = _build_prompt(_ctx(recent_message_ids=[1, 2, 3], budget=BudgetSummary(0, 0, 0)))
+
+        assert quiet[0] == busy[0]
+        assert quiet[1][0] == busy[1][0]
+
@@ -23,6 +23,7 @@ from proactive.reflection import (
     ReflectionEngine,
     infer_subject,
     observation_text,
+    parse_batch_ratings,
     parse_importance,
     parse_insights,
     parse_questions,
@@ -193,6 +194,17 @@ class TestAccumulatedImportance:
 
         assert result == 42
 
+    @pytest.mark.asyncio
+    async def test_single_query_with_reflection_cutoff(self):
+        pool = _pool_mock()
+        pool.fetchrow = AsyncMock(return_value={"total": 17})
+        engine = ReflectionEngine(pool)
+
+        assert await engine.accumulated_importance_since_last_reflection("slashai") == 17
+        pool.fetchrow.assert_awaited_once()
+        pool.fetchval.assert_not_called()
+        assert "agent_reflections" in pool.fetchrow.await_args.args[0]
+
     @pytest.mark.asyncio
     async def test_should_reflect_below_threshold(self):
         pool = _pool_mock()
@@ -316,9 +328,73 @@ class TestScoreImportance:
 # score_unscored_actions
 # ---------------------------------------------------------------
 
+def _ratings_response(ratings):
+    block = MagicMock()
+    block.type = "tool_use"
+    block.input = {"ratings": ratings}
+    response = MagicMock()
+    response.content = [block]
+    return response
+
+
+class TestParseBatchRatings:
+    def test_maps_numbers_to_positions(self):
+        ratings = [{"memory": 2, "rating": 9}, {"memory": 1, "rating": 3}]
+        assert parse_batch_ratings(ratings, 2) == [3, 9]
+
+    def test_missing_and_malformed_fall_back(self):
+        ratings = [{"memory": 1, "rating": "high"}, {"memory": 7, "rating": 4}, "junk"]
+        assert parse_batch_ratings(ratings, 3) == [5, 5, 5]
+
+    def test_clamps_out_of_range(self):
+        ratings = [{"memory": 1, "rating": 0}, {"memory": 2, "rating": 42}]
+        assert parse_batch_ratings(ratings, 2) == [1, 10]
+
+    def test_non_list_falls_back(self):
+        assert parse_batch_ratings(None, 2) == [5, 5]
+
+
+class TestScoreImportanceBatch:
+    @pytest.mark.asyncio
+    async def test_one_call_for_all_texts(self):
+        client = MagicMock()
+        client.messages = MagicMock()
+        client.messages.create = AsyncMock(return_value=_ratings_response(
+            [{"memory": 1, "rating": 2}, {"memory": 2, "rating": 8}, {"memory": 3, "rating": 6}]
+        ))
+        engine = ReflectionEngine(_pool_mock())
+
+        scores = await engine.score_importance_batch(["a", "b", "c"], client)
+
+        assert scores == [2, 8, 6]
+        client.messages.create.assert_awaited_once()
+        kwargs = client.messages.create.await_args.kwargs
+        assert kwargs["tool_choice"] == {"type": "tool", "name": "record_ratings"}
+        assert "1. a\n2. b\n3. c" in kwargs["messages"][0]["content"]
+
+    @pytest.mark.asyncio
+    async def test_api_error_returns_defaults(self):
+        client = MagicMock()
+        client.messages = MagicMock()
+        client.messages.create = AsyncMock(side_effect=RuntimeError("boom"))
+        engine = ReflectionEngine(_pool_mock())
+
+        assert await engine.score_importance_batch(["a", "b"], client) == [5, 5]
+
+    @pytest.mark.asyncio
+    async def test_empty_makes_no_call(self):
+        client = MagicMock()
+        client.messages = MagicMock()
+        client.messages.create = AsyncMock()
+        engine = ReflectionEngine(_pool_mock())
+
+        assert await engine.score_importance_batch([], client) == []
+        client.messages.create.assert_not_called()
+
+
 class TestScoreUnscoredActions:
     @pytest.mark.asyncio
-    async def test_scores_each_row(self):
+    async def test_scores_batch_with_one_call_and_one_update(self):
         pool = _pool_mock()
         pool.fetch = AsyncMock(return_value=[
             {"id": 1, "decision": "react", "target_persona_id": None,
@@ -326,30 +402,23 @@ class TestScoreUnscoredActions:
             {"id": 2, "decision": "reply", "target_persona_id": None,
              "emoji": None, "channel_id": 42, "reasoning": "agree"},
         ])
-        # Anthropic returns "7" then "5"
-        responses = []
-        for n in [7, 5]:
-            block = MagicMock()
-            block.type = "text"
-            block.text = str(n)
-            r = MagicMock()
-            r.content = [block]
-            responses.append(r)
         client = MagicMock()
         client.messages = MagicMock()
-        client.messages.create = AsyncMock(side_effect=responses)
+        client.messages.create = AsyncMock(return_value=_ratings_response(
+            [{"memory": 1, "rating": 7}, {"memory": 2, "rating": 5}]
+        ))
 
         engine = ReflectionEngine(pool)
         scored = await engine.score_unscored_actions("slashai", client)
 
         assert scored == 2
-        # Two UPDATEs issued, one per scored row
-        assert pool.execute.await_count == 2
-        # Verify importance values passed through
-        first_update = pool.execute.await_args_list[0]
-        assert first_update.args[2] == 7
-        second_update = pool.execute.await_args_list[1]
-        assert second_update.args[2] == 5
+        client.messages.create.assert_awaited_once()
+        # One UPDATE ... FROM unnest() for the whole batch
+        pool.execute.assert_awaited_once()
+        update = pool.execute.await_args
+        assert "unnest" in update.args[0]
+        assert update.args[1] == [1, 2]
+        assert update.args[2] == [7, 5]
 
     @pytest.mark.asyncio
     async def test_empty_returns_zero(self):
@@ -0,0 +1,102 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the prompt-cache aware request layout."""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from prompt_layout import MAX_BREAKPOINTS, PromptLayout, cache_hit_ratio
+
+TOOLS = [{"name": "read_messages"}, {"name": "search_messages"}]
+
+
+def _history(turns=2):
+    messages = []
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"question {i}"})
+        messages.append({"role": "assistant", "content": f"answer {i}"})
+    return messages
+
+
+def _breakpoints(request):
+    blocks = list(request.get("tools", [])) + list(request["system"])
+    for message in request["messages"]:
+        if isinstance(message["content"], list):
+            blocks += message["content"]
+    return [b for b in blocks if "cache_control" in b]
+
+
+def _cached(message):
+    content = message["content"]
+    return isinstance(content, list) and "cache_control" in content[-1]
+
+
+class TestPromptLayout:
+    def test_first_turn_caches_tools_persona_and_profile(self):
+        layout = PromptLayout(persona="persona", profile="builds", turn_context="today", tools=TOOLS)
+
+        request = layout.request([{"role": "user", "content": "hi"}])
+
+        assert [b["text"] for b in request["system"]] == ["persona", "builds"]
+        assert all("cache_control" in b for b in request["system"])
+        assert "cache_control" in request["tools"][-1]
+        assert len(_breakpoints(request)) == MAX_BREAKPOINTS
+
+    def test_turn_context_precedes_user_content_not_system(self):
+        layout = PromptLayout(persona="persona", turn_context="memories here")
+
+        request = layout.request(_history() + [{"role": "user", "content": "now"}])
+
+        assert all("memories here" not in b["text"] for b in request["system"])
+        current = request["messages"][-1]["content"]
+        assert current[0]["text"] == "<context>\nmemories here\n</context>"
+        assert current[1]["text"] == "now"
+
+    def test_history_end_and_final_message_marked(self):
+        layout = PromptLayout(persona="persona", profile="builds", tools=TOOLS)
+        messages = _history() + [{"role": "user", "content": "now"}]
+
+        request = layout.request(messages)
+
+        marked = [i for i, m in enumerate(request["messages"]) if _cached(m)]
+        assert marked == [len(messages) - 2, len(messages) - 1]
+        # Out of budget: the tool breakpoint goes first, the system covers it
+        assert "cache_control" not in request["tools"][-1]
+        assert len(_breakpoints(request)) == MAX_BREAKPOINTS
+
+    def test_final_breakpoint_moves_with_tool_round_trips(self):
+        layout = PromptLayout(persona="persona", turn_context="ctx", tools=TOOLS)
+        messages = _history() + [{"role": "user", "content": "now"}]
+        turn_start = len(messages) - 1
+        messages.append({"role": "assistant", "content": [{"type": "tool_use", "id": "t1"}]})
+        messages.append({"role": "user", "content": [{"type": "tool_result", "tool_use_id": "t1"}]})
+
+        request = layout.request(messages, turn_start)
+
+        marked = [i for i, m in enumerate(request["messages"]) if _cached(m)]
+        assert marked == [turn_start - 1, len(messages) - 1]
+        # Turn context stays on the current user message, not the tool result
+        assert request["messages"][turn_start]["content"][0]["text"].startswith("<context>")
+        assert len(_breakpoints(request)) <= MAX_BREAKPOINTS
+
+    def test_inputs_are_not_mutated(self):
+        tools = [dict(t) for t in TOOLS]
+        messages = _history() + [{"role": "user", "content": "now"}]
+        layout = PromptLayout(persona="persona", turn_context="ctx", tools=tools)
+
+        layout.request(messages)
+
+        assert tools == TOOLS
+        assert messages == _history() + [{"role": "user", "content": "now"}]
+
+
+def test_cache_hit_ratio():
+    usage = SimpleNamespace(input_tokens=100, cache_read_input_tokens=800, cache_creation_input_tokens=100)
+    assert cache_hit_ratio(usage) == 0.8
+    assert cache_hit_ratio(None) == 0.0
+    assert cache_hit_ratio(SimpleNamespace(input_tokens=0)) == 0.0
@@ -0,0 +1,174 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for set-based reaction aggregation and the dirty-memory queue."""
+
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from memory.config import MemoryConfig
+from memory.reactions.aggregator import AGGREGATION_BATCH_SIZE, ReactionAggregator
+from memory.reactions.store import ReactionStore
+
+
+def _stats(memory_id, total=0, reactors=0, sentiments=(), intensity=0.8, intents=None, emoji=None):
+    """A row shaped like _AGGREGATE_SQL output."""
+    return {
+        "memory_id": memory_id,
+        "total_reactions": total,
+        "unique_reactors": reactors,
+        "sentiment_count": len(sentiments),
+        "weighted_sentiment_sum": sum(s * intensity for s in sentiments) if sentiments else None,
+        "weight_sum": intensity * len(sentiments) if sentiments else None,
+        "avg_intensity": intensity if total else None,
+        "positive_count": sum(1 for s in sentiments if s > 0.3),
+        "negative_count": sum(1 for s in sentiments if s < -0.3),
+        "intent_distribution": json.dumps(intents) if intents else None,
+        "top_emoji": json.dumps(emoji) if emoji else None,
+    }
+
+
+@pytest.fixture
+def db():
+    pool = MagicMock()
+    pool.fetch = AsyncMock(return_value=[])
+    pool.fetchval = AsyncMock(return_value=True)
+    pool.execute = AsyncMock()
+
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=[])
+    conn.execute = AsyncMock()
+    txn_ctx = MagicMock()
+    txn_ctx.__aenter__ = AsyncMock(return_value=None)
+    txn_ctx.__aexit__ = AsyncMock(return_value=None)
+    conn.transaction = MagicMock(return_value=txn_ctx)
+    acquire_ctx = MagicMock()
+    acquire_ctx.__aenter__ = AsyncMock(return_value=conn)
+    acquire_ctx.__aexit__ = AsyncMock(return_value=None)
+    pool.acquire = MagicMock(return_value=acquire_ctx)
+    pool.conn = conn
+    return pool
+
+
+class TestReactionAggregator:
+    @pytest.mark.asyncio
+    async def test_batch_written_with_one_bulk_update(self, db):
+        db.conn.fetch.return_value = [
+            _stats(1, total=3, reactors=2, sentiments=(0.8, 0.8, 0.5),
+                   intents={"agreement": 2}, emoji=[{"emoji": "👍", "count": 2}]),
+            _stats(2),  # all reactions removed
+        ]
+        aggregator = ReactionAggregator(MagicMock(), db, MemoryConfig(promotion_enabled=False))
+
+        stats = await aggregator.run_aggregation()
+
+        assert stats["memories_processed"] == 2
+        assert stats["memories_updated"] == 1
+        claim_sql, limit = db.conn.fetch.call_args[0]
+        assert "DELETE FROM memory_reaction_dirty" in claim_sql
+        assert "FOR UPDATE SKIP LOCKED" in claim_sql
+        assert limit == AGGREGATION_BATCH_SIZE
+
+        assert db.conn.execute.call_count == 1
+        update_sql, ids, summaries, boosts = db.conn.execute.call_args[0]
+        assert "unnest" in update_sql
+        assert ids == [1, 2]
+        summary = json.loads(summaries[0])
+        assert summary["total_reactions"] == 3
+        assert summary["sentiment_score"] == 0.7
+        assert summary["controversy_score"] == 0.0
+        assert summary["intent_distribution"] == {"agreement": 2}
+        assert summary["top_emoji"] == [{"emoji": "👍", "count": 2}]
+        assert summaries[1] is None and boosts[1] == 0.0
+        assert boosts[0] == aggregator._calculate_confidence_boost(summary)
+
+        # Newly-linked sweep queued before the batch was claimed
+        assert "memory_message_links" in db.execute.call_args[0][0]
+
+    def test_controversy_from_mixed_sentiment(self):
+        row = _stats(1, total=4, reactors=4, sentiments=(0.9, 0.9, 0.9, -0.9))
+        summary = ReactionAggregator._summary_from_stats(row, datetime.now(timezone.utc))
+        assert summary["controversy_score"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_promotions_checked_in_one_statement(self, db):
+        popular = _stats(1, total=5, reactors=4, sentiments=(0.9,) * 5)
+        lukewarm = _stats(2, total=5, reactors=4, sentiments=(0.1,) * 5)
+        db.conn.fetch.side_effect = [
+            [popular, lukewarm],
+            [{"id": 1, "from_type": "episodic", "user_id": 111, "topic_summary": "Builds castles"}],
+        ]
+        aggregator = ReactionAggregator(MagicMock(), db, MemoryConfig())
+
+        with patch("memory.reactions.aggregator.track") as mock_track:
+            stats = await aggregator.run_aggregation()
+
+        assert stats["memories_promoted"] == 1
+        promote_sql, candidates, min_age = db.conn.fetch.call_args[0]
+        assert "memory_type = 'semantic'" in promote_sql
+        assert candidates == [1]
+        assert min_age == MemoryConfig().promotion_min_age_days
+        assert mock_track.call_args[1]["properties"]["from_type"] == "episodic"
+
+    @pytest.mark.asyncio
+    async def test_full_batches_keep_draining(self, db):
+        full = [_stats(i) for i in range(AGGREGATION_BATCH_SIZE)]
+        db.conn.fetch.side_effect = [full, [_stats(0)]]
+        aggregator = ReactionAggregator(MagicMock(), db, MemoryConfig(promotion_enabled=False))
+
+        stats = await aggregator.run_aggregation()
+
+        assert db.conn.fetch.call_count == 2
+        assert stats["memories_processed"] == AGGREGATION_BATCH_SIZE + 1
+
+    @pytest.mark.asyncio
+    async def test_fallback_without_dirty_queue(self, db):
+        db.fetchval.return_value = False
+        db.fetch.return_value = [{"id": 5}, {"id": 6}]
+        db.conn.fetch.return_value = [_stats(5), _stats(6)]
+        aggregator = ReactionAggregator(MagicMock(), db, MemoryConfig(promotion_enabled=False))
+
+        await aggregator.run_aggregation()
+
+        sql, ids = db.conn.fetch.call_args[0]
+        assert "unnest($1::int[])" in sql
+        assert ids == [5, 6]
+        db.execute.assert_not_called()
+
+
+class TestReactionStoreDirtyQueue:
+    @pytest.mark.asyncio
+    async def test_store_reaction_marks_linked_memories(self, db):
+        db.fetchrow = AsyncMock(return_value={"id": 9})
+        store = ReactionStore(db)
+
+        assert await store.store_reaction(1, 2, 3, 4, 5, "👍", {"sentiment": 0.5}) == 9
+        sql = db.fetchrow.call_args[0][0]
+        assert "INSERT INTO memory_reaction_dirty" in sql
+        assert db.fetchrow.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_remove_reaction_marks_linked_memories(self, db):
+        store = ReactionStore(db)
+        store._dirty_queue = True
+        db.fetchval.return_value = 1
+
+        assert await store.remove_reaction(1, 5, "👍") is True
+        assert "INSERT INTO memory_reaction_dirty" in db.fetchval.call_args[0][0]
+
+    @pytest.mark.asyncio
+    async def test_store_without_migration_skips_queue(self, db):
+        db.fetchval.return_value = False
+        db.fetchrow = AsyncMock(return_value={"id": 9})
+        store = ReactionStore(db)
+
+        await store.store_reaction(1, 2, 3, 4, 5, "👍", {})
+        assert "memory_reaction_dirty" not in db.fetchrow.call_args[0][0]
@@ -0,0 +1,218 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the async, concurrent recognition pipeline."""
+
+import asyncio
+import base64
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from recognition.analyzer import BuildAnalyzer
+from recognition.api import Nomination, PlayerProfile, Submission
+from recognition.nominations import NominationReviewer
+from recognition.scheduler import RecognitionScheduler
+
+
+def _response(content=b"img", content_type="image/png"):
+    response = MagicMock()
+    response.content = content
+    response.status_code = 200
+    response.headers = {"content-type": content_type}
+    response.raise_for_status = MagicMock()
+    return response
+
+
+def _submission(submission_id="s1", player_uuid="player-1", urls=None):
+    return Submission(
+        id=submission_id,
+        player_uuid=player_uuid,
+        build_name="Tower",
+        description=None,
+        screenshot_urls=urls or ["https://cdn/a.png"],
+        coordinates={"x": 0, "y": 64, "z": 0},
+        submission_type="submission",
+        status="pending",
+    )
+
+
+def _text_response(text):
+    response = MagicMock()
+    response.content = [MagicMock(text=text)]
+    return response
+
+
+class TestBuildAnalyzer:
+    @pytest.mark.asyncio
+    async def test_images_downloaded_concurrently_in_order(self):
+        in_flight = 0
+        peak = 0
+
+        async def get(url, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # First URL finishes last; order must still follow the input
+            await asyncio.sleep(0.03 if url.endswith("a.png") else 0.01)
+            in_flight -= 1
+            if url.endswith("bad.png"):
+                raise RuntimeError("404")
+            return _response(content=url.encode(), content_type="image/jpeg")
+
+        http = MagicMock()
+        http.get = AsyncMock(side_effect=get)
+        analyzer = BuildAnalyzer(api_key="test", http_client=http)
+
+        content = await analyzer._prepare_images(
+            ["https://cdn/a.png", "https://cdn/bad.png", "https://cdn/c.png", "https://cdn/d.png"]
+        )
+
+        assert peak == 3  # capped at MAX_ANALYSIS_IMAGES, all at once
+        assert len(content) == 2
+        assert content[0]["source"]["media_type"] == "image/jpeg"
+        assert base64.b64decode(content[0]["source"]["data"]) == b"https://cdn/a.png"
+        assert base64.b64decode(content[1]["source"]["data"]) == b"https://cdn/c.png"
+
+    @pytest.mark.asyncio
+    async def test_analyze_awaits_async_client(self):
+        http = MagicMock()
+        http.get = AsyncMock(return_value=_response())
+        analyzer = BuildAnalyzer(api_key="test", http_client=http)
+        analyzer.client = MagicMock()
+        analyzer.client.messages.create = AsyncMock(
+            return_value=_text_response('{"recognized": true, "confidence": 0.9}')
+        )
+
+        analysis = await analyzer.analyze(_submission())
+
+        analyzer.client.messages.create.assert_awaited_once()
+        assert analysis.recognized is True
+        assert analysis.confidence == 0.9
+
+    @pytest.mark.asyncio
+    async def test_shared_http_client_not_closed(self):
+        http = MagicMock()
+        http.aclose = AsyncMock()
+        analyzer = BuildAnalyzer(api_key="test", http_client=http)
+
+        await analyzer.close()
+
+        http.aclose.assert_not_awaited()
+
+
+class TestNominationReviewer:
+    @pytest.mark.asyncio
+    async def test_review_awaits_async_client(self):
+        reviewer = NominationReviewer(api_key="test")
+        reviewer.client = MagicMock()
+        reviewer.client.messages.create = AsyncMock(
+            return_value=_text_response('{"decision": "approved", "notes": "ok", "confidence": 0.8, "flags": []}')
+        )
+        nomination = Nomination(
+            id="n1",
+            nominator_uuid="a",
+            nominee_uuid="b",
+            category="helper",
+            reason="Helped me rebuild my whole farm after a creeper blew it up",
+            anonymous=False,
+            status="pending",
+        )
+
+        review = await reviewer.review(nomination)
+
+        reviewer.client.messages.create.assert_awaited_once()
+        assert review.decision == "approved"
+
+
+class TestRecognitionScheduler:
+    @pytest.fixture
+    def scheduler(self, monkeypatch):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+        scheduler = RecognitionScheduler(MagicMock())
+        scheduler.api_client = MagicMock()
+        return scheduler
+
+    @pytest.mark.asyncio
+    async def test_work_items_run_within_concurrency(self, scheduler):
+        scheduler.concurrency = 2
+        active = 0
+        peak = 0
+
+        async def job():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        await scheduler._run_bounded([job() for _ in range(6)])
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_failing_item_does_not_stop_others(self, scheduler):
+        done = []
+
+        async def ok(i):
+            done.append(i)
+
+        async def boom():
+            raise RuntimeError("boom")
+
+        await scheduler._run_bounded([ok(1), boom(), ok(2)])
+
+        assert sorted(done) == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_player_profile_fetched_once_per_cycle(self, scheduler):
+        profile = PlayerProfile("player-1", "Steve", None, 1, 2, [], None)
+
+        async def fetch(uuid):
+            await asyncio.sleep(0.01)
+            return profile
+
+        scheduler.api_client.get_player_profile = AsyncMock(side_effect=fetch)
+
+        results = await asyncio.gather(
+            scheduler._get_player_profile("player-1"),
+            scheduler._get_player_profile("player-1"),
+            scheduler._get_player_profile("player-2"),
+        )
+
+        assert results[0] is results[1] is profile
+        assert scheduler.api_client.get_player_profile.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_poll_cycle_processes_items_concurrently(self, scheduler):
+        scheduler.api_client.get_pending_submissions = AsyncMock(
+            return_value=([_submission("s1"), _submission("s2")], [])
+        )
+        scheduler.api_client.get_pending_nominations = AsyncMock(return_value=[])
+        scheduler.api_client.get_player_profile = AsyncMock(return_value=None)
+        scheduler._profile_cache["stale"] = MagicMock()
+
+        started = asyncio.Event()
+        release = asyncio.Event()
+        seen = []
+
+        async def process(submission):
+            seen.append(submission.id)
+            if len(seen) == 2:
+                started.set()
+            await release.wait()
+
+        scheduler._process_single_submission = process
+
+        cycle = asyncio.create_task(scheduler._process_submissions.coro(scheduler))
+        await asyncio.wait_for(started.wait(), timeout=1)
+        release.set()
+        await cycle
+
+        assert seen == ["s1", "s2"]
+        assert "stale" not in scheduler._profile_cache
@@ -8,11 +8,11 @@ import struct
 import sys
 from pathlib import Path
 
-import audioop
 import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from voice.dsp import mono_to_stereo, rms, to_samples
 from voice.resampler import AudioResampler, StreamResampler
 
 
@@ -47,8 +47,8 @@ class TestTtsToDiscord:
         # A non-silent signal should remain non-silent
         mono_24k = _make_tone(2400)  # 0.1 second
         stereo_48k = AudioResampler.tts_to_discord(mono_24k)
-        rms = audioop.rms(stereo_48k, 2)
-        assert rms > 0
+        rms_out = rms(stereo_48k)
+        assert rms_out > 0
 
 
 class TestDiscordToStt:
@@ -64,10 +64,10 @@ class TestDiscordToStt:
 
     def test_preserves_energy(self):
         stereo_48k = _make_tone(4800)  # Make mono tone, then fake stereo
-        stereo = audioop.tostereo(stereo_48k, 2, 1, 1)
+        stereo = mono_to_stereo(to_samples(stereo_48k)).tobytes()
         mono_16k = AudioResampler.discord_to_stt(stereo)
-        rms = audioop.rms(mono_16k, 2)
-        assert rms > 0
+        rms_out = rms(mono_16k)
+        assert rms_out > 0
 
 
 class TestPcmToWav:
@@ -111,8 +111,8 @@ class TestPcmToWav:
         mono_24k = _make_tone(2400, amplitude=5000)
         stereo_48k = AudioResampler.tts_to_discord(mono_24k)
         mono_16k = AudioResampler.discord_to_stt(stereo_48k)
-        rms = audioop.rms(mono_16k, 2)
-        assert rms > 0
+        rms_out = rms(mono_16k)
+        assert rms_out > 0
 
 
 class TestStreamResampler:
@@ -132,18 +132,19 @@ class TestStreamResampler:
         out1 = stream.tts_to_discord(chunk1)
         out2 = stream.tts_to_discord(chunk2)
         # Both should have similar RMS (no discontinuity artifacts)
-        rms1 = audioop.rms(out1, 2)
-        rms2 = audioop.rms(out2, 2)
+        rms1 = rms(out1)
+        rms2 = rms(out2)
         assert rms1 > 0
         assert rms2 > 0
         assert abs(rms1 - rms2) / max(rms1, rms2) < 0.3  # Within 30%
 
     def test_reset(self):
         stream = StreamResampler()
-        stream.tts_to_discord(_make_tone(2400))
-        assert stream._upsample_state is not None
+        tone = _make_tone(2400)
+        first = stream.tts_to_discord(tone)
+        assert stream.tts_to_discord(tone) != first  # Carries filter history
         stream.reset()
-        assert stream._upsample_state is None
+        assert stream.tts_to_discord(tone) == first
 
     def test_empty_input(self):
         stream = StreamResampler()
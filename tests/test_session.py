@@ -6,6 +6,7 @@
 
 import asyncio
 import sys
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -246,3 +247,322 @@ class TestVoiceSession:
         persona = _make_persona()
         session = VoiceSession(MagicMock(), persona, MagicMock())
         assert session.channel is None
+
+
+def _make_streaming_session():
+    from voice.session import VoiceSession
+
+    session = VoiceSession(_make_mock_client(), _make_persona(), AsyncMock())
+    session._running = True
+    session._streaming = True
+    session._voice_client = MagicMock()
+    session._voice_client.channel.id = 123
+    session._voice_client.channel.members = []
+    return session
+
+
+class TestStreamingSTT:
+    @pytest.mark.asyncio
+    async def test_stream_transcript_used_instead_of_batch(self):
+        session = _make_streaming_session()
+        stream = MagicMock()
+        stream.finalize = AsyncMock(return_value="What's the weather?")
+        session._user_streams[999] = stream
+
+        with (
+            patch.object(session._stt, "transcribe", new_callable=AsyncMock) as batch,
+            patch.object(session, "_speak_streaming", new_callable=AsyncMock) as speak,
+        ):
+            await session._handle_utterance(user_id=999, pcm_16k_mono=b"\x00" * 6400)
+
+        batch.assert_not_awaited()
+        assert speak.call_args.kwargs["content"] == "What's the weather?"
+        assert 999 not in session._user_streams
+
+    @pytest.mark.asyncio
+    async def test_failed_stream_falls_back_to_batch(self):
+        session = _make_streaming_session()
+        stream = MagicMock()
+        stream.finalize = AsyncMock(return_value=None)
+        session._user_streams[999] = stream
+
+        with (
+            patch.object(
+                session._stt, "transcribe", new_callable=AsyncMock, return_value="Hello there"
+            ) as batch,
+            patch.object(session, "_speak_streaming", new_callable=AsyncMock) as speak,
+        ):
+            await session._handle_utterance(user_id=999, pcm_16k_mono=b"\x00" * 6400)
+
+        batch.assert_awaited_once()
+        assert speak.call_args.kwargs["content"] == "Hello there"
+
+    @pytest.mark.asyncio
+    async def test_early_endpoint_needs_silence_and_stable_sentence(self):
+        from voice.session import EARLY_ENDPOINT_MS, PARTIAL_STABLE_MS
+        from voice.vad import VoiceActivityDetector
+
+        session = _make_streaming_session()
+        vad = VoiceActivityDetector()
+        vad.process(b"\x10\x27" * 800, 0.0)  # Loud enough to start speaking
+        stream = MagicMock()
+        stream.is_stable.return_value = True
+        session._user_streams[999] = stream
+
+        assert not session._should_endpoint_early(999, vad, EARLY_ENDPOINT_MS / 2000)
+        assert session._should_endpoint_early(999, vad, EARLY_ENDPOINT_MS / 1000)
+        stream.is_stable.assert_called_with(PARTIAL_STABLE_MS, EARLY_ENDPOINT_MS / 1000)
+
+        stream.is_stable.return_value = False
+        assert not session._should_endpoint_early(999, vad, 5.0)
+
+    @pytest.mark.asyncio
+    async def test_stream_opened_on_speech_onset_and_fed(self):
+        session = _make_streaming_session()
+        stream = MagicMock()
+
+        with patch.object(session._stt, "open_stream", return_value=stream) as open_stream:
+            session._stream_audio(999, b"a")
+            session._stream_audio(999, b"b")
+
+        open_stream.assert_called_once()
+        assert [c.args[0] for c in stream.feed.call_args_list] == [b"a", b"b"]
+
+
+def _loud_frame() -> bytes:
+    """20ms of loud 48kHz stereo, as received from Discord."""
+    return b"\x10\x27" * 1920  # 10000
+
+
+def _barge_in_turn(session, *, synthesis_done=False):
+    from voice.session import _Turn
+
+    pipeline = MagicMock()
+    pipeline.spoken_text.side_effect = lambda played, from_seconds=0.0: "Heard part."
+    pipeline.audio_seconds = 5.0
+    pipeline.text = "Heard part. Unheard part."
+    source = MagicMock()
+    source.played_ms = 1500
+    turn = _Turn("999", "123", pipeline, source, synthesis_done=synthesis_done)
+    session._turn = turn
+    session._is_speaking = True
+    return turn
+
+
+class TestBargeIn:
+    @pytest.mark.asyncio
+    async def test_no_barge_in_during_grace_period(self):
+        session = _make_streaming_session()
+        turn = _barge_in_turn(session)
+        turn.play_started_at = time.monotonic()
+
+        for _ in range(30):
+            session._on_audio_received(999, _loud_frame())
+
+        assert turn.interrupted_ms is None
+        assert session._is_speaking
+
+    @pytest.mark.asyncio
+    async def test_sustained_speech_stops_reply(self):
+        session = _make_streaming_session()
+        session._streaming = False
+        turn = _barge_in_turn(session)
+        turn.play_started_at = time.monotonic() - 5
+
+        for _ in range(30):
+            session._on_audio_received(999, _loud_frame())
+        await asyncio.sleep(0)
+
+        assert (turn.interrupted_ms, turn.interrupted_by) == (1500, 999)
+        assert not session._is_speaking
+        turn.source.interrupt.assert_called_once()
+        turn.pipeline.cancel.assert_called_once()  # Still synthesizing
+        # Speech after the trigger reaches the user's VAD again
+        assert session._user_vads[999].is_speaking
+
+    @pytest.mark.asyncio
+    async def test_barge_in_after_synthesis_amends_history(self):
+        session = _make_streaming_session()
+        turn = _barge_in_turn(session, synthesis_done=True)
+        turn.interrupted_ms, turn.interrupted_by = 1500, 999
+
+        with patch("voice.session.track") as track:
+            session._barge_in(turn)
+            for _ in range(3):
+                await asyncio.sleep(0)
+
+        turn.pipeline.cancel.assert_not_called()
+        session._claude.amend_interrupted_reply.assert_awaited_once_with("999", "123", "Heard part.")
+        assert track.call_args.args[0] == "voice_barge_in"
+        assert track.call_args.kwargs["properties"]["played_ms"] == 1500
+
+    @pytest.mark.asyncio
+    async def test_barge_in_during_synthesis_records_spoken_text(self):
+        session = _make_streaming_session()
+        session._voice_client.is_connected.return_value = True
+        session._voice_client.is_playing.return_value = True
+        session._claude.memory = None
+        never = asyncio.Event()
+
+        async def llm():
+            yield "Hello there."
+            await never.wait()
+
+        async def tts(segments, **kwargs):
+            async for _ in segments:
+                yield b"\x00" * 48000  # 1s
+                session._turn.interrupted_ms, session._turn.interrupted_by = 1000, 999
+                session._barge_in(session._turn)
+                await never.wait()
+
+        session._claude.chat_streaming = MagicMock(return_value=llm())
+        session._tts.synthesize_incremental = tts
+
+        with (
+            patch("voice.session.track"),
+            patch.object(session._echo_guard, "add_bot_text") as echo,
+        ):
+            await asyncio.wait_for(
+                session._speak_streaming(user_id="999", channel_id="123", content="Hi"), 2
+            )
+
+        session._claude.amend_interrupted_reply.assert_awaited_once_with("999", "123", "Hello there.")
+        session._voice_client.stop.assert_called_once()
+        echo.assert_called_once_with("Hello there.")
+
+    @pytest.mark.asyncio
+    async def test_finished_turn_is_not_barged_during_setup(self):
+        session = _make_streaming_session()
+        session._voice_client.is_connected.return_value = True
+        previous = _barge_in_turn(session, synthesis_done=True)
+        previous.play_started_at = time.monotonic() - 5
+
+        async def close_streams():
+            # User speaks while the next reply is being set up
+            for _ in range(30):
+                session._on_audio_received(999, _loud_frame())
+            await asyncio.sleep(0)
+            raise RuntimeError("stop before the pipeline")
+
+        with patch.object(session, "_close_streams", side_effect=close_streams):
+            with pytest.raises(RuntimeError):
+                await session._speak_streaming(user_id="999", channel_id="123", content="Hi")
+
+        assert previous.interrupted_ms is None
+        assert session._is_speaking
+        previous.source.interrupt.assert_not_called()
+        session._claude.amend_interrupted_reply.assert_not_called()
+
+
+def _member(user_id: int, name: str):
+    member = MagicMock()
+    member.id, member.display_name, member.bot = user_id, name, False
+    return member
+
+
+class TestTurnQueue:
+    @pytest.mark.asyncio
+    async def test_stt_runs_concurrently_and_replies_keep_order(self):
+        session = _make_streaming_session()
+        release_first = asyncio.Event()
+        started = []
+
+        async def transcribe(pcm, stream):
+            started.append(pcm)
+            if pcm == b"first":
+                await release_first.wait()
+            return pcm.decode()
+
+        with (
+            patch.object(session, "_transcribe", side_effect=transcribe),
+            patch.object(session, "_speak_streaming", new_callable=AsyncMock) as speak,
+        ):
+            first = asyncio.create_task(session._handle_utterance(1, b"first", 1.0))
+            second = asyncio.create_task(session._handle_utterance(2, b"second", 1.2))
+            for _ in range(5):
+                await asyncio.sleep(0)
+
+            assert started == [b"first", b"second"]  # Second STT didn't wait
+            speak.assert_not_awaited()  # Its reply waits for the first one's
+            release_first.set()
+            await asyncio.gather(first, second)
+
+        assert [c.kwargs["content"] for c in speak.call_args_list] == ["first", "second"]
+        assert not session._utterances
+
+    @pytest.mark.asyncio
+    async def test_next_reply_waits_for_playback(self):
+        session = _make_streaming_session()
+        session._playback_idle.clear()
+
+        with (
+            patch.object(session, "_transcribe", new_callable=AsyncMock, return_value="Hello"),
+            patch.object(session, "_speak_streaming", new_callable=AsyncMock) as speak,
+        ):
+            task = asyncio.create_task(session._handle_utterance(1, b"\x00" * 6400, 1.0))
+            for _ in range(5):
+                await asyncio.sleep(0)
+            speak.assert_not_awaited()
+
+            session._on_playback_done(None)
+            await task
+
+        speak.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_near_simultaneous_utterances_batched(self):
+        session = _make_streaming_session()
+        session._batch_ms = 300
+        session._voice_client.channel.members = [_member(1, "Alice"), _member(2, "Bob")]
+        transcripts = {b"a": "Test Bot, hi.", b"b": "Test Bot, hello.", b"c": "Test Bot, later."}
+        now = time.monotonic()
+
+        async def transcribe(pcm, stream):
+            return transcripts[pcm]
+
+        with (
+            patch.object(session, "_transcribe", side_effect=transcribe),
+            patch.object(session, "_speak_streaming", new_callable=AsyncMock) as speak,
+        ):
+            await asyncio.gather(
+                session._handle_utterance(1, b"a", now),
+                session._handle_utterance(2, b"b", now + 0.1),
+                session._handle_utterance(1, b"c", now + 1.0),  # Outside the window
+            )
+
+        assert speak.await_count == 2
+        batched = speak.call_args_list[0].kwargs
+        assert batched["content"] == "Alice: Test Bot, hi.\nBob: Test Bot, hello."
+        assert (batched["user_id"], batched["batched"]) == ("1", 2)
+        assert batched["speakers"] == [("1", "Test Bot, hi."), ("2", "Test Bot, hello.")]
+        assert speak.call_args_list[1].kwargs["content"] == "Test Bot, later."
+
+    @pytest.mark.asyncio
+    async def test_batch_memory_tracked_per_speaker(self):
+        session = _make_streaming_session()
+        session._voice_client.is_connected.return_value = True
+
+        async def llm():
+            yield "Hi both."
+
+        async def tts(segments, **kwargs):
+            async for _ in segments:
+                yield b"\x00" * 4800
+
+        session._claude.chat_streaming = MagicMock(return_value=llm())
+        session._tts.synthesize_incremental = tts
+
+        with (
+            patch("voice.session.track"),
+            patch.object(session, "_track_memory_async", new_callable=AsyncMock) as track_memory,
+        ):
+            await session._speak_streaming(
+                user_id="1", channel_id="123", content="Alice: hi.\nBob: hello.",
+                speakers=[("1", "hi."), ("2", "hello.")],
+            )
+            await asyncio.sleep(0)
+
+        assert [c.args for c in track_memory.call_args_list] == [
+            ("1", "123", "hi.", "Hi both."),
+            ("2", "123", "hello.", "Hi both."),
+        ]
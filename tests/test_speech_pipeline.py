@@ -0,0 +1,197 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the pipelined LLM → TTS voice turn."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from voice.speech_pipeline import SpeechPipeline
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class _FakeTTS:
+    """Yields one audio chunk per segment, as each segment arrives."""
+
+    def __init__(self):
+        self.received: list[str] = []
+        self.emotion = None
+
+    async def synthesize_incremental(
+        self, segments, *, emotion=None, speed=1.0, language="en", on_timestamps=None
+    ):
+        self.emotion = emotion
+        async for segment in segments:
+            self.received.append(segment)
+            yield segment.encode()
+
+
+class TestSpeechPipeline:
+    @pytest.mark.asyncio
+    async def test_audio_starts_before_llm_finishes(self):
+        tts = _FakeTTS()
+        release = asyncio.Event()
+        audio: list[bytes] = []
+
+        async def llm():
+            yield "First."
+            await release.wait()
+            yield "Second."
+
+        pipeline = SpeechPipeline(tts, llm(), audio.append)
+        run = asyncio.create_task(pipeline.run())
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert audio == [b"First."]  # Spoken while the LLM is still generating
+        release.set()
+        timing = await run
+
+        assert audio == [b"First.", b"Second."]
+        assert pipeline.text == "First. Second."
+        assert (timing.segments, timing.chars, timing.cancelled) == (2, 13, False)
+
+    @pytest.mark.asyncio
+    async def test_records_time_to_first_audio(self):
+        clock = _Clock()
+        tts = _FakeTTS()
+
+        async def llm():
+            clock.now += 0.4
+            yield "Hello there."
+
+        def on_audio(_):
+            clock.now += 0.1
+
+        timing = await SpeechPipeline(
+            tts, llm(), on_audio, started=clock.now - 0.2, clock=clock
+        ).run()
+
+        assert timing.first_segment_ms == 600
+        assert timing.ttfa_ms == 600  # Audio timestamp is taken before on_audio runs
+
+    @pytest.mark.asyncio
+    async def test_emotion_inferred_from_first_sentence(self):
+        tts = _FakeTTS()
+
+        async def llm():
+            yield "Wow!"
+            yield "Anyway."
+
+        await SpeechPipeline(
+            tts, llm(), lambda _: None, emotion_for=lambda s: "excited" if "!" in s else None
+        ).run()
+
+        assert tts.emotion == "excited"
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_turn_and_closes_llm_stream(self):
+        tts = _FakeTTS()
+        closed = asyncio.Event()
+
+        async def llm():
+            try:
+                yield "First."
+                await asyncio.Event().wait()  # Never finishes on its own
+            finally:
+                closed.set()
+
+        pipeline = SpeechPipeline(tts, llm(), lambda _: None)
+        run = asyncio.create_task(pipeline.run())
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        pipeline.cancel()
+        timing = await run
+
+        assert timing.cancelled is True
+        assert closed.is_set()
+        assert tts.received == ["First."]
+
+    @pytest.mark.asyncio
+    async def test_llm_error_raised_after_partial_audio(self):
+        tts = _FakeTTS()
+        audio: list[bytes] = []
+
+        async def llm():
+            yield "Partial."
+            raise RuntimeError("stream broke")
+
+        with pytest.raises(RuntimeError, match="stream broke"):
+            await SpeechPipeline(tts, llm(), audio.append).run()
+
+        assert audio == [b"Partial."]
+
+    @pytest.mark.asyncio
+    async def test_empty_reply_skips_tts(self):
+        tts = _FakeTTS()
+
+        async def llm():
+            return
+            yield
+
+        timing = await SpeechPipeline(tts, llm(), lambda _: None).run()
+
+        assert tts.received == []
+        assert timing.ttfa_ms is None
+
+
+class _TimestampedTTS(_FakeTTS):
+    """One second of audio per segment, with word end times."""
+
+    async def synthesize_incremental(
+        self, segments, *, emotion=None, speed=1.0, language="en", on_timestamps=None
+    ):
+        offset = 0.0
+        async for segment in segments:
+            words = segment.split()
+            if on_timestamps is not None:
+                on_timestamps(words, [offset + (i + 1) / len(words) for i in range(len(words))])
+            offset += 1.0
+            yield b"\x00" * 48000
+
+
+class TestSpokenText:
+    async def _run(self, tts, *sentences):
+        async def llm():
+            for sentence in sentences:
+                yield sentence
+
+        pipeline = SpeechPipeline(tts, llm(), lambda _: None)
+        await pipeline.run()
+        return pipeline
+
+    @pytest.mark.asyncio
+    async def test_uses_word_timestamps(self):
+        pipeline = await self._run(_TimestampedTTS(), "One two three four.", "Five six.")
+
+        assert pipeline.audio_seconds == 2.0
+        assert pipeline.spoken_text(0.6) == "One two"
+        assert pipeline.spoken_text(1.5, from_seconds=0.6) == "three four. Five"
+        assert pipeline.spoken_text(5.0) == "One two three four. Five six."
+
+    @pytest.mark.asyncio
+    async def test_proportional_without_timestamps(self):
+        class _Tts(_FakeTTS):
+            async def synthesize_incremental(self, segments, **kwargs):
+                async for _ in segments:
+                    yield b"\x00" * 48000
+
+        pipeline = await self._run(_Tts(), "Alpha beta.", "Gamma delta.")
+
+        # "Alpha beta. Gamma delta." is 24 chars over 2s; whole words only
+        assert pipeline.spoken_text(1.0) == "Alpha beta."
+        assert pipeline.spoken_text(0.0) == ""
@@ -0,0 +1,264 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for streamed chat replies (StreamingReply and ClaudeClient.chat(on_text=...))."""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from claude_client import ClaudeClient
+from utils.streaming_reply import StreamingReply
+
+
+class FakeMessage:
+    def __init__(self, channel, content):
+        self.channel = channel
+        self.content = content
+        self.deleted = False
+
+    async def edit(self, content):
+        self.channel.edits += 1
+        self.content = content
+
+    async def delete(self):
+        self.deleted = True
+
+    async def reply(self, content):
+        return await self.channel.send(content, reply=True)
+
+
+class FakeChannel:
+    def __init__(self):
+        self.sent: list[FakeMessage] = []
+        self.edits = 0
+        self.replies = 0
+
+    async def send(self, content, reply=False):
+        self.replies += reply
+        message = FakeMessage(self, content)
+        self.sent.append(message)
+        return message
+
+    def visible(self):
+        return [m.content for m in self.sent if not m.deleted]
+
+
+def _chunker(limit=40):
+    """Paragraph chunker with a tiny limit so tests exercise multi-message replies."""
+
+    def chunk(text):
+        chunks, current = [], ""
+        for para in text.split("\n\n"):
+            candidate = f"{current}\n\n{para}" if current else para
+            if current and len(candidate) > limit:
+                chunks.append(current)
+                current = para
+            else:
+                current = candidate
+        return chunks + [current] if current else chunks
+
+    return chunk
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestStreamingReply:
+    @pytest.mark.asyncio
+    async def test_first_chunk_posted_at_paragraph_boundary(self):
+        channel = FakeChannel()
+        original = FakeMessage(channel, "question")
+        reply = StreamingReply(channel, _chunker(), reply_to=original, min_interval=0)
+
+        await reply.feed("First para")
+        await _settle()
+        assert channel.sent == []  # nothing settled yet
+
+        await reply.feed("graph.\n\nSecond")
+        await _settle()
+        assert channel.visible() == ["First paragraph."]
+        assert channel.replies == 1
+        assert reply.first_sent_at is not None
+
+    @pytest.mark.asyncio
+    async def test_header_boundary_settles_previous_section(self):
+        channel = FakeChannel()
+        reply = StreamingReply(channel, _chunker(200), min_interval=0)
+
+        await reply.feed("Intro line\n## Details")
+        await _settle()
+
+        assert channel.visible() == ["Intro line"]
+
+    @pytest.mark.asyncio
+    async def test_unclosed_code_fence_not_rendered(self):
+        channel = FakeChannel()
+        reply = StreamingReply(channel, _chunker(200), min_interval=0)
+
+        await reply.feed("Try this:\n\n```py\nx = 1\n\ny = 2")
+        await _settle()
+        assert channel.visible() == ["Try this:"]
+
+        await reply.feed("\n```\n\nDone")
+        await _settle()
+        assert channel.visible() == ["Try this:\n\n```py\nx = 1\n\ny = 2\n```"]
+
+    @pytest.mark.asyncio
+    async def test_grows_into_multiple_messages_and_finishes(self):
+        channel = FakeChannel()
+        original = FakeMessage(channel, "question")
+        reply = StreamingReply(channel, _chunker(), reply_to=original, min_interval=0)
+        paragraphs = [f"Paragraph number {i} here." for i in range(4)]
+
+        for para in paragraphs:
+            await reply.feed(para + "\n\n")
+            await _settle()
+
+        last = await reply.finish("\n\n".join(paragraphs))
+
+        assert channel.visible() == _chunker()("\n\n".join(paragraphs))
+        assert last is channel.sent[-1]
+        assert reply.chunk_count == len(channel.visible())
+
+    @pytest.mark.asyncio
+    async def test_renders_throttled_by_interval(self):
+        channel = FakeChannel()
+        now = [0.0]
+        reply = StreamingReply(
+            channel, _chunker(1000), min_interval=1.0, clock=lambda: now[0]
+        )
+
+        await reply.feed("One.\n\n")
+        await _settle()
+        await reply.feed("Two.\n\n")
+        await _settle()
+        assert channel.visible() == ["One."]
+        assert channel.edits == 0
+
+        now[0] = 1.5
+        await reply.feed("Three.\n\n")
+        await _settle()
+        assert channel.visible() == ["One.\n\nTwo.\n\nThree."]
+        assert channel.edits == 1
+
+    @pytest.mark.asyncio
+    async def test_finish_replaces_interim_text_and_deletes_surplus(self):
+        channel = FakeChannel()
+        reply = StreamingReply(channel, _chunker(), min_interval=0)
+
+        await reply.feed("Let me look that up for you now.\n\nChecking the docs folder.\n\n")
+        await _settle()
+        assert len(channel.visible()) == 2
+
+        await reply.finish("Short answer.")
+
+        assert channel.visible() == ["Short answer."]
+
+    @pytest.mark.asyncio
+    async def test_finish_without_stream_posts_everything(self):
+        channel = FakeChannel()
+        reply = StreamingReply(channel, _chunker())
+
+        last = await reply.finish("Whole answer")
+
+        assert channel.visible() == ["Whole answer"]
+        assert last is channel.sent[0]
+
+
+class FakeStream:
+    def __init__(self, deltas, final):
+        self._deltas = deltas
+        self._final = final
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        async def gen():
+            for delta in self._deltas:
+                yield delta
+
+        return gen()
+
+    async def get_final_message(self):
+        return self._final
+
+
+def _block(type_, **fields):
+    block = SimpleNamespace(type=type_, **fields)
+    block.model_dump = lambda exclude=None: {k: v for k, v in fields.items()}
+    return block
+
+
+def _final(blocks, stop_reason):
+    usage = SimpleNamespace(
+        input_tokens=10, output_tokens=5, cache_creation_input_tokens=0, cache_read_input_tokens=0
+    )
+    return SimpleNamespace(content=blocks, stop_reason=stop_reason, usage=usage)
+
+
+class TestChatStreaming:
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setattr("claude_client.track", lambda *a, **k: None)
+        client = ClaudeClient(api_key="test", bot=MagicMock())
+        client._build_date_context = AsyncMock(return_value="Today is Friday.")
+        client._execute_tool = AsyncMock(return_value="tool output")
+        return client
+
+    @pytest.mark.asyncio
+    async def test_deltas_forwarded_and_tool_turns_work(self, client):
+        streams = [
+            FakeStream(
+                ["Let me ", "check."],
+                _final(
+                    [
+                        _block("text", text="Let me check."),
+                        _block("tool_use", id="t1", name="list_github_docs", input={}),
+                    ],
+                    "tool_use",
+                ),
+            ),
+            FakeStream(["Here is ", "the answer."], _final([_block("text", text="Here is the answer.")], "end_turn")),
+        ]
+        client.client = MagicMock()
+        client.client.messages.stream = MagicMock(side_effect=streams)
+        client.client.messages.create = AsyncMock()
+        deltas = []
+
+        async def on_text(delta):
+            deltas.append(delta)
+
+        result = await client.chat("1", "2", "what docs exist?", on_text=on_text)
+
+        assert "".join(deltas) == "Let me check.\n\nHere is the answer."
+        assert result.text == "Here is the answer."
+        client._execute_tool.assert_awaited_once()
+        client.client.messages.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_without_on_text_uses_create(self, client):
+        client.client = MagicMock()
+        client.client.messages.create = AsyncMock(
+            return_value=_final([_block("text", text="Hi!")], "end_turn")
+        )
+        client.client.messages.stream = MagicMock()
+
+        result = await client.chat("1", "2", "hello")
+
+        assert result.text == "Hi!"
+        client.client.messages.stream.assert_not_called()
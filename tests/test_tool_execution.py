@@ -0,0 +1,114 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for concurrent tool execution in the agentic loop."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from tool_execution import ToolCall, _stages, execute_tool_calls
+
+
+def _calls(*names):
+    return [ToolCall(id=f"t{i}", name=name, input={}) for i, name in enumerate(names)]
+
+
+class Recorder:
+    """Fake executor that logs start/end events and sleeps per tool."""
+
+    def __init__(self, delays=None, fail=()):
+        self.delays = delays or {}
+        self.fail = set(fail)
+        self.events: list[tuple[str, str]] = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, call: ToolCall) -> str:
+        self.events.append(("start", call.id))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(call.name, 0.01))
+            if call.name in self.fail:
+                raise RuntimeError("boom")
+            return f"{call.name} ok"
+        finally:
+            self.active -= 1
+            self.events.append(("end", call.id))
+
+
+class TestStages:
+    def test_reads_grouped_and_writes_isolated(self):
+        calls = _calls("read_messages", "list_channels", "send_message", "search_memories", "delete_message", "delete_message")
+        assert _stages(calls) == [[0, 1], [2], [3], [4], [5]]
+
+    def test_read_after_write_starts_new_stage(self):
+        calls = _calls("send_message", "read_messages", "list_github_docs")
+        assert _stages(calls) == [[0], [1, 2]]
+
+
+class TestExecuteToolCalls:
+    @pytest.mark.asyncio
+    async def test_independent_reads_run_concurrently(self):
+        recorder = Recorder(delays={"read_messages": 0.05, "list_github_docs": 0.05, "search_memories": 0.05})
+        calls = _calls("read_messages", "list_github_docs", "search_memories")
+
+        batch = await execute_tool_calls(calls, recorder)
+
+        assert recorder.peak == 3
+        assert batch.wall_ms < batch.serial_ms
+        assert [o.call.id for o in batch.outcomes] == ["t0", "t1", "t2"]
+        assert all(o.latency_ms >= 40 for o in batch.outcomes)
+
+    @pytest.mark.asyncio
+    async def test_side_effects_are_ordered_barriers(self):
+        recorder = Recorder()
+        calls = _calls("read_messages", "send_message", "edit_message", "read_messages")
+
+        await execute_tool_calls(calls, recorder)
+
+        assert recorder.peak == 1
+        assert recorder.events == [
+            ("start", "t0"), ("end", "t0"),
+            ("start", "t1"), ("end", "t1"),
+            ("start", "t2"), ("end", "t2"),
+            ("start", "t3"), ("end", "t3"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_timeout_returns_error_result(self):
+        recorder = Recorder(delays={"read_github_file": 1.0, "list_channels": 0.01})
+        calls = _calls("read_github_file", "list_channels")
+
+        batch = await execute_tool_calls(
+            calls, recorder, default_timeout_ms=5000, timeouts_ms={"read_github_file": 50}
+        )
+
+        slow, fast = batch.outcomes
+        assert slow.timed_out is True
+        assert slow.result.startswith("Error: read_github_file timed out")
+        assert fast.result == "list_channels ok"
+
+    @pytest.mark.asyncio
+    async def test_side_effect_timeout_warns_about_partial_completion(self):
+        recorder = Recorder(delays={"send_message": 1.0})
+
+        batch = await execute_tool_calls(_calls("send_message"), recorder, default_timeout_ms=50)
+
+        assert "may still have completed" in batch.outcomes[0].result
+
+    @pytest.mark.asyncio
+    async def test_exception_does_not_fail_turn(self):
+        recorder = Recorder(fail={"get_channel_info"})
+        calls = _calls("get_channel_info", "list_channels")
+
+        batch = await execute_tool_calls(calls, recorder)
+
+        assert batch.outcomes[0].result == "Error executing get_channel_info: boom"
+        assert batch.outcomes[1].result == "list_channels ok"
@@ -0,0 +1,158 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for MemoryUpdater.update_many (batched embed / match / merge / write)."""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from memory.config import MemoryConfig
+from memory.extractor import ExtractedMemory
+from memory.privacy import PrivacyLevel
+
+# Orthogonal-ish unit vectors keyed by summary so similarity is predictable
+_VECTORS = {
+    "Builds castles": [1.0, 0.0, 0.0],
+    "Builds big castles": [0.99, 0.1, 0.0],
+    "Likes cats": [0.0, 1.0, 0.0],
+    "Merged castles": [1.0, 0.0, 0.0],
+}
+
+
+def _memory(summary, memory_type="semantic"):
+    return ExtractedMemory(
+        summary=summary, memory_type=memory_type,
+        raw_dialogue=f"dialogue: {summary}", confidence=0.8, global_safe=False,
+    )
+
+
+def _embed_result(texts, **kwargs):
+    result = MagicMock()
+    result.embeddings = [_VECTORS.get(t, [0.0, 0.0, 1.0]) for t in texts]
+    return result
+
+
+def _merge_response(summary):
+    response = MagicMock()
+    response.content = [MagicMock(text=json.dumps({
+        "merged_summary": summary, "merged_dialogue": "merged", "confidence": 0.9,
+    }))]
+    return response
+
+
+@pytest.fixture
+def db():
+    pool = MagicMock()
+    pool.fetch = AsyncMock(return_value=[])
+    pool.fetchval = AsyncMock(return_value=True)
+    pool.execute = AsyncMock()
+
+    conn = MagicMock()
+    counter = iter(range(100, 200))
+    conn.fetchrow = AsyncMock(side_effect=lambda sql, *args: {"id": next(counter)})
+    txn_ctx = MagicMock()
+    txn_ctx.__aenter__ = AsyncMock(return_value=None)
+    txn_ctx.__aexit__ = AsyncMock(return_value=None)
+    conn.transaction = MagicMock(return_value=txn_ctx)
+    acquire_ctx = MagicMock()
+    acquire_ctx.__aenter__ = AsyncMock(return_value=conn)
+    acquire_ctx.__aexit__ = AsyncMock(return_value=None)
+    pool.acquire = MagicMock(return_value=acquire_ctx)
+    pool.conn = conn
+    return pool
+
+
+@pytest.fixture
+def updater(db):
+    with patch("memory.retriever.voyageai") as mock_voyageai:
+        from memory.retriever import MemoryRetriever
+        from memory.updater import MemoryUpdater
+
+        client = MagicMock()
+        client.embed = AsyncMock(side_effect=_embed_result)
+        mock_voyageai.AsyncClient.return_value = client
+        retriever = MemoryRetriever(db, MemoryConfig())
+        anthropic = MagicMock()
+        anthropic.messages.create = AsyncMock(return_value=_merge_response("Merged castles"))
+        yield MemoryUpdater(db, retriever, anthropic, MemoryConfig())
+
+
+class TestUpdateMany:
+    @pytest.mark.asyncio
+    async def test_all_adds_use_one_embed_one_query_one_transaction(self, updater, db):
+        items = [
+            (_memory("Builds castles"), PrivacyLevel.GUILD_PUBLIC),
+            (_memory("Likes cats"), PrivacyLevel.GUILD_PUBLIC),
+        ]
+        ids = await updater.update_many(111, items, 200, 100, agent_id="lena")
+
+        assert ids == [100, 101]
+        assert updater.retriever.voyage.embed.call_count == 1
+        assert db.fetch.call_count == 1
+        assert "LATERAL" in db.fetch.call_args[0][0]
+        db.conn.transaction.assert_called_once()
+        insert_args = db.conn.fetchrow.call_args_list[0][0]
+        assert "INSERT INTO memories" in insert_args[0]
+        assert insert_args[10] == "lena"
+        updater.anthropic.messages.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_merges_into_stored_neighbour(self, updater, db):
+        db.fetch.return_value = [
+            {"ord": 1, "id": 7, "topic_summary": "Builds castles", "raw_dialogue": "old",
+             "source_count": 1, "similarity": 0.95},
+        ]
+        items = [
+            (_memory("Builds big castles"), PrivacyLevel.GUILD_PUBLIC),
+            (_memory("Likes cats"), PrivacyLevel.GUILD_PUBLIC),
+        ]
+        ids = await updater.update_many(111, items)
+
+        assert updater.anthropic.messages.create.call_count == 1
+        update_sql, summary, _, _, confidence, merges, target = db.conn.fetchrow.call_args_list[0][0]
+        assert "UPDATE memories" in update_sql
+        assert (summary, confidence, merges, target) == ("Merged castles", 0.9, 1, 7)
+        # Summaries batch + merged summaries batch
+        assert updater.retriever.voyage.embed.call_count == 2
+        assert ids == [100, 101]
+
+    @pytest.mark.asyncio
+    async def test_in_batch_near_duplicates_fold_together(self, updater, db):
+        items = [
+            (_memory("Builds castles"), PrivacyLevel.GUILD_PUBLIC),
+            (_memory("Builds big castles"), PrivacyLevel.GUILD_PUBLIC),
+        ]
+        ids = await updater.update_many(111, items)
+
+        assert db.conn.fetchrow.call_count == 1
+        assert ids == [100, 100]
+        assert db.conn.fetchrow.call_args[0][2] == "Merged castles"
+
+    @pytest.mark.asyncio
+    async def test_no_merge_across_privacy_levels(self, updater, db):
+        items = [
+            (_memory("Builds castles"), PrivacyLevel.DM),
+            (_memory("Builds big castles"), PrivacyLevel.GUILD_PUBLIC),
+        ]
+        ids = await updater.update_many(111, items)
+
+        assert ids == [100, 101]
+        updater.anthropic.messages.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_is_noop(self, updater, db):
+        assert await updater.update_many(111, []) == []
+        db.acquire.assert_not_called()
+
+
+class TestConfigFields:
+    def test_merge_concurrency_from_env(self, monkeypatch):
+        monkeypatch.setenv("MEMORY_MERGE_CONCURRENCY", "8")
+        assert MemoryConfig.from_env().merge_concurrency == 8
@@ -12,7 +12,7 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from voice.vad import VADConfig, VoiceActivityDetector
+from voice.vad import BargeInConfig, BargeInDetector, VADConfig, VoiceActivityDetector
 
 
 def _make_silence(num_samples: int) -> bytes:
@@ -148,3 +148,48 @@ class TestVAD:
         vad = VoiceActivityDetector()
         assert vad.process(b"", 0.0) is None
         assert vad.process(b"\x00", 0.0) is None  # Single byte, < 2
+
+    def test_take_utterance_ends_early(self):
+        vad = VoiceActivityDetector(VADConfig(
+            rms_threshold=500.0,
+            silence_timeout_ms=1500,
+            min_audio_bytes=100000,  # Early endpoint bypasses the minimum
+        ))
+        loud = _make_loud(1600)
+        vad.process(loud, 0.0)
+        vad.process(_make_silence(800), 0.1)
+
+        assert vad.silence_ms(0.4) == pytest.approx(400)
+        utterance = vad.take_utterance()
+
+        assert utterance is not None and utterance.startswith(loud)
+        assert not vad.is_speaking
+        assert vad.take_utterance() is None
+
+
+class TestBargeInDetector:
+    def test_triggers_after_sustained_speech(self):
+        detector = BargeInDetector(BargeInConfig(rms_threshold=1500.0, min_speech_ms=300))
+        frames = [_make_loud(320) for _ in range(15)]  # 15 x 20ms
+
+        results = [detector.process(f) for f in frames]
+
+        assert results[:14] == [None] * 14
+        assert results[14] == b"".join(frames)  # Triggering speech is returned
+
+    def test_quiet_speech_ignored(self):
+        detector = BargeInDetector(BargeInConfig(rms_threshold=1500.0, min_speech_ms=100))
+        for _ in range(20):
+            assert detector.process(_make_loud(320, amplitude=1000)) is None
+
+    def test_short_gap_bridged_long_gap_resets(self):
+        detector = BargeInDetector(BargeInConfig(min_speech_ms=100, max_gap_ms=60))
+        for _ in range(3):
+            detector.process(_make_loud(320))
+        detector.process(_make_silence(320 * 2))  # 40ms gap: kept
+        assert detector.process(_make_loud(320 * 2)) is not None
+
+        for _ in range(3):
+            detector.process(_make_loud(320))
+        detector.process(_make_silence(320 * 4))  # 80ms gap: run forgotten
+        assert detector.process(_make_loud(320 * 2)) is None
@@ -0,0 +1,256 @@
+# slashAI - Discord Bot and MCP Server
+# Copyright (c) 2025-2026 Slash Daemon slashdaemon@protonmail.com
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the in-process retrieval tier (result cache + vector index)."""
+
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from memory.config import MemoryConfig
+from memory.vector_index import MemoryVectorIndex, RetrievalCache
+
+
+def _vec(*head: float, dim: int = 8) -> list[float]:
+    """Small embedding with the given leading components."""
+    return list(head) + [0.0] * (dim - len(head))
+
+
+def _db_row(memory_id, embedding, **kwargs):
+    row = {
+        "id": memory_id,
+        "user_id": 111,
+        "agent_id": "slashai",
+        "topic_summary": f"memory {memory_id}",
+        "raw_dialogue": "",
+        "memory_type": "semantic",
+        "privacy_level": "guild_public",
+        "origin_channel_id": 200,
+        "origin_guild_id": 100,
+        "source_count": 1,
+        "confidence": 0.9,
+        "created_at": None,
+        "updated_at": None,
+        "embedding": "[" + ",".join(str(x) for x in embedding) + "]",
+    }
+    row.update(kwargs)
+    return row
+
+
+@pytest.fixture
+def mock_db():
+    pool = MagicMock()
+    pool.fetch = AsyncMock(return_value=[])
+    pool.fetchval = AsyncMock(return_value=True)
+    pool.execute = AsyncMock()
+    return pool
+
+
+class TestRetrievalCache:
+    def test_hit_after_put(self):
+        cache = RetrievalCache()
+        cache.put(1, "k", ["a"])
+        assert cache.get(1, "k") == ["a"]
+        assert cache.hits == 1
+
+    def test_miss_counts(self):
+        cache = RetrievalCache()
+        assert cache.get(1, "k") is None
+        assert cache.misses == 1
+
+    def test_ttl_expiry(self):
+        cache = RetrievalCache(ttl_seconds=10)
+        with patch("memory.vector_index.time.monotonic", return_value=100.0):
+            cache.put(1, "k", ["a"])
+        with patch("memory.vector_index.time.monotonic", return_value=111.0):
+            assert cache.get(1, "k") is None
+
+    def test_lru_eviction(self):
+        cache = RetrievalCache(max_entries=2)
+        cache.put(1, "a", 1)
+        cache.put(1, "b", 2)
+        cache.get(1, "a")  # a is now most recent
+        cache.put(1, "c", 3)
+        assert cache.get(1, "b") is None
+        assert cache.get(1, "a") == 1
+
+    def test_invalidate_user_only_affects_that_user(self):
+        cache = RetrievalCache()
+        cache.put(1, "k1", "one")
+        cache.put(2, "k2", "two")
+        cache.invalidate_user(1)
+        assert cache.get(1, "k1") is None
+        assert cache.get(2, "k2") == "two"
+
+    def test_normalize_query(self):
+        assert RetrievalCache.normalize_query("  What   BUILDS ") == "what builds"
+
+
+class TestMemoryVectorIndex:
+    @pytest.mark.asyncio
+    async def test_search_ranks_by_similarity(self, mock_db):
+        mock_db.fetch.return_value = [
+            _db_row(1, _vec(1.0, 0.0)),
+            _db_row(2, _vec(0.0, 1.0)),
+        ]
+        index = MemoryVectorIndex(mock_db)
+        await index.ensure_loaded(111)
+
+        rows = index.search(111, "", _vec(0.1, 1.0), "guild_public", 100, 200, 5, 20, "slashai")
+        assert [r["id"] for r in rows] == [2, 1]
+        assert rows[0]["semantic_rank"] == 1
+        assert rows[0]["lexical_rank"] == 999
+
+    @pytest.mark.asyncio
+    async def test_search_applies_privacy_and_agent_filters(self, mock_db):
+        mock_db.fetch.return_value = [
+            _db_row(1, _vec(1.0), privacy_level="dm"),
+            _db_row(2, _vec(1.0), privacy_level="global"),
+            _db_row(3, _vec(1.0), privacy_level="guild_public"),
+            _db_row(4, _vec(1.0), privacy_level="global", agent_id="lena"),
+            _db_row(5, _vec(1.0), privacy_level="channel_restricted", origin_channel_id=200),
+            _db_row(6, _vec(1.0), privacy_level="channel_restricted", origin_channel_id=999),
+        ]
+        index = MemoryVectorIndex(mock_db)
+        await index.ensure_loaded(111)
+
+        def ids(privacy):
+            rows = index.search(111, "", _vec(1.0), privacy, 100, 200, 10, 20, "slashai")
+            return sorted(r["id"] for r in rows)
+
+        assert ids("dm") == [1, 2]
+        assert ids("guild_public") == [2, 3]
+        assert ids("channel_restricted") == [2, 5]
+
+    @pytest.mark.asyncio
+    async def test_lexical_match_boosts_rank(self, mock_db):
+        mock_db.fetch.return_value = [
+            _db_row(1, _vec(1.0, 0.1), topic_summary="Likes cats"),
+            _db_row(2, _vec(1.0, 0.0), topic_summary="Built a redstone computer"),
+        ]
+        index = MemoryVectorIndex(mock_db)
+        await index.ensure_loaded(111)
+
+        rows = index.search(111, "my redstone", _vec(1.0, 0.1), "guild_public", 100, 200, 5, 20, "slashai")
+        # Memory 2 is second semantically but is the only lexical hit
+        assert rows[0]["id"] == 2
+        assert rows[0]["lexical_rank"] == 1
+
+    @pytest.mark.asyncio
+    async def test_search_returns_none_when_not_loaded(self, mock_db):
+        index = MemoryVectorIndex(mock_db)
+        assert index.search(111, "q", _vec(1.0), "dm", None, None, 5, 20, None) is None
+
+    @pytest.mark.asyncio
+    async def test_stale_index_reloads(self, mock_db):
+        index = MemoryVectorIndex(mock_db, ttl_seconds=10)
+        with patch("memory.vector_index.time.monotonic", return_value=100.0):
+            await index.ensure_loaded(111)
+        with patch("memory.vector_index.time.monotonic", return_value=105.0):
+            await index.ensure_loaded(111)
+            assert mock_db.fetch.call_count == 1
+        with patch("memory.vector_index.time.monotonic", return_value=111.0):
+            assert not index.is_fresh(111)
+            await index.ensure_loaded(111)
+            assert mock_db.fetch.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_upsert_and_remove_keep_index_warm(self, mock_db):
+        mock_db.fetch.return_value = [_db_row(1, _vec(1.0, 0.0))]
+        index = MemoryVectorIndex(mock_db)
+        await index.ensure_loaded(111)
+
+        new_row = _db_row(2, _vec(0.0, 1.0))
+        new_row.pop("embedding")
+        index.upsert(new_row, _vec(0.0, 1.0))
+        rows = index.search(111, "", _vec(0.0, 1.0), "guild_public", 100, 200, 5, 20, "slashai")
+        assert rows[0]["id"] == 2
+
+        index.remove(111, 2)
+        rows = index.search(111, "", _vec(0.0, 1.0), "guild_public", 100, 200, 5, 20, "slashai")
+        assert [r["id"] for r in rows] == [1]
+
+    @pytest.mark.asyncio
+    async def test_nearest_respects_privacy_level(self, mock_db):
+        mock_db.fetch.return_value = [
+            _db_row(1, _vec(1.0, 0.0), privacy_level="dm"),
+            _db_row(2, _vec(0.5, 0.5), privacy_level="guild_public"),
+        ]
+        index = MemoryVectorIndex(mock_db)
+        await index.ensure_loaded(111)
+
+        best = index.nearest(111, _vec(1.0, 0.0), "guild_public")
+        assert best["id"] == 2
+        assert 0.70 < best["similarity"] < 0.71
+        assert index.nearest(111, _vec(1.0, 0.0), "global") is None
+
+
+class TestRetrieverTier:
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_embedding_and_search(self, mock_db):
+        channel = MagicMock()
+        channel.guild.id = 100
+        channel.id = 200
+
+        with patch("memory.retriever.voyageai") as mock_voyageai, \
+             patch("memory.retriever.classify_channel_privacy", new_callable=AsyncMock) as mock_privacy:
+            from memory.privacy import PrivacyLevel
+            from memory.retriever import MemoryRetriever
+
+            mock_privacy.return_value = PrivacyLevel.GUILD_PUBLIC
+            embed_result = MagicMock()
+            embed_result.embeddings = [_vec(1.0)]
+            mock_client = MagicMock()
+            mock_client.embed = AsyncMock(return_value=embed_result)
+            mock_voyageai.AsyncClient.return_value = mock_client
+
+            config = MemoryConfig(retrieval_cache_enabled=True)
+            retriever = MemoryRetriever(mock_db, config)
+
+            await retriever.retrieve(111, "what do I build", channel, agent_id="slashai")
+            await retriever.retrieve(111, "What do I  build", channel, agent_id="slashai")
+
+            assert mock_client.embed.call_count == 1
+            assert mock_db.fetch.call_count == 1
+            assert retriever.cache.hits == 1
+
+            retriever.invalidate_user(111)
+            await retriever.retrieve(111, "what do I build", channel, agent_id="slashai")
+            assert mock_db.fetch.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_index_serves_hybrid_search(self, mock_db):
+        channel = MagicMock()
+        channel.guild.id = 100
+        channel.id = 200
+        mock_db.fetch.return_value = [_db_row(7, _vec(1.0))]
+
+        with patch("memory.retriever.voyageai") as mock_voyageai, \
+             patch("memory.retriever.classify_channel_privacy", new_callable=AsyncMock) as mock_privacy:
+            from memory.privacy import PrivacyLevel
+            from memory.retriever import MemoryRetriever
+
+            mock_privacy.return_value = PrivacyLevel.GUILD_PUBLIC
+            embed_result = MagicMock()
+            embed_result.embeddings = [_vec(1.0)]
+            mock_client = MagicMock()
+            mock_client.embed = AsyncMock(return_value=embed_result)
+            mock_voyageai.AsyncClient.return_value = mock_client
+
+            config = MemoryConfig(vector_index_enabled=True)
+            retriever = MemoryRetriever(mock_db, config)
+
+            first = await retriever.retrieve(111, "q1", channel, agent_id="slashai")
+            second = await retriever.retrieve(111, "q2", channel, agent_id="slashai")
+
+            assert [m.id for m in first] == [7]
+            assert [m.id for m in second] == [7]
+            # Only the initial index load hit Postgres; hybrid_memory_search never ran
+            sqls = [c[0][0] for c in mock_db.fetch.call_args_list]
+            assert len(sqls) == 1
+            assert "hybrid_memory_search" not in sqls[0]